@@ -0,0 +1 @@
+"""Benchmarks to keep track of the performance of dagger. They are not run as part of the test suite."""
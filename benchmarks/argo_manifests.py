@@ -0,0 +1,169 @@
+"""
+Measure how long it takes to generate Argo manifests for very large DAGs.
+
+This benchmark builds synthetic DAGs with a configurable number of nodes, and measures:
+
+- The time it takes to build (and validate) the DAG.
+- The time it takes the Argo runtime to generate the spec of a Workflow for it, with the default options and with each of the options that change how templates are generated.
+
+The synthetic DAGs are:
+
+- wide: A task whose output is consumed by every other task. A tenth of the tasks are also outputs of the DAG.
+- chain: A chain of tasks, each of them consuming the output of the previous one. Every task can be fused with the next one.
+- tree: Every task consumes the output of a task generated before it, either the previous one or the one at half of its index. A tenth of the tasks are also outputs of the DAG.
+- nested: A DAG of sub-DAGs. Each sub-DAG is a chain of tasks, and they are all structurally identical.
+
+The time to generate a spec should grow linearly with the number of nodes.
+
+Usage:
+
+    python -m benchmarks.argo_manifests --nodes 10000 --runs 3
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from dagger.dag import DAG
+from dagger.input import FromNodeOutput, FromParam
+from dagger.output import FromReturnValue
+from dagger.runtime.argo import Workflow
+from dagger.runtime.argo.workflow_spec import workflow_spec
+from dagger.task import Task
+
+
+def identity(x):
+    """Return the input. Every task of the synthetic DAGs runs this function."""
+    return x
+
+
+def task(source: str = None) -> Task:
+    """Return a task that consumes the output of the source node, or the parameter of the DAG if no source is supplied."""
+    return Task(
+        identity,
+        inputs={"x": FromNodeOutput(source, "y") if source else FromParam()},
+        outputs={"y": FromReturnValue()},
+    )
+
+
+def wide_dag(nodes: int) -> DAG:
+    """Return a DAG where every task consumes the output of the first one."""
+    tasks = {"t0": task()}
+    for i in range(1, nodes):
+        tasks[f"t{i}"] = task("t0")
+
+    return DAG(
+        tasks,
+        inputs={"x": FromParam()},
+        outputs={f"o{i}": FromNodeOutput(f"t{i}", "y") for i in range(0, nodes, 10)},
+    )
+
+
+def chain_dag(nodes: int) -> DAG:
+    """Return a DAG where every task consumes the output of the previous one."""
+    tasks = {"t0": task()}
+    for i in range(1, nodes):
+        tasks[f"t{i}"] = task(f"t{i - 1}")
+
+    return DAG(
+        tasks,
+        inputs={"x": FromParam()},
+        outputs={"y": FromNodeOutput(f"t{nodes - 1}", "y")},
+    )
+
+
+def tree_dag(nodes: int) -> DAG:
+    """Return a DAG where every task consumes the output of either the previous task or the task at half of its index."""
+    tasks = {"t0": task()}
+    for i in range(1, nodes):
+        tasks[f"t{i}"] = task(f"t{i - 1}" if i % 2 else f"t{i // 2}")
+
+    return DAG(
+        tasks,
+        inputs={"x": FromParam()},
+        outputs={f"o{i}": FromNodeOutput(f"t{i}", "y") for i in range(0, nodes, 10)},
+    )
+
+
+def nested_dag(nodes: int) -> DAG:
+    """Return a DAG of identical sub-DAGs, each of them a chain of 100 tasks."""
+    tasks_per_dag = 100
+    dags = {}
+    for i in range(max(nodes // tasks_per_dag, 1)):
+        dags[f"d{i}"] = chain_dag(tasks_per_dag)
+
+    return DAG(dags, inputs={"x": FromParam()})
+
+
+def synthetic_dags() -> Dict[str, Callable[[int], DAG]]:
+    """Return the functions that build each synthetic DAG, by name."""
+    return {
+        "wide": wide_dag,
+        "chain": chain_dag,
+        "tree": tree_dag,
+        "nested": nested_dag,
+    }
+
+
+def workflows() -> Dict[str, Workflow]:
+    """Return the workflow configurations to benchmark, by name."""
+    return {
+        "default": Workflow(container_image="my-image", params={"x": 1}),
+        "deduplicate_templates": Workflow(
+            container_image="my-image",
+            params={"x": 1},
+            deduplicate_templates=True,
+        ),
+        "fuse_tasks": Workflow(
+            container_image="my-image",
+            params={"x": 1},
+            fuse_tasks=True,
+        ),
+    }
+
+
+def measure(operation: Callable[[], object], runs: int) -> List[float]:
+    """Return the number of seconds each run of the operation takes."""
+    measurements = []
+    for _ in range(runs):
+        started_at = time.perf_counter()
+        operation()
+        measurements.append(time.perf_counter() - started_at)
+
+    return measurements
+
+
+def report(name: str, measurements: List[float]):
+    """Print a summary of the measurements in milliseconds."""
+    print(
+        f"{name:<36} "
+        f"median={statistics.median(measurements) * 1000:10.1f}ms "
+        f"min={min(measurements) * 1000:10.1f}ms "
+        f"max={max(measurements) * 1000:10.1f}ms"
+    )
+
+
+def main():
+    """Run the manifest generation benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    for dag_name, build_dag in synthetic_dags().items():
+        report(
+            f"{dag_name}/build",
+            measure(lambda: build_dag(args.nodes), args.runs),
+        )
+
+        dag = build_dag(args.nodes)
+        for workflow_name, workflow in workflows().items():
+            report(
+                f"{dag_name}/{workflow_name}",
+                measure(lambda: workflow_spec(dag, workflow), args.runs),
+            )
+
+
+if __name__ == "__main__":
+    main()
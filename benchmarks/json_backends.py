@@ -0,0 +1,88 @@
+"""
+Compare the throughput of the backends supported by `dagger.AsJSON`.
+
+For each backend and payload, this benchmark measures how many values per second (and how many MB per second) `AsJSON` can serialize into, and deserialize from, an in-memory stream.
+
+Payloads:
+
+- small: A small dictionary, similar to the values passed between the partitions of a map-reduce workflow.
+- records: A list of 10,000 flat records.
+- nested: A deeply nested structure of dictionaries and lists.
+
+Usage:
+
+    python -m benchmarks.json_backends --runs 5
+"""
+
+import argparse
+import io
+import statistics
+from typing import Any, List
+
+from benchmarks.throughput import measure_throughput
+from dagger.serializer import AsJSON
+from dagger.serializer.as_json import JSON_BACKENDS
+
+PAYLOADS = {
+    "small": {"partition": 42, "status": "done", "items": [1, 2, 3], "score": 0.97},
+    "records": [
+        {"id": i, "name": f"record-{i}", "value": i * 0.5, "tags": ["a", "b"]}
+        for i in range(10_000)
+    ],
+    "nested": {
+        f"level-{i}": {f"child-{j}": [{"k": k} for k in range(10)] for j in range(10)}
+        for i in range(50)
+    },
+}
+
+
+def available_backends() -> List[str]:
+    """Return the backends that can run in the current environment."""
+    backends = []
+    for backend in JSON_BACKENDS:
+        try:
+            AsJSON(backend=backend).serialize(None, io.BytesIO())
+            backends.append(backend)
+        except ImportError:
+            pass
+
+    return backends
+
+
+def report(backend: str, payload_name: str, payload: Any, runs: int):
+    """Measure serialization and deserialization of a payload with a backend, and print the median of several runs."""
+    serializer = AsJSON(backend=backend)
+    buffer = io.BytesIO()
+    serializer.serialize(payload, buffer)
+    serialized = buffer.getvalue()
+    size_mb = len(serialized) / 1024**2
+
+    encode = statistics.median(
+        measure_throughput(lambda: serializer.serialize(payload, io.BytesIO()))
+        for _ in range(runs)
+    )
+    decode = statistics.median(
+        measure_throughput(lambda: serializer.deserialize(io.BytesIO(serialized)))
+        for _ in range(runs)
+    )
+    print(
+        f"{backend:<8} {payload_name:<8} "
+        f"size={len(serialized):>9}B "
+        f"encode={encode:>10.1f}/s ({encode * size_mb:7.1f}MB/s) "
+        f"decode={decode:>10.1f}/s ({decode * size_mb:7.1f}MB/s)"
+    )
+
+
+def main():
+    """Run the benchmark for every available backend and payload."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    for payload_name, payload in PAYLOADS.items():
+        for backend in available_backends():
+            report(backend, payload_name, payload, args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Compare the performance of dagger's serializers over representative payloads.
+
+For each combination of serializer and payload, this benchmark dumps the payload into a file and loads it back, the same way the local runtime stores outputs. It reports:
+
+- Encode and decode throughput, in values per second and MB per second of serialized data.
+- The number of bytes the serialized value takes on disk.
+- The peak memory allocated (as reported by tracemalloc) while encoding and decoding a value.
+
+Deserialized values that are iterators (e.g. those returned by AsJSONLines) are consumed completely as part of decoding. Values that are loaded lazily (e.g. memory-mapped arrays returned by AsNumpy) are measured as returned by the serializer.
+
+Serializers that do not support a payload are skipped for it. Serializers that depend on optional libraries are skipped when those libraries are not installed.
+
+Results can be stored as a baseline, and later runs can be compared against it. The benchmark exits with a non-zero status if any metric is worse than the baseline by more than the tolerance allowed. Throughput depends on the machine, so only compare results obtained on the same machine.
+
+Usage:
+
+    python -m benchmarks.serializers --runs 5 --save-baseline baseline.json
+    python -m benchmarks.serializers --runs 5 --baseline baseline.json --tolerance 0.2
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from benchmarks.throughput import measure_throughput
+from dagger.runtime.local.output import dump, load
+from dagger.serializer import (
+    AsAuto,
+    AsBytes,
+    AsJSON,
+    AsJSONLines,
+    AsNumpy,
+    AsPickle,
+    Compressed,
+    SerializationError,
+    Serializer,
+)
+
+#: Metrics where a higher value is better. For the rest, lower is better.
+HIGHER_IS_BETTER = ("encode_per_second", "decode_per_second")
+
+#: Differences below these values are considered noise, regardless of the tolerance
+ABSOLUTE_TOLERANCES = {
+    "encode_peak_memory": 64 * 1024,
+    "decode_peak_memory": 64 * 1024,
+}
+
+
+def payloads() -> Dict[str, Any]:
+    """Return the payloads to benchmark, by name."""
+    values: Dict[str, Any] = {
+        "small-dict": {
+            "partition": 42,
+            "status": "done",
+            "items": [1, 2, 3],
+            "score": 0.97,
+        },
+        "big-list": [
+            {"id": i, "name": f"record-{i}", "value": i * 0.5} for i in range(100_000)
+        ],
+        "bytes": os.urandom(16 * 1024**2),
+        "nested": {
+            f"level-{i}": {
+                f"child-{j}": [{"k": k, "v": [k] * 5} for k in range(20)]
+                for j in range(20)
+            }
+            for i in range(20)
+        },
+    }
+
+    try:
+        import numpy as np
+
+        values["array"] = np.random.default_rng(0).random((2048, 1024))
+    except ImportError:
+        pass
+
+    return values
+
+
+def serializers() -> Dict[str, Serializer]:
+    """Return the serializers to benchmark, by name."""
+    return {
+        "AsJSON": AsJSON(),
+        "AsJSON(backend=auto)": AsJSON(backend="auto"),
+        "AsJSONLines": AsJSONLines(),
+        "AsPickle": AsPickle(),
+        "AsPickle(oob)": AsPickle(out_of_band_buffers=True),
+        "AsNumpy": AsNumpy(),
+        "AsBytes": AsBytes(),
+        "AsBytes(memory_map=True)": AsBytes(memory_map=True),
+        "AsAuto": AsAuto(),
+        "Compressed(AsPickle)": Compressed(AsPickle()),
+        "Compressed(AsPickle, zstd)": Compressed(AsPickle(), codec="zstd"),
+    }
+
+
+def measure_peak_memory(operation: Callable[[], Any]) -> int:
+    """Return the peak number of bytes allocated while running the operation."""
+    tracemalloc.start()
+    try:
+        operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak
+
+
+def benchmark(
+    serializer: Serializer,
+    payload: Any,
+    runs: int,
+    tmp: str,
+) -> Optional[Dict[str, float]]:
+    """Return the metrics of a serializer for a payload, or None if the serializer does not support it."""
+    filename = os.path.join(tmp, f"output.{serializer.extension}")
+
+    def encode():
+        dump(filename, payload, serializer)
+
+    def decode():
+        value = load(filename, serializer)
+        if isinstance(value, Iterator):
+            for _ in value:
+                pass
+
+    try:
+        encode()
+        if not round_trips(payload, load(filename, serializer)):
+            return None
+    except (ImportError, SerializationError):
+        return None
+
+    return {
+        "encode_per_second": statistics.median(
+            measure_throughput(encode) for _ in range(runs)
+        ),
+        "decode_per_second": statistics.median(
+            measure_throughput(decode) for _ in range(runs)
+        ),
+        "bytes_on_disk": os.path.getsize(filename),
+        "encode_peak_memory": measure_peak_memory(encode),
+        "decode_peak_memory": measure_peak_memory(decode),
+    }
+
+
+def round_trips(payload: Any, value: Any) -> bool:
+    """
+    Return true if a deserialized value has the same type as the payload it was serialized from.
+
+    Some serializers accept values they can't restore faithfully (e.g. AsNumpy turns bytes into 0-dimensional arrays). Those combinations are not worth benchmarking.
+    """
+    if isinstance(value, Iterator):
+        return isinstance(payload, list)
+
+    if isinstance(value, memoryview):
+        return isinstance(payload, (bytes, bytearray, memoryview))
+
+    return isinstance(value, type(payload))
+
+
+def run(
+    runs: int,
+    serializers: Mapping[str, Serializer],
+    payloads: Mapping[str, Any],
+) -> Dict[str, Dict[str, float]]:
+    """Benchmark every serializer over every payload, printing and returning the results keyed by "serializer/payload"."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for payload_name, payload in payloads.items():
+            for serializer_name, serializer in serializers.items():
+                metrics = benchmark(serializer, payload, runs, tmp)
+                if metrics is None:
+                    continue
+
+                key = f"{serializer_name}/{payload_name}"
+                results[key] = metrics
+                report(key, metrics)
+
+    return results
+
+
+def report(key: str, metrics: Mapping[str, float]):
+    """Print the metrics of a combination of serializer and payload."""
+    size_mb = metrics["bytes_on_disk"] / 1024**2
+    print(
+        f"{key:<42} "
+        f"size={metrics['bytes_on_disk']:>10}B "
+        f"encode={metrics['encode_per_second']:>9.1f}/s "
+        f"({metrics['encode_per_second'] * size_mb:7.1f}MB/s) "
+        f"decode={metrics['decode_per_second']:>9.1f}/s "
+        f"({metrics['decode_per_second'] * size_mb:7.1f}MB/s) "
+        f"peak-memory={metrics['encode_peak_memory'] / 1024**2:7.1f}MB"
+        f"/{metrics['decode_peak_memory'] / 1024**2:7.1f}MB"
+    )
+
+
+def regressions(
+    results: Mapping[str, Mapping[str, float]],
+    baseline: Mapping[str, Mapping[str, float]],
+    tolerance: float,
+) -> List[Tuple[str, str, float, float]]:
+    """
+    Compare the results with a baseline.
+
+    Returns a list of (key, metric, baseline value, current value) for each metric that is worse than in the baseline by more than the tolerance (a fraction of the baseline value).
+    Combinations of serializer and payload that are not present in both the results and the baseline are ignored.
+    """
+    found = []
+    for key, metrics in results.items():
+        for metric, value in metrics.items():
+            baseline_value = baseline.get(key, {}).get(metric)
+            if baseline_value is None:
+                continue
+
+            noise = ABSOLUTE_TOLERANCES.get(metric, 0)
+            if metric in HIGHER_IS_BETTER:
+                regressed = value < baseline_value * (1 - tolerance) - noise
+            else:
+                regressed = value > baseline_value * (1 + tolerance) + noise
+
+            if regressed:
+                found.append((key, metric, baseline_value, value))
+
+    return found
+
+
+def main():
+    """Run the serializer benchmarks, optionally saving or comparing against a baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument(
+        "--baseline",
+        help="Path to a baseline to compare the results against",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        help="Path to store the results in, so they can be used as a baseline",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Fraction by which a metric may be worse than the baseline before it is considered a regression",
+    )
+    args = parser.parse_args()
+
+    results = run(args.runs, serializers(), payloads())
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+        found = regressions(results, baseline, args.tolerance)
+        for key, metric, baseline_value, value in found:
+            print(
+                f"REGRESSION {key} {metric}: {baseline_value:.1f} -> {value:.1f}",
+                file=sys.stderr,
+            )
+
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Measure how long it takes to start a process that uses dagger.
+
+Runtimes such as Argo start a new process (usually, a new container) for every task they execute. Every one of those processes needs to import dagger and the user's DAG before the task can start, so startup time is paid once per task.
+
+This benchmark measures, in fresh Python processes:
+
+- The time it takes to `import dagger`.
+- The time it takes to import the CLI runtime (`import dagger.runtime.cli`).
+- The time it takes for the CLI runtime to start executing a task (time-to-first-task), from the moment the process is spawned.
+
+Usage:
+
+    python -m benchmarks.startup --runs 20
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, List
+
+DAG_MODULE = """
+import os
+import time
+
+from dagger import DAG, Task
+
+
+def record_start():
+    with open(os.environ["DAGGER_BENCHMARK_TASK_STARTED_AT"], "w") as f:
+        f.write(repr(time.time()))
+
+
+dag = DAG({"record-start": Task(record_start)})
+
+if __name__ == "__main__":
+    from dagger.runtime.cli import invoke
+
+    invoke(dag)
+"""
+
+
+def measure_import(module_name: str) -> float:
+    """Return the number of seconds a fresh Python process spends importing the module."""
+    output = subprocess.check_output(
+        [
+            sys.executable,
+            "-c",
+            f"import time; s = time.perf_counter(); import {module_name}; print(time.perf_counter() - s)",
+        ],
+    )
+    return float(output)
+
+
+def measure_time_to_first_task(dag_module_path: str, tmp: str) -> float:
+    """Return the number of seconds between spawning a CLI process and the start of its task."""
+    started_at_path = os.path.join(tmp, "task_started_at")
+    env = {**os.environ, "DAGGER_BENCHMARK_TASK_STARTED_AT": started_at_path}
+
+    spawned_at = time.time()
+    subprocess.check_call(
+        [sys.executable, dag_module_path, "--node-name", "record-start"],
+        env=env,
+    )
+
+    with open(started_at_path) as f:
+        return float(f.read()) - spawned_at
+
+
+def report(name: str, measure: Callable[[], float], runs: int):
+    """Run a measurement several times and print a summary of the results in milliseconds."""
+    measurements: List[float] = [measure() * 1000 for _ in range(runs)]
+    print(
+        f"{name:<28} "
+        f"median={statistics.median(measurements):8.2f}ms "
+        f"min={min(measurements):8.2f}ms "
+        f"max={max(measurements):8.2f}ms"
+    )
+
+
+def main():
+    """Run all startup benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    repository_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    os.environ["PYTHONPATH"] = os.pathsep.join(
+        [repository_root] + os.environ.get("PYTHONPATH", "").split(os.pathsep)
+    ).rstrip(os.pathsep)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dag_module_path = os.path.join(tmp, "dag.py")
+        with open(dag_module_path, "w") as f:
+            f.write(DAG_MODULE)
+
+        report("import dagger", lambda: measure_import("dagger"), args.runs)
+        report(
+            "import dagger.runtime.cli",
+            lambda: measure_import("dagger.runtime.cli"),
+            args.runs,
+        )
+        report(
+            "cli time-to-first-task",
+            lambda: measure_time_to_first_task(dag_module_path, tmp),
+            args.runs,
+        )
+
+
+if __name__ == "__main__":
+    main()
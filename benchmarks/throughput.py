@@ -0,0 +1,20 @@
+"""Measure the throughput of the operations exercised by the benchmarks."""
+
+import time
+from typing import Any, Callable
+
+#: Minimum number of seconds to spend measuring each operation
+MIN_MEASUREMENT_TIME = 0.2
+
+
+def measure_throughput(operation: Callable[[], Any]) -> float:
+    """Return the number of operations per second, repeating the operation for at least MIN_MEASUREMENT_TIME."""
+    iterations = 0
+    started_at = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < MIN_MEASUREMENT_TIME:
+        operation()
+        iterations += 1
+        elapsed = time.perf_counter() - started_at
+
+    return iterations / elapsed
@@ -1,17 +1,75 @@
 """Define sophisticated data pipelines as Directed Acyclic Graphs (DAGs) and execute them with different runtimes, either locally or remotely."""
 
-import dagger.dsl as dsl  # noqa
-from dagger.dag import DAG  # noqa
-from dagger.input import FromNodeOutput, FromParam  # noqa
-from dagger.output import FromKey, FromProperty, FromReturnValue  # noqa
-from dagger.serializer import (  # noqa
-    AsJSON,
-    AsPickle,
-    DeserializationError,
-    SerializationError,
-    Serializer,
-)
-from dagger.task import Task  # noqa
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:  # pragma: no cover
+    import dagger.dsl as dsl  # noqa
+    from dagger.dag import DAG  # noqa
+    from dagger.input import FromNodeOutput, FromParam  # noqa
+    from dagger.output import FromKey, FromProperty, FromReturnValue  # noqa
+    from dagger.serializer import (  # noqa
+        AsAuto,
+        AsBytes,
+        AsDirectory,
+        AsFile,
+        AsJSON,
+        AsJSONLines,
+        AsNumpy,
+        AsPickle,
+        Compressed,
+        DeserializationError,
+        PathSerializer,
+        SerializationError,
+        Serializer,
+    )
+    from dagger.task import Task  # noqa
+
+# Top-level objects are imported lazily, the first time they are accessed.
+# Runtimes such as the CLI are invoked once per task (e.g. in every pod of
+# an Argo workflow), so we avoid importing subpackages they don't need.
+_LAZY_ATTRIBUTES = {
+    "dsl": ("dagger.dsl", None),
+    "DAG": ("dagger.dag", "DAG"),
+    "FromNodeOutput": ("dagger.input", "FromNodeOutput"),
+    "FromParam": ("dagger.input", "FromParam"),
+    "FromKey": ("dagger.output", "FromKey"),
+    "FromProperty": ("dagger.output", "FromProperty"),
+    "FromReturnValue": ("dagger.output", "FromReturnValue"),
+    "AsAuto": ("dagger.serializer", "AsAuto"),
+    "AsBytes": ("dagger.serializer", "AsBytes"),
+    "AsDirectory": ("dagger.serializer", "AsDirectory"),
+    "AsFile": ("dagger.serializer", "AsFile"),
+    "AsJSON": ("dagger.serializer", "AsJSON"),
+    "AsJSONLines": ("dagger.serializer", "AsJSONLines"),
+    "AsNumpy": ("dagger.serializer", "AsNumpy"),
+    "AsPickle": ("dagger.serializer", "AsPickle"),
+    "Compressed": ("dagger.serializer", "Compressed"),
+    "DeserializationError": ("dagger.serializer", "DeserializationError"),
+    "PathSerializer": ("dagger.serializer", "PathSerializer"),
+    "SerializationError": ("dagger.serializer", "SerializationError"),
+    "Serializer": ("dagger.serializer", "Serializer"),
+    "Task": ("dagger.task", "Task"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import top-level objects the first time they are accessed."""
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+    import importlib
+
+    module_name, attribute_name = _LAZY_ATTRIBUTES[name]
+    module = importlib.import_module(module_name)
+    value = module if attribute_name is None else getattr(module, attribute_name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """List all top-level objects, including the ones that have not been imported yet."""
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
+
 
 # This will be replaced at package publication time by the latest git tag
 __version__ = "0.0.0"
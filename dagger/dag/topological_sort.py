@@ -1,5 +1,6 @@
 """Sort nodes topologically by their dependencies and detect possible cyclic dependencies."""
-from typing import Any, List, Mapping, Set, TypeVar
+
+from typing import Any, Dict, List, Mapping, Set, TypeVar
 
 T = TypeVar("T")
 
@@ -14,6 +15,9 @@ def topological_sort(node_dependencies: Mapping[T, Set[T]]) -> List[Set[T]]:
     """
     Perform a topological sort of the provided set of dependencies.
 
+    The nodes no other node depends on are always executed last, in the same set.
+    The cost of sorting grows linearly with the number of nodes and dependencies.
+
     Parameters
     ----------
     node_dependencies : A mapping from T to Set[T], where T must be hashable
@@ -27,34 +31,40 @@ def topological_sort(node_dependencies: Mapping[T, Set[T]]) -> List[Set[T]]:
         Each set contains nodes that can be executed concurrently.
         The list determines the right order of execution.
     """
-    sorted_sets = []
+    all_nodes = _all_nodes(node_dependencies)
+    pending_dependencies = {node: 0 for node in all_nodes}
+    dependents: Dict[T, List[T]] = {node: [] for node in all_nodes}
+    for node, dependencies in node_dependencies.items():
+        pending_dependencies[node] = len(dependencies)
+        for dependency in dependencies:
+            dependents[dependency].append(node)
 
-    remaining_node_dependencies = {
-        node: dependencies
-        for node, dependencies in node_dependencies.items()
-        if len(dependencies) != 0
+    sorted_sets = []
+    nodes_with_no_pending_dependencies = {
+        node
+        for node in all_nodes
+        if pending_dependencies[node] == 0 and dependents[node]
     }
 
-    while len(remaining_node_dependencies) != 0:
-        remaining_nodes = _all_nodes(remaining_node_dependencies)
-        nodes_with_no_incoming_dependencies = remaining_nodes - set(
-            remaining_node_dependencies.keys()
-        )
+    while len(nodes_with_no_pending_dependencies) != 0:
+        sorted_sets.append(nodes_with_no_pending_dependencies)
 
-        if len(nodes_with_no_incoming_dependencies) == 0:
-            raise CyclicDependencyError(
-                f"There is a cyclic dependency between the following nodes: {remaining_nodes}"
-            )
+        next_nodes = set()
+        for node in nodes_with_no_pending_dependencies:
+            for dependent in dependents[node]:
+                pending_dependencies[dependent] -= 1
+                if pending_dependencies[dependent] == 0 and dependents[dependent]:
+                    next_nodes.add(dependent)
 
-        sorted_sets.append(nodes_with_no_incoming_dependencies)
+        nodes_with_no_pending_dependencies = next_nodes
 
-        remaining_node_dependencies = {
-            node: dependencies - nodes_with_no_incoming_dependencies
-            for node, dependencies in remaining_node_dependencies.items()
-            if len(dependencies - nodes_with_no_incoming_dependencies) != 0
-        }
+    nodes_in_cycle = {node for node in all_nodes if pending_dependencies[node] != 0}
+    if len(nodes_in_cycle) != 0:
+        raise CyclicDependencyError(
+            f"There is a cyclic dependency between the following nodes: {nodes_in_cycle}"
+        )
 
-    last_set = _all_nodes(node_dependencies) - set().union(*sorted_sets)
+    last_set = all_nodes - set().union(*sorted_sets)
     if len(last_set) != 0:
         sorted_sets.append(last_set)
 
@@ -3,12 +3,14 @@
 import inspect
 from contextvars import copy_context
 from itertools import groupby
-from typing import Any, Callable, List, Mapping, Optional, Union
+from typing import Any, Callable, List, Mapping, NamedTuple, Optional, Union
 
 from dagger.dag import DAG, Node
+from dagger.dag import SupportedInputs as SupportedDAGInputs
 from dagger.dag import SupportedOutputs as SupportedDAGOutputs
 from dagger.dsl.context import node_invocations
 from dagger.dsl.dag_parent import DAGParent
+from dagger.dsl.lazy_dag import LazyDAG
 from dagger.dsl.node_invocation_recorder import NodeInvocationRecorder
 from dagger.dsl.node_invocations import NodeInvocation, NodeType
 from dagger.dsl.node_output_key_usage import NodeOutputKeyUsage
@@ -26,21 +28,42 @@ from dagger.task import Task
 POTENTIAL_BUG_MESSAGE = "If you are seeing this error, this is probably a bug in the library. Please check our GitHub repository to see whether the bug has already been reported/fixed. Otherwise, please create a ticket."
 
 
-def build(dag: NodeInvocationRecorder) -> DAG:
-    """Build a DAG data structure it defines."""
+def build(dag: NodeInvocationRecorder, lazy: bool = False) -> DAG:
+    """
+    Build a DAG data structure it defines.
+
+    Parameters
+    ----------
+    dag
+        A function decorated with `dsl.DAG`.
+
+    lazy
+        If true, nested DAGs are only built when their nodes are accessed. This is useful when only a small part of a big DAG will be used (e.g. the CLI runtime only runs one of its nodes), but it also means that errors in the definition of a nested DAG will only be raised when that DAG is accessed.
+    """
     return _build(
         build_func=dag.func,
         parent=None,
         runtime_options=dag.runtime_options,
         partition_by_input=None,
+        lazy=lazy,
     )
 
 
+class _RecordedDAG(NamedTuple):
+    """Information recorded by invoking the build function of a DAG."""
+
+    inputs: Mapping[str, SupportedDAGInputs]
+    outputs: Mapping[str, SupportedDAGOutputs]
+    invocations: List[NodeInvocation]
+    node_names_by_id: Mapping[str, str]
+
+
 def _build(
     build_func: Callable,
     parent: Optional[DAGParent],
     runtime_options: Mapping[str, Any],
     partition_by_input: Optional[str],
+    lazy: bool = False,
 ) -> DAG:
     """
     Invoke the builder function and return the DAG data structure it defines.
@@ -76,8 +99,21 @@ def _build(
     Build the Nodes based on the recorded NodeInvocations
     -----------------------------------------------------
     We build all of the DAG's nodes. If a node is a DAG, we invoke the builder
-    recursively.
+    recursively (or, if `lazy` is set, we defer it until its nodes are accessed).
     """
+    return _build_recorded(
+        _record(build_func, parent=parent),
+        runtime_options=runtime_options,
+        partition_by_input=partition_by_input,
+        lazy=lazy,
+    )
+
+
+def _record(
+    build_func: Callable,
+    parent: Optional[DAGParent],
+) -> _RecordedDAG:
+    """Invoke the build function in a clean context and record the inputs, outputs and node invocations of the DAG."""
     parameters = {
         param_name: ParameterUsage(
             name=param_name,
@@ -87,6 +123,7 @@ def _build(
     }
 
     ctx = copy_context()
+    ctx.run(node_invocations.set, [])
     dag_output = ctx.run(build_func, **parameters)
 
     invocations_in_context = ctx.get(node_invocations, [])
@@ -104,16 +141,33 @@ def _build(
         node_names_by_id=node_names_by_id,
     )
 
+    return _RecordedDAG(
+        inputs=dag_inputs,
+        outputs=dag_outputs,
+        invocations=invocations_in_context,
+        node_names_by_id=node_names_by_id,
+    )
+
+
+def _build_recorded(
+    recorded: _RecordedDAG,
+    runtime_options: Mapping[str, Any],
+    partition_by_input: Optional[str],
+    lazy: bool,
+) -> DAG:
+    """Build the nodes of a recorded DAG and return the DAG data structure."""
     dag_nodes = {
-        node_names_by_id[node_invocation.id]: _build_node(
-            node_invocation, node_names_by_id=node_names_by_id
+        recorded.node_names_by_id[node_invocation.id]: _build_node(
+            node_invocation,
+            node_names_by_id=recorded.node_names_by_id,
+            lazy=lazy,
         )
-        for node_invocation in invocations_in_context
+        for node_invocation in recorded.invocations
     }
 
     return DAG(
-        inputs=dag_inputs,
-        outputs=dag_outputs,
+        inputs=recorded.inputs,
+        outputs=recorded.outputs,
         nodes=dag_nodes,
         runtime_options=runtime_options,
         partition_by_input=partition_by_input,
@@ -308,6 +362,7 @@ def _build_task_output(
 def _build_node(
     node_invocation: NodeInvocation,
     node_names_by_id: Mapping[str, str],
+    lazy: bool = False,
 ) -> Node:
     """Build a node (a task or DAG) based on the data collected during its invocation."""
     if node_invocation.node_type == NodeType.TASK:
@@ -330,12 +385,14 @@ def _build_node(
         return _build_from_parent(
             invocation=node_invocation,
             parent_node_names_by_id=node_names_by_id,
+            lazy=lazy,
         )
 
 
 def _build_from_parent(
     invocation: NodeInvocation,
     parent_node_names_by_id: Mapping[str, str],
+    lazy: bool = False,
 ) -> DAG:
     """Instantiate a DAGBuilder when a DAG is invoked from a parent context (that is, inside the context of execution of another DAG)."""
     if invocation.node_type != NodeType.DAG:
@@ -343,12 +400,36 @@ def _build_from_parent(
             "The DAGBuilder may only be instantiated from a NodeInvocation object with NodeType.DAG"
         )
 
-    return _build(
-        build_func=invocation.func,
-        parent=DAGParent(
-            inputs=invocation.inputs,
-            node_names_by_id=parent_node_names_by_id,
-        ),
-        runtime_options=invocation.runtime_options or {},
+    parent = DAGParent(
+        inputs=invocation.inputs,
+        node_names_by_id=parent_node_names_by_id,
+    )
+    runtime_options = invocation.runtime_options or {}
+
+    if not lazy:
+        return _build(
+            build_func=invocation.func,
+            parent=parent,
+            runtime_options=runtime_options,
+            partition_by_input=invocation.partition_by_input,
+        )
+
+    recorded: List[_RecordedDAG] = []
+
+    def record() -> _RecordedDAG:
+        if not recorded:
+            recorded.append(_record(invocation.func, parent=parent))
+        return recorded[0]
+
+    return LazyDAG(
+        inputs=_build_dag_inputs(invocation.func, parent=parent),
+        runtime_options=runtime_options,
         partition_by_input=invocation.partition_by_input,
+        build_outputs=lambda: record().outputs,
+        build_dag=lambda: _build_recorded(
+            record(),
+            runtime_options=runtime_options,
+            partition_by_input=invocation.partition_by_input,
+            lazy=True,
+        ),
     )
@@ -0,0 +1,102 @@
+"""DAG whose outputs and nodes are only built the first time they are accessed."""
+
+from typing import Any, Callable, List, Mapping, Optional, Set
+
+from dagger.dag import DAG, Node
+from dagger.dag import SupportedInputs as SupportedDAGInputs
+from dagger.dag import SupportedOutputs as SupportedDAGOutputs
+
+
+class LazyDAG(DAG):
+    """
+    A DAG whose outputs and nodes are only built the first time they are accessed.
+
+    The DSL uses this class to defer building nested DAGs. Inputs, runtime options and partitioning are known as soon as the DAG is invoked from its parent, so they are set straight away. Outputs require the DAG's build function to be invoked. Nodes require the DAG to be fully built and validated.
+
+    Once built, a LazyDAG behaves exactly like the DAG it wraps.
+    """
+
+    def __init__(
+        self,
+        inputs: Mapping[str, SupportedDAGInputs],
+        runtime_options: Mapping[str, Any],
+        partition_by_input: Optional[str],
+        build_outputs: Callable[[], Mapping[str, SupportedDAGOutputs]],
+        build_dag: Callable[[], DAG],
+    ):
+        """
+        Initialize a DAG that will be built lazily.
+
+        Parameters
+        ----------
+        inputs
+            The inputs of the DAG.
+
+        runtime_options
+            The runtime options of the DAG.
+
+        partition_by_input
+            The input the DAG is partitioned by, if any.
+
+        build_outputs
+            A function that returns the outputs of the DAG, without building its nodes.
+
+        build_dag
+            A function that builds and validates the DAG.
+        """
+        # We purposefully don't call the parent's initializer. Validation
+        # happens when `build_dag` is invoked.
+        self._inputs = inputs
+        self._runtime_options = runtime_options
+        self._partition_by_input = partition_by_input
+        self._build_outputs = build_outputs
+        self._build_dag = build_dag
+        self._lazy_outputs: Optional[Mapping[str, SupportedDAGOutputs]] = None
+        self._dag: Optional[DAG] = None
+
+    @property
+    def is_built(self) -> bool:
+        """Return true if the DAG has already been built."""
+        return self._dag is not None
+
+    @property
+    def dag(self) -> DAG:
+        """Build the DAG, if it hasn't been built yet, and return it."""
+        if self._dag is None:
+            self._dag = self._build_dag()
+
+        return self._dag
+
+    # The parent class exposes (and compares) its structure through the
+    # following attributes, so we override them to build the DAG on demand.
+
+    @property  # type: ignore
+    def _outputs(self) -> Mapping[str, SupportedDAGOutputs]:  # type: ignore
+        if self._dag is not None:
+            return self._dag.outputs
+
+        if self._lazy_outputs is None:
+            self._lazy_outputs = self._build_outputs()
+
+        return self._lazy_outputs
+
+    @property  # type: ignore
+    def _nodes(self) -> Mapping[str, Node]:  # type: ignore
+        return self.dag.nodes
+
+    @property  # type: ignore
+    def _node_execution_order(self) -> List[Set[str]]:  # type: ignore
+        return self.dag.node_execution_order
+
+    def __reduce__(self):
+        """Serialize the DAG (e.g. with pickle) as the regular DAG it wraps."""
+        import copyreg
+
+        return (copyreg._reconstructor, (DAG, object, None), self.dag.__dict__)
+
+    def __repr__(self) -> str:
+        """Return a human-readable representation of the DAG, without building it."""
+        if self._dag is not None:
+            return repr(self._dag)
+
+        return f"LazyDAG(inputs={self._inputs}, runtime_options={self._runtime_options}, partition_by_input={self._partition_by_input})"
@@ -3,15 +3,19 @@ Compile DAGs into manifests that will run on top of [Argo Workflows](https://arg
 
 This runtime produces Python mappings (dictionaries) that contain all the necessary Kubernetes resources for Argo Workflows to execute the supplied DAG.
 
-Please note that this runtime doesn't produce JSON/YAML files. Users will still need to take the manifests generated by this runtime and apply them to a Kubernetes cluster.
+Users will still need to take the manifests generated by this runtime and apply them to a Kubernetes cluster. `write_manifest` writes them into files as YAML or JSON.
 
 This runtime requires a container image and entrypoint to be specified, and assumes the supplied entrypoint exposes the same DAG that was used to generate the manifests through the CLI runtime.
 
 Please check the Argo runtime user guide for more details.
 """
 
+from dagger.runtime.argo.archive import ArtifactArchive  # noqa
+from dagger.runtime.argo.concurrency import Concurrency, Semaphore  # noqa
 from dagger.runtime.argo.cron import Cron, CronConcurrencyPolicy  # noqa
 from dagger.runtime.argo.metadata import Metadata  # noqa
+from dagger.runtime.argo.split import manifest_sizes, split_manifest  # noqa
+from dagger.runtime.argo.stream import write_manifest  # noqa
 from dagger.runtime.argo.v1alpha1 import (  # noqa
     cluster_workflow_template_manifest,
     cron_workflow_manifest,
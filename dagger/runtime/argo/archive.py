@@ -0,0 +1,66 @@
+"""How Argo archives the artifacts it stores."""
+
+from typing import Any, Mapping, Optional
+
+
+class ArtifactArchive:
+    """
+    How Argo should archive an output before storing it as an artifact.
+
+    Spec: https://github.com/argoproj/argo-workflows/blob/v3.0.4/docs/fields.md#archivestrategy
+    """
+
+    def __init__(self, compression_level: Optional[int] = None):
+        """
+        Initialize an archive strategy.
+
+        Parameters
+        ----------
+        compression_level: int, optional
+            The gzip compression level (from 0 to 9) to use when storing the output. Argo stores the output in a gzipped tarball and extracts it again before passing it to the nodes that consume it.
+            If not set, the output is stored as it is. This is the best option for data that is already compressed (e.g. outputs serialized with `Compressed`).
+
+
+        Raises
+        ------
+        ValueError
+            If the compression level is not an integer between 0 and 9.
+        """
+        if compression_level is not None and (
+            not isinstance(compression_level, int)
+            or isinstance(compression_level, bool)
+            or not 0 <= compression_level <= 9
+        ):
+            raise ValueError(
+                f"The compression level of an artifact must be an integer between 0 and 9. However, it was set to {repr(compression_level)}."
+            )
+
+        self._compression_level = compression_level
+
+    @property
+    def compression_level(self) -> Optional[int]:
+        """Return the gzip compression level to use, or None if the output should be stored as it is."""
+        return self._compression_level
+
+    def __repr__(self) -> str:
+        """Return a human-readable representation of the archive strategy."""
+        return f"ArtifactArchive(compression_level={self._compression_level})"
+
+    def __eq__(self, obj) -> bool:
+        """Return true if the supplied object is equivalent to the current instance."""
+        return (
+            isinstance(obj, ArtifactArchive)
+            and self._compression_level == obj._compression_level
+        )
+
+
+def archive_strategy(archive: ArtifactArchive) -> Mapping[str, Any]:
+    """
+    Return a minimal representation of an ArchiveStrategy object for the supplied archive.
+
+    Spec: https://github.com/argoproj/argo-workflows/blob/v3.0.4/docs/fields.md#archivestrategy
+    """
+    if archive.compression_level is None:
+        return {"none": {}}
+
+    return {"tar": {"compressionLevel": archive.compression_level}}
@@ -0,0 +1,129 @@
+"""Limits on the number of nodes that may run concurrently in Argo."""
+
+from typing import Any, Dict, Mapping, Optional
+
+
+class Semaphore:
+    """
+    A semaphore shared by all the workflows in a namespace. Its limit is stored in a key of a ConfigMap.
+
+    Spec: https://github.com/argoproj/argo-workflows/blob/v3.0.4/docs/fields.md#semaphoreref
+    """
+
+    def __init__(self, config_map_name: str, key: str):
+        """
+        Initialize a reference to a semaphore.
+
+        Parameters
+        ----------
+        config_map_name: str
+            The name of the ConfigMap that stores the limit of the semaphore.
+
+        key: str
+            The key of the ConfigMap that stores the limit of the semaphore. It also identifies the semaphore, so nodes using the same ConfigMap and key share the same semaphore.
+        """
+        self._config_map_name = config_map_name
+        self._key = key
+
+    @property
+    def config_map_name(self) -> str:
+        """Return the name of the ConfigMap that stores the limit of the semaphore."""
+        return self._config_map_name
+
+    @property
+    def key(self) -> str:
+        """Return the key of the ConfigMap that stores the limit of the semaphore."""
+        return self._key
+
+    def __repr__(self) -> str:
+        """Return a human-readable representation of the semaphore."""
+        return f"Semaphore(config_map_name={self._config_map_name}, key={self._key})"
+
+    def __eq__(self, obj) -> bool:
+        """Return true if the supplied object is equivalent to the current instance."""
+        return (
+            isinstance(obj, Semaphore)
+            and self._config_map_name == obj._config_map_name
+            and self._key == obj._key
+        )
+
+
+class Concurrency:
+    """Limits on the number of executions of a node that Argo may run at the same time."""
+
+    def __init__(
+        self,
+        max_partitions: Optional[int] = None,
+        semaphore: Optional[Semaphore] = None,
+    ):
+        """
+        Initialize the concurrency limits of a node.
+
+        Parameters
+        ----------
+        max_partitions: int, optional
+            The maximum number of partitions of the node that may run at the same time. Only partitioned nodes may set it.
+
+        semaphore: Semaphore, optional
+            A semaphore every execution of the node (or every partition, if the node is partitioned) needs to acquire before it runs.
+
+
+        Raises
+        ------
+        ValueError
+            If max_partitions is not a positive integer.
+
+        TypeError
+            If the semaphore is not a Semaphore.
+        """
+        if max_partitions is not None and (
+            not isinstance(max_partitions, int)
+            or isinstance(max_partitions, bool)
+            or max_partitions < 1
+        ):
+            raise ValueError(
+                f"The maximum number of concurrent partitions must be a positive integer. However, it was set to {repr(max_partitions)}."
+            )
+
+        if semaphore is not None and not isinstance(semaphore, Semaphore):
+            raise TypeError(
+                f"The semaphore must be of type 'Semaphore'. However, it was of type '{type(semaphore).__name__}'."
+            )
+
+        self._max_partitions = max_partitions
+        self._semaphore = semaphore
+
+    @property
+    def max_partitions(self) -> Optional[int]:
+        """Return the maximum number of partitions that may run at the same time, if any."""
+        return self._max_partitions
+
+    @property
+    def semaphore(self) -> Optional[Semaphore]:
+        """Return the semaphore every execution needs to acquire, if any."""
+        return self._semaphore
+
+    def __repr__(self) -> str:
+        """Return a human-readable representation of the limits."""
+        return f"Concurrency(max_partitions={self._max_partitions}, semaphore={self._semaphore})"
+
+    def __eq__(self, obj) -> bool:
+        """Return true if the supplied object is equivalent to the current instance."""
+        return (
+            isinstance(obj, Concurrency)
+            and self._max_partitions == obj._max_partitions
+            and self._semaphore == obj._semaphore
+        )
+
+
+def synchronization(semaphore: Semaphore) -> Mapping[str, Any]:
+    """
+    Return a minimal representation of a Synchronization object that acquires the supplied semaphore.
+
+    Spec: https://github.com/argoproj/argo-workflows/blob/v3.0.4/docs/fields.md#synchronization
+    """
+    config_map_key_ref: Dict[str, str] = {
+        "name": semaphore.config_map_name,
+        "key": semaphore.key,
+    }
+    return {"semaphore": {"configMapKeyRef": config_map_key_ref}}
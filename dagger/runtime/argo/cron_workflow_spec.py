@@ -13,6 +13,7 @@ def cron_workflow_spec(
     dag: DAG,
     workflow: Workflow,
     cron: Cron,
+    lazy_templates: bool = False,
 ) -> Mapping[str, Any]:
     """
     Return a minimal representation of a CronWorkflowSpec with the supplied parameters.
@@ -30,6 +31,9 @@ def cron_workflow_spec(
     cron
         The configuration for the cron workflow
 
+    lazy_templates
+        Whether to generate the templates of the workflow on demand. See `workflow_spec` for more details.
+
 
     Raises
     ------
@@ -40,7 +44,7 @@ def cron_workflow_spec(
         "schedule": cron.schedule,
         "startingDeadlineSeconds": cron.starting_deadline_seconds,
         "concurrencyPolicy": cron.concurrency_policy.value,
-        "workflowSpec": workflow_spec(dag, workflow),
+        "workflowSpec": workflow_spec(dag, workflow, lazy_templates=lazy_templates),
     }
 
     if cron.timezone:
@@ -0,0 +1,205 @@
+"""
+Split the manifest of a large workflow into several, smaller objects.
+
+Kubernetes limits the size of every object it stores, and Argo inlines the templates of every node of a DAG into the same object. The functions in this module move the templates of nested DAGs into WorkflowTemplates of their own, which the main object references through 'templateRef'.
+"""
+
+from typing import Any, Dict, List, Mapping, Set
+
+from dagger.runtime.argo.v1alpha1 import API_VERSION
+from dagger.runtime.argo.workflow_spec import FAN_OUT_TEMPLATE_PREFIX
+
+# Kubernetes object names can't be longer than this
+MAX_OBJECT_NAME_LENGTH = 253
+
+
+def split_manifest(
+    manifest: Mapping[str, Any],
+    cluster_scope: bool = False,
+) -> List[Mapping[str, Any]]:
+    """
+    Move the templates of every nested DAG of a manifest into a WorkflowTemplate of its own.
+
+    Each WorkflowTemplate contains the template of a nested DAG and the templates of the tasks it runs. Nested DAGs run by other DAGs are referenced through 'templateRef', so a DAG template shared by several nodes (see `Workflow(deduplicate_templates=True)`) is only stored once.
+    WorkflowTemplates are named after the main object and the template they contain.
+
+
+    Parameters
+    ----------
+    manifest
+        A manifest generated by any of the functions in `dagger.runtime.argo.v1alpha1` (e.g. `workflow_manifest` or `cron_workflow_manifest`).
+
+    cluster_scope
+        Whether to generate ClusterWorkflowTemplates instead of WorkflowTemplates.
+
+
+    Returns
+    -------
+    A list of manifests. The WorkflowTemplates come first, followed by the main object, so they can be applied in order.
+    """
+    import copy
+
+    is_cron_workflow = manifest["kind"] == "CronWorkflow"
+    spec = manifest["spec"]["workflowSpec"] if is_cron_workflow else manifest["spec"]
+    templates = {template["name"]: template for template in spec["templates"]}
+    metadata = manifest["metadata"]
+    name_prefix = metadata.get("name") or metadata["generateName"].rstrip("-")
+
+    extracted_template_names = [
+        template_name
+        for template_name, template in templates.items()
+        if "dag" in template
+        and template_name != spec["entrypoint"]
+        and not template_name.startswith(f"{FAN_OUT_TEMPLATE_PREFIX}-")
+    ]
+    object_names = {
+        template_name: _object_name(name_prefix, template_name)
+        for template_name in extracted_template_names
+    }
+
+    def local_templates(template_name: str) -> List[Mapping[str, Any]]:
+        return [
+            _with_template_refs(templates[name], object_names, cluster_scope)
+            for name in _local_template_names(template_name, templates, object_names)
+        ]
+
+    manifests: List[Mapping[str, Any]] = []
+    for template_name in extracted_template_names:
+        object_metadata = {"name": object_names[template_name]}
+        if metadata.get("namespace") and not cluster_scope:
+            object_metadata["namespace"] = metadata["namespace"]
+        if metadata.get("labels"):
+            object_metadata["labels"] = metadata["labels"]
+
+        manifests.append(
+            {
+                "apiVersion": API_VERSION,
+                "kind": (
+                    "ClusterWorkflowTemplate" if cluster_scope else "WorkflowTemplate"
+                ),
+                "metadata": object_metadata,
+                "spec": {"templates": local_templates(template_name)},
+            }
+        )
+
+    main_manifest = copy.copy(manifest)
+    main_spec = {**spec, "templates": local_templates(spec["entrypoint"])}
+    if is_cron_workflow:
+        main_manifest["spec"] = {**manifest["spec"], "workflowSpec": main_spec}
+    else:
+        main_manifest["spec"] = main_spec
+
+    manifests.append(main_manifest)
+    return manifests
+
+
+def manifest_sizes(manifests: List[Mapping[str, Any]]) -> Mapping[str, int]:
+    """
+    Estimate the size each manifest takes when it is stored in Kubernetes.
+
+    The size is estimated as the number of bytes of the manifest serialized as compact JSON. Keep in mind that 'kubectl apply' also stores a copy of the manifest in an annotation of the object, which doubles its size.
+
+
+    Returns
+    -------
+    A mapping from '<kind>/<name>' to the estimated size of each manifest, in bytes.
+    """
+    import json
+
+    sizes = {}
+    for manifest in manifests:
+        metadata = manifest["metadata"]
+        key = f"{manifest['kind']}/{metadata.get('name') or metadata['generateName']}"
+        sizes[key] = len(json.dumps(manifest, separators=(",", ":")).encode("utf-8"))
+
+    return sizes
+
+
+def _local_template_names(
+    template_name: str,
+    templates: Mapping[str, Mapping[str, Any]],
+    object_names: Mapping[str, str],
+) -> List[str]:
+    """Return the names of the templates that need to be stored together with a template, in the order they appear in the original manifest. Templates stored in other objects are not included."""
+    found: Set[str] = set()
+    pending = [template_name]
+    while pending:
+        name = pending.pop()
+        if name in found:
+            continue
+
+        found.add(name)
+        for dag_task in templates[name].get("dag", {}).get("tasks", []):
+            referenced_name = dag_task.get("template")
+            if referenced_name is not None and referenced_name not in object_names:
+                pending.append(referenced_name)
+
+    return [name for name in templates if name in found]
+
+
+def _with_template_refs(
+    template: Mapping[str, Any],
+    object_names: Mapping[str, str],
+    cluster_scope: bool,
+) -> Mapping[str, Any]:
+    """Return a copy of the template, where the tasks that run templates stored in other objects reference them through 'templateRef'."""
+    if "dag" not in template:
+        return template
+
+    return {
+        **template,
+        "dag": {
+            **template["dag"],
+            "tasks": [
+                _dag_task_with_template_ref(dag_task, object_names, cluster_scope)
+                for dag_task in template["dag"]["tasks"]
+            ],
+        },
+    }
+
+
+def _dag_task_with_template_ref(
+    dag_task: Mapping[str, Any],
+    object_names: Mapping[str, str],
+    cluster_scope: bool,
+) -> Mapping[str, Any]:
+    """
+    Return a copy of the DAGTask that references its template through 'templateRef', if the template is stored in another object.
+
+    Spec: https://github.com/argoproj/argo-workflows/blob/v3.0.4/docs/fields.md#templateref
+    """
+    template_name = dag_task.get("template")
+    if template_name not in object_names:
+        return dag_task
+
+    template_ref: Dict[str, Any] = {
+        "name": object_names[template_name],
+        "template": template_name,
+    }
+    if cluster_scope:
+        template_ref["clusterScope"] = True
+
+    return {
+        ("templateRef" if key == "template" else key): (
+            template_ref if key == "template" else value
+        )
+        for key, value in dag_task.items()
+    }
+
+
+def _object_name(name_prefix: str, template_name: str) -> str:
+    """
+    Generate the name of the object that stores a template.
+
+    Kubernetes object names may only contain lowercase alphanumeric characters, '-' and '.'. When the name of the template needs to be changed to comply with that, or to fit in the maximum length, a hash of the original name is appended to keep names unique.
+    """
+    import hashlib
+    import re
+
+    name = f"{name_prefix}-{template_name}"
+    valid_name = re.sub(r"[^a-z0-9.-]", "-", name.lower())
+    if valid_name == name and len(name) <= MAX_OBJECT_NAME_LENGTH:
+        return name
+
+    suffix = hashlib.sha256(name.encode("utf-8")).hexdigest()[:8]
+    return f"{valid_name[: MAX_OBJECT_NAME_LENGTH - len(suffix) - 1]}-{suffix}"
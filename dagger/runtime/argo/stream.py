@@ -0,0 +1,179 @@
+"""
+Write manifests into files incrementally, as YAML or compact JSON.
+
+Manifests generated with `lazy_templates=True` contain an iterator of templates instead of a list. The functions in this module consume those iterators one item at a time, so the templates of a manifest never need to be held in memory (or serialized into a single string) all at once.
+"""
+
+from typing import Any, Iterator, Mapping, Optional, TextIO
+
+SUPPORTED_FORMATS = ("yaml", "json")
+
+# Chunks are accumulated until they reach this number of characters, and then written together
+BUFFER_SIZE = 64 * 1024
+
+# Strings that YAML would load as something other than a string if they were not quoted
+YAML_RESERVED_WORDS = {"true", "false", "yes", "no", "on", "off", "null", "y", "n"}
+
+
+def write_manifest(
+    manifest: Mapping[str, Any],
+    writer: TextIO,
+    format: str = "yaml",
+    max_size: Optional[int] = None,
+) -> int:
+    """
+    Write a manifest into a file-like object, one chunk at a time.
+
+    Any iterator found in the manifest (such as the templates of a manifest generated with `lazy_templates=True`) is written as a list, consuming one item at a time.
+
+
+    Parameters
+    ----------
+    manifest
+        The manifest to write. Its values may be mappings, lists, tuples, iterators and any value JSON can represent.
+
+    writer
+        A file-like object opened in text mode.
+
+    format
+        The format to write the manifest in: "yaml" (block style, as 'kubectl' and most tools expect) or "json" (compact JSON in a single line).
+
+    max_size
+        The maximum number of bytes to write. If set, the manifest is not consumed any further as soon as it becomes clear it would exceed this size.
+
+
+    Returns
+    -------
+    The number of bytes written. Non-ASCII characters are always escaped, so it matches the number of characters written.
+
+
+    Raises
+    ------
+    ValueError
+        If the format is not supported, or if the manifest exceeds the maximum size. In the latter case, the writer may already contain the first part of the manifest.
+
+    TypeError
+        If the manifest contains values JSON can't represent.
+    """
+    if format not in SUPPORTED_FORMATS:
+        raise ValueError(
+            f"Manifests can only be written in one of the following formats: {list(SUPPORTED_FORMATS)}. However, the format '{format}' was requested."
+        )
+
+    chunks = _yaml_mapping(manifest, indent=0) if format == "yaml" else _json(manifest)
+
+    size = 0
+    buffer = []
+    buffer_size = 0
+    for chunk in chunks:
+        size += len(chunk)
+        if max_size is not None and size > max_size:
+            raise ValueError(
+                f"The manifest exceeds the maximum size of {max_size} bytes. It was not written completely."
+            )
+
+        buffer.append(chunk)
+        buffer_size += len(chunk)
+        if buffer_size >= BUFFER_SIZE:
+            writer.write("".join(buffer))
+            buffer = []
+            buffer_size = 0
+
+    writer.write("".join(buffer))
+    return size
+
+
+def _json(value: Any) -> Iterator[str]:
+    """Generate the compact JSON representation of a value, recursing into mappings and iterators so that iterators are consumed one item at a time."""
+    import json
+
+    if isinstance(value, Mapping):
+        yield "{"
+        for i, (key, item) in enumerate(value.items()):
+            yield f"{',' if i else ''}{json.dumps(key)}:"
+            yield from _json(item)
+        yield "}"
+    elif isinstance(value, Iterator):
+        yield "["
+        for i, item in enumerate(value):
+            if i:
+                yield ","
+            yield from _json(item)
+        yield "]"
+    else:
+        yield json.dumps(value, separators=(",", ":"), allow_nan=False)
+
+
+def _yaml_mapping(mapping: Mapping[str, Any], indent: int) -> Iterator[str]:
+    """Generate the lines of a YAML mapping in block style, indented by the supplied number of levels."""
+    padding = "  " * indent
+    for key, value in mapping.items():
+        prefix = f"{padding}{_yaml_scalar(key)}:"
+        if isinstance(value, Mapping) and value:
+            yield f"{prefix}\n"
+            yield from _yaml_mapping(value, indent + 1)
+        elif _is_sequence(value):
+            # Sequences are written at the same indentation as the key that contains them
+            lines = _yaml_sequence(value, indent)
+            first_line = next(lines, None)
+            if first_line is None:
+                yield f"{prefix} []\n"
+            else:
+                yield f"{prefix}\n"
+                yield first_line
+                yield from lines
+        else:
+            yield f"{prefix} {_yaml_flow(value)}\n"
+
+
+def _yaml_sequence(sequence: Any, indent: int) -> Iterator[str]:
+    """Generate the lines of a YAML sequence in block style, consuming one item at a time."""
+    padding = "  " * indent
+    for item in sequence:
+        if (isinstance(item, Mapping) and item) or _is_sequence(item):
+            lines = (
+                _yaml_mapping(item, indent + 1)
+                if isinstance(item, Mapping)
+                else _yaml_sequence(item, indent + 1)
+            )
+            first_line = next(lines, None)
+            if first_line is None:
+                yield f"{padding}- []\n"
+            else:
+                # The first line of the item goes right after the dash, replacing the indentation of its level
+                yield f"{padding}- {first_line[len(padding) + 2:]}"
+                yield from lines
+        else:
+            yield f"{padding}- {_yaml_flow(item)}\n"
+
+
+def _yaml_flow(value: Any) -> str:
+    """Return the representation of a value that is written in a single line: scalars and empty mappings."""
+    if isinstance(value, Mapping):
+        return "{}"
+
+    return _yaml_scalar(value)
+
+
+def _yaml_scalar(value: Any) -> str:
+    """
+    Return the representation of a scalar in YAML.
+
+    Strings are written without quotes only when YAML would load them back as the same string. Otherwise, they are written as JSON strings, which YAML reads as double-quoted strings.
+    """
+    import json
+    import re
+
+    if (
+        isinstance(value, str)
+        and re.fullmatch(r"[A-Za-z_/][A-Za-z0-9_./-]*", value)
+        and value.lower() not in YAML_RESERVED_WORDS
+    ):
+        return value
+
+    return json.dumps(value, allow_nan=False)
+
+
+def _is_sequence(value: Any) -> bool:
+    """Return true if the value should be written as a sequence."""
+    return isinstance(value, (list, tuple, Iterator))
@@ -15,6 +15,7 @@ def workflow_manifest(
     dag: DAG,
     metadata: Metadata,
     workflow: Workflow,
+    lazy_templates: bool = False,
 ) -> Mapping[str, Any]:
     """
     Return a minimal representation of a Workflow to execute the supplied DAG with the specified metadata.
@@ -33,6 +34,9 @@ def workflow_manifest(
     workflow
         Workflow configuration (parameters, container image and entrypoint, ...)
 
+    lazy_templates
+        Whether to generate templates on demand. If set, the templates of the spec are an iterator that can only be consumed once. Use it together with `write_manifest` to write very large manifests without holding them in memory.
+
 
     Raises
     ------
@@ -43,7 +47,7 @@ def workflow_manifest(
         "apiVersion": API_VERSION,
         "kind": "Workflow",
         "metadata": object_meta(metadata),
-        "spec": workflow_spec(dag, workflow),
+        "spec": workflow_spec(dag, workflow, lazy_templates=lazy_templates),
     }
 
 
@@ -51,6 +55,7 @@ def workflow_template_manifest(
     dag: DAG,
     metadata: Metadata,
     workflow: Workflow,
+    lazy_templates: bool = False,
 ) -> Mapping[str, Any]:
     """
     Return a minimal representation of a WorkflowTemplate to execute the supplied DAG with the specified metadata.
@@ -63,7 +68,7 @@ def workflow_template_manifest(
         "apiVersion": API_VERSION,
         "kind": "WorkflowTemplate",
         "metadata": object_meta(metadata),
-        "spec": workflow_spec(dag, workflow),
+        "spec": workflow_spec(dag, workflow, lazy_templates=lazy_templates),
     }
 
 
@@ -71,6 +76,7 @@ def cluster_workflow_template_manifest(
     dag: DAG,
     metadata: Metadata,
     workflow: Workflow,
+    lazy_templates: bool = False,
 ) -> Mapping[str, Any]:
     """
     Return a minimal representation of a ClusterWorkflowTemplate to execute the supplied DAG with the specified metadata.
@@ -83,7 +89,7 @@ def cluster_workflow_template_manifest(
         "apiVersion": API_VERSION,
         "kind": "ClusterWorkflowTemplate",
         "metadata": object_meta(metadata),
-        "spec": workflow_spec(dag, workflow),
+        "spec": workflow_spec(dag, workflow, lazy_templates=lazy_templates),
     }
 
 
@@ -92,6 +98,7 @@ def cron_workflow_manifest(
     metadata: Metadata,
     workflow: Workflow,
     cron: Cron,
+    lazy_templates: bool = False,
 ) -> Mapping[str, Any]:
     """
     Return a minimal representation of a CronWorkflow to execute the supplied DAG with the specified metadata and scheduling parameters.
@@ -112,6 +119,9 @@ def cron_workflow_manifest(
     cron
         Cron configuration (schedule, concurrency, ...)
 
+    lazy_templates
+        Whether to generate templates on demand. See `workflow_manifest` for more details.
+
 
     Raises
     ------
@@ -126,5 +136,6 @@ def cron_workflow_manifest(
             dag=dag,
             cron=cron,
             workflow=workflow,
+            lazy_templates=lazy_templates,
         ),
     }
@@ -1,6 +1,12 @@
 """Configuration for a Workflow."""
 
-from typing import Any, List, Mapping
+from typing import Any, List, Mapping, Type
+
+from dagger.runtime.argo.archive import ArtifactArchive
+from dagger.serializer import Serializer
+
+#: Ways in which the Argo runtime can fan out partitioned nodes
+PARTITION_FAN_OUTS = ("withParam", "withSequence")
 
 
 class Workflow:
@@ -16,6 +22,10 @@ class Workflow:
         container_entrypoint_to_dag_cli: List[str] = None,
         params: Mapping[str, Any] = None,
         extra_spec_options: Mapping[str, Any] = None,
+        deduplicate_templates: bool = False,
+        partition_fan_out: str = "withParam",
+        fuse_tasks: bool = False,
+        artifact_archives: Mapping[Type[Serializer], ArtifactArchive] = None,
     ):
         """
         Create a workflow configuration.
@@ -36,11 +46,54 @@ class Workflow:
 
         extra_spec_options, Mapping[str, Any], default={}
             WorkflowSpec properties to set (if they are not used by the runtime).
+
+        deduplicate_templates: bool, default=False
+            Whether to emit structurally identical templates only once, and point every task that uses them to the same template.
+            This reduces the size of the manifests of DAGs that reuse the same tasks or sub-DAGs many times. However, templates will not be named after every node anymore.
+
+        partition_fan_out: str, default="withParam"
+            How to fan out nodes that are partitioned by the output of another node. One of:
+
+            - "withParam": Iterate over the list of partitions of the output. The whole list is passed as an output parameter, which is subject to Argo's size limits.
+            - "withSequence": Iterate over the indices of the partitions, from 0 to the number of partitions. Only the number of partitions is passed as an output parameter, so it supports outputs with any number of partitions. It requires the container image to use a version of dagger that stores the number of partitions of partitioned outputs.
+
+        fuse_tasks: bool, default=False
+            Whether to run chains of tasks in a single container, instead of one container per task.
+            A task is fused with the next one when the next task is the only consumer of its outputs, neither of them is partitioned, and both have the same runtime options. Only the outputs consumed outside of the chain are stored as artifacts.
+            It requires the container image to use a version of dagger whose CLI can run several nodes in the same invocation.
+
+        artifact_archives: Mapping[Type[Serializer], ArtifactArchive], default={}
+            How to archive the outputs serialized with each type of serializer (e.g. `{AsJSON: ArtifactArchive(compression_level=6)}`). Subclasses of a serializer use its archive, unless they have one of their own.
+            Outputs are stored as they are by default. Tasks may override the archive of specific outputs through the 'argo_artifact_archive' runtime option. Partitioned outputs are always stored as they are.
+
+
+        Raises
+        ------
+        ValueError
+            If the partition fan-out is not supported.
+
+        TypeError
+            If any of the artifact archives is not of type ArtifactArchive.
         """
+        if partition_fan_out not in PARTITION_FAN_OUTS:
+            raise ValueError(
+                f"Partition fan-out '{partition_fan_out}' is not supported. These are the options available: {list(PARTITION_FAN_OUTS)}"
+            )
+
+        for serializer_type, archive in (artifact_archives or {}).items():
+            if not isinstance(archive, ArtifactArchive):
+                raise TypeError(
+                    f"The artifact archive for serializer '{getattr(serializer_type, '__name__', serializer_type)}' must be of type 'ArtifactArchive'. However, it was of type '{type(archive).__name__}'."
+                )
+
         self._container_image = container_image
         self._container_entrypoint_to_dag_cli = container_entrypoint_to_dag_cli or []
         self._params = params or {}
         self._extra_spec_options = extra_spec_options or {}
+        self._deduplicate_templates = deduplicate_templates
+        self._partition_fan_out = partition_fan_out
+        self._fuse_tasks = fuse_tasks
+        self._artifact_archives = artifact_archives or {}
 
     @property
     def container_image(self) -> str:
@@ -66,9 +119,29 @@ class Workflow:
         """Return any extra options that should be passed to the WorkflowSpec."""
         return self._extra_spec_options
 
+    @property
+    def deduplicate_templates(self) -> bool:
+        """Return whether structurally identical templates should be emitted only once."""
+        return self._deduplicate_templates
+
+    @property
+    def partition_fan_out(self) -> str:
+        """Return how partitioned nodes should be fanned out."""
+        return self._partition_fan_out
+
+    @property
+    def fuse_tasks(self) -> bool:
+        """Return whether chains of tasks should be fused into a single template."""
+        return self._fuse_tasks
+
+    @property
+    def artifact_archives(self) -> Mapping[Type[Serializer], ArtifactArchive]:
+        """Return how to archive the outputs serialized with each type of serializer."""
+        return self._artifact_archives
+
     def __repr__(self) -> str:
         """Return a human-readable representation of this instance."""
-        return f"Workflow(container_image={self._container_image}, container_entrypoint_to_dag_cli={self._container_entrypoint_to_dag_cli}, params={self._params}, extra_spec_options={self._extra_spec_options})"
+        return f"Workflow(container_image={self._container_image}, container_entrypoint_to_dag_cli={self._container_entrypoint_to_dag_cli}, params={self._params}, extra_spec_options={self._extra_spec_options}, deduplicate_templates={self._deduplicate_templates}, partition_fan_out={self._partition_fan_out}, fuse_tasks={self._fuse_tasks}, artifact_archives={self._artifact_archives})"
 
     def __eq__(self, obj) -> bool:
         """Return true if the object is equivalent to the current instance."""
@@ -79,4 +152,8 @@ class Workflow:
             == obj._container_entrypoint_to_dag_cli
             and self._params == obj._params
             and self._extra_spec_options == obj._extra_spec_options
+            and self._deduplicate_templates == obj._deduplicate_templates
+            and self._partition_fan_out == obj._partition_fan_out
+            and self._fuse_tasks == obj._fuse_tasks
+            and self._artifact_archives == obj._artifact_archives
         )
@@ -1,23 +1,68 @@
 """Generate Workflow specifications."""
+
 import itertools
-from typing import Any, Dict, List, Mapping, Sequence, Union
+import re
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
 from dagger.dag import DAG, Node
 from dagger.dag import SupportedInputs as SupportedDAGInputs
 from dagger.input import FromNodeOutput, FromParam, validate_and_clean_parameters
+from dagger.runtime.argo.archive import ArtifactArchive, archive_strategy
+from dagger.runtime.argo.concurrency import Concurrency, synchronization
 from dagger.runtime.argo.extra_spec_options import with_extra_spec_options
 from dagger.runtime.argo.workflow import Workflow
-from dagger.serializer import Serializer
+from dagger.serializer import AsJSON, Serializer
 from dagger.task import Task
 
 BASE_DAG_NAME = "dag"
+FAN_OUT_TEMPLATE_PREFIX = "fan-out"
+FUSED_TEMPLATE_PREFIX = "fused"
 INPUT_PATH = "/tmp/inputs"
 OUTPUT_PATH = "/tmp/outputs"
 
+# Shared templates receive the address of the node they run through this parameter
+NODE_NAME_PARAMETER = "node_name"
+
+# Suffix of the keys of fan-out templates in the mappings of shared templates (see `_fan_out_key`)
+FAN_OUT_KEY = "_fan_out"
+
+# Runtime option of tasks listing the outputs to pass as parameters instead of artifacts
+INLINE_OUTPUTS_OPTION = "argo_inline_outputs"
+
+# Maximum number of bytes an inlined output may take. Argo stores parameters in the status of the workflow, whose size is limited
+MAX_INLINED_OUTPUT_SIZE = 64 * 1024
+
+# Runtime option of tasks to enable Argo's memoization
+MEMOIZE_OPTION = "argo_memoize"
+
+# Runtime option of nodes to limit how many of their executions may run at the same time
+CONCURRENCY_OPTION = "argo_concurrency"
+
+# Runtime option to set how specific outputs of a task are archived (a mapping from output names to ArtifactArchive instances)
+ARTIFACT_ARCHIVE_OPTION = "argo_artifact_archive"
+
+# References to the inputs of a DAG template, or to the outputs of its tasks
+TEMPLATE_REFERENCE = re.compile(
+    r"\{\{((?:inputs|tasks\.[\w-]+\.outputs)\.(parameters|artifacts)\.[\w-]+)\}\}"
+)
+
 
 def workflow_spec(
     dag: DAG,
     workflow: Workflow,
+    lazy_templates: bool = False,
 ) -> Mapping[str, Any]:
     """
     Return a minimal representation of a WorkflowSpec for the supplied DAG and metadata.
@@ -33,6 +78,9 @@ def workflow_spec(
     workflow
         The configuration for this workflow
 
+    lazy_templates
+        Whether to generate templates on demand. If set, 'templates' is an iterator that generates each template as it is consumed, and that can only be consumed once (e.g. by `write_manifest`).
+
     Raises
     ------
     ValueError
@@ -40,14 +88,26 @@ def workflow_spec(
     """
     params = validate_and_clean_parameters(dag.inputs, workflow.params)
 
-    spec = {
-        "entrypoint": BASE_DAG_NAME,
-        "templates": _templates(
-            node=dag,
+    # Memoized tasks are keyed by the digests of their inputs, so every node needs to publish the digests of its outputs
+    publish_digests = _uses_memoization(dag)
+
+    shared_template_names = {}
+    if workflow.deduplicate_templates:
+        shared_template_names = _shared_template_names(
+            dag=dag,
             container_image=workflow.container_image,
             container_command=workflow.container_entrypoint_to_dag_cli,
             params=params,
-        ),
+            partition_fan_out=workflow.partition_fan_out,
+            publish_digests=publish_digests,
+            artifact_archives=workflow.artifact_archives,
+            fuse_tasks=workflow.fuse_tasks,
+        )
+
+    # Templates are generated after the extra options are merged, so extra templates can be appended to them without consuming them
+    spec = {
+        "entrypoint": BASE_DAG_NAME,
+        "templates": [],
     }
 
     if workflow.params:
@@ -59,6 +119,22 @@ def workflow_spec(
         context="the Workflow spec",
     )
 
+    templates = itertools.chain(
+        _templates(
+            node=dag,
+            container_image=workflow.container_image,
+            container_command=workflow.container_entrypoint_to_dag_cli,
+            params=params,
+            shared_template_names=shared_template_names,
+            partition_fan_out=workflow.partition_fan_out,
+            publish_digests=publish_digests,
+            artifact_archives=workflow.artifact_archives,
+            fuse_tasks=workflow.fuse_tasks,
+        ),
+        spec["templates"],
+    )
+    spec["templates"] = templates if lazy_templates else list(templates)
+
     return spec
 
 
@@ -78,9 +154,14 @@ def _templates(
     container_command: List[str],
     params: Mapping[str, Any],
     address: List[str] = None,
-) -> List[Mapping[str, Any]]:
+    shared_template_names: Mapping[Tuple[str, ...], str] = None,
+    partition_fan_out: str = "withParam",
+    publish_digests: bool = False,
+    artifact_archives: Mapping[Type[Serializer], ArtifactArchive] = None,
+    fuse_tasks: bool = False,
+) -> Iterator[Mapping[str, Any]]:
     """
-    Return a list of Template resources for all the sub-DAGs and sub-nodes.
+    Generate the Template resources for all the sub-DAGs and sub-nodes, one at a time.
 
     Spec: https://github.com/argoproj/argo-workflows/blob/v3.0.4/docs/fields.md#template
 
@@ -107,59 +188,285 @@ def _templates(
         If not specified, it defaults to an empty list.
         The address should only be empty for the root node of the DAG.
 
+    shared_template_names
+        The name of the template each node should use, for the nodes whose templates are shared with other nodes (see `_shared_template_names`).
+        Shared templates are only emitted by the first node that uses them.
+
+    partition_fan_out
+        How to fan out partitioned nodes ("withParam" or "withSequence").
+
+    publish_digests
+        Whether nodes should publish the digests of their outputs, so they can be used as memoization keys.
+
+    artifact_archives
+        How to archive the outputs serialized with each type of serializer (see `_artifact_archive`).
+
+    fuse_tasks
+        Whether to run chains of tasks in a single template (see `_fused_groups`).
+
 
     Returns
     -------
-    A list of template specifications.
+    An iterator of template specifications. Templates are only generated as the iterator is consumed.
     """
     address = address or []
+    shared_template_names = shared_template_names or {}
+
+    shared_template_name = shared_template_names.get(tuple(address))
+    if shared_template_name is not None and shared_template_name != _template_name(
+        address
+    ):
+        return
 
     if isinstance(node, Task):
-        task = node
-        return [
-            _task_template(
-                task=task,
-                address=address,
+        yield _task_template(
+            task=node,
+            address=address,
+            container_image=container_image,
+            container_command=container_command,
+            is_shared=shared_template_name is not None,
+            partition_fan_out=partition_fan_out,
+            publish_digests=publish_digests,
+            artifact_archives=artifact_archives,
+        )
+        return
+
+    dag = node
+    fused_groups = _fused_groups(dag) if fuse_tasks else []
+    fused_node_names = {node_name for group in fused_groups for node_name in group}
+    yield _dag_template(
+        dag=dag,
+        params=params,
+        address=address,
+        shared_template_names=shared_template_names,
+        partition_fan_out=partition_fan_out,
+        publish_digests=publish_digests,
+        fuse_tasks=fuse_tasks,
+    )
+
+    for group in fused_groups:
+        yield _fused_task_template(
+            dag=dag,
+            group=group,
+            address=address,
+            container_image=container_image,
+            container_command=container_command,
+            publish_digests=publish_digests,
+            artifact_archives=artifact_archives,
+        )
+
+    yield from _fan_out_templates(
+        dag=dag,
+        address=address,
+        shared_template_names=shared_template_names,
+        partition_fan_out=partition_fan_out,
+        publish_digests=publish_digests,
+        fuse_tasks=fuse_tasks,
+    )
+
+    for node_name in dag.nodes:
+        if node_name not in fused_node_names:
+            yield from _templates(
+                node=dag.nodes[node_name],
+                address=address + [node_name],
                 container_image=container_image,
                 container_command=container_command,
+                params=params,
+                shared_template_names=shared_template_names,
+                partition_fan_out=partition_fan_out,
+                publish_digests=publish_digests,
+                artifact_archives=artifact_archives,
+                fuse_tasks=fuse_tasks,
             )
-        ]
+
+
+def _shared_template_names(
+    dag: DAG,
+    container_image: str,
+    container_command: List[str],
+    params: Mapping[str, Any],
+    partition_fan_out: str = "withParam",
+    publish_digests: bool = False,
+    artifact_archives: Mapping[Type[Serializer], ArtifactArchive] = None,
+    fuse_tasks: bool = False,
+) -> Mapping[Tuple[str, ...], str]:
+    """
+    Find the nodes whose templates are structurally identical and return the name of the template each of them should share.
+
+    Templates are compared as they would be emitted if they were shared (i.e. receiving the address of the node they run as a parameter), ignoring their names. DAG templates are compared after their own nodes (and fan-out templates) have been deduplicated.
+    Every group of identical templates shares the template of the node that comes first in the DAG.
+    The root DAG is never shared. Neither are fused tasks, nor the DAGs that contain them.
+
+
+    Returns
+    -------
+    A mapping from node addresses to template names, only for the nodes that share their template with other nodes.
+    Fan-out templates are shared the same way, and they are keyed by `_fan_out_key` instead of by the address of the node they fan out.
+    """
+    signatures: Dict[Tuple[str, ...], str] = {}
+    fused_node_names = _fused_node_names(dag) if fuse_tasks else set()
+    for node_name in dag.nodes:
+        if node_name in fused_node_names:
+            continue
+
+        _collect_template_signatures(
+            node=dag.nodes[node_name],
+            address=[node_name],
+            container_image=container_image,
+            container_command=container_command,
+            params=params,
+            partition_fan_out=partition_fan_out,
+            publish_digests=publish_digests,
+            artifact_archives=artifact_archives,
+            fuse_tasks=fuse_tasks,
+            signatures=signatures,
+        )
+
+    addresses_by_signature: Dict[str, List[Tuple[str, ...]]] = {}
+    for address, signature in signatures.items():
+        addresses_by_signature.setdefault(signature, []).append(address)
+
+    return {
+        address: (
+            _fan_out_template_name(list(addresses[0][:-1]))
+            if addresses[0][-1] == FAN_OUT_KEY
+            else _template_name(list(addresses[0]))
+        )
+        for addresses in addresses_by_signature.values()
+        if len(addresses) > 1
+        for address in addresses
+    }
+
+
+def _collect_template_signatures(
+    node: Union[Task, DAG],
+    address: List[str],
+    container_image: str,
+    container_command: List[str],
+    params: Mapping[str, Any],
+    partition_fan_out: str,
+    publish_digests: bool,
+    artifact_archives: Mapping[Type[Serializer], ArtifactArchive],
+    fuse_tasks: bool,
+    signatures: Dict[Tuple[str, ...], str],
+) -> str:
+    """Compute the signature of the template of a node (and all of its sub-nodes and fan-out templates), storing it by address and returning it."""
+    if isinstance(node, Task):
+        template = _task_template(
+            task=node,
+            address=address,
+            container_image=container_image,
+            container_command=container_command,
+            is_shared=True,
+            partition_fan_out=partition_fan_out,
+            publish_digests=publish_digests,
+            artifact_archives=artifact_archives,
+        )
     else:
-        dag = node
-        return list(
-            itertools.chain(
-                [
-                    _dag_template(
-                        dag=dag,
-                        params=params,
-                        address=address,
-                    )
-                ],
-                *[
-                    _templates(
-                        node=dag.nodes[node_name],
-                        address=address + [node_name],
-                        container_image=container_image,
-                        container_command=container_command,
-                        params=params,
-                    )
-                    for node_name in dag.nodes
-                ],
+        # Sub-nodes are referenced by signature, so DAGs are identical if their sub-nodes are.
+        # Fused templates are named after their address, so DAGs that contain them are unique.
+        fused_node_names = _fused_node_names(node) if fuse_tasks else set()
+        node_signatures = {
+            tuple(address + [node_name]): _collect_template_signatures(
+                node=node.nodes[node_name],
+                address=address + [node_name],
+                container_image=container_image,
+                container_command=container_command,
+                params=params,
+                partition_fan_out=partition_fan_out,
+                publish_digests=publish_digests,
+                artifact_archives=artifact_archives,
+                fuse_tasks=fuse_tasks,
+                signatures=signatures,
+            )
+            for node_name in node.nodes
+            if node_name not in fused_node_names
+        }
+        # Fan-out templates are compared as if they were shared too, so the DAG references them by signature as well
+        fan_out_signatures = {
+            _fan_out_key(address + [dag_task["name"]]): _template_signature(
+                _fan_out_template(
+                    dag_task=dag_task,
+                    node=node.nodes[dag_task["name"]],
+                    node_address=address + [dag_task["name"]],
+                    shared_template_names={
+                        _fan_out_key(address + [dag_task["name"]]): ""
+                    },
+                    publish_digests=publish_digests,
+                )
             )
+            for dag_task in _dag_template_tasks(
+                dag=node,
+                address=address,
+                shared_template_names={**node_signatures, tuple(address): ""},
+                partition_fan_out=partition_fan_out,
+                publish_digests=publish_digests,
+                fuse_tasks=fuse_tasks,
+            )
+            if _max_partitions(node.nodes[dag_task["name"]])
+        }
+        signatures.update(fan_out_signatures)
+        template = _dag_template(
+            dag=node,
+            params=params,
+            address=address,
+            shared_template_names={
+                **node_signatures,
+                **fan_out_signatures,
+                tuple(address): "",
+            },
+            partition_fan_out=partition_fan_out,
+            publish_digests=publish_digests,
+            fuse_tasks=fuse_tasks,
         )
 
+    signature = _template_signature(template)
+    signatures[tuple(address)] = signature
+    return signature
+
+
+def _template_signature(template: Mapping[str, Any]) -> str:
+    """Return a hash of the contents of a template, ignoring its name."""
+    import hashlib
+    import json
+
+    return hashlib.sha256(
+        json.dumps(
+            {key: value for key, value in template.items() if key != "name"},
+            sort_keys=True,
+            default=repr,
+        ).encode("utf-8")
+    ).hexdigest()
+
 
 def _dag_template(
     dag: DAG,
     params: Mapping[str, Any],
     address: List[str] = None,
+    shared_template_names: Mapping[Tuple[str, ...], str] = None,
+    partition_fan_out: str = "withParam",
+    publish_digests: bool = False,
+    fuse_tasks: bool = False,
 ) -> Mapping[str, Any]:
     """
     Return a minimal representation of a Template that uses 'tasks' to orchestrate the supplied DAG.
 
+    Fused groups of tasks are orchestrated as a single task, named after the last task of the group, so the tasks that depend on it don't need to change.
+    Partitioned nodes that limit how many of their partitions run at the same time are orchestrated through a fan-out template (see `_fan_out_template`).
+
     Spec: https://github.com/argoproj/argo-workflows/blob/v3.0.4/docs/fields.md#template
     """
     address = address or []
+    shared_template_names = shared_template_names or {}
+    is_shared = tuple(address) in shared_template_names
+
+    if dag.partition_by_input and any(
+        _is_memoized(dag.nodes[output_type.node], output_type.output)
+        for output_type in dag.outputs.values()
+    ):
+        raise ValueError(
+            f"DAG '{'.'.join(address)}' is partitioned, so its outputs can't come from memoized tasks."
+        )
 
     template: dict = {
         "name": _template_name(address),
@@ -167,16 +474,29 @@ def _dag_template(
             "parameters": _dag_template_parameters(
                 address=address,
                 dag_outputs=dag.outputs,
+                is_shared=is_shared,
+                dag_inputs=dag.inputs if publish_digests else {},
             ),
         },
         "dag": {
             "tasks": [
-                _dag_task(
-                    node=dag.nodes[node_name],
-                    node_address=address + [node_name],
-                    parent=dag,
+                (
+                    _fan_out_dag_task(
+                        dag_task=dag_task,
+                        node_address=address + [dag_task["name"]],
+                        shared_template_names=shared_template_names,
+                    )
+                    if _max_partitions(dag.nodes[dag_task["name"]])
+                    else dag_task
+                )
+                for dag_task in _dag_template_tasks(
+                    dag=dag,
+                    address=address,
+                    shared_template_names=shared_template_names,
+                    partition_fan_out=partition_fan_out,
+                    publish_digests=publish_digests,
+                    fuse_tasks=fuse_tasks,
                 )
-                for node_name in dag.nodes
             ]
         },
     }
@@ -195,10 +515,15 @@ def _dag_template(
     dag_outputs = _dag_template_outputs(
         nodes=dag.nodes,
         outputs=dag.outputs,
+        publish_digests=publish_digests,
     )
     if dag_outputs:
         template["outputs"] = dag_outputs
 
+    concurrency = _concurrency_options(dag, address)
+    if concurrency.semaphore:
+        template["synchronization"] = synchronization(concurrency.semaphore)
+
     template["dag"] = with_extra_spec_options(
         original=template["dag"],
         extra_options=dag.runtime_options.get("argo_dag_template_overrides", {}),
@@ -208,14 +533,74 @@ def _dag_template(
     return template
 
 
+def _dag_template_tasks(
+    dag: DAG,
+    address: List[str],
+    shared_template_names: Mapping[Tuple[str, ...], str],
+    partition_fan_out: str,
+    publish_digests: bool,
+    fuse_tasks: bool,
+) -> List[Mapping[str, Any]]:
+    """
+    Return a minimal representation of the DAGTasks that orchestrate the nodes of a DAG.
+
+    Fused groups of tasks are orchestrated as a single task, named after the last task of the group, so the tasks that depend on it don't need to change.
+    The concurrency of partitioned nodes is not limited yet (see `_fan_out_dag_task`).
+    The DAG outputs are indexed once, so the cost of generating the tasks grows linearly with the size of the DAG.
+    """
+    is_shared = tuple(address) in shared_template_names
+    dag_output_names = _dag_output_names(dag.outputs)
+    fused_groups = {
+        group[-1]: group for group in (_fused_groups(dag) if fuse_tasks else [])
+    }
+    fused_node_names = {
+        node_name for group in fused_groups.values() for node_name in group
+    }
+
+    return [
+        (
+            _fused_dag_task(
+                dag=dag,
+                group=fused_groups[node_name],
+                address=address,
+                dag_output_names=dag_output_names,
+            )
+            if node_name in fused_groups
+            else _dag_task(
+                node=dag.nodes[node_name],
+                node_address=address + [node_name],
+                parent=dag,
+                shared_template_names=shared_template_names,
+                parent_node_name=(
+                    _parameter(NODE_NAME_PARAMETER) if is_shared else ".".join(address)
+                ),
+                partition_fan_out=partition_fan_out,
+                publish_digests=publish_digests,
+                dag_output_names=dag_output_names,
+            )
+        )
+        for node_name in dag.nodes
+        if node_name in fused_groups or node_name not in fused_node_names
+    ]
+
+
 def _dag_template_parameters(
     address: List[str],
     dag_outputs: Mapping[str, FromNodeOutput],
+    is_shared: bool = False,
+    dag_inputs: Mapping[str, SupportedDAGInputs] = None,
 ) -> Sequence[Mapping[str, Any]]:
-    """Return a list of parameters for a DAG template."""
+    """
+    Return a list of parameters for a DAG template.
+
+    If DAG inputs are supplied, the DAG also receives their digests as parameters. The root DAG uses the values of the workflow parameters as their digests.
+    """
     parameters = []
     is_root_dag = len(address) == 0
 
+    if is_shared:
+        parameters.append({"name": NODE_NAME_PARAMETER})
+
     name_param = {"name": "name"}
     if is_root_dag:
         name_param["value"] = "dag"
@@ -232,6 +617,13 @@ def _dag_template_parameters(
 
         parameters.append(output_param)
 
+    for input_name in dag_inputs or {}:
+        digest_param = {"name": f"{input_name}_digest"}
+        if is_root_dag:
+            digest_param["value"] = "{{" + f"workflow.parameters.{input_name}" + "}}"
+
+        parameters.append(digest_param)
+
     return parameters
 
 
@@ -265,19 +657,57 @@ def _dag_root_artifacts_from_params(
 def _dag_template_outputs(
     nodes: Mapping[str, Node],
     outputs: Mapping[str, FromNodeOutput],
+    publish_digests: bool = False,
 ) -> Mapping[str, Any]:
-    """Return a structure representing the outputs of a DAG template."""
+    """
+    Return a structure representing the outputs of a DAG template.
+
+    Outputs produced by memoized tasks may come from the cache, so they are taken from the artifacts of the task, instead of the path they would have been stored in.
+    """
+    for output_name, output_type in outputs.items():
+        if output_type.output in _inlined_outputs(nodes[output_type.node]):
+            raise ValueError(
+                f"Output '{output_type.output}' of node '{output_type.node}' is inlined as a parameter, so it can't be used as output '{output_name}' of its DAG."
+            )
+
     artifacts = [
-        {
-            "name": output_name,
-            "s3": {
-                "key": "{{inputs.parameters." + output_name + "_output_path}}",
-            },
-        }
-        for output_name in outputs
+        (
+            {
+                "name": output_name,
+                "from": "{{"
+                + f"tasks.{output_type.node}.outputs.artifacts.{output_type.output}"
+                + "}}",
+            }
+            if publish_digests
+            and _is_memoized(nodes[output_type.node], output_type.output)
+            else {
+                "name": output_name,
+                "s3": {
+                    "key": "{{inputs.parameters." + output_name + "_output_path}}",
+                },
+            }
+        )
+        for output_name, output_type in outputs.items()
     ]
 
+    parameters = []
+    if publish_digests:
+        parameters = [
+            {
+                "name": f"{output_name}_digest",
+                "valueFrom": {
+                    "parameter": "{{"
+                    + f"tasks.{output_type.node}.outputs.parameters.{output_type.output}_digest"
+                    + "}}",
+                },
+            }
+            for output_name, output_type in outputs.items()
+        ]
+
     dag_outputs = {}
+    if parameters:
+        dag_outputs["parameters"] = parameters
+
     if artifacts:
         dag_outputs["artifacts"] = artifacts
 
@@ -288,34 +718,61 @@ def _dag_task(
     node: Node,
     node_address: List[str],
     parent: DAG,
+    shared_template_names: Mapping[Tuple[str, ...], str] = None,
+    parent_node_name: str = None,
+    partition_fan_out: str = "withParam",
+    publish_digests: bool = False,
+    dag_output_names: Mapping[Tuple[str, str], str] = None,
 ) -> Mapping[str, Any]:
     """
     Return a minimal representation of a DAGTask for a specific node.
 
+    If the node uses a shared template, the task points to that template and supplies the address of the node as a parameter. The address is built from the name of the parent node, which may be a parameter itself if the parent is also shared.
+    The DAG outputs of the parent may be supplied already indexed (see `_dag_output_names`), to avoid indexing them again for every node.
+
     Spec: https://github.com/argoproj/argo-workflows/blob/v3.0.4/docs/fields.md#dagtask
     """
+    shared_template_name = (shared_template_names or {}).get(tuple(node_address))
+
     dag_task: Dict[str, Any] = {
         "name": node_address[-1],
-        "template": _template_name(node_address),
+        "template": shared_template_name or _template_name(node_address),
     }
 
     dependencies = _dag_task_dependencies(node)
     if dependencies:
         dag_task["dependencies"] = dependencies
 
+    node_name = None
+    if shared_template_name is not None:
+        node_name = ".".join(
+            [parent_node_name, node_address[-1]]
+            if parent_node_name
+            else [node_address[-1]]
+        )
+
     arguments = _dag_task_arguments(
         node=node,
         node_address=node_address,
         parent=parent,
+        node_name=node_name,
+        publish_digests=publish_digests,
+        dag_output_names=dag_output_names,
     )
     if arguments:
         dag_task["arguments"] = arguments
 
     if node.partition_by_input:
-        dag_task["withParam"] = _dag_task_with_param(
-            input_name=node.partition_by_input,
-            input_type=node.inputs[node.partition_by_input],
-        )
+        input_type = node.inputs[node.partition_by_input]
+        if partition_fan_out == "withSequence" and isinstance(
+            input_type, FromNodeOutput
+        ):
+            dag_task["withSequence"] = _dag_task_with_sequence(input_type)
+        else:
+            dag_task["withParam"] = _dag_task_with_param(
+                input_name=node.partition_by_input,
+                input_type=input_type,
+            )
 
     dag_task = with_extra_spec_options(
         original=dag_task,
@@ -346,6 +803,21 @@ def _dag_task_with_param(
         )
 
 
+def _dag_task_with_sequence(input_type: FromNodeOutput) -> Mapping[str, str]:
+    """
+    Return the value for the withSequence field in a DAGTask spec, iterating over the indices of the partitions of a node output.
+
+    Partitions are named after their index, so each item of the sequence points to one of the partitions.
+
+    Spec: https://argoproj.github.io/argo-workflows/fields/#sequence
+    """
+    return {
+        "count": "{{"
+        + f"tasks.{input_type.node}.outputs.parameters.{input_type.output}_partition_count"
+        + "}}"
+    }
+
+
 def _dag_task_dependencies(node: Node) -> List[str]:
     """
     Return a list of dependencies for the current node.
@@ -363,14 +835,26 @@ def _dag_task_arguments(
     node: Union[Task, DAG],
     node_address: List[str],
     parent: DAG,
+    node_name: str = None,
+    publish_digests: bool = False,
+    dag_output_names: Mapping[Tuple[str, str], str] = None,
 ) -> Mapping[str, Any]:
     """
     Return a minimal representation of an Arguments object, retrieving each of the node's inputs from the right source.
 
+    If a node name is supplied, it is passed as a parameter, so that shared templates know which node they run.
+    If digests are published, DAGs and memoized tasks also receive the digests of their inputs as parameters.
+
     Spec: https://github.com/argoproj/argo-workflows/blob/v3.0.4/docs/fields.md#arguments
     """
+    if dag_output_names is None:
+        dag_output_names = _dag_output_names(parent.outputs)
+
     parameters = []
 
+    if node_name is not None:
+        parameters.append({"name": NODE_NAME_PARAMETER, "value": node_name})
+
     if isinstance(node, DAG):
         name_param = {
             "name": "name",
@@ -380,7 +864,11 @@ def _dag_task_arguments(
             name_param["value"] += "-{{item}}"
         parameters.append(name_param)
 
+    inlined_outputs = _inlined_outputs(node)
     for output_name, output_type in node.outputs.items():
+        if output_name in inlined_outputs:
+            continue
+
         parameters.append(
             {
                 "name": f"{output_name}_output_path",
@@ -388,19 +876,36 @@ def _dag_task_arguments(
                     node_name=node_address[-1],
                     output_name=output_name,
                     serializer=output_type.serializer,
-                    dag_outputs=parent.outputs,
+                    dag_output_names=dag_output_names,
                     is_partitioned=bool(node.partition_by_input),
                 ),
             }
         )
 
+    if publish_digests and (isinstance(node, DAG) or _memoize_options(node)):
+        parameters += [
+            {
+                "name": f"{input_name}_digest",
+                "value": _dag_task_arguments_input_digest(
+                    input_name=input_name,
+                    input_type=input_type,
+                    parent=parent,
+                    is_partitioned=node.partition_by_input == input_name,
+                ),
+            }
+            for input_name, input_type in node.inputs.items()
+        ]
+
     artifacts = [
         _dag_task_argument_artifact(
             node_address=node_address,
             input_name=input_name,
             input_type=node.inputs[input_name],
             is_partitioned=node.partition_by_input == input_name,
-            dag_outputs=parent.outputs,
+            dag_output_names=dag_output_names,
+            is_inlined=_is_inlined(parent, node.inputs[input_name]),
+            is_memoized=publish_digests
+            and _is_memoized_input(parent, node.inputs[input_name]),
         )
         for input_name in node.inputs
     ]
@@ -415,22 +920,67 @@ def _dag_task_arguments(
     return arguments
 
 
+def _dag_task_arguments_input_digest(
+    input_name: str,
+    input_type: Union[FromParam, FromNodeOutput],
+    parent: DAG,
+    is_partitioned: bool,
+) -> str:
+    """Return a reference to the digest of an input, published either by the parent DAG or by the node that produced it (see `_output_digest`)."""
+    if isinstance(input_type, FromParam):
+        return _parameter(f"{input_type.name or input_name}_digest")
+
+    digest = _output_digest(
+        node_name=input_type.node,
+        node=parent.nodes[input_type.node],
+        output_name=input_type.output,
+    )
+    if is_partitioned:
+        # Every partition needs its own key
+        digest += "-{{item}}"
+
+    return digest
+
+
+def _output_digest(node_name: str, node: Node, output_name: str) -> str:
+    """
+    Return a reference to the digest of an output of a node in the same DAG.
+
+    Partitioned nodes run in a loop, and Argo only exposes the outputs of a loop as a JSON list with the output parameters of every partition. The digest of an output of a partitioned node is that list, so it changes whenever any of the partitions does.
+    Partitioned nodes that limit how many of their partitions run at the same time publish that list through their fan-out template (see `_fan_out_template`).
+    """
+    if node.partition_by_input and not _max_partitions(node):
+        return "{{" + f"tasks.{node_name}.outputs.parameters" + "}}"
+
+    return "{{" + f"tasks.{node_name}.outputs.parameters.{output_name}_digest" + "}}"
+
+
+def _dag_output_names(
+    dag_outputs: Mapping[str, FromNodeOutput],
+) -> Mapping[Tuple[str, str], str]:
+    """Index the outputs of a DAG by the (node name, output name) they come from. If several DAG outputs come from the same node output, the first one is used."""
+    dag_output_names: Dict[Tuple[str, str], str] = {}
+    for dag_output_name, dag_output_type in dag_outputs.items():
+        dag_output_names.setdefault(
+            (dag_output_type.node, dag_output_type.output), dag_output_name
+        )
+
+    return dag_output_names
+
+
 def _dag_task_arguments_output_path(
     node_name: str,
     output_name: str,
     serializer: Serializer,
-    dag_outputs: Mapping[str, FromNodeOutput],
+    dag_output_names: Mapping[Tuple[str, str], str],
     is_partitioned: bool,
 ) -> str:
-    corresponding_dag_output = [
-        dag_output_name
-        for dag_output_name, dag_output_type in dag_outputs.items()
-        if dag_output_type.node == node_name and dag_output_type.output == output_name
-    ]
+    """Return the path where an output of a node is stored. Outputs that are also outputs of the parent DAG are stored where the DAG's output is expected."""
+    corresponding_dag_output = dag_output_names.get((node_name, output_name))
 
-    if corresponding_dag_output:
+    if corresponding_dag_output is not None:
         output_path = (
-            "{{inputs.parameters." + f"{corresponding_dag_output[0]}_output_path" + "}}"
+            "{{inputs.parameters." + f"{corresponding_dag_output}_output_path" + "}}"
         )
     else:
         output_path = (
@@ -449,11 +999,16 @@ def _dag_task_argument_artifact(
     input_name: str,
     input_type: Union[FromParam, FromNodeOutput],
     is_partitioned: bool,
-    dag_outputs: Mapping[str, FromNodeOutput],
+    dag_output_names: Mapping[Tuple[str, str], str],
+    is_inlined: bool = False,
+    is_memoized: bool = False,
 ) -> Mapping[str, Any]:
     """
     Return a pointer to the source of a specific artifact, based on the type of each input, and using Argo's workflow variables.
 
+    Inputs that come from inlined outputs are materialized from the output parameter of the node that produced them.
+    Inputs that come from memoized outputs are taken from the artifacts of the node that produced them, since they may have been stored by a previous workflow.
+
     Spec: https://github.com/argoproj/argo-workflows/blob/v3.0.4/docs/variables.md
     """
     if isinstance(input_type, FromParam):
@@ -461,12 +1016,28 @@ def _dag_task_argument_artifact(
             "name": input_name,
             "from": "{{" + f"inputs.artifacts.{input_type.name or input_name}" + "}}",
         }
+    elif is_inlined:
+        return {
+            "name": input_name,
+            "raw": {
+                "data": "{{"
+                + f"tasks.{input_type.node}.outputs.parameters.{input_type.output}"
+                + "}}"
+            },
+        }
+    elif is_memoized:
+        return {
+            "name": input_name,
+            "from": "{{"
+            + f"tasks.{input_type.node}.outputs.artifacts.{input_type.output}"
+            + "}}",
+        }
     else:
         key = _dag_task_arguments_output_path(
             node_name=input_type.node,
             output_name=input_type.output,
             serializer=input_type.serializer,
-            dag_outputs=dag_outputs,
+            dag_output_names=dag_output_names,
             is_partitioned=is_partitioned,
         )
         return {
@@ -480,17 +1051,32 @@ def _task_template(
     address: List[str],
     container_image: str,
     container_command: List[str],
+    is_shared: bool = False,
+    partition_fan_out: str = "withParam",
+    publish_digests: bool = False,
+    artifact_archives: Mapping[Type[Serializer], ArtifactArchive] = None,
 ) -> Mapping[str, Any]:
     """
     Return a minimal representation of a Template that executes a specific Node.
 
+    Shared templates receive the address of the node they execute as a parameter, instead of having it hardcoded.
+    Memoized tasks receive the digests of their inputs as parameters, and use them to build their memoization key.
+
     https://github.com/argoproj/argo-workflows/blob/v3.0.4/docs/fields.md#template
     """
+    _validate_inlined_outputs(task, address)
+
     template: dict = {
         "name": _template_name(address),
         "container": {
             "image": container_image,
-            "args": _task_template_container_arguments(task=task, address=address),
+            "args": _task_template_container_arguments(
+                task=task,
+                node_name=(
+                    _parameter(NODE_NAME_PARAMETER) if is_shared else ".".join(address)
+                ),
+                publish_digests=publish_digests,
+            ),
         },
     }
 
@@ -501,12 +1087,29 @@ def _task_template(
         # of the entrypoints without affecting the rest
         template["container"]["command"] = container_command[:]
 
-    task_inputs = _task_template_inputs(task)
+    task_inputs = _task_template_inputs(task, is_shared=is_shared)
     if task_inputs:
         template["inputs"] = task_inputs
 
+    if _memoize_options(task):
+        template["memoize"] = _task_template_memoize(task, address)
+        if task.inputs:
+            template["inputs"]["parameters"] = template["inputs"].get(
+                "parameters", []
+            ) + [{"name": f"{input_name}_digest"} for input_name in task.inputs]
+
+    concurrency = _concurrency_options(task, address)
+    if concurrency.semaphore:
+        template["synchronization"] = synchronization(concurrency.semaphore)
+
     if task.outputs:
-        template["outputs"] = _task_template_outputs(task)
+        template["outputs"] = _task_template_outputs(
+            task=task,
+            address=address,
+            partition_fan_out=partition_fan_out,
+            publish_digests=publish_digests,
+            artifact_archives=artifact_archives,
+        )
         template["volumes"] = [{"name": "outputs", "emptyDir": {}}]
         template["container"]["volumeMounts"] = [
             {"name": "outputs", "mountPath": OUTPUT_PATH}
@@ -526,15 +1129,20 @@ def _task_template(
     )
 
 
-def _task_template_inputs(task: Task) -> Mapping[str, Any]:
+def _task_template_inputs(task: Task, is_shared: bool = False) -> Mapping[str, Any]:
     """
     Return a minimal representation of an Inputs object, mounting all the inputs a node needs as artifacts in a given path.
 
     Spec: https://github.com/argoproj/argo-workflows/blob/v3.0.4/docs/fields.md#inputs
     """
+    inlined_outputs = _inlined_outputs(task)
     parameters = [
-        {"name": f"{output_name}_output_path"} for output_name in task.outputs
+        {"name": f"{output_name}_output_path"}
+        for output_name in task.outputs
+        if output_name not in inlined_outputs
     ]
+    if is_shared:
+        parameters.insert(0, {"name": NODE_NAME_PARAMETER})
 
     artifacts = [
         {
@@ -560,40 +1168,74 @@ def _task_template_inputs(task: Task) -> Mapping[str, Any]:
     return inputs
 
 
-def _task_template_outputs(task: Task) -> Mapping[str, Any]:
+def _task_template_outputs(
+    task: Task,
+    address: List[str],
+    partition_fan_out: str = "withParam",
+    publish_digests: bool = False,
+    artifact_archives: Mapping[Type[Serializer], ArtifactArchive] = None,
+) -> Mapping[str, Any]:
     """
     Return a minimal representation of an Outputs object, pointing all the outputs a node produces to artifacts in a given path.
 
+    Partitioned outputs also expose, as a parameter, the list of partitions or the number of partitions (depending on how partitioned nodes are fanned out).
+    Inlined outputs are exposed as parameters, instead of artifacts.
+    If digests are published, the digest of every output is also exposed as a parameter.
+    Artifacts are archived as configured for the task or for their serializer (see `_artifact_archive`).
+
     Spec: https://github.com/argoproj/argo-workflows/blob/v3.0.4/docs/fields.md#outputs
     """
+    if partition_fan_out == "withSequence":
+        parameter_suffix, filename = "partition_count", "partition_count"
+    else:
+        parameter_suffix, filename = "partitions", "partitions.json"
+
     parameters = [
         {
-            "name": f"{output_name}_partitions",
+            "name": f"{output_name}_{parameter_suffix}",
             "valueFrom": {
                 "path": "{{"
                 + f"outputs.artifacts.{output_name}.path"
-                + "}}/partitions.json",
+                + "}}/"
+                + filename,
             },
         }
         for output_name, output_type in task.outputs.items()
         if output_type.is_partitioned
     ]
 
+    inlined_outputs = _inlined_outputs(task)
+    parameters += [
+        {
+            "name": output_name,
+            "valueFrom": {"path": _task_template_output_path(task, output_name)},
+        }
+        for output_name in task.outputs
+        if output_name in inlined_outputs
+    ]
+
+    if publish_digests:
+        parameters += [
+            {
+                "name": f"{output_name}_digest",
+                "valueFrom": {"path": _task_template_digest_path(output_name)},
+            }
+            for output_name in task.outputs
+        ]
+
     artifacts = [
         {
             "name": output_name,
-            "path": "/".join(
-                [
-                    OUTPUT_PATH,
-                    f"{output_name}.{task.outputs[output_name].serializer.extension}",
-                ]
+            "path": _task_template_output_path(task, output_name),
+            "archive": archive_strategy(
+                _artifact_archive(task, output_name, address, artifact_archives)
             ),
-            "archive": {"none": {}},
             "s3": {
                 "key": "{{inputs.parameters." + output_name + "_output_path}}",
             },
         }
         for output_name in task.outputs
+        if output_name not in inlined_outputs
     ]
 
     outputs = {}
@@ -608,17 +1250,19 @@ def _task_template_outputs(task: Task) -> Mapping[str, Any]:
 
 def _task_template_container_arguments(
     task: Task,
-    address: List[str],
+    node_name: str,
+    publish_digests: bool = False,
 ) -> List[str]:
     """
     Return a list of arguments to supply to the CLI runtime to run a specific DAG node with a set of inputs and outputs mounted as artifacts.
 
     Spec: https://github.com/argoproj/argo-workflows/blob/v3.0.4/docs/fields.md#outputs
     """
+    inlined_outputs = _inlined_outputs(task)
     return list(
         itertools.chain(
             *[
-                ["--node-name", ".".join(address)],
+                ["--node-name", node_name],
                 *[
                     [
                         "--input",
@@ -631,20 +1275,884 @@ def _task_template_container_arguments(
                     [
                         "--output",
                         output_name,
-                        "{{" + f"outputs.artifacts.{output_name}.path" + "}}",
+                        (
+                            _task_template_output_path(task, output_name)
+                            if output_name in inlined_outputs
+                            else "{{" + f"outputs.artifacts.{output_name}.path" + "}}"
+                        ),
                     ]
                     for output_name in task.outputs
                 ],
+                *[
+                    [
+                        "--output-digest",
+                        output_name,
+                        _task_template_digest_path(output_name),
+                    ]
+                    for output_name in (task.outputs if publish_digests else [])
+                ],
+                *[
+                    [
+                        "--output-max-size",
+                        output_name,
+                        str(MAX_INLINED_OUTPUT_SIZE),
+                    ]
+                    for output_name in inlined_outputs
+                ],
             ]
         )
     )
 
 
-def _template_name(address: List[str]) -> str:
+def _task_template_output_path(task: Task, output_name: str) -> str:
+    """Return the path where the container stores an output of the task."""
+    return "/".join(
+        [
+            OUTPUT_PATH,
+            f"{output_name}.{task.outputs[output_name].serializer.extension}",
+        ]
+    )
+
+
+def _task_template_digest_path(output_name: str) -> str:
+    """Return the path where the container stores the digest of an output."""
+    return "/".join([OUTPUT_PATH, f"{output_name}.sha256"])
+
+
+def _task_template_memoize(task: Task, address: List[str]) -> Mapping[str, Any]:
     """
-    Generate a template name from a node address.
+    Return a minimal representation of a Memoize object for a memoized task.
 
-    If the name is None, we return the default base DAG name.
-    If the name is defined, we prefix it with the base DAG name. We do this to guarantee all names are unique.
+    The key is derived from the version of the task's code and the digests of all of its inputs. Since the digests may be long, or contain characters that are not valid in a ConfigMap key, the key is the SHA-256 of all of them together.
+
+    Spec: https://argoproj.github.io/argo-workflows/fields/#memoize
     """
-    return "-".join([BASE_DAG_NAME] + address)
+    options = _memoize_options(task)
+    context = ".".join(address)
+
+    if not options.get("cache"):
+        raise ValueError(
+            f"Node '{context}' is memoized through the '{MEMOIZE_OPTION}' runtime option, but it doesn't specify the name of the ConfigMap to use as a 'cache'."
+        )
+
+    if task.partition_by_input or any(
+        output.is_partitioned for output in task.outputs.values()
+    ):
+        raise ValueError(
+            f"Node '{context}' is partitioned or produces partitioned outputs, so it can't be memoized."
+        )
+
+    code_version = _code_version(task, options.get("version"))
+    if task.inputs:
+        key = (
+            "{{=sprig.sha256sum('"
+            + code_version
+            + "'"
+            + "".join(
+                f" + '|' + inputs.parameters['{input_name}_digest']"
+                for input_name in task.inputs
+            )
+            + ")}}"
+        )
+    else:
+        key = code_version
+
+    memoize: Dict[str, Any] = {
+        "key": key,
+        "cache": {"configMap": {"name": options["cache"]}},
+    }
+    if options.get("max_age"):
+        memoize["maxAge"] = options["max_age"]
+
+    return memoize
+
+
+def _code_version(task: Task, version: str = None) -> str:
+    """
+    Return an identifier for the version of the code of a task.
+
+    If a version is not supplied explicitly, it is derived from the source code of the task's function.
+    """
+    import hashlib
+    import inspect
+
+    if version is None:
+        try:
+            version = inspect.getsource(task.func)
+        except (OSError, TypeError):
+            version = f"{task.func.__module__}.{task.func.__qualname__}"
+
+    return hashlib.sha256(str(version).encode("utf-8")).hexdigest()[:16]
+
+
+def _memoize_options(node: Node) -> Mapping[str, Any]:
+    """Return the memoization options of a node, or an empty mapping if it isn't memoized."""
+    if not isinstance(node, Task):
+        return {}
+
+    return node.runtime_options.get(MEMOIZE_OPTION, {})
+
+
+def _uses_memoization(node: Node) -> bool:
+    """Return true if the node, or any of its sub-nodes, is memoized."""
+    if isinstance(node, DAG):
+        return any(_uses_memoization(child) for child in node.nodes.values())
+
+    return bool(_memoize_options(node))
+
+
+def _is_memoized(node: Node, output_name: str) -> bool:
+    """Return true if an output of a node comes from a memoized task, either directly or through nested DAGs."""
+    if isinstance(node, DAG):
+        output_type = node.outputs[output_name]
+        return _is_memoized(node.nodes[output_type.node], output_type.output)
+
+    return bool(_memoize_options(node))
+
+
+def _is_memoized_input(
+    parent: DAG, input_type: Union[FromParam, FromNodeOutput]
+) -> bool:
+    """Return true if the input comes from a memoized output of another node in the DAG."""
+    return isinstance(input_type, FromNodeOutput) and _is_memoized(
+        parent.nodes[input_type.node], input_type.output
+    )
+
+
+def _inlined_outputs(node: Node) -> List[str]:
+    """Return the names of the outputs of a node that are passed as parameters instead of artifacts."""
+    if not isinstance(node, Task):
+        return []
+
+    return list(node.runtime_options.get(INLINE_OUTPUTS_OPTION, []))
+
+
+def _is_inlined(parent: DAG, input_type: Union[FromParam, FromNodeOutput]) -> bool:
+    """Return true if the input comes from an inlined output of another node in the DAG."""
+    return isinstance(input_type, FromNodeOutput) and input_type.output in (
+        _inlined_outputs(parent.nodes[input_type.node])
+    )
+
+
+def _validate_inlined_outputs(task: Task, address: List[str]):
+    """Validate that the outputs a task inlines exist and can be passed as parameters. Argo reads parameters as text, so only outputs serialized as JSON can be inlined."""
+    for output_name in _inlined_outputs(task):
+        if output_name not in task.outputs:
+            raise ValueError(
+                f"Node '{'.'.join(address)}' is set to inline an output named '{output_name}' through the '{INLINE_OUTPUTS_OPTION}' runtime option. However, it only has the following outputs: {sorted(task.outputs)}"
+            )
+
+        if task.outputs[output_name].is_partitioned:
+            raise ValueError(
+                f"Output '{output_name}' of node '{'.'.join(address)}' is partitioned, so it can't be inlined as a parameter."
+            )
+
+        if not isinstance(task.outputs[output_name].serializer, AsJSON):
+            raise ValueError(
+                f"Output '{output_name}' of node '{'.'.join(address)}' is serialized with {task.outputs[output_name].serializer}. However, Argo reads parameters as text, so only outputs serialized with AsJSON can be inlined as parameters."
+            )
+
+
+def _fan_out_templates(
+    dag: DAG,
+    address: List[str],
+    shared_template_names: Mapping[Tuple[str, ...], str],
+    partition_fan_out: str,
+    publish_digests: bool,
+    fuse_tasks: bool,
+) -> List[Mapping[str, Any]]:
+    """
+    Return the fan-out templates of the partitioned nodes of a DAG that limit how many of their partitions run at the same time.
+
+    Shared fan-out templates are only returned for the node that comes first in the DAG.
+    """
+    if not any(_max_partitions(node) for node in dag.nodes.values()):
+        return []
+
+    fan_out_templates = []
+    for dag_task in _dag_template_tasks(
+        dag=dag,
+        address=address,
+        shared_template_names=shared_template_names,
+        partition_fan_out=partition_fan_out,
+        publish_digests=publish_digests,
+        fuse_tasks=fuse_tasks,
+    ):
+        node_address = address + [dag_task["name"]]
+        if not _max_partitions(dag.nodes[dag_task["name"]]):
+            continue
+
+        shared_template_name = shared_template_names.get(_fan_out_key(node_address))
+        if (
+            shared_template_name is not None
+            and shared_template_name != _fan_out_template_name(node_address)
+        ):
+            continue
+
+        fan_out_templates.append(
+            _fan_out_template(
+                dag_task=dag_task,
+                node=dag.nodes[dag_task["name"]],
+                node_address=node_address,
+                shared_template_names=shared_template_names,
+                publish_digests=publish_digests,
+            )
+        )
+
+    return fan_out_templates
+
+
+def _fan_out_template(
+    dag_task: Mapping[str, Any],
+    node: Node,
+    node_address: List[str],
+    shared_template_names: Mapping[Tuple[str, ...], str] = None,
+    publish_digests: bool = False,
+) -> Mapping[str, Any]:
+    """
+    Return a minimal representation of a Template that fans out a partitioned node, running a limited number of partitions at the same time.
+
+    Argo only limits the parallelism of the tasks inside of a template, so the fan-out needs a DAG template of its own. The template runs the same DAGTask the parent DAG would run. Everything the task references from the parent DAG (its inputs, or the outputs of other tasks) is passed to the template as an input.
+    If the template is shared, the address of the node it fans out is passed as a parameter as well.
+    If digests are published, the template publishes the digests of the outputs of the node, so the tasks that consume them don't need to change.
+
+    Spec: https://github.com/argoproj/argo-workflows/blob/v3.0.4/docs/fields.md#template
+    """
+    shared_template_name = (shared_template_names or {}).get(_fan_out_key(node_address))
+    is_shared = shared_template_name is not None
+    node_name, dag_task = _fan_out_node_name(dag_task, is_shared=is_shared)
+    fanned_out_task, references = _fan_out_references(dag_task)
+
+    template: dict = {
+        "name": shared_template_name or _fan_out_template_name(node_address),
+        "parallelism": _max_partitions(node),
+    }
+
+    template_inputs = {
+        kind: [
+            {"name": name}
+            for reference_kind, name in references.values()
+            if reference_kind == kind
+        ]
+        for kind in ["parameters", "artifacts"]
+    }
+    if node_name is not None:
+        template_inputs["parameters"].insert(0, {"name": NODE_NAME_PARAMETER})
+        fanned_out_task["arguments"] = {
+            **fanned_out_task.get("arguments", {}),
+            "parameters": [
+                {"name": NODE_NAME_PARAMETER, "value": _parameter(NODE_NAME_PARAMETER)},
+                *fanned_out_task.get("arguments", {}).get("parameters", []),
+            ],
+        }
+    if any(template_inputs.values()):
+        template["inputs"] = {
+            kind: value for kind, value in template_inputs.items() if value
+        }
+
+    template["dag"] = {"tasks": [fanned_out_task]}
+
+    if publish_digests and node.outputs:
+        # The fanned out task runs in a loop, so Argo only exposes the outputs of all of its partitions together
+        template["outputs"] = {
+            "parameters": [
+                {
+                    "name": f"{output_name}_digest",
+                    "valueFrom": {
+                        "parameter": "{{"
+                        + f"tasks.{dag_task['name']}.outputs.parameters"
+                        + "}}"
+                    },
+                }
+                for output_name in node.outputs
+            ]
+        }
+
+    return template
+
+
+def _fan_out_dag_task(
+    dag_task: Mapping[str, Any],
+    node_address: List[str],
+    shared_template_names: Mapping[Tuple[str, ...], str] = None,
+) -> Mapping[str, Any]:
+    """Return a minimal representation of a DAGTask that runs the fan-out template of a node instead of fanning out the node directly (see `_fan_out_template`)."""
+    shared_template_name = (shared_template_names or {}).get(_fan_out_key(node_address))
+    node_name, stripped_dag_task = _fan_out_node_name(
+        dag_task, is_shared=shared_template_name is not None
+    )
+    _, references = _fan_out_references(stripped_dag_task)
+
+    outer_task: Dict[str, Any] = {
+        "name": dag_task["name"],
+        "template": shared_template_name or _fan_out_template_name(node_address),
+    }
+    if "dependencies" in dag_task:
+        outer_task["dependencies"] = dag_task["dependencies"]
+
+    arguments = {
+        kind: [
+            {"name": name, value_key: "{{" + reference + "}}"}
+            for reference, (reference_kind, name) in references.items()
+            if reference_kind == kind
+        ]
+        for kind, value_key in [("parameters", "value"), ("artifacts", "from")]
+    }
+    if node_name is not None:
+        arguments["parameters"].insert(
+            0, {"name": NODE_NAME_PARAMETER, "value": node_name}
+        )
+    if any(arguments.values()):
+        outer_task["arguments"] = {
+            kind: value for kind, value in arguments.items() if value
+        }
+
+    return outer_task
+
+
+def _fan_out_references(
+    dag_task: Mapping[str, Any],
+) -> Tuple[Mapping[str, Any], Mapping[str, Tuple[str, str]]]:
+    """
+    Rewrite a DAGTask so that it can run inside of its fan-out template.
+
+    Returns the rewritten task, and the references it had to the scope of the parent DAG. References are mapped to their kind ("parameters" or "artifacts") and to the name of the input of the fan-out template that replaces them.
+    """
+    references: Dict[str, Tuple[str, str]] = {}
+
+    def replace(match) -> str:
+        reference, kind = match.group(1), match.group(2)
+        name = reference.replace(".", "-")
+        references[reference] = (kind, name)
+        return "{{" + f"inputs.{kind}.{name}" + "}}"
+
+    def rewrite(value: Any) -> Any:
+        if isinstance(value, str):
+            return TEMPLATE_REFERENCE.sub(replace, value)
+        elif isinstance(value, Mapping):
+            return {key: rewrite(item) for key, item in value.items()}
+        elif isinstance(value, list):
+            return [rewrite(item) for item in value]
+        else:
+            return value
+
+    fanned_out_task = rewrite(
+        {key: value for key, value in dag_task.items() if key != "dependencies"}
+    )
+    return fanned_out_task, references
+
+
+def _fan_out_node_name(
+    dag_task: Mapping[str, Any],
+    is_shared: bool,
+) -> Tuple[Optional[str], Mapping[str, Any]]:
+    """
+    Take the address of the node out of a DAGTask, so that a shared fan-out template can receive it as a parameter.
+
+    Returns the address (or None if the fan-out template is not shared, or the node doesn't receive its address) and the DAGTask without it.
+    """
+    parameters = dag_task.get("arguments", {}).get("parameters", [])
+    node_name = next(
+        (
+            parameter["value"]
+            for parameter in parameters
+            if parameter["name"] == NODE_NAME_PARAMETER
+        ),
+        None,
+    )
+    if not is_shared or node_name is None:
+        return None, dag_task
+
+    arguments = {
+        **dag_task["arguments"],
+        "parameters": [
+            parameter
+            for parameter in parameters
+            if parameter["name"] != NODE_NAME_PARAMETER
+        ],
+    }
+    if not arguments["parameters"]:
+        del arguments["parameters"]
+
+    stripped_dag_task = {
+        key: arguments if key == "arguments" else value
+        for key, value in dag_task.items()
+        if key != "arguments" or arguments
+    }
+
+    return node_name, stripped_dag_task
+
+
+def _fan_out_key(address: List[str]) -> Tuple[str, ...]:
+    """
+    Return the key of the fan-out template of a node in a mapping of shared template names (see `_shared_template_names`).
+
+    Node names can't contain underscores, so the key never collides with the address of a node.
+    """
+    return tuple(address) + (FAN_OUT_KEY,)
+
+
+def _fan_out_template_name(address: List[str]) -> str:
+    """
+    Generate the name of a fan-out template from the address of the node it fans out.
+
+    Fan-out templates use their own prefix, so their names never collide with the names of regular templates.
+    """
+    return "-".join([FAN_OUT_TEMPLATE_PREFIX] + address)
+
+
+def _concurrency_options(node: Node, address: List[str]) -> Concurrency:
+    """
+    Return the concurrency limits of a node, or an empty set of limits if it doesn't have any.
+
+    Raises
+    ------
+    TypeError
+        If the runtime option is not of type Concurrency.
+
+    ValueError
+        If a node that is not partitioned limits the number of partitions that run at the same time.
+    """
+    concurrency = node.runtime_options.get(CONCURRENCY_OPTION, Concurrency())
+    context = ".".join(address) if address else "DAG"
+
+    if not isinstance(concurrency, Concurrency):
+        raise TypeError(
+            f"Node '{context}' sets the '{CONCURRENCY_OPTION}' runtime option to a value of type '{type(concurrency).__name__}'. However, it must be of type 'Concurrency'."
+        )
+
+    if concurrency.max_partitions and not node.partition_by_input:
+        raise ValueError(
+            f"Node '{context}' limits the number of partitions that may run at the same time through the '{CONCURRENCY_OPTION}' runtime option. However, it is not partitioned."
+        )
+
+    return concurrency
+
+
+def _max_partitions(node: Node) -> Optional[int]:
+    """Return the maximum number of partitions of a node that may run at the same time, if the node limits it."""
+    concurrency = node.runtime_options.get(CONCURRENCY_OPTION)
+    if not isinstance(concurrency, Concurrency) or not node.partition_by_input:
+        return None
+
+    return concurrency.max_partitions
+
+
+def _artifact_archive(
+    task: Task,
+    output_name: str,
+    address: List[str],
+    artifact_archives: Mapping[Type[Serializer], ArtifactArchive] = None,
+) -> ArtifactArchive:
+    """
+    Return how an output of a task should be archived.
+
+    The archive set for the output through the task's runtime options takes precedence over the archive set for the type of its serializer (or any of its base classes). Partitioned outputs are always stored as they are, because their consumers retrieve each partition separately.
+
+    Raises
+    ------
+    TypeError
+        If the runtime option is not a mapping of ArtifactArchive instances.
+
+    ValueError
+        If the runtime option refers to outputs the task doesn't have, or it compresses a partitioned output.
+    """
+    archives = task.runtime_options.get(ARTIFACT_ARCHIVE_OPTION, {})
+    context = ".".join(address)
+
+    if not isinstance(archives, Mapping) or not all(
+        isinstance(archive, ArtifactArchive) for archive in archives.values()
+    ):
+        raise TypeError(
+            f"Task '{context}' sets the '{ARTIFACT_ARCHIVE_OPTION}' runtime option to {repr(archives)}. However, it must be a mapping from output names to instances of 'ArtifactArchive'."
+        )
+
+    unknown_outputs = sorted(set(archives) - set(task.outputs))
+    if unknown_outputs:
+        raise ValueError(
+            f"Task '{context}' sets the archive of outputs {unknown_outputs} through the '{ARTIFACT_ARCHIVE_OPTION}' runtime option. However, these are the outputs it has: {sorted(task.outputs)}."
+        )
+
+    output = task.outputs[output_name]
+    if output.is_partitioned:
+        if archives.get(output_name, ArtifactArchive()) != ArtifactArchive():
+            raise ValueError(
+                f"Task '{context}' compresses its partitioned output '{output_name}' through the '{ARTIFACT_ARCHIVE_OPTION}' runtime option. However, partitioned outputs are always stored as they are. Consider serializing the output with `Compressed` instead."
+            )
+
+        return ArtifactArchive()
+
+    if output_name in archives:
+        return archives[output_name]
+
+    artifact_archives = artifact_archives or {}
+    for serializer_type in type(output.serializer).__mro__:
+        if serializer_type in artifact_archives:
+            return artifact_archives[serializer_type]
+
+    return ArtifactArchive()
+
+
+def _fused_groups(dag: DAG) -> List[List[str]]:
+    """
+    Find the chains of tasks in a DAG that can run in a single container, and return the names of their tasks in execution order.
+
+    A task is fused with the next one when:
+    - Both of them are tasks, and neither of them is partitioned nor produces partitioned outputs.
+    - The next task is the only consumer of its outputs (including the outputs of the DAG).
+    - Both of them have the same runtime options, so they can share a template.
+    - Neither of them inlines any of its outputs as parameters, nor is memoized.
+
+    Since every task in a chain (except for the last one) is only consumed by the next one, the rest of the DAG only depends on the last task of the chain.
+    """
+    consumers: Dict[str, set] = {node_name: set() for node_name in dag.nodes}
+    for node_name, node in dag.nodes.items():
+        for input_type in node.inputs.values():
+            if isinstance(input_type, FromNodeOutput):
+                consumers[input_type.node].add(node_name)
+
+    for output_type in dag.outputs.values():
+        # The DAG's own outputs are consumed outside the DAG
+        consumers[output_type.node].add(None)
+
+    def is_fusable(node: Node) -> bool:
+        return (
+            isinstance(node, Task)
+            and not node.partition_by_input
+            and not any(output.is_partitioned for output in node.outputs.values())
+            and not _inlined_outputs(node)
+            and not _memoize_options(node)
+        )
+
+    groups: Dict[str, List[str]] = {}
+    for node_name in itertools.chain(*dag.node_execution_order):
+        node = dag.nodes[node_name]
+        previous = next(
+            (
+                input_type.node
+                for input_type in node.inputs.values()
+                if isinstance(input_type, FromNodeOutput)
+                and consumers[input_type.node] == {node_name}
+                and is_fusable(node)
+                and is_fusable(dag.nodes[input_type.node])
+                and node.runtime_options == dag.nodes[input_type.node].runtime_options
+            ),
+            None,
+        )
+        if previous is None:
+            groups[node_name] = [node_name]
+        else:
+            groups[node_name] = groups.pop(previous)
+            groups[node_name].append(node_name)
+
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def _fused_node_names(dag: DAG) -> Set[str]:
+    """Return the names of all the nodes of a DAG that are part of a fused group."""
+    return {node_name for group in _fused_groups(dag) for node_name in group}
+
+
+def _fused_inputs(dag: DAG, group: List[str]) -> List[Tuple[str, str]]:
+    """Return the (node name, input name) of the inputs of a fused group that come from outside the group."""
+    group_node_names = set(group)
+    return [
+        (node_name, input_name)
+        for node_name in group
+        for input_name, input_type in dag.nodes[node_name].inputs.items()
+        if not (
+            isinstance(input_type, FromNodeOutput)
+            and input_type.node in group_node_names
+        )
+    ]
+
+
+def _fused_outputs(dag: DAG, group: List[str]) -> List[Tuple[str, str]]:
+    """Return the (node name, output name) of the outputs of a fused group that are not consumed within the group."""
+    consumed = {
+        (input_type.node, input_type.output)
+        for node_name in group
+        for input_type in dag.nodes[node_name].inputs.values()
+        if isinstance(input_type, FromNodeOutput)
+    }
+    return [
+        (node_name, output_name)
+        for node_name in group
+        for output_name in dag.nodes[node_name].outputs
+        if (node_name, output_name) not in consumed
+    ]
+
+
+def _fused_name(node_name: str, name: str) -> str:
+    """
+    Return the name of an input/output of a node in a fused group.
+
+    Node names can't contain underscores, so the name is unique within the group.
+    """
+    return f"{node_name}_{name}"
+
+
+def _fused_dag_task(
+    dag: DAG,
+    group: List[str],
+    address: List[str],
+    dag_output_names: Mapping[Tuple[str, str], str] = None,
+) -> Mapping[str, Any]:
+    """
+    Return a minimal representation of a DAGTask that runs a fused group of tasks.
+
+    The task is named after the last task of the group. It receives the inputs that come from outside the group, and produces the outputs that are not consumed within the group.
+
+    Spec: https://github.com/argoproj/argo-workflows/blob/v3.0.4/docs/fields.md#dagtask
+    """
+    last_node = dag.nodes[group[-1]]
+    group_node_names = set(group)
+    if dag_output_names is None:
+        dag_output_names = _dag_output_names(dag.outputs)
+
+    dag_task: Dict[str, Any] = {
+        "name": group[-1],
+        "template": _fused_template_name(address + [group[0]]),
+    }
+
+    dependencies = list(
+        dict.fromkeys(
+            dependency
+            for node_name in group
+            for dependency in _dag_task_dependencies(dag.nodes[node_name])
+            if dependency not in group_node_names
+        )
+    )
+    if dependencies:
+        dag_task["dependencies"] = dependencies
+
+    parameters = [
+        {
+            "name": f"{_fused_name(node_name, output_name)}_output_path",
+            "value": _dag_task_arguments_output_path(
+                node_name=node_name,
+                output_name=output_name,
+                serializer=dag.nodes[node_name].outputs[output_name].serializer,
+                dag_output_names=dag_output_names,
+                is_partitioned=False,
+            ),
+        }
+        for node_name, output_name in _fused_outputs(dag, group)
+    ]
+
+    artifacts = [
+        {
+            **_dag_task_argument_artifact(
+                node_address=address + [node_name],
+                input_name=input_name,
+                input_type=dag.nodes[node_name].inputs[input_name],
+                is_partitioned=False,
+                dag_output_names=dag_output_names,
+                is_inlined=_is_inlined(dag, dag.nodes[node_name].inputs[input_name]),
+                is_memoized=_is_memoized_input(
+                    dag, dag.nodes[node_name].inputs[input_name]
+                ),
+            ),
+            "name": _fused_name(node_name, input_name),
+        }
+        for node_name, input_name in _fused_inputs(dag, group)
+    ]
+
+    arguments: Dict[str, Any] = {}
+    if parameters:
+        arguments["parameters"] = parameters
+
+    if artifacts:
+        arguments["artifacts"] = artifacts
+
+    if arguments:
+        dag_task["arguments"] = arguments
+
+    return with_extra_spec_options(
+        original=dag_task,
+        extra_options=last_node.runtime_options.get("argo_task_overrides", {}),
+        context=".".join(address + [group[-1]]),
+    )
+
+
+def _fused_task_template(
+    dag: DAG,
+    group: List[str],
+    address: List[str],
+    container_image: str,
+    container_command: List[str],
+    publish_digests: bool = False,
+    artifact_archives: Mapping[Type[Serializer], ArtifactArchive] = None,
+) -> Mapping[str, Any]:
+    """
+    Return a minimal representation of a Template that runs a fused group of tasks in a single container, one after the other.
+
+    Only the inputs that come from outside the group and the outputs that are not consumed within the group are exchanged as artifacts.
+    If digests are published, they are published for the outputs of the last task, which are the only ones other nodes may consume, with the same names a regular template would use.
+
+    https://github.com/argoproj/argo-workflows/blob/v3.0.4/docs/fields.md#template
+    """
+    first_node = dag.nodes[group[0]]
+    inputs = _fused_inputs(dag, group)
+    outputs = _fused_outputs(dag, group)
+    digested_outputs = list(dag.nodes[group[-1]].outputs) if publish_digests else []
+
+    template: dict = {
+        "name": _fused_template_name(address + [group[0]]),
+        "container": {
+            "image": container_image,
+            "args": list(
+                itertools.chain(
+                    *[
+                        ["--node-name", ".".join(address + [node_name])]
+                        for node_name in group
+                    ],
+                    *[
+                        [
+                            "--input",
+                            f"{node_name}.{input_name}",
+                            "{{"
+                            + f"inputs.artifacts.{_fused_name(node_name, input_name)}.path"
+                            + "}}",
+                        ]
+                        for node_name, input_name in inputs
+                    ],
+                    *[
+                        [
+                            "--output",
+                            f"{node_name}.{output_name}",
+                            "{{"
+                            + f"outputs.artifacts.{_fused_name(node_name, output_name)}.path"
+                            + "}}",
+                        ]
+                        for node_name, output_name in outputs
+                    ],
+                    *[
+                        [
+                            "--output-digest",
+                            f"{group[-1]}.{output_name}",
+                            _task_template_digest_path(
+                                _fused_name(group[-1], output_name)
+                            ),
+                        ]
+                        for output_name in digested_outputs
+                    ],
+                )
+            ),
+        },
+    }
+
+    if container_command:
+        template["container"]["command"] = container_command[:]
+
+    template_inputs: Dict[str, Any] = {}
+    if outputs:
+        template_inputs["parameters"] = [
+            {"name": f"{_fused_name(node_name, output_name)}_output_path"}
+            for node_name, output_name in outputs
+        ]
+
+    if inputs:
+        template_inputs["artifacts"] = [
+            {
+                "name": _fused_name(node_name, input_name),
+                "path": "/".join(
+                    [
+                        INPUT_PATH,
+                        f"{_fused_name(node_name, input_name)}.{dag.nodes[node_name].inputs[input_name].serializer.extension}",
+                    ]
+                ),
+            }
+            for node_name, input_name in inputs
+        ]
+
+    if template_inputs:
+        template["inputs"] = template_inputs
+
+    if outputs:
+        template["outputs"] = {}
+        if digested_outputs:
+            template["outputs"]["parameters"] = [
+                {
+                    "name": f"{output_name}_digest",
+                    "valueFrom": {
+                        "path": _task_template_digest_path(
+                            _fused_name(group[-1], output_name)
+                        )
+                    },
+                }
+                for output_name in digested_outputs
+            ]
+
+        template["outputs"]["artifacts"] = [
+            {
+                "name": _fused_name(node_name, output_name),
+                "path": "/".join(
+                    [
+                        OUTPUT_PATH,
+                        f"{_fused_name(node_name, output_name)}.{dag.nodes[node_name].outputs[output_name].serializer.extension}",
+                    ]
+                ),
+                "archive": archive_strategy(
+                    _artifact_archive(
+                        dag.nodes[node_name],
+                        output_name,
+                        address + [node_name],
+                        artifact_archives,
+                    )
+                ),
+                "s3": {
+                    "key": _parameter(
+                        f"{_fused_name(node_name, output_name)}_output_path"
+                    ),
+                },
+            }
+            for node_name, output_name in outputs
+        ]
+        template["volumes"] = [{"name": "outputs", "emptyDir": {}}]
+        template["container"]["volumeMounts"] = [
+            {"name": "outputs", "mountPath": OUTPUT_PATH}
+        ]
+
+    # All tasks in the group have the same runtime options.
+    context = ".".join(address + [group[0]])
+    concurrency = _concurrency_options(first_node, address + [group[0]])
+    if concurrency.semaphore:
+        template["synchronization"] = synchronization(concurrency.semaphore)
+
+    # Overrides
+    template["container"] = with_extra_spec_options(
+        original=template["container"],
+        extra_options=first_node.runtime_options.get("argo_container_overrides", {}),
+        context=context,
+    )
+
+    return with_extra_spec_options(
+        original=template,
+        extra_options=first_node.runtime_options.get("argo_template_overrides", {}),
+        context=context,
+    )
+
+
+def _fused_template_name(address: List[str]) -> str:
+    """
+    Generate the name of a fused template from the address of the first task in the group.
+
+    Fused templates use their own prefix, so their names never collide with the names of regular templates.
+    """
+    return "-".join([FUSED_TEMPLATE_PREFIX] + address)
+
+
+def _template_name(address: List[str]) -> str:
+    """
+    Generate a template name from a node address.
+
+    If the name is None, we return the default base DAG name.
+    If the name is defined, we prefix it with the base DAG name. We do this to guarantee all names are unique.
+    """
+    return "-".join([BASE_DAG_NAME] + address)
+
+
+def _parameter(name: str) -> str:
+    """Return a reference to an input parameter of the current template."""
+    return "{{inputs.parameters." + name + "}}"
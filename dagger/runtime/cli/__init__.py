@@ -8,4 +8,14 @@ It runs all tasks/DAGs using the "local" runtime.
 """
 
 from dagger.runtime.cli.cli import invoke  # noqa
-from dagger.runtime.cli.locations import PARTITION_MANIFEST_FILENAME  # noqa
+from dagger.runtime.cli.location_schemes import LocationScheme  # noqa
+from dagger.runtime.cli.locations import (  # noqa
+    PARTITION_MANIFEST_FILENAME,
+    register_location_scheme,
+)
+from dagger.runtime.cli.snapshot import (  # noqa
+    DAGSnapshot,
+    compile_snapshot,
+    load_snapshot,
+)
+from dagger.runtime.cli.worker import send_request, serve  # noqa
@@ -0,0 +1,30 @@
+"""
+Run a DAG (or a node therein) from a snapshot compiled with `dagger.runtime.cli.compile_snapshot`, or through a worker started with `--serve-worker`.
+
+Usage:
+    python -m dagger.runtime.cli <snapshot> [--node-name NODE_NAME] [--input name location] [--output name location]
+    python -m dagger.runtime.cli --worker-socket SOCKET [--node-name NODE_NAME] [--input name location] [--output name location]
+"""
+
+import sys
+
+if __name__ == "__main__":
+    from dagger.runtime.cli.cli import _call_arg_parser, _invocation_kwargs
+
+    argv = sys.argv[1:]
+    if any(
+        arg == "--worker-socket" or arg.startswith("--worker-socket=") for arg in argv
+    ):
+        from dagger.runtime.cli.worker import send_request
+
+        parser = _call_arg_parser()
+        parser.add_argument("--worker-socket", type=str, required=True)
+        args = parser.parse_args(argv)
+        send_request(args.worker_socket, **_invocation_kwargs(args))
+    elif argv and not argv[0].startswith("-"):
+        from dagger.runtime.cli.cli import invoke
+        from dagger.runtime.cli.snapshot import load_snapshot
+
+        invoke(load_snapshot(argv[0]), argv=argv[1:])
+    else:
+        sys.exit(__doc__.strip())
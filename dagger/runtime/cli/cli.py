@@ -2,14 +2,18 @@
 
 import logging
 import sys
-from typing import List
+from typing import List, Union
 
 from dagger.dag import DAG
-from dagger.runtime.cli.invoke_with_locations import invoke_with_locations
+from dagger.runtime.cli.invoke_with_locations import (
+    invoke_nodes_with_locations,
+    invoke_with_locations,
+)
+from dagger.runtime.cli.snapshot import DAGSnapshot
 
 
 def invoke(
-    dag: DAG,
+    dag: Union[DAG, DAGSnapshot],
     argv: List[str] = sys.argv[1:],
 ):
     """
@@ -20,12 +24,16 @@ def invoke(
     * `--input <name> <location>` -- Retrieve input <name> of the DAG from <location>
     * `--output <name> <location>` -- Store output <name> of the DAG into <location>
     * `--node-name <name>` (optional) -- Select a specific node of the DAG to run. If your DAG contains other nested DAGs you can access nodes using dot-notation (e.g. nested-dag-name.node-name)
+      It may be repeated to run several nodes of the same parent DAG in order, in the same process. In that case, inputs and outputs are referenced as <node-name>.<name>, and only the outputs that no other selected node consumes need a location.
+    * `--output-digest <name> <path>` (optional) -- Store the SHA-256 digest of output <name> of the DAG into <path>, in the local filesystem
+    * `--output-max-size <name> <bytes>` (optional) -- Fail instead of storing output <name> of the DAG if it takes more than <bytes> once serialized
+    * `--serve-worker <socket>` (optional) -- Instead of running the DAG once, start a worker server that listens to requests on a UNIX socket. Check `dagger.runtime.cli.serve` for more details.
 
 
     Parameters
     ----------
-    dag : DAG
-        DAG to execute
+    dag : DAG or DAGSnapshot
+        DAG to execute. Check `dagger.runtime.cli.compile_snapshot` to understand when it may be useful to pass a snapshot instead of a DAG.
 
     argv : List of str (by default, the system's CLI arguments)
         List of arguments expected by the Command-Line Interface of this runtime.
@@ -44,21 +52,76 @@ def invoke(
         When some of the outputs cannot be serialized with the specified Serializer
     """
     parser = _call_arg_parser()
+    parser.add_argument(
+        "--serve-worker",
+        type=str,
+        default=None,
+        metavar="socket",
+        help="Start a worker server listening to requests on the UNIX socket specified, instead of running the DAG once.",
+    )
     args = parser.parse_args(argv)
     logging.debug(f"Arguments supplied to CLI are {args}")
 
+    if args.serve_worker:
+        from dagger.runtime.cli.worker import serve
+
+        serve(dag, socket_path=args.serve_worker)
+        return
+
+    if len(args.node_names) > 1:
+        invoke_nodes_with_locations(dag, **_nodes_invocation_kwargs(args))
+    else:
+        invoke_with_locations(dag, **_invocation_kwargs(args))
+
+
+def _invocation_kwargs(args) -> dict:
+    if len(args.node_names) > 1:
+        raise ValueError(
+            f"Only one node can be selected in this mode. However, the following nodes were supplied: {args.node_names}"
+        )
+
+    return dict(
+        node_address=_node_address(args.node_names[0] if args.node_names else ""),
+        **_locations(args),
+    )
+
+
+def _nodes_invocation_kwargs(args) -> dict:
+    return dict(
+        node_addresses=[_node_address(node_name) for node_name in args.node_names],
+        **_locations(args),
+    )
+
+
+def _node_address(node_name: str) -> List[str]:
+    return [n for n in node_name.split(".") if n != ""]
+
+
+def _locations(args) -> dict:
     input_locations = {
         input_name: input_location for input_name, input_location in args.inputs
     }
     output_locations = {
         output_name: output_location for output_name, output_location in args.outputs
     }
+    output_digest_locations = {
+        output_name: digest_location
+        for output_name, digest_location in args.output_digests
+    }
+    output_max_sizes = {}
+    for output_name, max_size in args.output_max_sizes:
+        if not max_size.isdigit():
+            raise ValueError(
+                f"The maximum size of output '{output_name}' must be a number of bytes. However, it was set to '{max_size}'."
+            )
 
-    invoke_with_locations(
-        dag,
-        node_address=[n for n in args.node_name.split(".") if n != ""],
+        output_max_sizes[output_name] = int(max_size)
+
+    return dict(
         input_locations=input_locations,
         output_locations=output_locations,
+        output_digest_locations=output_digest_locations,
+        output_max_sizes=output_max_sizes,
     )
 
 
@@ -70,9 +133,11 @@ def _call_arg_parser():
     )
     parser.add_argument(
         "--node-name",
+        action="append",
+        default=[],
+        dest="node_names",
         type=str,
-        default="",
-        help="Select a specific node to run. It must be properly namespaced with the name of all the parent DAGs.",
+        help="Select a specific node to run. It must be properly namespaced with the name of all the parent DAGs. Repeat it to run several nodes of the same parent DAG in order.",
     )
     parser.add_argument(
         "--output",
@@ -81,7 +146,25 @@ def _call_arg_parser():
         dest="outputs",
         nargs=2,
         metavar=("name", "location"),
-        help="Store a given output into the location specified. Currently, we only support storing outputs in the local filesystem",
+        help="Store a given output into the location specified. Locations may be paths in the local filesystem or URLs of any registered scheme (e.g. file://, s3://)",
+    )
+    parser.add_argument(
+        "--output-digest",
+        action="append",
+        default=[],
+        dest="output_digests",
+        nargs=2,
+        metavar=("name", "path"),
+        help="Store the SHA-256 digest of the contents of a given output into a path in the local filesystem. The output must also be stored with --output.",
+    )
+    parser.add_argument(
+        "--output-max-size",
+        action="append",
+        default=[],
+        dest="output_max_sizes",
+        nargs=2,
+        metavar=("name", "bytes"),
+        help="Fail instead of storing a given output if it takes more than the number of bytes specified once serialized (each partition, for partitioned outputs). The output must also be stored with --output.",
     )
     parser.add_argument(
         "--input",
@@ -90,6 +173,6 @@ def _call_arg_parser():
         dest="inputs",
         nargs=2,
         metavar=("name", "location"),
-        help="Retrieve a given input from the location specified. Currently, we only support retrieving inputs from the local filesystem",
+        help="Retrieve a given input from the location specified. Locations may be paths in the local filesystem or URLs of any registered scheme (e.g. file://, s3://)",
     )
     return parser
@@ -0,0 +1,92 @@
+"""Compute digests of the serialized contents of node outputs."""
+
+from typing import Iterator
+
+from dagger.runtime.local import NodeOutput, OutputFile, PartitionedOutput
+
+#: Number of bytes read from a file at a time when computing its digest
+CHUNK_SIZE = 1024**2
+
+
+def output_digest(output_value: NodeOutput) -> str:
+    """
+    Return the hexadecimal SHA-256 digest of the serialized contents of an output.
+
+    Partitioned outputs are digested from the digests of their partitions, in order. Since partitioned outputs are iterators, they are consumed by this function.
+    Outputs stored as directories (see `dagger.serializer.PathSerializer`) are digested from the names of their entries and the digests of their files.
+    """
+    import hashlib
+
+    if isinstance(output_value, PartitionedOutput):
+        digest = hashlib.sha256()
+        for partition in output_value:
+            digest.update(_path_digest(partition.filename).encode("ascii"))
+            digest.update(b"\n")
+
+        return digest.hexdigest()
+
+    return _path_digest(output_value.filename)
+
+
+def with_digest_stored(output_value: NodeOutput, digest_location: str) -> NodeOutput:
+    """
+    Return an equivalent output that stores its digest as text in a path of the local filesystem.
+
+    The digest of a partitioned output is stored once all of its partitions have been consumed. Partitions may share the same file until they are consumed, so each of them is digested as soon as it is produced.
+    """
+    if isinstance(output_value, PartitionedOutput):
+        return PartitionedOutput(_digesting_partitions(output_value, digest_location))
+
+    _write_digest(digest_location, output_digest(output_value))
+    return output_value
+
+
+def _digesting_partitions(
+    partitions: PartitionedOutput[OutputFile],
+    digest_location: str,
+) -> Iterator[OutputFile]:
+    import hashlib
+
+    digest = hashlib.sha256()
+    for partition in partitions:
+        digest.update(_path_digest(partition.filename).encode("ascii"))
+        digest.update(b"\n")
+        yield partition
+
+    _write_digest(digest_location, digest.hexdigest())
+
+
+def _write_digest(digest_location: str, digest: str):
+    with open(digest_location, "w") as f:
+        f.write(digest)
+
+
+def _path_digest(path: str) -> str:
+    import hashlib
+    import os
+
+    if not os.path.isdir(path):
+        return _file_digest(path)
+
+    digest = hashlib.sha256()
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames.sort()
+        relative_dirpath = os.path.relpath(dirpath, path).replace(os.sep, "/")
+        for name in dirnames:
+            digest.update(f"{relative_dirpath}/{name}/\n".encode("utf-8"))
+        for name in sorted(filenames):
+            file_digest = _file_digest(os.path.join(dirpath, name))
+            digest.update(f"{file_digest}  {relative_dirpath}/{name}\n".encode("utf-8"))
+
+    return digest.hexdigest()
+
+
+def _file_digest(filename: str) -> str:
+    import hashlib
+
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
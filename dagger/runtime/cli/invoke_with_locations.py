@@ -1,31 +1,42 @@
 """Command-line Interface to run DAGs or Tasks taking their inputs from files and storing their outputs into files."""
+
+import os
 import tempfile
-from typing import Any, Iterable, List, Mapping, Union
+from typing import Any, Dict, Iterable, List, Mapping, Union
 
 import dagger.runtime.local as local
-from dagger import FromNodeOutput, FromParam
-from dagger.dag import DAG
-from dagger.input import split_required_and_optional_inputs
+from dagger.dag import DAG, Node
+from dagger.input import (
+    FromNodeOutput,
+    FromParam,
+    split_required_and_optional_inputs,
+)
+from dagger.runtime.cli.digests import with_digest_stored
 from dagger.runtime.cli.locations import (
     retrieve_input_from_location,
     store_output_in_location,
 )
-from dagger.runtime.cli.nested_nodes import NodeWithParent, find_nested_node
+from dagger.runtime.cli.nested_nodes import find_nested_node
+from dagger.runtime.cli.snapshot import DAGSnapshot
+from dagger.runtime.local import NodeOutput, OutputFile, PartitionedOutput
+from dagger.runtime.local.output import load
 
 
 def invoke_with_locations(
-    dag: DAG,
+    dag: Union[DAG, DAGSnapshot],
     node_address: List[str] = None,
     input_locations: Mapping[str, str] = None,
     output_locations: Mapping[str, str] = None,
+    output_digest_locations: Mapping[str, str] = None,
+    output_max_sizes: Mapping[str, int] = None,
 ):
     """
     Invoke the supplied DAG (or a node therein) retrieving the inputs from, and storing the outputs into, the specified locations.
 
     Parameters
     ----------
-    dag : DAG
-        DAG to execute
+    dag : DAG or DAGSnapshot
+        DAG to execute. If it is a snapshot, only the selected node is restored from it.
 
     node_address
         The address of the nested node. Each item in the list represents a level of nesting.
@@ -37,11 +48,17 @@ def invoke_with_locations(
     output_locations
         A mapping of output names to output locations
 
+    output_digest_locations
+        A mapping of output names to paths in the local filesystem where the SHA-256 digest of the serialized output should be stored
+
+    output_max_sizes
+        A mapping of output names to the maximum number of bytes the serialized output (or each of its partitions) may take. Outputs that take more are not stored.
+
 
     Raises
     ------
     ValueError
-        When the location of any required input/output is missing
+        When the location of any required input/output is missing, or an output takes more than its maximum size
 
     TypeError
         When any of the outputs cannot be obtained from the return value of their node
@@ -54,30 +71,272 @@ def invoke_with_locations(
     """
     input_locations = input_locations or {}
     output_locations = output_locations or {}
-    nested_node = find_nested_node(dag, node_address or [])
+    output_digest_locations = output_digest_locations or {}
+    output_max_sizes = output_max_sizes or {}
+    if isinstance(dag, DAGSnapshot):
+        node = dag.find_node(node_address or [])
+    else:
+        node = find_nested_node(dag, node_address or []).node
 
-    _validate_inputs(nested_node.node.inputs, input_locations)
-    _validate_outputs(nested_node.node.outputs.keys(), output_locations.keys())
+    _validate_inputs(node.inputs, input_locations)
+    _validate_outputs(node.outputs.keys(), output_locations.keys())
+    _validate_output_digests(output_digest_locations.keys(), output_locations.keys())
+    _validate_output_max_sizes(output_max_sizes.keys(), output_locations.keys())
 
-    params = _deserialized_params(nested_node, input_locations)
+    params = _deserialized_params(node, input_locations)
 
     with tempfile.TemporaryDirectory() as tmp:
         outputs = local.invoke(
-            nested_node.node,
+            node,
             params=params,
             outputs=local.StoreSerializedOutputsInPath(tmp),
         )
 
-        for output_name in output_locations:
-            try:
-                store_output_in_location(
-                    output_location=output_locations[output_name],
-                    output_value=outputs[output_name],
+        _store_outputs(
+            outputs, output_locations, output_digest_locations, output_max_sizes
+        )
+
+
+def invoke_nodes_with_locations(
+    dag: Union[DAG, DAGSnapshot],
+    node_addresses: List[List[str]],
+    input_locations: Mapping[str, str] = None,
+    output_locations: Mapping[str, str] = None,
+    output_digest_locations: Mapping[str, str] = None,
+    output_max_sizes: Mapping[str, int] = None,
+):
+    """
+    Invoke several sibling nodes of the supplied DAG, one after the other, in the same process.
+
+    The outputs a node produces for the nodes invoked after it are passed to them through the local filesystem. Only the inputs the nodes receive from outside the group are retrieved from locations, and only the outputs with a location are stored.
+
+    Inputs and outputs are referenced by their qualified name, made of the name of the node and the name of the input/output (e.g. "node-name.input_name").
+
+
+    Parameters
+    ----------
+    dag : DAG or DAGSnapshot
+        DAG that contains the nodes to execute.
+
+    node_addresses
+        The addresses of the nodes to invoke, in the order they should be invoked.
+        All nodes must be part of the same parent DAG.
+
+    input_locations
+        A mapping of qualified input names to input locations
+
+    output_locations
+        A mapping of qualified output names to output locations
+
+    output_digest_locations
+        A mapping of qualified output names to paths in the local filesystem where the SHA-256 digest of the serialized output should be stored
+
+    output_max_sizes
+        A mapping of qualified output names to the maximum number of bytes the serialized output (or each of its partitions) may take
+
+
+    Raises
+    ------
+    ValueError
+        When the nodes are not siblings, they are not in the order of their dependencies, a node consumes a partitioned output of another node in the group, the location of any required input/output is missing, or an output takes more than its maximum size.
+        Locations are validated before invoking any node.
+
+    TypeError
+        When any of the outputs cannot be obtained from the return value of their node
+
+    OSError
+        When there is a problem with the operating system's permissions to access the supplied input/output locations.
+
+    SerializationError
+        When some of the outputs cannot be serialized with the specified Serializer
+    """
+    input_locations = input_locations or {}
+    output_locations = output_locations or {}
+    output_digest_locations = output_digest_locations or {}
+    output_max_sizes = output_max_sizes or {}
+    if not node_addresses or any(len(address) == 0 for address in node_addresses):
+        raise ValueError(
+            "Only nodes within a DAG can be invoked together. Please specify the address of each node."
+        )
+
+    parent_addresses = {tuple(address[:-1]) for address in node_addresses}
+    if len(parent_addresses) > 1:
+        raise ValueError(
+            f"Only nodes with the same parent DAG can be invoked together. However, the following nodes were supplied: {['.'.join(address) for address in node_addresses]}"
+        )
+
+    nodes: Dict[str, Node] = {}
+    for address in node_addresses:
+        if isinstance(dag, DAGSnapshot):
+            nodes[address[-1]] = dag.find_node(address)
+        else:
+            nodes[address[-1]] = find_nested_node(dag, address).node
+
+    consumed_outputs = {
+        (input_type.node, input_type.output)
+        for node in nodes.values()
+        for input_type in node.inputs.values()
+        if isinstance(input_type, FromNodeOutput) and input_type.node in nodes
+    }
+
+    node_output_locations = {
+        node_name: {
+            output_name: output_locations[f"{node_name}.{output_name}"]
+            for output_name in node.outputs
+            if f"{node_name}.{output_name}" in output_locations
+        }
+        for node_name, node in nodes.items()
+    }
+    _validate_output_digests(output_digest_locations.keys(), output_locations.keys())
+    _validate_output_max_sizes(output_max_sizes.keys(), output_locations.keys())
+
+    # All locations are validated before invoking any node, so that a
+    # misconfigured group of nodes fails before doing any work.
+    node_input_locations: Dict[str, Mapping[str, str]] = {}
+    node_internal_inputs: Dict[str, Mapping[str, FromNodeOutput]] = {}
+    for node_name, node in nodes.items():
+        node_input_locations[node_name] = {
+            input_name: input_locations[f"{node_name}.{input_name}"]
+            for input_name in node.inputs
+            if f"{node_name}.{input_name}" in input_locations
+        }
+
+        node_internal_inputs[node_name] = {
+            input_name: input_type
+            for input_name, input_type in node.inputs.items()
+            if isinstance(input_type, FromNodeOutput) and input_type.node in nodes
+        }
+        external_inputs = {
+            input_name: input_type
+            for input_name, input_type in node.inputs.items()
+            if input_name not in node_internal_inputs[node_name]
+        }
+        _validate_inputs(external_inputs, node_input_locations[node_name])
+        _validate_outputs(
+            [
+                output_name
+                for output_name in node.outputs
+                if (node_name, output_name) not in consumed_outputs
+            ],
+            node_output_locations[node_name],
+        )
+        _validate_internal_inputs(node_name, node_internal_inputs[node_name], nodes)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        outputs: Dict[str, Mapping[str, Any]] = {}
+        for node_name, node in nodes.items():
+            params = _deserialized_params(node, node_input_locations[node_name])
+            for input_name, input_type in node_internal_inputs[node_name].items():
+                params[input_name] = load(
+                    filename=outputs[input_type.node][input_type.output].filename,
+                    serializer=input_type.serializer,
+                )
+
+            node_output_path = os.path.join(tmp, node_name)
+            os.makedirs(node_output_path)
+            outputs[node_name] = local.invoke(
+                node,
+                params=params,
+                outputs=local.StoreSerializedOutputsInPath(node_output_path),
+            )
+
+        # Outputs are stored once all nodes have consumed them, since storing
+        # them may move them out of the temporary directory.
+        for node_name in nodes:
+            _store_outputs(
+                outputs[node_name],
+                node_output_locations[node_name],
+                {
+                    output_name: output_digest_locations[f"{node_name}.{output_name}"]
+                    for output_name in node_output_locations[node_name]
+                    if f"{node_name}.{output_name}" in output_digest_locations
+                },
+                {
+                    output_name: output_max_sizes[f"{node_name}.{output_name}"]
+                    for output_name in node_output_locations[node_name]
+                    if f"{node_name}.{output_name}" in output_max_sizes
+                },
+            )
+
+
+def _store_outputs(
+    outputs: Mapping[str, Any],
+    output_locations: Mapping[str, str],
+    output_digest_locations: Mapping[str, str],
+    output_max_sizes: Mapping[str, int] = None,
+):
+    """Store the outputs produced by a node in the locations supplied, together with the digests requested."""
+    output_max_sizes = output_max_sizes or {}
+    for output_name in output_locations:
+        output_value = outputs[output_name]
+        if output_name in output_max_sizes:
+            output_value = _with_max_size_checked(
+                output_value, output_name, output_max_sizes[output_name]
+            )
+
+        try:
+            if output_name in output_digest_locations:
+                output_value = with_digest_stored(
+                    output_value, output_digest_locations[output_name]
                 )
-            except (OSError, FileExistsError, IsADirectoryError, PermissionError) as e:
-                raise OSError(
-                    f"When storing output '{output_name}', we got the following error: {str(e)}"
-                ) from e
+
+            store_output_in_location(
+                output_location=output_locations[output_name],
+                output_value=output_value,
+            )
+        except (OSError, FileExistsError, IsADirectoryError, PermissionError) as e:
+            raise OSError(
+                f"When storing output '{output_name}', we got the following error: {str(e)}"
+            ) from e
+
+
+def _validate_output_digests(
+    output_digest_names: Iterable[str],
+    output_locations: Iterable[str],
+):
+    """Validate that digests are only requested for outputs that will be stored."""
+    for output_name in output_digest_names:
+        if output_name not in output_locations:
+            raise ValueError(
+                f"The digest of an output named '{output_name}' was requested. However, digests can only be requested for the outputs being stored: {sorted(output_locations)}"
+            )
+
+
+def _validate_output_max_sizes(
+    output_max_size_names: Iterable[str],
+    output_locations: Iterable[str],
+):
+    """Validate that maximum sizes are only set for outputs that will be stored."""
+    for output_name in output_max_size_names:
+        if output_name not in output_locations:
+            raise ValueError(
+                f"A maximum size was set for an output named '{output_name}'. However, maximum sizes can only be set for the outputs being stored: {sorted(output_locations)}"
+            )
+
+
+def _with_max_size_checked(
+    output_value: NodeOutput, output_name: str, max_size: int
+) -> NodeOutput:
+    """Return an equivalent output that raises a ValueError if its file (or the file of any of its partitions) takes more than the maximum size."""
+    if isinstance(output_value, PartitionedOutput):
+        return PartitionedOutput(
+            _check_max_size(partition, output_name, max_size)
+            for partition in output_value
+        )
+
+    return _check_max_size(output_value, output_name, max_size)
+
+
+def _check_max_size(
+    output_value: OutputFile, output_name: str, max_size: int
+) -> OutputFile:
+    size = os.path.getsize(output_value.filename)
+    if size > max_size:
+        raise ValueError(
+            f"Output '{output_name}' takes {size} bytes once serialized. However, it may take {max_size} bytes at most."
+        )
+
+    return output_value
 
 
 def _validate_inputs(
@@ -109,8 +368,30 @@ def _validate_outputs(
             )
 
 
+def _validate_internal_inputs(
+    node_name: str,
+    inputs: Mapping[str, FromNodeOutput],
+    nodes: Mapping[str, Node],
+):
+    """Validate the inputs a node receives from other nodes invoked in the same group. Nodes are invoked in the order of the mapping."""
+    invoked_before = list(nodes)[: list(nodes).index(node_name)]
+    for input_type in inputs.values():
+        if input_type.node not in invoked_before:
+            raise ValueError(
+                f"Node '{node_name}' depends on the output of node '{input_type.node}', so it must be invoked after it."
+            )
+
+        producer = nodes[input_type.node]
+        if producer.partition_by_input or getattr(
+            producer.outputs[input_type.output], "is_partitioned", False
+        ):
+            raise ValueError(
+                f"Node '{node_name}' depends on output '{input_type.output}' of node '{input_type.node}', which is partitioned. Partitioned outputs can only be passed to other nodes through locations, so these nodes cannot be invoked together."
+            )
+
+
 def _deserialized_params(
-    nested_node: NodeWithParent,
+    node: Node,
     input_locations: Mapping[str, str],
 ) -> Mapping[str, Any]:
     """Retrieve and deserialize all the parameters expected by a Node."""
@@ -119,7 +400,7 @@ def _deserialized_params(
         try:
             params[input_name] = retrieve_input_from_location(
                 input_location=input_locations[input_name],
-                serializer=nested_node.node.inputs[input_name].serializer,
+                serializer=node.inputs[input_name].serializer,
             )
         except (FileNotFoundError, PermissionError) as e:
             raise OSError(
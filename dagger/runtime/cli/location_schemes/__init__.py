@@ -0,0 +1,9 @@
+"""Schemes (e.g. file://, s3://) the CLI runtime can use to retrieve inputs and store outputs."""
+
+from dagger.runtime.cli.location_schemes.local_filesystem import LocalFileSystem  # noqa
+from dagger.runtime.cli.location_schemes.protocol import (  # noqa
+    PARTITION_COUNT_FILENAME,
+    PARTITION_MANIFEST_FILENAME,
+    LocationScheme,
+)
+from dagger.runtime.cli.location_schemes.s3 import S3  # noqa
@@ -0,0 +1,137 @@
+"""Retrieve from / store into locations in the local filesystem."""
+
+import json
+import os
+import shutil
+from typing import Any, List
+
+from dagger.runtime.cli.location_schemes.protocol import (
+    PARTITION_COUNT_FILENAME,
+    PARTITION_MANIFEST_FILENAME,
+)
+from dagger.runtime.local import NodeOutput, PartitionedOutput
+from dagger.runtime.local.output import load
+from dagger.serializer import Serializer
+
+
+class LocalFileSystem:
+    """Location scheme that points to paths in the local filesystem (e.g. "/my/filesystem/file.txt" or "file:///my/filesystem/file.txt")."""
+
+    def retrieve(self, path: str, serializer: Serializer) -> Any:
+        """
+        Given a path, retrieve the contents of the file/directory it points to.
+
+        Parameters
+        ----------
+        path
+            A pointer to a path (e.g. "/my/filesystem/file.txt").
+            If the path is a directory of partitions (i.e. all of its entries are named after a number),
+            the runtime will assume the input is partitioned, and concatenate all existing partitions
+            based on the numerical order of their filenames.
+            Other directories are outputs stored as directories by their serializer (see `dagger.serializer.PathSerializer`).
+
+        serializer
+            The serializer implementation to use to deserialize the input file.
+
+
+        Returns
+        -------
+        The original value of the input. If the input is partitioned, it returns an iterable of values.
+
+
+        Raises
+        ------
+        FileNotFoundError
+            If the file cannot be located.
+
+        PermissionError
+            If the current execution context doesn't have enough permissions to read the file.
+        """
+        if _is_partitioned(path):
+            sorted_partition_filenames = sorted(_partition_filenames(path), key=int)
+
+            return [
+                load(os.path.join(path, fname), serializer)
+                for fname in sorted_partition_filenames
+            ]
+
+        else:
+            return load(path, serializer)
+
+    def store(self, path: str, output_value: NodeOutput):
+        """
+        Store a serialized output into the specified path.
+
+        It uses shutil.move(): https://docs.python.org/3/library/shutil.html#shutil.move
+
+        Parameters
+        ----------
+        path
+            A pointer to a path (e.g. "/my/filesystem/file.txt").
+            The path must not exist previously.
+
+        output_value
+            A NodeOutput, pointing to the file that contains the serialized version of the output value.
+            It may be partitioned. If it is, we will treat the path as a directory
+            and dump each partition separately, together with a file named "partitions.json"
+            containing a json-serialized list with all the partitions, and a file named
+            "partition_count" containing the number of partitions.
+            Partitions filenames follow a lexicographical order, so they can be joined later
+            in the same order.
+
+
+        Raises
+        ------
+        OSError
+            If the path is a non-empty directory, in Unix
+
+        FileExistsError
+            If the path already exists, in Windows
+
+        IsADirectoryError
+            If the path exists and it is an empty directory, in Unix.
+
+        PermissionError
+            If the current execution context doesn't have enough permissions to read the file.
+        """
+        if isinstance(output_value, PartitionedOutput):
+            os.mkdir(path)
+            partition_filenames = []
+
+            for i, src in enumerate(output_value):
+                partition_filename = str(i)
+                shutil.move(
+                    src.filename,
+                    os.path.join(
+                        path,
+                        partition_filename,
+                    ),
+                )
+                partition_filenames.append(partition_filename)
+
+            with open(os.path.join(path, PARTITION_MANIFEST_FILENAME), "w") as p:
+                json.dump(partition_filenames, p)
+
+            with open(os.path.join(path, PARTITION_COUNT_FILENAME), "w") as p:
+                p.write(str(len(partition_filenames)))
+        else:
+            shutil.move(output_value.filename, path)
+
+    def __repr__(self) -> str:
+        """Get a human-readable string representation of the location scheme."""
+        return "LocalFileSystem()"
+
+
+def _is_partitioned(path: str) -> bool:
+    """Return true if the path points to a directory that only contains partitions, named after their index."""
+    return os.path.isdir(path) and all(
+        fname.isdigit() for fname in _partition_filenames(path)
+    )
+
+
+def _partition_filenames(path: str) -> List[str]:
+    return [
+        fname
+        for fname in os.listdir(path)
+        if fname not in (PARTITION_MANIFEST_FILENAME, PARTITION_COUNT_FILENAME)
+    ]
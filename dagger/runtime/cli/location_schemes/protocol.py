@@ -0,0 +1,46 @@
+"""Protocol all location schemes should conform to."""
+
+from typing import Any, Protocol, runtime_checkable
+
+from dagger.runtime.local import NodeOutput
+from dagger.serializer import Serializer
+
+PARTITION_MANIFEST_FILENAME = "partitions.json"
+PARTITION_COUNT_FILENAME = "partition_count"
+
+
+@runtime_checkable
+class LocationScheme(Protocol):  # pragma: no cover
+    """
+    Protocol all location schemes should conform to.
+
+    A location scheme knows how to retrieve inputs from, and store outputs into, locations of the form '<scheme>://<path>'. The path received by each method has already been stripped of the '<scheme>://' prefix.
+
+    Partitioned outputs are stored as a "directory" containing one entry per partition, a manifest named "partitions.json" with a json-serialized list of all the partitions, in order, and a file named "partition_count" with the number of partitions.
+    Partitions are named after their index (i.e. "0", "1", ...), so runtimes can refer to them by index (e.g. to fan out over the count without reading the manifest).
+    """
+
+    def retrieve(self, path: str, serializer: Serializer) -> Any:
+        """
+        Retrieve and deserialize the value stored in the path.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the path cannot be located.
+
+        PermissionError
+            If the current execution context doesn't have enough permissions to read the path.
+        """
+        ...
+
+    def store(self, path: str, output_value: NodeOutput):
+        """
+        Store a serialized output into the path.
+
+        Raises
+        ------
+        OSError
+            If the output cannot be stored in the path.
+        """
+        ...
@@ -0,0 +1,326 @@
+"""Retrieve from / store into locations in an S3-compatible object store."""
+
+import json
+import os
+from contextlib import contextmanager
+from typing import Any, List, Optional, Tuple
+
+from dagger.runtime.cli.location_schemes.protocol import (
+    PARTITION_COUNT_FILENAME,
+    PARTITION_MANIFEST_FILENAME,
+)
+from dagger.runtime.local import NodeOutput, PartitionedOutput
+from dagger.runtime.local.output import load
+from dagger.serializer import Serializer
+
+MB = 1024**2
+
+
+class S3:
+    """
+    Location scheme that points to objects in an S3-compatible object store (e.g. "s3://my-bucket/path/to/key").
+
+    This scheme requires the boto3 library to be installed (`pip install boto3`). Credentials and region are resolved by boto3 through its usual mechanisms (environment variables, shared config files, instance profiles...).
+
+    All transfers share a single client with a pool of connections. Objects larger than `multipart_threshold` are downloaded through parallel ranged GETs and uploaded through multipart uploads.
+
+    Partitions of a partitioned output are uploaded in the background as soon as the node produces them, overlapping the transfer of each partition with the computation of the next one.
+
+    Outputs stored as directories by their serializer (see `dagger.serializer.PathSerializer`) are uploaded as one object per file, under the key of the output. Since object stores have no directories, empty directories are kept as empty objects whose key ends with a slash.
+    """
+
+    def __init__(
+        self,
+        endpoint_url: Optional[str] = None,
+        max_concurrency: int = 10,
+        multipart_threshold: int = 8 * MB,
+        multipart_chunksize: int = 8 * MB,
+    ):
+        """
+        Initialize an S3 location scheme.
+
+        Parameters
+        ----------
+        endpoint_url: str, optional
+            URL of the S3-compatible service (e.g. a MinIO deployment). If not specified, we use the value of the environment variable AWS_ENDPOINT_URL or, if that is not set, the default AWS endpoint.
+
+        max_concurrency: int
+            Maximum number of connections in the pool, and maximum number of concurrent requests used to transfer a single object or a set of partitions.
+
+        multipart_threshold: int
+            Size (in bytes) above which objects are transferred in several parts.
+
+        multipart_chunksize: int
+            Size (in bytes) of each of the parts.
+        """
+        self._endpoint_url = endpoint_url
+        self._max_concurrency = max_concurrency
+        self._multipart_threshold = multipart_threshold
+        self._multipart_chunksize = multipart_chunksize
+        self._client = None
+
+    def retrieve(self, path: str, serializer: Serializer) -> Any:
+        """
+        Given a path (without the "s3://" prefix), retrieve the contents of the object it points to.
+
+        If the path contains a partition manifest, the runtime will assume the input is partitioned and retrieve all partitions, in the order specified by the manifest.
+
+        Raises
+        ------
+        ValueError
+            If the path doesn't contain both a bucket and a key.
+
+        FileNotFoundError
+            If the object cannot be located.
+
+        PermissionError
+            If the current execution context doesn't have enough permissions to read the object.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        bucket, key = _bucket_and_key(path)
+        self._s3_client()
+
+        with _translated_errors(path):
+            partitions = self._partition_manifest(bucket, key)
+            if partitions is None:
+                return self._load(bucket, key, serializer)
+
+            with ThreadPoolExecutor(max_workers=self._max_concurrency) as pool:
+                return list(
+                    pool.map(
+                        lambda partition: self._load(
+                            bucket, f"{key}/{partition}", serializer
+                        ),
+                        partitions,
+                    )
+                )
+
+    def store(self, path: str, output_value: NodeOutput):
+        """
+        Store a serialized output into the object the path (without the "s3://" prefix) points to.
+
+        If the output is partitioned, each partition is stored under "<path>/<partition number>", together with a manifest in "<path>/partitions.json" and the number of partitions in "<path>/partition_count".
+
+        Raises
+        ------
+        ValueError
+            If the path doesn't contain both a bucket and a key.
+
+        OSError
+            If the object cannot be stored.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        bucket, key = _bucket_and_key(path)
+        self._s3_client()
+
+        with _translated_errors(path):
+            if isinstance(output_value, PartitionedOutput):
+                partitions: List[str] = []
+
+                with ThreadPoolExecutor(max_workers=self._max_concurrency) as pool:
+                    uploads = []
+                    for i, src in enumerate(output_value):
+                        partition = str(i)
+                        # Nodes dump all partitions of an output into the same file,
+                        # so we need to move each one out of the way before the next
+                        # partition is generated.
+                        staged_filename = f"{src.filename}.{partition}"
+                        os.rename(src.filename, staged_filename)
+                        uploads.append(
+                            pool.submit(
+                                self._upload_and_remove,
+                                staged_filename,
+                                bucket,
+                                f"{key}/{partition}",
+                            )
+                        )
+                        partitions.append(partition)
+
+                    for upload in uploads:
+                        upload.result()
+
+                self._s3_client().put_object(
+                    Bucket=bucket,
+                    Key=f"{key}/{PARTITION_MANIFEST_FILENAME}",
+                    Body=json.dumps(partitions).encode("utf-8"),
+                )
+                self._s3_client().put_object(
+                    Bucket=bucket,
+                    Key=f"{key}/{PARTITION_COUNT_FILENAME}",
+                    Body=str(len(partitions)).encode("utf-8"),
+                )
+            else:
+                self._upload(output_value.filename, bucket, key)
+
+    def _partition_manifest(self, bucket: str, key: str) -> Optional[List[str]]:
+        from botocore.exceptions import ClientError
+
+        try:
+            response = self._s3_client().get_object(
+                Bucket=bucket,
+                Key=f"{key}/{PARTITION_MANIFEST_FILENAME}",
+            )
+        except ClientError as e:
+            if _error_code(e) in NOT_FOUND_ERROR_CODES:
+                return None
+            raise
+
+        with response["Body"] as body:
+            return json.load(body)
+
+    def _load(self, bucket: str, key: str, serializer: Serializer) -> Any:
+        import tempfile
+
+        from botocore.exceptions import ClientError
+
+        with tempfile.TemporaryFile() as f:
+            try:
+                self._s3_client().download_fileobj(
+                    bucket,
+                    key,
+                    f,
+                    Config=self._transfer_config(),
+                )
+            except ClientError as e:
+                if _error_code(e) not in NOT_FOUND_ERROR_CODES:
+                    raise
+                not_found = e
+            else:
+                f.seek(0)
+                return serializer.deserialize(f)
+
+        with tempfile.TemporaryDirectory(prefix="dagger-") as tmp:
+            path = os.path.join(tmp, "value")
+            if not self._download_tree(bucket, key, path):
+                raise not_found
+
+            return load(path, serializer)
+
+    def _upload(self, path: str, bucket: str, key: str):
+        """Upload a file into an object, or the contents of a directory into objects under the key."""
+        if not os.path.isdir(path):
+            self._s3_client().upload_file(
+                path,
+                bucket,
+                key,
+                Config=self._transfer_config(),
+            )
+            return
+
+        for dirpath, dirnames, filenames in os.walk(path):
+            relative_dirpath = os.path.relpath(dirpath, path).replace(os.sep, "/")
+            prefix = key if relative_dirpath == "." else f"{key}/{relative_dirpath}"
+            if not dirnames and not filenames:
+                self._s3_client().put_object(Bucket=bucket, Key=f"{prefix}/", Body=b"")
+
+            for filename in filenames:
+                self._s3_client().upload_file(
+                    os.path.join(dirpath, filename),
+                    bucket,
+                    f"{prefix}/{filename}",
+                    Config=self._transfer_config(),
+                )
+
+    def _download_tree(self, bucket: str, key: str, path: str) -> bool:
+        """Download all objects under the key into a directory, preserving their structure (see `_upload`). Return false if there are none."""
+        found = False
+        paginator = self._s3_client().get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket, Prefix=f"{key}/"):
+            for obj in page.get("Contents", []):
+                found = True
+                name = obj["Key"][len(key) + 1 :]
+                dst = os.path.join(path, *name.split("/"))
+                if name.endswith("/"):
+                    os.makedirs(dst, exist_ok=True)
+                    continue
+
+                os.makedirs(os.path.dirname(dst), exist_ok=True)
+                self._s3_client().download_file(
+                    bucket,
+                    obj["Key"],
+                    dst,
+                    Config=self._transfer_config(),
+                )
+
+        return found
+
+    def _upload_and_remove(self, filename: str, bucket: str, key: str):
+        import shutil
+
+        self._upload(filename, bucket, key)
+        if os.path.isdir(filename):
+            shutil.rmtree(filename)
+        else:
+            os.remove(filename)
+
+    def _s3_client(self):
+        if self._client is None:
+            try:
+                import boto3
+                from botocore.config import Config
+            except ImportError as e:
+                raise ImportError(
+                    "Storing or retrieving values through 's3://' locations requires the boto3 library. You can install it with `pip install boto3`."
+                ) from e
+
+            self._client = boto3.client(
+                "s3",
+                endpoint_url=self._endpoint_url or os.environ.get("AWS_ENDPOINT_URL"),
+                config=Config(max_pool_connections=self._max_concurrency),
+            )
+
+        return self._client
+
+    def _transfer_config(self):
+        from boto3.s3.transfer import TransferConfig
+
+        return TransferConfig(
+            multipart_threshold=self._multipart_threshold,
+            multipart_chunksize=self._multipart_chunksize,
+            max_concurrency=self._max_concurrency,
+            use_threads=True,
+        )
+
+    def __repr__(self) -> str:
+        """Get a human-readable string representation of the location scheme."""
+        return f"S3(endpoint_url={self._endpoint_url}, max_concurrency={self._max_concurrency}, multipart_threshold={self._multipart_threshold}, multipart_chunksize={self._multipart_chunksize})"
+
+
+NOT_FOUND_ERROR_CODES = {"404", "NoSuchKey", "NoSuchBucket"}
+FORBIDDEN_ERROR_CODES = {"403", "AccessDenied"}
+
+
+def _bucket_and_key(path: str) -> Tuple[str, str]:
+    bucket, _, key = path.partition("/")
+    if not bucket or not key:
+        raise ValueError(
+            f"'s3://{path}' is not a valid S3 location. S3 locations must follow the format 's3://<bucket>/<key>'."
+        )
+
+    return bucket, key
+
+
+def _error_code(error) -> str:
+    return str(error.response.get("Error", {}).get("Code", ""))
+
+
+@contextmanager
+def _translated_errors(path: str):
+    """Translate errors raised by boto3 into the OSError family, which is what the CLI runtime expects."""
+    from boto3.exceptions import S3UploadFailedError
+    from botocore.exceptions import BotoCoreError, ClientError
+
+    try:
+        yield
+    except ClientError as e:
+        code = _error_code(e)
+        if code in NOT_FOUND_ERROR_CODES:
+            raise FileNotFoundError(f"'s3://{path}' does not exist: {e}") from e
+        elif code in FORBIDDEN_ERROR_CODES:
+            raise PermissionError(f"Access to 's3://{path}' was denied: {e}") from e
+        else:
+            raise OSError(f"Error accessing 's3://{path}': {e}") from e
+    except (S3UploadFailedError, BotoCoreError) as e:
+        raise OSError(f"Error accessing 's3://{path}': {e}") from e
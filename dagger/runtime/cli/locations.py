@@ -1,18 +1,44 @@
 """
 Retrieve from / store into the specified locations.
 
-At the moment, only locations in the local filesystem are supported.
+Locations may be plain paths in the local filesystem (e.g. "/my/file.json") or URLs of the form '<scheme>://<path>' (e.g. "file:///my/file.json" or "s3://my-bucket/my/file.json"). Each scheme is handled by a LocationScheme registered in this module.
 """
 
-import json
-import os
-import shutil
-from typing import Any
+import re
+from typing import Any, Dict, Tuple
 
-from dagger.runtime.local import NodeOutput, PartitionedOutput
+from dagger.runtime.cli.location_schemes import PARTITION_COUNT_FILENAME  # noqa
+from dagger.runtime.cli.location_schemes import PARTITION_MANIFEST_FILENAME  # noqa
+from dagger.runtime.cli.location_schemes import S3, LocalFileSystem, LocationScheme
+from dagger.runtime.local import NodeOutput
 from dagger.serializer import Serializer
 
-PARTITION_MANIFEST_FILENAME = "partitions.json"
+LOCATION_SCHEME_PREFIX = re.compile(r"^([a-zA-Z][a-zA-Z0-9+.-]*)://")
+
+LOCATION_SCHEMES: Dict[str, LocationScheme] = {
+    "file": LocalFileSystem(),
+    "s3": S3(),
+}
+
+
+def register_location_scheme(scheme: str, location_scheme: LocationScheme):
+    """
+    Register a LocationScheme to handle all locations prefixed by '<scheme>://'.
+
+    Schemes are case-insensitive, so they are registered in lowercase. If the scheme was already registered, the previous implementation is replaced.
+
+
+    Raises
+    ------
+    ValueError
+        If the scheme is not a valid URL scheme (a letter followed by letters, digits, '+', '-' or '.').
+    """
+    if not LOCATION_SCHEME_PREFIX.fullmatch(f"{scheme}://"):
+        raise ValueError(
+            f"'{scheme}' is not a valid location scheme. Schemes must start with a letter, followed by any number of letters, digits, '+', '-' or '.'."
+        )
+
+    LOCATION_SCHEMES[scheme.lower()] = location_scheme
 
 
 def retrieve_input_from_location(
@@ -25,10 +51,10 @@ def retrieve_input_from_location(
     Parameters
     ----------
     input_location
-        A pointer to a path (e.g. "/my/filesystem/file.txt").
-        If the path is a directory, the runtime will assume the input is partitioned,
-        and concatenate all existing partitions based on the lexicographical order
-        of their filenames.
+        A pointer to a path (e.g. "/my/filesystem/file.txt") or to a location
+        in any of the registered schemes (e.g. "s3://my-bucket/file.txt").
+        If the location is partitioned (e.g. a directory), the runtime will concatenate
+        all existing partitions in the same order they were stored.
 
     serializer
         The serializer implementation to use to deserialize the input file.
@@ -41,30 +67,17 @@ def retrieve_input_from_location(
 
     Raises
     ------
+    ValueError
+        If the location uses a scheme that has not been registered.
+
     FileNotFoundError
         If the file cannot be located.
 
     PermissionError
         If the current execution context doesn't have enough permissions to read the file.
     """
-    if os.path.isdir(input_location):
-        partition_filenames = [
-            fname
-            for fname in os.listdir(input_location)
-            if os.path.isfile(os.path.join(input_location, fname))
-            and fname != PARTITION_MANIFEST_FILENAME
-        ]
-        sorted_partition_filenames = sorted(partition_filenames, key=int)
-
-        def load(partition_filename: str) -> Any:
-            with open(os.path.join(input_location, partition_filename), "rb") as reader:
-                return serializer.deserialize(reader)
-
-        return [load(fname) for fname in sorted_partition_filenames]
-
-    else:
-        with open(input_location, "rb") as reader:
-            return serializer.deserialize(reader)
+    location_scheme, path = _location_scheme_and_path(input_location)
+    return location_scheme.retrieve(path, serializer)
 
 
 def store_output_in_location(
@@ -74,25 +87,28 @@ def store_output_in_location(
     """
     Store a serialized output into the specified location.
 
-    It uses shutil.move(): https://docs.python.org/3/library/shutil.html#shutil.move
-
     Parameters
     ----------
     output_location
-        A pointer to a path (e.g. "/my/filesystem/file.txt").
-        The path must not exist previously.
+        A pointer to a path (e.g. "/my/filesystem/file.txt") or to a location
+        in any of the registered schemes (e.g. "s3://my-bucket/file.txt").
+        Paths in the local filesystem must not exist previously.
 
     output_value
         A NodeOutput, pointing to the file that contains the serialized version of the output value.
         It may be partitioned. If it is, we will treat the output_location as a directory
         and dump each partition separately, together with a file named "partitions.json"
-        containing a json-serialized list with all the partitions.
+        containing a json-serialized list with all the partitions, and a file named
+        "partition_count" containing the number of partitions.
         Partitions filenames follow a lexicographical order, so they can be joined later
         in the same order.
 
 
     Raises
     ------
+    ValueError
+        If the location uses a scheme that has not been registered.
+
     OSError
         If the output location is a non-empty directory, in Unix
 
@@ -105,22 +121,38 @@ def store_output_in_location(
     PermissionError
         If the current execution context doesn't have enough permissions to read the file.
     """
-    if isinstance(output_value, PartitionedOutput):
-        os.mkdir(output_location)
-        partition_filenames = []
-
-        for i, src in enumerate(output_value):
-            partition_filename = str(i)
-            shutil.move(
-                src.filename,
-                os.path.join(
-                    output_location,
-                    partition_filename,
-                ),
-            )
-            partition_filenames.append(partition_filename)
-
-        with open(os.path.join(output_location, PARTITION_MANIFEST_FILENAME), "w") as p:
-            json.dump(partition_filenames, p)
-    else:
-        shutil.move(output_value.filename, output_location)
+    location_scheme, path = _location_scheme_and_path(output_location)
+    location_scheme.store(path, output_value)
+
+
+def absolute_location(location: str) -> str:
+    """
+    Return an equivalent location that doesn't depend on the current working directory.
+
+    Plain paths and 'file://' locations are made absolute. Locations in any other scheme are returned as they are.
+    """
+    import os
+
+    match = LOCATION_SCHEME_PREFIX.match(location)
+    if not match:
+        return os.path.abspath(location)
+
+    if match.group(1).lower() == "file":
+        return match.group(0) + os.path.abspath(location[match.end() :])
+
+    return location
+
+
+def _location_scheme_and_path(location: str) -> Tuple[LocationScheme, str]:
+    """Return the LocationScheme that handles a location, and the location stripped of its scheme prefix."""
+    match = LOCATION_SCHEME_PREFIX.match(location)
+    if not match:
+        return LOCATION_SCHEMES["file"], location
+
+    scheme = match.group(1).lower()
+    if scheme not in LOCATION_SCHEMES:
+        raise ValueError(
+            f"Location '{location}' uses the scheme '{scheme}://'. However, there is no location scheme registered with that name. These are the schemes available: {sorted(list(LOCATION_SCHEMES))}"
+        )
+
+    return LOCATION_SCHEMES[scheme], location[match.end() :]
@@ -0,0 +1,303 @@
+"""
+Compile DAGs into snapshots the CLI runtime can load without building or validating the whole DAG again.
+
+A snapshot is a file that contains the structure of a DAG, indexed by the address of each of its nodes (e.g. "outer.inner.task"). Each node is stored separately:
+
+- Tasks reference their functions by import path (module + qualified name) instead of storing their code.
+- DAGs reference their child nodes by address, so every node is stored exactly once.
+
+When the CLI runtime runs a node from a snapshot, it only reads and restores the node it was asked to run (and its children, if the node is a DAG). The rest of the DAG is never built, validated or imported.
+
+Snapshots are versioned. A snapshot can only be loaded by the same version of dagger that compiled it.
+"""
+
+import os
+import pickle
+import struct
+import sys
+from typing import Any, BinaryIO, Dict, List, Mapping, Optional, Tuple
+
+from dagger.dag import DAG, Node
+from dagger.task import Task
+
+SNAPSHOT_VERSION = 1
+
+_HEADER_SIZE = struct.Struct(">Q")
+
+
+def compile_snapshot(dag: DAG, filename: str):
+    """
+    Compile a DAG into a snapshot and store it in the specified file.
+
+    The file is written atomically, so it is safe to compile a snapshot while other processes are reading a previous version of it.
+
+
+    Parameters
+    ----------
+    dag
+        The DAG to compile
+
+    filename
+        The path where the snapshot will be stored
+
+
+    Raises
+    ------
+    ValueError
+        If the function of any of the tasks cannot be imported by its path (e.g. it is a lambda or it was defined inside of another function).
+    """
+    addresses_by_node_id: Dict[int, str] = {}
+    nodes_by_address: Dict[str, Node] = {}
+    for address, node in _nodes_by_address(dag):
+        addresses_by_node_id.setdefault(id(node), address)
+        nodes_by_address[address] = node
+
+    entries = []
+    index: Dict[str, Tuple[int, int]] = {}
+    offset = 0
+    for address, node in nodes_by_address.items():
+        entry = _dumps_node(node, addresses_by_node_id)
+        index[address] = (offset, len(entry))
+        entries.append(entry)
+        offset += len(entry)
+
+    from dagger import __version__
+
+    header = pickle.dumps(
+        {
+            "snapshot_version": SNAPSHOT_VERSION,
+            "dagger_version": __version__,
+            "index": index,
+        }
+    )
+
+    tmp_filename = f"{filename}.{os.getpid()}.tmp"
+    with open(tmp_filename, "wb") as f:
+        f.write(_HEADER_SIZE.pack(len(header)))
+        f.write(header)
+        for entry in entries:
+            f.write(entry)
+
+    os.replace(tmp_filename, filename)
+
+
+def load_snapshot(filename: str) -> "DAGSnapshot":
+    """
+    Load a snapshot compiled with `compile_snapshot`.
+
+    Only the index of the snapshot is read. Nodes are restored on demand.
+
+
+    Raises
+    ------
+    ValueError
+        If the snapshot was compiled by a different version of dagger.
+
+    OSError
+        If the file cannot be read.
+    """
+    from dagger import __version__
+
+    with open(filename, "rb") as f:
+        (header_size,) = _HEADER_SIZE.unpack(f.read(_HEADER_SIZE.size))
+        header = pickle.loads(f.read(header_size))
+
+    if (
+        header.get("snapshot_version") != SNAPSHOT_VERSION
+        or header.get("dagger_version") != __version__
+    ):
+        raise ValueError(
+            f"The snapshot in '{filename}' was compiled with version {header.get('dagger_version')} of dagger (snapshot format v{header.get('snapshot_version')}). However, the current version of dagger is {__version__} (snapshot format v{SNAPSHOT_VERSION}). Please compile the snapshot again."
+        )
+
+    return DAGSnapshot(
+        filename=filename,
+        index=header["index"],
+        entries_offset=_HEADER_SIZE.size + header_size,
+    )
+
+
+class DAGSnapshot:
+    """A DAG compiled into a snapshot, whose nodes can be restored individually."""
+
+    def __init__(
+        self,
+        filename: str,
+        index: Mapping[str, Tuple[int, int]],
+        entries_offset: int,
+    ):
+        self._filename = filename
+        self._index = index
+        self._entries_offset = entries_offset
+
+    def find_node(self, address: List[str]) -> Node:
+        """
+        Restore the node in the specified address.
+
+        Parameters
+        ----------
+        address
+            Address of a nested node. (e.g. ['three', 'nested', 'levels']).
+            An empty address references the root DAG.
+
+
+        Raises
+        ------
+        ValueError
+            If the snapshot doesn't contain a node in that address.
+
+        ImportError
+            If the function of a task in the node cannot be imported.
+        """
+        key = ".".join(address)
+        if key not in self._index:
+            raise ValueError(self._missing_node_error_message(address))
+
+        with open(self._filename, "rb") as f:
+            return self._load_node(f, key)
+
+    def _load_node(self, f: BinaryIO, address: str) -> Node:
+        import io
+
+        offset, size = self._index[address]
+        f.seek(self._entries_offset + offset)
+        entry = io.BytesIO(f.read(size))
+        return _NodeUnpickler(entry, lambda child: self._load_node(f, child)).load()
+
+    def _missing_node_error_message(self, address: List[str]) -> str:
+        parent_address = ".".join(address[:-1])
+        for i in range(1, len(address)):
+            ancestor = ".".join(address[:i])
+            if ancestor not in self._index:
+                return self._missing_node_error_message(address[:i])
+
+            if not self._index_is_dag(ancestor):
+                return f"Node '{ancestor}' does not contain any other nodes. However, you are trying to access a subnode '{'.'.join(address[i:])}'."
+
+        prefix = f"{parent_address}." if parent_address else ""
+        sibling_names = sorted(
+            key[len(prefix) :]
+            for key in self._index
+            if key.startswith(prefix) and key and "." not in key[len(prefix) :]
+        )
+        human_readable_dag_address = (
+            f"DAG '{parent_address}'" if parent_address else "this DAG"
+        )
+        return f"You selected node '{'.'.join(address)}'. However, {human_readable_dag_address} does not contain any node with such a name. These are the names the DAG contains: {sibling_names}"
+
+    def _index_is_dag(self, address: str) -> bool:
+        return any(key.startswith(f"{address}.") for key in self._index)
+
+    def __repr__(self) -> str:
+        """Get a human-readable string representation of the snapshot."""
+        return f"DAGSnapshot(filename={self._filename}, nodes={len(self._index)})"
+
+
+def _nodes_by_address(node: Node, address: Optional[List[str]] = None):
+    address = address or []
+    yield ".".join(address), node
+
+    if isinstance(node, DAG):
+        for node_name, child in node.nodes.items():
+            yield from _nodes_by_address(child, address + [node_name])
+
+
+def _dumps_node(node: Node, addresses_by_node_id: Mapping[int, str]) -> bytes:
+    import io
+
+    buffer = io.BytesIO()
+    _NodePickler(buffer, root=node, addresses_by_node_id=addresses_by_node_id).dump(
+        node
+    )
+    return buffer.getvalue()
+
+
+class _NodePickler(pickle.Pickler):
+    """Pickle a node, referencing its child nodes by address and its function by import path."""
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        root: Node,
+        addresses_by_node_id: Mapping[int, str],
+    ):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._root = root
+        self._addresses_by_node_id = addresses_by_node_id
+
+    def persistent_id(self, obj: Any) -> Optional[Tuple[str, ...]]:
+        if isinstance(obj, (Task, DAG)) and obj is not self._root:
+            return ("node", self._addresses_by_node_id[id(obj)])
+
+        if isinstance(self._root, Task) and obj is self._root.func:
+            return ("function", *_import_path(obj))
+
+        return None
+
+
+class _NodeUnpickler(pickle.Unpickler):
+    """Restore a node pickled by _NodePickler, resolving references to other nodes and functions."""
+
+    def __init__(self, file: BinaryIO, load_node):
+        super().__init__(file)
+        self._load_node = load_node
+
+    def persistent_load(self, pid: Tuple[str, ...]) -> Any:
+        kind, *reference = pid
+        if kind == "node":
+            return self._load_node(reference[0])
+        elif kind == "function":
+            return _import_function(*reference)
+
+        raise pickle.UnpicklingError(f"Unsupported reference in snapshot: {pid}")
+
+
+def _import_path(func: Any) -> Tuple[str, str]:
+    """Return the import path of a function, verifying it can be imported."""
+    module_name = getattr(func, "__module__", None)
+    qualname = getattr(func, "__qualname__", None)
+
+    if module_name == "__main__":
+        raise ValueError(
+            f"Function {func} is defined in the '__main__' module (the script that is being run). Snapshots reference functions by their import path, and '__main__' will be a different module when the snapshot is loaded. Please move the function to a module that can be imported and import it from your script."
+        )
+
+    if module_name and qualname and "<" not in qualname:
+        try:
+            if _import_function(module_name, qualname) is func:
+                return module_name, qualname
+        except ImportError:
+            pass
+
+    raise ValueError(
+        f"Function {func} cannot be referenced by its import path. Snapshots can only contain tasks whose functions are defined at the top level of a module (e.g. they cannot be lambdas or be defined inside other functions)."
+    )
+
+
+def _import_function(module_name: str, qualname: str) -> Any:
+    """
+    Import a function referenced by a snapshot.
+
+    Raises
+    ------
+    ImportError
+        If the module cannot be imported or doesn't contain the function (e.g. because the code changed since the snapshot was compiled).
+    """
+    import importlib
+
+    try:
+        obj: Any = importlib.import_module(module_name)
+        for attribute in qualname.split("."):
+            obj = getattr(obj, attribute)
+    except (ImportError, AttributeError) as e:
+        raise ImportError(
+            f"Function '{qualname}' could not be imported from module '{module_name}' ({e}). Please make sure the snapshot is loaded with the same code and Python path it was compiled with, or compile the snapshot again."
+        ) from e
+
+    # Functions decorated with the DSL are replaced by a recorder in their module.
+    # If the DSL hasn't been imported, the object cannot be a recorder.
+    recorder_module = sys.modules.get("dagger.dsl.node_invocation_recorder")
+    if recorder_module and isinstance(obj, recorder_module.NodeInvocationRecorder):
+        return obj.func
+
+    return obj
@@ -0,0 +1,219 @@
+"""
+Serve invocations of a DAG (or a node therein) from a long-lived worker process.
+
+Starting a new Python process for every node means importing dagger and building the DAG every time. A worker server imports and builds the DAG once, and then forks a child process to handle each request. Requests are equivalent to the arguments of `invoke_with_locations` and are sent over a UNIX socket.
+
+The protocol is a single line of JSON per request and per response:
+
+- Request: {"node_address": [...], "input_locations": {...}, "output_locations": {...}, "output_digest_locations": {...}, "output_max_sizes": {...}}
+- Response: {"status": "ok"} or {"status": "error", "error_type": "...", "message": "..."}
+"""
+
+import json
+import logging
+import os
+import socket
+from typing import List, Mapping, Union
+
+from dagger.dag import DAG
+from dagger.runtime.cli.invoke_with_locations import invoke_with_locations
+from dagger.runtime.cli.locations import absolute_location
+from dagger.runtime.cli.snapshot import DAGSnapshot
+from dagger.serializer import DeserializationError, SerializationError
+
+#: Errors that are raised by the client with the same type they had in the worker
+KNOWN_ERRORS = {
+    error.__name__: error
+    for error in [
+        ValueError,
+        TypeError,
+        OSError,
+        FileNotFoundError,
+        PermissionError,
+        SerializationError,
+        DeserializationError,
+    ]
+}
+
+
+def serve(
+    dag: Union[DAG, DAGSnapshot],
+    socket_path: str,
+):
+    """
+    Listen to requests on a UNIX socket and invoke the DAG (or a node therein) in a forked process for each of them.
+
+    This function blocks until the process is interrupted.
+
+
+    Parameters
+    ----------
+    dag
+        DAG to serve.
+
+    socket_path
+        The path to the UNIX socket to listen to. If there is already a socket on that path (e.g. from a previous server that was killed), it is replaced.
+
+
+    Raises
+    ------
+    NotImplementedError
+        If the current platform doesn't support forking processes.
+
+    OSError
+        If the socket cannot be created.
+    """
+    if not hasattr(os, "fork"):
+        raise NotImplementedError(
+            "The worker server needs to fork a new process for every request. However, the current platform does not support os.fork()."
+        )
+
+    _remove_stale_socket(socket_path)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(socket_path)
+        server.listen()
+        logging.info(f"Worker listening on '{socket_path}'")
+
+        try:
+            while True:
+                connection, _ = server.accept()
+                _reap_finished_children()
+
+                if os.fork() == 0:
+                    # The child must never return into the server's code (e.g. the
+                    # `finally` below, which would remove the server's socket)
+                    exit_code = 1
+                    try:
+                        server.close()
+                        exit_code = _handle_request(dag, connection)
+                    finally:
+                        os._exit(exit_code)
+
+                connection.close()
+        finally:
+            os.unlink(socket_path)
+
+
+def send_request(
+    socket_path: str,
+    node_address: List[str] = None,
+    input_locations: Mapping[str, str] = None,
+    output_locations: Mapping[str, str] = None,
+    output_digest_locations: Mapping[str, str] = None,
+    output_max_sizes: Mapping[str, int] = None,
+):
+    """
+    Ask a worker server to invoke a node, and wait until the invocation finishes.
+
+    The worker may run in a different working directory, so relative paths are resolved against the working directory of the caller before sending them.
+
+    Parameters
+    ----------
+    socket_path
+        The UNIX socket the worker is listening to.
+
+    node_address
+        The address of the nested node. Each item in the list represents a level of nesting.
+        Empty references the DAG served by the worker.
+
+    input_locations
+        A mapping of input names to input locations
+
+    output_locations
+        A mapping of output names to output locations
+
+    output_digest_locations
+        A mapping of output names to paths where the digests of the outputs should be stored
+
+    output_max_sizes
+        A mapping of output names to the maximum number of bytes they may take once serialized
+
+
+    Raises
+    ------
+    Any of the errors raised by `invoke_with_locations`, with the same type and message they had in the worker. Unknown errors are raised as a RuntimeError.
+    """
+    request = {
+        "node_address": node_address or [],
+        "input_locations": {
+            input_name: absolute_location(input_location)
+            for input_name, input_location in (input_locations or {}).items()
+        },
+        "output_locations": {
+            output_name: absolute_location(output_location)
+            for output_name, output_location in (output_locations or {}).items()
+        },
+        "output_digest_locations": {
+            output_name: os.path.abspath(digest_location)
+            for output_name, digest_location in (output_digest_locations or {}).items()
+        },
+        "output_max_sizes": dict(output_max_sizes or {}),
+    }
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        client.shutdown(socket.SHUT_WR)
+
+        with client.makefile("rb") as reader:
+            line = reader.readline()
+
+    if not line:
+        raise RuntimeError(
+            f"The worker listening on '{socket_path}' closed the connection without sending a response."
+        )
+
+    response = json.loads(line)
+    if response["status"] != "ok":
+        error = KNOWN_ERRORS.get(response["error_type"], RuntimeError)
+        raise error(response["message"])
+
+
+def _handle_request(dag: Union[DAG, DAGSnapshot], connection: socket.socket) -> int:
+    """Handle a request in a forked process and return the exit code for the process."""
+    with connection:
+        try:
+            with connection.makefile("rb") as reader:
+                request = json.loads(reader.readline())
+
+            invoke_with_locations(
+                dag,
+                node_address=request["node_address"],
+                input_locations=request["input_locations"],
+                output_locations=request["output_locations"],
+                output_digest_locations=request.get("output_digest_locations", {}),
+                output_max_sizes=request.get("output_max_sizes", {}),
+            )
+            response = {"status": "ok"}
+        except BaseException as e:
+            # Tasks may also raise SystemExit or KeyboardInterrupt, which still need to be reported to the client
+            logging.exception("Error handling request")
+            response = {
+                "status": "error",
+                "error_type": type(e).__name__,
+                "message": str(e),
+            }
+
+        connection.sendall(json.dumps(response).encode("utf-8") + b"\n")
+
+    return 0 if response["status"] == "ok" else 1
+
+
+def _reap_finished_children():
+    """Collect the exit status of finished children so they don't linger as zombie processes."""
+    try:
+        while os.waitpid(-1, os.WNOHANG)[0] != 0:
+            pass
+    except ChildProcessError:
+        pass
+
+
+def _remove_stale_socket(socket_path: str):
+    import stat
+
+    try:
+        if stat.S_ISSOCK(os.stat(socket_path).st_mode):
+            os.unlink(socket_path)
+    except FileNotFoundError:
+        pass
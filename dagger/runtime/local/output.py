@@ -1,12 +1,18 @@
 """Store node outputs in the local filesystem and load them back."""
+
+import os
+import shutil
 from typing import Any, Mapping
 
 from dagger.runtime.local.types import NodeOutputs, OutputFile, PartitionedOutput
-from dagger.serializer import Serializer
+from dagger.serializer import PathSerializer, Serializer
 
 
 def load(filename: str, serializer: Serializer) -> Any:
-    """Load a value from the file system."""
+    """Load a value from the file system, using the path-based methods of the serializer if it supports them."""
+    if isinstance(serializer, PathSerializer):
+        return serializer.deserialize_from_path(filename)
+
     with open(filename, "rb") as reader:
         return serializer.deserialize(reader)
 
@@ -16,7 +22,19 @@ def dump(
     value: Any,
     serializer: Serializer,
 ) -> OutputFile:
-    """Dump a value into a file in the specified path and return the filename."""
+    """Dump a value into a file in the specified path and return the filename, using the path-based methods of the serializer if it supports them."""
+    if isinstance(serializer, PathSerializer):
+        # Partitions are dumped into the same filename one after the other.
+        # Previous partitions may still be referenced by the values loaded
+        # from them (e.g. through a hard link), so we never write over them.
+        if os.path.isdir(filename) and not os.path.islink(filename):
+            shutil.rmtree(filename)
+        elif os.path.lexists(filename):
+            os.remove(filename)
+
+        serializer.serialize_to_path(value, filename)
+        return OutputFile(filename=filename, serializer=serializer)
+
     with open(filename, "wb") as writer:
         serializer.serialize(value, writer)
 
@@ -29,14 +47,12 @@ def deserialized_outputs(node_outputs: NodeOutputs) -> Mapping[str, Any]:
 
     for name, node_output in node_outputs.items():
         if isinstance(node_output, PartitionedOutput):
-            partition_values = []
-            for partition in node_output:
-                with open(partition.filename, "rb") as reader:
-                    partition_values.append(partition.serializer.deserialize(reader))
-            results[name] = partition_values
+            results[name] = [
+                load(partition.filename, partition.serializer)
+                for partition in node_output
+            ]
 
         else:
-            with open(node_output.filename, "rb") as reader:
-                results[name] = node_output.serializer.deserialize(reader)
+            results[name] = load(node_output.filename, node_output.serializer)
 
     return results
@@ -1,9 +1,16 @@
 """Serialization strategies to pass inputs/outputs safely between tasks in a distributed environment."""
 
+from dagger.serializer.as_auto import AsAuto  # noqa
+from dagger.serializer.as_bytes import AsBytes  # noqa
+from dagger.serializer.as_directory import AsDirectory  # noqa
+from dagger.serializer.as_file import AsFile  # noqa
 from dagger.serializer.as_json import AsJSON  # noqa
 from dagger.serializer.as_json import JSONSerializableType  # noqa
+from dagger.serializer.as_json_lines import AsJSONLines  # noqa
+from dagger.serializer.as_numpy import AsNumpy  # noqa
 from dagger.serializer.as_pickle import AsPickle  # noqa
+from dagger.serializer.compressed import Compressed  # noqa
 from dagger.serializer.errors import DeserializationError, SerializationError  # noqa
-from dagger.serializer.protocol import Serializer  # noqa
+from dagger.serializer.protocol import PathSerializer, Serializer  # noqa
 
 DefaultSerializer = AsJSON()
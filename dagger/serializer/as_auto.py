@@ -0,0 +1,155 @@
+"""Serialization strategy that picks the encoding of each value based on its type."""
+
+import sys
+from typing import Any, BinaryIO, Mapping, Optional
+
+from dagger.serializer.as_bytes import AsBytes
+from dagger.serializer.as_json import AsJSON
+from dagger.serializer.as_numpy import AsNumpy
+from dagger.serializer.as_pickle import AsPickle
+from dagger.serializer.errors import DeserializationError
+from dagger.serializer.protocol import Serializer
+
+# Values are stored with a header identifying the serializer used to encode them:
+#
+#   HEADER_PREFIX | tag | \n | value encoded by the serializer
+#
+HEADER_PREFIX = b"DGRAUTO:"
+MAX_HEADER_SIZE = 64
+
+
+class AsAuto:
+    """
+    Serializer implementation that chooses how to encode each value based on its type.
+
+    - bytes and memoryviews are stored verbatim (with AsBytes by default).
+    - NumPy arrays are stored in the .npy format (with AsNumpy by default), unless they contain Python objects.
+    - Values made exclusively of JSON types (dicts with string keys, lists, strings, finite floats, integers, booleans and None) are stored as JSON (with AsJSON by default).
+    - Any other value is pickled (with AsPickle by default).
+
+    Every value is preceded by a short header identifying the serializer used to encode it, so it can be deserialized without knowing its type in advance.
+    """
+
+    extension = "auto"
+
+    def __init__(
+        self,
+        json: Optional[Serializer] = None,
+        bytes: Optional[Serializer] = None,
+        numpy: Optional[Serializer] = None,
+        pickle: Optional[Serializer] = None,
+    ):
+        """
+        Initialize an automatic serializer.
+
+        Parameters
+        ----------
+        json: Serializer, optional
+            The serializer to use for JSON values. AsJSON() by default.
+
+        bytes: Serializer, optional
+            The serializer to use for bytes and memoryviews. AsBytes() by default.
+
+        numpy: Serializer, optional
+            The serializer to use for NumPy arrays. AsNumpy() by default.
+
+        pickle: Serializer, optional
+            The serializer to use for any other value. AsPickle() by default.
+        """
+        self._serializers: Mapping[str, Serializer] = {
+            "json": AsJSON() if json is None else json,
+            "bytes": AsBytes() if bytes is None else bytes,
+            "numpy": AsNumpy() if numpy is None else numpy,
+            "pickle": AsPickle() if pickle is None else pickle,
+        }
+
+    def serialize(self, value: Any, writer: BinaryIO):
+        """Serialize a value with the serializer that corresponds to its type, preceded by a header identifying that serializer."""
+        tag = _tag(value)
+        writer.write(HEADER_PREFIX + tag.encode("ascii") + b"\n")
+        self._serializers[tag].serialize(value, writer)
+
+    def deserialize(self, reader: BinaryIO) -> Any:
+        """Read the header of the value and deserialize the rest of the stream with the serializer it identifies."""
+        header = reader.readline(MAX_HEADER_SIZE)
+        if not header.startswith(HEADER_PREFIX) or not header.endswith(b"\n"):
+            raise DeserializationError(
+                "The value does not start with the header written by AsAuto. Make sure it was serialized with AsAuto."
+            )
+
+        tag = header[len(HEADER_PREFIX) : -1].decode("ascii", errors="replace")
+        if tag not in self._serializers:
+            raise DeserializationError(
+                f"The value was serialized with an unknown tag '{tag}'. These are the tags supported: {list(self._serializers)}"
+            )
+
+        return self._serializers[tag].deserialize(reader)
+
+    def __repr__(self) -> str:
+        """Get a human-readable string representation of the serializer."""
+        arguments = ", ".join(
+            f"{tag}={repr(serializer)}" for tag, serializer in self._serializers.items()
+        )
+        return f"AsAuto({arguments})"
+
+    def __eq__(self, obj) -> bool:
+        """Return true if both serializers are equivalent."""
+        return isinstance(obj, AsAuto) and self._serializers == obj._serializers
+
+
+def _tag(value: Any) -> str:
+    """Return the tag of the serializer to use for a value."""
+    if type(value) in (bytes, memoryview):
+        return "bytes"
+
+    # Values can only be arrays if numpy has already been imported
+    np = sys.modules.get("numpy")
+    if (
+        np is not None
+        and type(value) in (np.ndarray, np.memmap)
+        and not value.dtype.hasobject
+    ):
+        return "numpy"
+
+    if _is_json(value):
+        return "json"
+
+    return "pickle"
+
+
+def _is_json(value: Any) -> bool:
+    """
+    Return true if the value is only made of types that JSON can represent and restore faithfully.
+
+    Subclasses of those types (e.g. named tuples or enums) would lose their type, and containers referenced more than once would lose their identity, so they are not considered JSON values.
+    """
+    import math
+
+    pending = [value]
+    seen = set()
+    while pending:
+        item = pending.pop()
+        item_type = type(item)
+
+        if item is None or item_type in (bool, int, str):
+            continue
+        elif item_type is float:
+            if not math.isfinite(item):
+                return False
+        elif item_type is list:
+            if id(item) in seen:
+                return False
+            seen.add(id(item))
+            pending.extend(item)
+        elif item_type is dict:
+            if id(item) in seen:
+                return False
+            seen.add(id(item))
+            for key, child in item.items():
+                if type(key) is not str:
+                    return False
+                pending.append(child)
+        else:
+            return False
+
+    return True
@@ -0,0 +1,61 @@
+"""Serialization strategy for binary values, stored verbatim."""
+
+from typing import Any, BinaryIO, Union
+
+from dagger.serializer.errors import SerializationError
+from dagger.serializer.memory_map import memory_map
+
+
+class AsBytes:
+    """
+    Serializer implementation that stores binary values (bytes, bytearrays and memoryviews) as they are, without any framing or encoding.
+
+    This is the cheapest way to pass values that are already binary (e.g. images, protobuf messages or compressed archives) between tasks.
+    """
+
+    extension = "bin"
+
+    def __init__(self, memory_map: bool = False):
+        """
+        Initialize a binary serializer.
+
+        Parameters
+        ----------
+        memory_map: bool
+            Whether to deserialize values as read-only memoryviews instead of bytes.
+            When the reader is backed by a file, the memoryview is backed by a memory map of that file, so its contents are not read into memory until they are accessed.
+            Streams that are not backed by a file (e.g. io.BytesIO) are always read into memory.
+        """
+        self._memory_map = memory_map
+
+    def serialize(self, value: Any, writer: BinaryIO):
+        """Write the contents of a bytes, bytearray or memoryview value into the writer, without copying them."""
+        if not isinstance(value, (bytes, bytearray, memoryview)):
+            raise SerializationError(
+                f"AsBytes can only serialize bytes, bytearray or memoryview values. However, the value was of type '{type(value).__name__}'."
+            )
+
+        data = memoryview(value)
+        if not data.c_contiguous:
+            data = memoryview(data.tobytes())
+
+        writer.write(data)
+
+    def deserialize(self, reader: BinaryIO) -> Union[bytes, memoryview]:
+        """Read the rest of the stream as bytes, or as a read-only memoryview if the serializer memory-maps values."""
+        if not self._memory_map:
+            return reader.read()
+
+        mapped_file = memory_map(reader)
+        if mapped_file is None:
+            return memoryview(reader.read()).toreadonly()
+
+        return mapped_file[reader.tell() :]
+
+    def __repr__(self) -> str:
+        """Get a human-readable string representation of the serializer."""
+        return f"AsBytes(memory_map={self._memory_map})"
+
+    def __eq__(self, obj) -> bool:
+        """Return true if both serializers are equivalent."""
+        return isinstance(obj, AsBytes) and self._memory_map == obj._memory_map
@@ -0,0 +1,134 @@
+"""Serialization strategy for directories in the local filesystem."""
+
+import os
+from typing import Any, BinaryIO, Iterable, Optional, Tuple
+
+from dagger.serializer.checksummed_tar import (
+    DATA_DIRNAME,
+    extract_checksummed_tar,
+    write_checksummed_tar,
+)
+from dagger.serializer.errors import DeserializationError, SerializationError
+from dagger.serializer.hard_links import link_entries
+
+
+class AsDirectory:
+    """
+    Serializer implementation for values that are paths to directories in the local filesystem.
+
+    The directory is streamed into an uncompressed tar archive, together with the SHA-256 checksum of each of its files. When deserialized, the contents are extracted into a new directory, the checksums are verified, and the path to the new directory is returned.
+
+    This is useful to pass datasets made of many files (e.g. a directory of Parquet partitions written by Dask or Spark) between tasks without loading them into memory.
+
+    When values are stored in, or retrieved from, the local filesystem, the directory is not archived. Instead, its files are handed over through hard links (or copied, if they cannot be linked) into a 'data' directory under the path of the stored value.
+
+    Symbolic links are followed, so the files and directories they point to are serialized as if they were part of the directory.
+    """
+
+    extension = "tar"
+
+    def __init__(self, output_dir: Optional[str] = None):
+        """
+        Initialize a directory serializer.
+
+        Parameters
+        ----------
+        output_dir: str, optional
+            Directory where deserialized directories will be created.
+            By default, they are created in the temporary directory of the system. Dagger will not remove them.
+        """
+        self._output_dir = output_dir
+
+    def serialize(self, value: Any, writer: BinaryIO):
+        """Serialize the directory the value points to (and everything it contains), recording the checksum of each file."""
+        write_checksummed_tar(_entries(_directory_path(value)), writer)
+
+    def deserialize(self, reader: BinaryIO) -> str:
+        """Extract the serialized directory into a new directory, verify its checksums, and return its path."""
+        import tempfile
+
+        output_dir = tempfile.mkdtemp(prefix="dagger-", dir=self._output_dir)
+        extract_checksummed_tar(reader, output_dir)
+        return output_dir
+
+    def serialize_to_path(self, value: Any, path: str):
+        """Link every file in the directory the value points to into the 'data' directory of the specified path, preserving its structure."""
+        src = _directory_path(value)
+        try:
+            link_entries(_entries(src), os.path.join(path, DATA_DIRNAME))
+        except (OSError, ValueError) as e:
+            raise SerializationError(e)
+
+    def deserialize_from_path(self, path: str) -> str:
+        """
+        Link every file stored in the specified path into a new directory, and return its path.
+
+        If the path points to a file, it is read as an archive written by `serialize`.
+        """
+        import tempfile
+
+        if os.path.isfile(path):
+            with open(path, "rb") as reader:
+                return self.deserialize(reader)
+
+        data_dir = os.path.join(path, DATA_DIRNAME)
+        if not os.path.isdir(data_dir):
+            raise DeserializationError(
+                f"AsDirectory expected '{path}' to contain a '{DATA_DIRNAME}' directory. However, it doesn't."
+            )
+
+        output_dir = tempfile.mkdtemp(prefix="dagger-", dir=self._output_dir)
+        try:
+            link_entries(_entries(data_dir), output_dir)
+        except (OSError, ValueError) as e:
+            raise DeserializationError(e)
+
+        return output_dir
+
+    def __repr__(self) -> str:
+        """Get a human-readable string representation of the serializer."""
+        return f"AsDirectory(output_dir={self._output_dir})"
+
+    def __eq__(self, obj) -> bool:
+        """Return true if both serializers are equivalent."""
+        return isinstance(obj, AsDirectory) and self._output_dir == obj._output_dir
+
+
+def _directory_path(value: Any) -> str:
+    try:
+        path = os.fspath(value)
+    except TypeError as e:
+        raise SerializationError(e)
+
+    if not os.path.isdir(path):
+        raise SerializationError(
+            f"AsDirectory can only serialize paths to directories. However, '{path}' is not a directory."
+        )
+
+    return path
+
+
+def _entries(root: str) -> Iterable[Tuple[str, str]]:
+    """
+    Return all paths in the directory, together with their names relative to the root, in a deterministic order.
+
+    Symbolic links to directories are followed, unless they point to the directory that contains them or to one of its parents, since the directory would contain itself.
+    """
+    for dirpath, dirnames, filenames in os.walk(root, followlinks=True):
+        dirnames.sort()
+        realpath = os.path.realpath(dirpath)
+        for dirname in dirnames:
+            target = os.path.realpath(os.path.join(dirpath, dirname))
+            if os.path.commonpath([realpath, target]) == target:
+                raise SerializationError(
+                    f"Directory '{os.path.join(dirpath, dirname)}' is a symbolic link to '{target}', which contains it. AsDirectory cannot serialize directories that contain themselves."
+                )
+
+        relative_dirpath = os.path.relpath(dirpath, root)
+        for name in dirnames + sorted(filenames):
+            relative_path = (
+                name
+                if relative_dirpath == "."
+                else os.path.join(relative_dirpath, name)
+            )
+            yield os.path.join(dirpath, name), relative_path.replace(os.sep, "/")
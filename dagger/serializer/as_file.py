@@ -0,0 +1,115 @@
+"""Serialization strategy for files in the local filesystem."""
+
+import os
+from typing import Any, BinaryIO, Optional
+
+from dagger.serializer.checksummed_tar import (
+    DATA_DIRNAME,
+    extract_checksummed_tar,
+    write_checksummed_tar,
+)
+from dagger.serializer.errors import DeserializationError, SerializationError
+from dagger.serializer.hard_links import link_entries
+
+
+class AsFile:
+    """
+    Serializer implementation for values that are paths to files in the local filesystem.
+
+    The contents of the file are streamed into an uncompressed tar archive, together with their SHA-256 checksum. When deserialized, the file is extracted into a new directory, the checksum is verified, and the path to the new file is returned.
+
+    Files are never loaded into memory, so files of any size can be passed between tasks.
+
+    When values are stored in, or retrieved from, the local filesystem, the file is not archived. Instead, it is handed over through a hard link (or copied, if it cannot be linked) into a 'data' directory under the path of the stored value.
+    """
+
+    extension = "tar"
+
+    def __init__(self, output_dir: Optional[str] = None):
+        """
+        Initialize a file serializer.
+
+        Parameters
+        ----------
+        output_dir: str, optional
+            Directory where deserialized files will be stored. Each file is extracted into a new subdirectory, so files with the same name never overwrite each other.
+            By default, they are stored in the temporary directory of the system. Dagger will not remove them.
+        """
+        self._output_dir = output_dir
+
+    def serialize(self, value: Any, writer: BinaryIO):
+        """Serialize the file the value points to, recording its checksum."""
+        path = _file_path(value)
+        write_checksummed_tar([(path, os.path.basename(path))], writer)
+
+    def deserialize(self, reader: BinaryIO) -> str:
+        """Extract the serialized file into a new directory, verify its checksum, and return its path."""
+        import tempfile
+
+        output_dir = tempfile.mkdtemp(prefix="dagger-", dir=self._output_dir)
+        names = extract_checksummed_tar(reader, output_dir)
+        if len(names) != 1 or not os.path.isfile(os.path.join(output_dir, names[0])):
+            raise DeserializationError(
+                f"AsFile expected the archive to contain a single file. However, it contains: {names}"
+            )
+
+        return os.path.join(output_dir, names[0])
+
+    def serialize_to_path(self, value: Any, path: str):
+        """Link the file the value points to into the 'data' directory of the specified path."""
+        src = _file_path(value)
+        try:
+            link_entries(
+                [(src, os.path.basename(src))], os.path.join(path, DATA_DIRNAME)
+            )
+        except (OSError, ValueError) as e:
+            raise SerializationError(e)
+
+    def deserialize_from_path(self, path: str) -> str:
+        """
+        Link the file stored in the specified path into a new directory, and return its path.
+
+        If the path points to a file, it is read as an archive written by `serialize`.
+        """
+        import tempfile
+
+        if os.path.isfile(path):
+            with open(path, "rb") as reader:
+                return self.deserialize(reader)
+
+        data_dir = os.path.join(path, DATA_DIRNAME)
+        names = sorted(os.listdir(data_dir)) if os.path.isdir(data_dir) else []
+        if len(names) != 1 or not os.path.isfile(os.path.join(data_dir, names[0])):
+            raise DeserializationError(
+                f"AsFile expected '{data_dir}' to contain a single file. However, it contains: {names}"
+            )
+
+        output_dir = tempfile.mkdtemp(prefix="dagger-", dir=self._output_dir)
+        try:
+            link_entries([(os.path.join(data_dir, names[0]), names[0])], output_dir)
+        except OSError as e:
+            raise DeserializationError(e)
+
+        return os.path.join(output_dir, names[0])
+
+    def __repr__(self) -> str:
+        """Get a human-readable string representation of the serializer."""
+        return f"AsFile(output_dir={self._output_dir})"
+
+    def __eq__(self, obj) -> bool:
+        """Return true if both serializers are equivalent."""
+        return isinstance(obj, AsFile) and self._output_dir == obj._output_dir
+
+
+def _file_path(value: Any) -> str:
+    try:
+        path = os.fspath(value)
+    except TypeError as e:
+        raise SerializationError(e)
+
+    if not os.path.isfile(path):
+        raise SerializationError(
+            f"AsFile can only serialize paths to regular files. However, '{path}' is not a regular file."
+        )
+
+    return path
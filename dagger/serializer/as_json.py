@@ -19,6 +19,10 @@ JSONSerializableType = Union[  # type: ignore
 ]
 
 
+#: Backends AsJSON can use to encode and decode values
+JSON_BACKENDS = ("json", "orjson", "auto")
+
+
 class AsJSON:
     """Serializer implementation that uses JSON to marshal/unmarshal Python data structures."""
 
@@ -28,6 +32,7 @@ class AsJSON:
         self,
         indent: Optional[int] = None,
         allow_nan: bool = False,
+        backend: str = "json",
     ):
         """
         Initialize a JSON serializer.
@@ -41,9 +46,33 @@ class AsJSON:
         allow_nan: bool
             Whether or not to allow NaN values.
             See the official json library in Python for more details about the expected behavior.
+
+        backend: str
+            The library used to encode and decode values. One of:
+
+            - "json": Python's standard json library.
+            - "orjson": The orjson library, which is significantly faster. It needs to be installed separately, and it only supports an indentation of 2 and no NaN values. Values with NaN or infinite numbers raise a SerializationError, as they do with the standard json library.
+            - "auto": orjson, if it is installed and it supports the options above. It falls back to the standard json library otherwise, including for values orjson cannot handle (e.g. integers larger than 64 bits, or NaN and infinite numbers).
+
+
+        Raises
+        ------
+        ValueError
+            If the backend is not supported, or it does not support the options selected.
         """
+        if backend not in JSON_BACKENDS:
+            raise ValueError(
+                f"JSON backend '{backend}' is not supported. These are the backends available: {list(JSON_BACKENDS)}"
+            )
+
+        if backend == "orjson" and (indent not in (None, 2) or allow_nan):
+            raise ValueError(
+                "The 'orjson' backend only supports an indentation of 2 and does not allow NaN values. Use the 'auto' backend to fall back to the standard json library for other options."
+            )
+
         self._indent = indent
         self._allow_nan = allow_nan
+        self._backend = backend
 
     def serialize(self, value: Any, writer: BinaryIO):
         """
@@ -51,30 +80,101 @@ class AsJSON:
 
         The value needs to be serializable into JSON by the standard 'json' library in Python.
         """
+        orjson = self._orjson()
+        if orjson is not None:
+            try:
+                data = orjson.dumps(value, option=self._orjson_options(orjson))
+            except orjson.JSONEncodeError as e:
+                if self._backend == "orjson":
+                    raise SerializationError(e)
+            else:
+                # orjson encodes NaN and infinite values as null, instead of failing
+                if b"null" not in data or not _contains_non_finite_floats(value):
+                    writer.write(data)
+                    return
+
+                if self._backend == "orjson":
+                    raise SerializationError(
+                        "Out of range float values are not JSON compliant"
+                    )
+
         import json
 
+        stream = io.TextIOWrapper(writer, encoding="utf-8")
         try:
             json.dump(
                 value,
-                io.TextIOWrapper(writer, encoding="utf-8"),
+                stream,
                 indent=self._indent,
                 allow_nan=self._allow_nan,
             )
         except (TypeError, ValueError) as e:
             raise SerializationError(e)
+        finally:
+            # Detaching the wrapper prevents it from closing the writer
+            stream.flush()
+            stream.detach()
 
     def deserialize(self, reader: BinaryIO) -> Any:
         """Deserialize a utf-8-encoded json object into the value it represents."""
         import json
 
+        orjson = self._orjson()
+        if orjson is not None:
+            data = reader.read()
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError as e:
+                if self._backend == "orjson":
+                    raise DeserializationError(e)
+
+            try:
+                return json.loads(data)
+            except (TypeError, JSONDecodeError, UnicodeDecodeError) as e:
+                raise DeserializationError(e)
+
+        stream = io.TextIOWrapper(reader, encoding="utf-8")
         try:
-            return json.load(reader)
-        except (TypeError, JSONDecodeError) as e:
+            return json.load(stream)
+        except (TypeError, JSONDecodeError, UnicodeDecodeError) as e:
             raise DeserializationError(e)
+        finally:
+            stream.detach()
+
+    def _orjson(self):
+        """Return the orjson module if this serializer should use it, or None otherwise."""
+        if self._backend == "json":
+            return None
+        elif self._backend == "orjson":
+            orjson = _import_orjson()
+            if orjson is None:
+                raise ImportError(
+                    "The 'orjson' backend of AsJSON requires the orjson library. You can install it with `pip install orjson`."
+                )
+            return orjson
+        elif self._indent in (None, 2) and not self._allow_nan:
+            return _import_orjson()
+
+        return None
+
+    def _orjson_options(self, orjson) -> int:
+        # Leave the types the standard json library doesn't support to it, so
+        # it raises the same errors (or serializes them in the same way).
+        options = (
+            orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_SUBCLASS
+        )
+        if self._indent == 2:
+            options |= orjson.OPT_INDENT_2
+
+        return options
 
     def __repr__(self) -> str:
         """Get a human-readable string representation of the serializer."""
-        return f"AsJSON(indent={self._indent}, allow_nan={self._allow_nan})"
+        backend = "" if self._backend == "json" else f", backend={self._backend}"
+        return f"AsJSON(indent={self._indent}, allow_nan={self._allow_nan}{backend})"
 
     def __eq__(self, obj) -> bool:
         """Return true if both serializers are equivalent."""
@@ -82,4 +182,41 @@ class AsJSON:
             isinstance(obj, AsJSON)
             and self._indent == obj._indent
             and self._allow_nan == obj._allow_nan
+            and self._backend == obj._backend
         )
+
+
+_orjson_module: Any = None
+
+
+def _import_orjson():
+    """Import orjson the first time it is needed, returning None if it is not installed."""
+    global _orjson_module
+
+    if _orjson_module is None:
+        try:
+            import orjson
+
+            _orjson_module = orjson
+        except ImportError:
+            _orjson_module = False
+
+    return _orjson_module or None
+
+
+def _contains_non_finite_floats(value: Any) -> bool:
+    """Return true if the value contains any NaN or infinite float, at any depth."""
+    import math
+
+    pending = [value]
+    while pending:
+        item = pending.pop()
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                return True
+        elif isinstance(item, dict):
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            pending.extend(item)
+
+    return False
@@ -0,0 +1,205 @@
+"""Serialization strategy for sequences of records, based on JSON Lines."""
+
+import os
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, Mapping, Optional
+
+from dagger.serializer.errors import DeserializationError, SerializationError
+
+
+class AsJSONLines:
+    """
+    Serializer implementation that stores iterables as JSON Lines (one JSON-encoded record per line).
+
+    Records are written one at a time, and deserialized values are lazy iterators over records. This allows tasks to process sequences of records that don't fit in memory, as long as they consume them as streams.
+
+    Since values are iterators, they can only be consumed once.
+
+    Reference: https://jsonlines.org/
+    """
+
+    extension = "jsonl"
+
+    def __init__(self, allow_nan: bool = False):
+        """
+        Initialize a JSON Lines serializer.
+
+        Parameters
+        ----------
+        allow_nan: bool
+            Whether or not to allow NaN values.
+            See the official json library in Python for more details about the expected behavior.
+        """
+        self._allow_nan = allow_nan
+
+    def serialize(self, value: Any, writer: BinaryIO):
+        """
+        Serialize every record of an iterable into a line of JSON, encoded into binary format using utf-8.
+
+        The value may be any iterable (e.g. a list or a generator), except for strings, bytes and mappings. Each of its records needs to be serializable into JSON by the standard 'json' library in Python.
+        """
+        import json
+
+        if isinstance(value, (str, bytes, Mapping)) or not isinstance(value, Iterable):
+            raise SerializationError(
+                f"AsJSONLines can only serialize iterables of records (e.g. lists or generators). However, the value was of type '{type(value).__name__}'."
+            )
+
+        encoder = json.JSONEncoder(allow_nan=self._allow_nan)
+        try:
+            for record in value:
+                writer.write(encoder.encode(record).encode("utf-8"))
+                writer.write(b"\n")
+        except (TypeError, ValueError) as e:
+            raise SerializationError(e)
+
+    def deserialize(self, reader: BinaryIO) -> Iterator[Any]:
+        """
+        Deserialize a stream of JSON Lines into an iterator over its records.
+
+        The records are read from a private copy of the stream: a hard link if the reader is backed by a file, or a temporary file the stream is copied into, one chunk at a time, otherwise (e.g. for compressed or remote values). The copy is only opened when the first record is consumed, and it is read lazily from then on.
+        Invalid records raise a DeserializationError when the iterator reaches them.
+        """
+        filename = _filename(reader)
+        if filename is None:
+            return _Records(self._records, _spool(reader))
+
+        return _Records(self._records, _pin(filename), offset=reader.tell())
+
+    def serialize_to_path(self, value: Any, path: str):
+        """Serialize an iterable of records into a new file in the specified path."""
+        with open(path, "wb") as writer:
+            self.serialize(value, writer)
+
+    def deserialize_from_path(self, path: str) -> Iterator[Any]:
+        """Deserialize the file in the specified path into an iterator over its records. The file is only opened when the first record is consumed, and it is read lazily from then on."""
+        return _Records(self._records, _pin(path))
+
+    def _records(self, reader: BinaryIO) -> Iterator[Any]:
+        import json
+
+        for line_number, line in enumerate(reader, start=1):
+            if not line.strip():
+                continue
+
+            try:
+                yield json.loads(line)
+            except (UnicodeDecodeError, ValueError) as e:
+                raise DeserializationError(f"Line {line_number} is not valid JSON: {e}")
+
+    def __repr__(self) -> str:
+        """Get a human-readable string representation of the serializer."""
+        return f"AsJSONLines(allow_nan={self._allow_nan})"
+
+    def __eq__(self, obj) -> bool:
+        """Return true if both serializers are equivalent."""
+        return isinstance(obj, AsJSONLines) and self._allow_nan == obj._allow_nan
+
+
+class _Records:
+    """
+    Iterator over the records of a private file, which it owns.
+
+    Values may outlive the file they were loaded from (e.g. the local runtime writes all partitions of an output into the same path, one after the other, and removes its temporary directory when it finishes), so records are read from a private file instead (see `_pin` and `_spool`).
+    The private file is only opened when the first record is consumed, so many values can be loaded at the same time without keeping a file open for each of them. It is removed as soon as it is opened (the open file keeps its contents available), or when the iterator is closed or discarded before that.
+    """
+
+    def __init__(
+        self,
+        records: Callable[[BinaryIO], Iterator[Any]],
+        path: str,
+        offset: int = 0,
+    ):
+        self._records = records
+        self._path: Optional[str] = path
+        self._offset = offset
+        self._reader: Optional[BinaryIO] = None
+        self._iterator: Optional[Iterator[Any]] = None
+
+    def __iter__(self) -> Iterator[Any]:
+        return self
+
+    def __next__(self) -> Any:
+        if self._iterator is None:
+            if self._path is None:
+                raise StopIteration
+
+            self._reader = open(self._path, "rb")
+            self._remove_path()
+            self._reader.seek(self._offset)
+            self._iterator = self._records(self._reader)
+
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            self.close()
+            raise
+
+    def _remove_path(self):
+        """Remove the private file, if it still exists. Once it is open, its contents remain available until the reader is closed."""
+        if self._path is not None:
+            _remove(self._path)
+            self._path = None
+
+    def close(self):
+        """Release the private file. No more records are returned after this."""
+        self._remove_path()
+        if self._reader is not None:
+            self._reader.close()
+        self._iterator = iter(())
+
+    def __del__(self):
+        self.close()
+
+
+def _pin(path: str) -> str:
+    """Return the path of a private hard link to a file, or of a private copy of it if it cannot be linked (e.g. because it is in another filesystem)."""
+    import tempfile
+    import uuid
+
+    pin = os.path.join(tempfile.gettempdir(), f"dagger-{uuid.uuid4().hex}.jsonl")
+    try:
+        os.link(path, pin)
+    except OSError:
+        with open(path, "rb") as reader:
+            return _spool(reader)
+
+    return pin
+
+
+def _spool(reader: BinaryIO) -> str:
+    """Copy the rest of a stream into a private temporary file, one chunk at a time, and return its path."""
+    import shutil
+    import tempfile
+
+    fd, path = tempfile.mkstemp(prefix="dagger-", suffix=".jsonl")
+    try:
+        with os.fdopen(fd, "wb") as writer:
+            shutil.copyfileobj(reader, writer)
+    except BaseException:
+        _remove(path)
+        raise
+
+    return path
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _filename(reader: BinaryIO) -> Optional[str]:
+    """Return the name of the regular file backing the reader, if any."""
+    import io
+
+    filename = getattr(reader, "name", None)
+    if not isinstance(filename, str) or not os.path.isfile(filename):
+        return None
+
+    try:
+        reader.fileno()
+    except (AttributeError, io.UnsupportedOperation):
+        return None
+
+    return filename
@@ -0,0 +1,121 @@
+"""Serialization strategy for NumPy arrays, based on the .npy format."""
+
+from typing import Any, BinaryIO, Optional
+
+from dagger.serializer.errors import DeserializationError, SerializationError
+
+
+class AsNumpy:
+    """
+    Serializer implementation that stores NumPy arrays in the .npy format.
+
+    When values are deserialized from a file in the local filesystem, they are memory-mapped instead of being read into memory. This allows downstream tasks to work with slices of very large arrays without loading them completely.
+
+    This serializer requires the numpy library to be installed.
+
+    Reference: https://numpy.org/doc/stable/reference/generated/numpy.lib.format.html
+    """
+
+    extension = "npy"
+
+    def __init__(self, memory_map: bool = True):
+        """
+        Initialize a NumPy serializer.
+
+        Parameters
+        ----------
+        memory_map: bool
+            Whether to deserialize values as read-only memory-mapped arrays (np.memmap) when the reader is backed by a file.
+            Streams that are not backed by a file (e.g. io.BytesIO) are always read into memory.
+        """
+        self._memory_map = memory_map
+
+    def serialize(self, value: Any, writer: BinaryIO):
+        """
+        Serialize an array into the .npy format.
+
+        The value may be any object NumPy can turn into an array without resorting to pickle (i.e. it must not have an object dtype).
+        """
+        np = _import_numpy()
+        try:
+            np.save(writer, np.asanyarray(value), allow_pickle=False)
+        except (TypeError, ValueError) as e:
+            raise SerializationError(e)
+
+    def deserialize(self, reader: BinaryIO) -> Any:
+        """Deserialize a .npy file into a read-only memory-mapped array, or an in-memory array if the reader is not backed by a file."""
+        np = _import_numpy()
+        try:
+            filename = self._memory_mappable_filename(reader)
+            if filename is not None:
+                array = _memory_mapped_array(np, filename, reader)
+                if array is not None:
+                    return array
+
+            return np.load(reader, allow_pickle=False)
+        except (EOFError, TypeError, ValueError) as e:
+            raise DeserializationError(e)
+
+    def _memory_mappable_filename(self, reader: BinaryIO) -> Optional[str]:
+        """Return the name of the file backing the reader, if it can be memory-mapped."""
+        import io
+        import os
+
+        if not self._memory_map:
+            return None
+
+        try:
+            reader.fileno()
+        except (AttributeError, io.UnsupportedOperation):
+            return None
+
+        filename = getattr(reader, "name", None)
+        if not isinstance(filename, str) or not os.path.isfile(filename):
+            return None
+
+        return filename
+
+    def __repr__(self) -> str:
+        """Get a human-readable string representation of the serializer."""
+        return f"AsNumpy(memory_map={self._memory_map})"
+
+    def __eq__(self, obj) -> bool:
+        """Return true if both serializers are equivalent."""
+        return isinstance(obj, AsNumpy) and self._memory_map == obj._memory_map
+
+
+def _memory_mapped_array(np, filename: str, reader: BinaryIO) -> Optional[Any]:
+    """
+    Memory-map the array stored in the file, starting at the current position of the reader.
+
+    Arrays may not start at the beginning of the file (e.g. when they are preceded by the header written by AsAuto). Returns None, leaving the reader where it was, if the format version of the array is not supported.
+    """
+    start = reader.tell()
+    version = np.lib.format.read_magic(reader)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(reader)
+    elif version == (2, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(reader)
+    else:
+        reader.seek(start)
+        return None
+
+    return np.memmap(
+        filename,
+        dtype=dtype,
+        shape=shape,
+        order="F" if fortran_order else "C",
+        mode="r",
+        offset=reader.tell(),
+    )
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "Serializing values with AsNumpy requires the numpy library. You can install it with `pip install numpy`."
+        ) from e
+
+    return numpy
@@ -1,8 +1,20 @@
 """Serialization strategy based on the Pickle protocol."""
 
-from typing import Any, BinaryIO
+import struct
+from typing import Any, BinaryIO, List, Optional
 
 from dagger.serializer.errors import DeserializationError, SerializationError
+from dagger.serializer.memory_map import memory_map
+
+# Values pickled with out-of-band buffers are stored with the following layout:
+#
+#   magic | pickle size | number of buffers | size of each buffer | pickle | buffers
+#
+# Each buffer starts at an offset that is a multiple of BUFFER_ALIGNMENT, so it
+# can be memory-mapped and handed over to libraries such as NumPy without copies.
+OUT_OF_BAND_MAGIC = b"DGRPKL5\x00"
+BUFFER_ALIGNMENT = 64
+_SIZE = struct.Struct("<Q")
 
 
 class AsPickle:
@@ -14,12 +26,54 @@ class AsPickle:
 
     extension = "pickle"
 
+    def __init__(
+        self,
+        protocol: Optional[int] = None,
+        out_of_band_buffers: bool = False,
+    ):
+        """
+        Initialize a Pickle serializer.
+
+        Parameters
+        ----------
+        protocol: int, optional
+            The pickle protocol to use. By default, it uses `pickle.DEFAULT_PROTOCOL`.
+
+        out_of_band_buffers: bool
+            Whether to store large buffers (e.g. bytearrays or NumPy arrays) outside of the pickle stream. Requires protocol 5 or higher.
+            Buffers are written as separate, aligned segments. When the value is deserialized from a file, they are memory-mapped instead of being copied into memory. This means they will be read-only.
+            Values serialized with this option can only be deserialized by a serializer with the same option.
+
+
+        Raises
+        ------
+        ValueError
+            If the protocol is not supported by the current version of Python, or it doesn't support out-of-band buffers.
+        """
+        import pickle
+
+        if protocol is not None and not 0 <= protocol <= pickle.HIGHEST_PROTOCOL:
+            raise ValueError(
+                f"Pickle protocol {protocol} is not supported. Protocols supported by this version of Python range from 0 to {pickle.HIGHEST_PROTOCOL}."
+            )
+
+        if out_of_band_buffers and protocol is not None and protocol < 5:
+            raise ValueError(
+                f"Out-of-band buffers require pickle protocol 5 or higher. However, you selected protocol {protocol}."
+            )
+
+        self._protocol = protocol
+        self._out_of_band_buffers = out_of_band_buffers
+
     def serialize(self, value: Any, writer: BinaryIO):
         """Serialize a value using the Pickle protocol."""
         import pickle
 
         try:
-            pickle.dump(value, writer)
+            if self._out_of_band_buffers:
+                self._serialize_with_out_of_band_buffers(value, writer)
+            else:
+                pickle.dump(value, writer, protocol=self._protocol)
         except (pickle.PicklingError, AttributeError) as e:
             raise SerializationError(e)
 
@@ -28,6 +82,9 @@ class AsPickle:
         import pickle
 
         try:
+            if self._out_of_band_buffers:
+                return self._deserialize_with_out_of_band_buffers(reader)
+
             return pickle.load(reader)
         except (
             pickle.UnpicklingError,
@@ -36,13 +93,104 @@ class AsPickle:
             ImportError,
             IndexError,
             TypeError,
+            ValueError,
+            struct.error,
         ) as e:
             raise DeserializationError(e)
 
+    def _serialize_with_out_of_band_buffers(self, value: Any, writer: BinaryIO):
+        import pickle
+
+        buffers: List[memoryview] = []
+
+        def buffer_callback(buffer: pickle.PickleBuffer) -> bool:
+            try:
+                buffers.append(buffer.raw())
+                return False
+            except BufferError:
+                # Non-contiguous buffers cannot be written as a single segment
+                return True
+
+        data = pickle.dumps(
+            value,
+            protocol=5 if self._protocol is None else self._protocol,
+            buffer_callback=buffer_callback,
+        )
+
+        header = b"".join(
+            [
+                OUT_OF_BAND_MAGIC,
+                _SIZE.pack(len(data)),
+                _SIZE.pack(len(buffers)),
+                *[_SIZE.pack(buffer.nbytes) for buffer in buffers],
+            ]
+        )
+        writer.write(header)
+        writer.write(data)
+
+        offset = len(header) + len(data)
+        for buffer in buffers:
+            padding = -offset % BUFFER_ALIGNMENT
+            writer.write(b"\x00" * padding)
+            writer.write(buffer)
+            offset += padding + buffer.nbytes
+
+    def _deserialize_with_out_of_band_buffers(self, reader: BinaryIO) -> Any:
+        import pickle
+
+        magic = reader.read(len(OUT_OF_BAND_MAGIC))
+        if magic != OUT_OF_BAND_MAGIC:
+            raise DeserializationError(
+                "The value was not serialized with out-of-band buffers. Make sure the serializer used to deserialize it has the same configuration as the one used to serialize it."
+            )
+
+        (data_size,) = _SIZE.unpack(reader.read(_SIZE.size))
+        (buffer_count,) = _SIZE.unpack(reader.read(_SIZE.size))
+        buffer_sizes = [
+            _SIZE.unpack(reader.read(_SIZE.size))[0] for _ in range(buffer_count)
+        ]
+        data = reader.read(data_size)
+        offset = len(OUT_OF_BAND_MAGIC) + _SIZE.size * (2 + buffer_count) + data_size
+
+        mapped_file = memory_map(reader)
+        start = reader.tell() - offset
+
+        buffers = []
+        for size in buffer_sizes:
+            padding = -offset % BUFFER_ALIGNMENT
+            if mapped_file is not None:
+                buffer_start = start + offset + padding
+                buffer = mapped_file[buffer_start : buffer_start + size]
+            else:
+                reader.read(padding)
+                buffer = bytearray(size)
+                if reader.readinto(buffer) != size:  # type: ignore
+                    buffer = None
+
+            if buffer is None or len(buffer) != size:
+                raise DeserializationError(
+                    "The serialized value is truncated. Some of its buffers are missing."
+                )
+
+            buffers.append(buffer)
+            offset += padding + size
+
+        return pickle.loads(data, buffers=buffers)
+
     def __repr__(self) -> str:
         """Get a human-readable string representation of the serializer."""
-        return "AsPickle()"
+        arguments = []
+        if self._protocol is not None:
+            arguments.append(f"protocol={self._protocol}")
+        if self._out_of_band_buffers:
+            arguments.append("out_of_band_buffers=True")
+
+        return f"AsPickle({', '.join(arguments)})"
 
     def __eq__(self, obj) -> bool:
         """Return true if both serializers are equivalent."""
-        return isinstance(obj, AsPickle)
+        return (
+            isinstance(obj, AsPickle)
+            and self._protocol == obj._protocol
+            and self._out_of_band_buffers == obj._out_of_band_buffers
+        )
@@ -0,0 +1,216 @@
+"""
+Stream files in and out of uncompressed tar archives that record the checksum of their contents.
+
+Archives have the following layout:
+
+- data/...: The files and directories being serialized.
+- SHA256SUMS: The SHA-256 checksum of every file under data/, in the format used by `sha256sum`. It is always the last member of the archive.
+
+Archives are written and read as streams, so memory usage stays constant regardless of the size of the files.
+"""
+
+import os
+from typing import TYPE_CHECKING, BinaryIO, Iterable, List, Tuple
+
+from dagger.serializer.errors import DeserializationError, SerializationError
+
+if TYPE_CHECKING:  # pragma: no cover
+    import tarfile
+
+DATA_DIRNAME = "data"
+CHECKSUMS_FILENAME = "SHA256SUMS"
+CHUNK_SIZE = 1024**2
+
+
+def write_checksummed_tar(entries: Iterable[Tuple[str, str]], writer: BinaryIO):
+    """
+    Write a tar archive with the specified entries into the writer.
+
+    Parameters
+    ----------
+    entries
+        Pairs of (path in the local filesystem, name in the archive). Paths may point to regular files or directories. Directories are added without their contents.
+        Names are relative to the data directory of the archive.
+
+    writer
+        The stream to write the archive to.
+
+
+    Raises
+    ------
+    SerializationError
+        If any of the paths is not a regular file or a directory, or a file changes size while it is being archived.
+    """
+    import hashlib
+    import io
+    import tarfile
+
+    checksums: List[Tuple[str, str]] = []
+    with tarfile.open(fileobj=writer, mode="w|", format=tarfile.PAX_FORMAT) as tar:
+        for path, name in entries:
+            arcname = f"{DATA_DIRNAME}/{name}"
+            if os.path.isdir(path):
+                tar.addfile(_tarinfo(arcname, tarfile.DIRTYPE, 0, path))
+            elif os.path.isfile(path):
+                size = os.path.getsize(path)
+                with open(path, "rb") as f:
+                    hashing_reader = _HashingReader(f, hashlib.sha256())
+                    try:
+                        tar.addfile(
+                            _tarinfo(arcname, tarfile.REGTYPE, size, path),
+                            hashing_reader,
+                        )
+                    except OSError as e:
+                        raise SerializationError(
+                            f"File '{path}' could not be archived ({e}). This happens when the file changes size while it is being serialized."
+                        )
+                checksums.append((hashing_reader.hexdigest(), arcname))
+            else:
+                raise SerializationError(
+                    f"Path '{path}' is not a regular file or a directory."
+                )
+
+        checksums_contents = "".join(
+            f"{digest}  {arcname}\n" for digest, arcname in checksums
+        ).encode("utf-8")
+        tar.addfile(
+            _tarinfo(CHECKSUMS_FILENAME, tarfile.REGTYPE, len(checksums_contents)),
+            io.BytesIO(checksums_contents),
+        )
+
+
+def extract_checksummed_tar(reader: BinaryIO, output_dir: str) -> List[str]:
+    """
+    Extract a tar archive written by `write_checksummed_tar` into a directory, verifying the checksum of every file.
+
+    Returns the names of the entries extracted, relative to the output directory.
+
+
+    Raises
+    ------
+    DeserializationError
+        If the archive is malformed, it contains entries outside of the data directory, or the checksums don't match its contents.
+    """
+    import hashlib
+    import tarfile
+
+    names = []
+    checksums = {}
+    expected_checksums = None
+
+    try:
+        with tarfile.open(fileobj=reader, mode="r|") as tar:
+            for member in tar:
+                if expected_checksums is not None:
+                    raise DeserializationError(
+                        f"Found member '{member.name}' after '{CHECKSUMS_FILENAME}'. The archive was not written by dagger or it has been tampered with."
+                    )
+
+                if member.name == CHECKSUMS_FILENAME and member.isfile():
+                    expected_checksums = _parse_checksums(
+                        tar.extractfile(member).read().decode("utf-8")  # type: ignore
+                    )
+                    continue
+
+                name = _relative_name(member.name)
+                path = os.path.join(output_dir, name)
+                if member.isdir():
+                    os.makedirs(path, exist_ok=True)
+                elif member.isfile():
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    digest = hashlib.sha256()
+                    src = tar.extractfile(member)
+                    with open(path, "wb") as dst:
+                        for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):  # type: ignore
+                            digest.update(chunk)
+                            dst.write(chunk)
+                    checksums[member.name] = digest.hexdigest()
+                else:
+                    raise DeserializationError(
+                        f"Member '{member.name}' is not a regular file or a directory."
+                    )
+
+                names.append(name)
+    except (tarfile.TarError, EOFError, UnicodeDecodeError) as e:
+        raise DeserializationError(e)
+
+    if expected_checksums is None:
+        raise DeserializationError(
+            f"The archive does not contain a '{CHECKSUMS_FILENAME}' file. It was not written by dagger or it is incomplete."
+        )
+
+    if checksums != expected_checksums:
+        mismatches = sorted(
+            name
+            for name in set(checksums) | set(expected_checksums)
+            if checksums.get(name) != expected_checksums.get(name)
+        )
+        raise DeserializationError(
+            f"The checksums of the following files do not match the checksums recorded when they were serialized: {mismatches}"
+        )
+
+    return names
+
+
+class _HashingReader:
+    """Wrap a binary stream, updating a hash with every chunk read from it."""
+
+    def __init__(self, reader: BinaryIO, digest):
+        self._reader = reader
+        self._digest = digest
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._reader.read(size)
+        self._digest.update(chunk)
+        return chunk
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+
+def _tarinfo(name: str, type_: bytes, size: int, path: str = None) -> "tarfile.TarInfo":
+    import tarfile
+
+    info = tarfile.TarInfo(name)
+    info.type = type_
+    info.size = size
+    if path is not None:
+        stat = os.stat(path)
+        info.mtime = int(stat.st_mtime)
+        info.mode = stat.st_mode & 0o777
+    else:
+        info.mode = 0o644
+
+    return info
+
+
+def _relative_name(member_name: str) -> str:
+    """Return the name of a member relative to the data directory, rejecting names that would escape it."""
+    import posixpath
+
+    prefix = f"{DATA_DIRNAME}/"
+    normalized = posixpath.normpath(member_name)
+    if (
+        not member_name.startswith(prefix)
+        or normalized.startswith("/")
+        or ".." in normalized.split("/")
+        or normalized == DATA_DIRNAME
+    ):
+        raise DeserializationError(
+            f"Member '{member_name}' is outside of the '{DATA_DIRNAME}' directory of the archive."
+        )
+
+    return normalized[len(prefix) :]
+
+
+def _parse_checksums(contents: str) -> dict:
+    checksums = {}
+    for line in contents.splitlines():
+        digest, _, name = line.partition("  ")
+        if not digest or not name:
+            raise DeserializationError(
+                f"Line '{line}' in '{CHECKSUMS_FILENAME}' is malformed."
+            )
+        checksums[name] = digest
+
+    return checksums
@@ -0,0 +1,200 @@
+"""Serialization strategy that compresses the output of another serializer."""
+
+import io
+from typing import Any, BinaryIO, Optional
+
+from dagger.serializer.errors import DeserializationError
+from dagger.serializer.protocol import Serializer
+
+#: Extension appended to the extension of the inner serializer, for each supported codec
+CODEC_EXTENSIONS = {
+    "gzip": "gz",
+    "bz2": "bz2",
+    "lzma": "xz",
+    "zstd": "zst",
+}
+
+
+class Compressed:
+    """
+    Serializer implementation that compresses (and decompresses) the values serialized by another serializer.
+
+    Values are compressed and decompressed as streams, so memory usage does not depend on the size of the value.
+
+    Supported codecs are "gzip", "bz2" and "lzma" from Python's standard library, and "zstd", which requires the zstandard library to be installed.
+    """
+
+    def __init__(
+        self,
+        serializer: Serializer,
+        codec: str = "gzip",
+        level: Optional[int] = None,
+    ):
+        """
+        Initialize a compressed serializer.
+
+        Parameters
+        ----------
+        serializer: Serializer
+            The serializer whose output will be compressed.
+
+        codec: str
+            The compression codec to use. One of "gzip", "bz2", "lzma" or "zstd".
+
+        level: int, optional
+            The compression level. Its range depends on the codec (e.g. 1-9 for gzip and bz2, 0-9 for lzma and 1-22 for zstd). If not set, the default level of the codec is used.
+
+
+        Raises
+        ------
+        ValueError
+            If the codec is not supported.
+        """
+        if codec not in CODEC_EXTENSIONS:
+            raise ValueError(
+                f"Compression codec '{codec}' is not supported. These are the codecs available: {list(CODEC_EXTENSIONS)}"
+            )
+
+        self._serializer = serializer
+        self._codec = codec
+        self._level = level
+
+    @property
+    def extension(self) -> str:
+        """Extension of the inner serializer followed by the extension of the codec (e.g. "json.gz")."""
+        return f"{self._serializer.extension}.{CODEC_EXTENSIONS[self._codec]}"
+
+    def serialize(self, value: Any, writer: BinaryIO):
+        """Serialize the value with the inner serializer, compressing its output."""
+        compressed_writer = self._compressed_writer(writer)
+        try:
+            self._serializer.serialize(value, compressed_writer)
+        finally:
+            compressed_writer.close()
+
+    def deserialize(self, reader: BinaryIO) -> Any:
+        """Decompress the stream and deserialize it with the inner serializer."""
+        decompressed_reader = self._decompressed_reader(reader)
+        try:
+            return self._serializer.deserialize(_Stream(decompressed_reader))
+        except self._decompression_errors() as e:
+            raise DeserializationError(e)
+        finally:
+            decompressed_reader.close()
+
+    def _compressed_writer(self, writer: BinaryIO) -> BinaryIO:
+        if self._codec == "gzip":
+            import gzip
+
+            return gzip.GzipFile(
+                fileobj=writer,
+                mode="wb",
+                # Omit the timestamp, so equal values produce equal outputs
+                mtime=0,
+                **self._level_option("compresslevel"),
+            )
+        elif self._codec == "bz2":
+            import bz2
+
+            return bz2.BZ2File(writer, mode="wb", **self._level_option("compresslevel"))
+        elif self._codec == "lzma":
+            import lzma
+
+            return lzma.LZMAFile(writer, mode="wb", **self._level_option("preset"))
+        else:
+            compressor = _zstandard().ZstdCompressor(**self._level_option("level"))
+            return compressor.stream_writer(writer, closefd=False)
+
+    def _decompressed_reader(self, reader: BinaryIO) -> BinaryIO:
+        if self._codec == "gzip":
+            import gzip
+
+            return gzip.GzipFile(fileobj=reader, mode="rb")
+        elif self._codec == "bz2":
+            import bz2
+
+            return bz2.BZ2File(reader, mode="rb")
+        elif self._codec == "lzma":
+            import lzma
+
+            return lzma.LZMAFile(reader, mode="rb")
+        else:
+            return _zstandard().ZstdDecompressor().stream_reader(reader, closefd=False)
+
+    def _decompression_errors(self) -> tuple:
+        """Return the errors the codec raises when the stream is not valid."""
+        if self._codec == "gzip":
+            import zlib
+
+            return (EOFError, OSError, zlib.error)
+        elif self._codec == "bz2":
+            return (EOFError, OSError)
+        elif self._codec == "lzma":
+            import lzma
+
+            return (EOFError, lzma.LZMAError)
+        else:
+            return (EOFError, _zstandard().ZstdError)
+
+    def _level_option(self, name: str) -> dict:
+        """Return the compression level as a keyword argument for the codec, or nothing to use the default level of the codec."""
+        return {} if self._level is None else {name: self._level}
+
+    def __repr__(self) -> str:
+        """Get a human-readable string representation of the serializer."""
+        return f"Compressed({repr(self._serializer)}, codec={self._codec}, level={self._level})"
+
+    def __eq__(self, obj) -> bool:
+        """Return true if both serializers are equivalent."""
+        return (
+            isinstance(obj, Compressed)
+            and self._serializer == obj._serializer
+            and self._codec == obj._codec
+            and self._level == obj._level
+        )
+
+
+class _Stream(io.BufferedIOBase):
+    """
+    Expose a decompressed stream to the inner serializer.
+
+    Compressed file objects (e.g. gzip.GzipFile) expose the file descriptor of the compressed file they read from. Serializers that memory-map the files they read (such as AsNumpy) would then map the compressed bytes. This wrapper only exposes the decompressed stream.
+    """
+
+    def __init__(self, reader: BinaryIO):
+        self._reader = reader
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        return self._reader.read(-1 if size is None else size)
+
+    def read1(self, size: int = -1) -> bytes:
+        return self.read(size)
+
+    def readinto(self, buffer) -> int:
+        return self._reader.readinto(buffer)  # type: ignore
+
+    def readline(self, size: Optional[int] = -1) -> bytes:
+        return self._reader.readline(-1 if size is None else size)
+
+    def seekable(self) -> bool:
+        return self._reader.seekable()
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._reader.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._reader.tell()
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "Compressing values with the 'zstd' codec requires the zstandard library. You can install it with `pip install zstandard`."
+        ) from e
+
+    return zstandard
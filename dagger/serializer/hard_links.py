@@ -0,0 +1,61 @@
+"""
+Hand files and directories over through hard links, so their contents are never copied while they stay in the same filesystem.
+
+Files are copied instead when they cannot be linked (e.g. because they are in a different filesystem, or the filesystem doesn't support hard links).
+"""
+
+import os
+from typing import Iterable, List, Tuple
+
+
+def link_entries(entries: Iterable[Tuple[str, str]], output_dir: str) -> List[str]:
+    """
+    Link the specified entries into a directory, creating it if it doesn't exist yet.
+
+    Parameters
+    ----------
+    entries
+        Pairs of (path in the local filesystem, name relative to the output directory), with parent directories listed before their contents. Paths may point to regular files or directories. Directories are created without their contents.
+
+    output_dir
+        The directory to link the entries into.
+
+
+    Returns
+    -------
+    The names of the entries linked, relative to the output directory.
+
+
+    Raises
+    ------
+    ValueError
+        If any of the paths is not a regular file or a directory.
+
+    OSError
+        If any of the entries cannot be linked or copied.
+    """
+    names = []
+    os.makedirs(output_dir, exist_ok=True)
+    for path, name in entries:
+        dst = os.path.join(output_dir, *name.split("/"))
+        if os.path.isdir(path):
+            os.makedirs(dst, exist_ok=True)
+        elif os.path.isfile(path):
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            _link_or_copy(path, dst)
+        else:
+            raise ValueError(f"Path '{path}' is not a regular file or a directory.")
+
+        names.append(name)
+
+    return names
+
+
+def _link_or_copy(src: str, dst: str):
+    """Create a hard link to a file, or copy it if it cannot be linked. Symbolic links are followed."""
+    import shutil
+
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
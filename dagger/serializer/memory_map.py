@@ -0,0 +1,20 @@
+"""Memory-map the files that back the readers passed to serializers, so their contents can be used without copying them into memory."""
+
+from typing import BinaryIO, Optional
+
+
+def memory_map(reader: BinaryIO) -> Optional[memoryview]:
+    """Return a read-only memory view of the whole file backing the reader, if it is backed by a non-empty file."""
+    import io
+    import mmap
+
+    try:
+        fileno = reader.fileno()
+    except (AttributeError, io.UnsupportedOperation):
+        return None
+
+    try:
+        return memoryview(mmap.mmap(fileno, 0, access=mmap.ACCESS_READ))
+    except (OSError, ValueError):
+        # Empty files cannot be memory-mapped
+        return None
@@ -19,3 +19,20 @@ class Serializer(Protocol):  # pragma: no cover
     def deserialize(self, reader: BinaryIO) -> Any:
         """Deserialize a stream of bytes into a value."""
         ...
+
+
+@runtime_checkable
+class PathSerializer(Serializer, Protocol):  # pragma: no cover
+    """
+    Optional extension of the Serializer protocol for serializers that work with paths in the local filesystem.
+
+    When a value is stored in, or retrieved from, the local filesystem, runtimes prefer these methods over their stream-based counterparts. This allows serializers of file-backed values to hand files over without copying them (e.g. through hard links, reflinks or renames).
+    """
+
+    def serialize_to_path(self, value: Any, path: str):
+        """Serialize a value into the specified path. The path does not exist when this method is called."""
+        ...
+
+    def deserialize_from_path(self, path: str) -> Any:
+        """Deserialize the contents of the specified path into a value."""
+        ...
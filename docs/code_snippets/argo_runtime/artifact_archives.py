@@ -0,0 +1,42 @@
+from dagger import dsl
+from dagger.runtime.argo import ArtifactArchive, Workflow
+from dagger.serializer import AsJSON, AsPickle, Compressed
+
+
+@dsl.task(serializer=dsl.Serialize(AsJSON()))
+def generate_report():
+    return {"rows": [{"id": i, "status": "ok"} for i in range(100_000)]}
+
+
+@dsl.task(
+    serializer=dsl.Serialize(Compressed(AsPickle())),
+)
+def train_model(report):
+    return {"weights": [0.1] * len(report["rows"])}
+
+
+@dsl.task(
+    serializer=dsl.Serialize(AsJSON()),
+    runtime_options={
+        # This output is tiny, so it is not worth compressing it
+        "argo_artifact_archive": {"return_value": ArtifactArchive()},
+    },
+)
+def summarize(report):
+    return {"count": len(report["rows"])}
+
+
+@dsl.DAG()
+def dag():
+    report = generate_report()
+    return {
+        "model": train_model(report),
+        "summary": summarize(report),
+    }
+
+
+workflow = Workflow(
+    container_image="my-image",
+    # Every output serialized as JSON is stored in a gzipped tarball
+    artifact_archives={AsJSON: ArtifactArchive(compression_level=6)},
+)
@@ -0,0 +1,27 @@
+from dagger import dsl
+from dagger.runtime.argo import Concurrency, Semaphore
+
+
+@dsl.task()
+def list_customers():
+    return ["customer-1", "customer-2", "customer-3"]
+
+
+@dsl.task(
+    runtime_options={
+        "argo_concurrency": Concurrency(
+            # At most 20 partitions of this task run at the same time
+            max_partitions=20,
+            # Every partition acquires this semaphore before it runs
+            semaphore=Semaphore(config_map_name="my-limits", key="customers-db"),
+        ),
+    }
+)
+def update_customer(customer):
+    print(f"Updating {customer}")
+
+
+@dsl.DAG()
+def dag():
+    for customer in list_customers():
+        update_customer(customer)
@@ -2,10 +2,8 @@
 
 from typing import List
 
-import yaml
-
 from dagger import DAG
-from dagger.runtime.argo import Metadata, Workflow, workflow_manifest
+from dagger.runtime.argo import Metadata, Workflow, workflow_manifest, write_manifest
 
 
 def dump_argo_manifest(dag: DAG, example_name: str):
@@ -17,7 +15,7 @@ def dump_argo_manifest(dag: DAG, example_name: str):
     )
 
     with open(f"tests/examples/argo/{example_name}.yaml", "w") as f:
-        yaml.safe_dump(manifest, f)
+        write_manifest(manifest, f)
 
 
 def _generate_manifest(dag: DAG, name: str, entrypoint: List[str]):
@@ -29,4 +27,9 @@ def _generate_manifest(dag: DAG, name: str, entrypoint: List[str]):
         container_image="local.registry/dagger",
         container_entrypoint_to_dag_cli=entrypoint,
     )
-    return workflow_manifest(dag, metadata=metadata, workflow=workflow)
+    return workflow_manifest(
+        dag,
+        metadata=metadata,
+        workflow=workflow,
+        lazy_templates=True,
+    )
@@ -0,0 +1 @@
+"""Test suite for the helpers used by the benchmarks."""
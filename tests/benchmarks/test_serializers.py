@@ -0,0 +1,37 @@
+from benchmarks.serializers import regressions
+
+
+def test__regressions__with_a_drop_beyond_the_tolerance():
+    baseline = {"AsJSON/small-dict": {"encode_per_second": 100.0}}
+    results = {"AsJSON/small-dict": {"encode_per_second": 70.0}}
+
+    assert regressions(results, baseline, tolerance=0.2) == [
+        ("AsJSON/small-dict", "encode_per_second", 100.0, 70.0)
+    ]
+
+
+def test__regressions__with_a_drop_within_the_tolerance():
+    baseline = {"AsJSON/small-dict": {"encode_per_second": 100.0}}
+    results = {"AsJSON/small-dict": {"encode_per_second": 90.0}}
+
+    assert regressions(results, baseline, tolerance=0.2) == []
+
+
+def test__regressions__when_lower_is_better():
+    baseline = {"AsJSON/small-dict": {"bytes_on_disk": 100, "decode_peak_memory": 0}}
+    results = {"AsJSON/small-dict": {"bytes_on_disk": 130, "decode_peak_memory": 1024}}
+
+    # Small differences in memory are considered noise
+    assert regressions(results, baseline, tolerance=0.2) == [
+        ("AsJSON/small-dict", "bytes_on_disk", 100, 130)
+    ]
+
+
+def test__regressions__with_a_serializer_missing_from_the_baseline():
+    baseline = {"AsJSON/small-dict": {"encode_per_second": 100.0}}
+    results = {
+        "AsJSON/small-dict": {"encode_per_second": 100.0},
+        "AsPickle/small-dict": {"encode_per_second": 1.0},
+    }
+
+    assert regressions(results, baseline, tolerance=0.2) == []
@@ -0,0 +1,14 @@
+from unittest import mock
+
+from benchmarks.throughput import MIN_MEASUREMENT_TIME, measure_throughput
+
+
+def test__measure_throughput():
+    clock = iter([0.0, MIN_MEASUREMENT_TIME / 2, MIN_MEASUREMENT_TIME * 2])
+    operation = mock.Mock()
+
+    with mock.patch("time.perf_counter", lambda: next(clock)):
+        throughput = measure_throughput(operation)
+
+    assert operation.call_count == 2
+    assert throughput == 2 / (MIN_MEASUREMENT_TIME * 2)
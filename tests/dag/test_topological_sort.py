@@ -71,3 +71,14 @@ def test__topological_sort__with_complex_topologies():
 
     for case in cases:
         assert topological_sort(case["topology"]) == case["right_order"]
+
+
+def test__topological_sort__with_long_chains():
+    length = 100_000
+    topology = {i: {i - 1} for i in range(1, length)}
+
+    sorted_sets = topological_sort(topology)
+
+    assert len(sorted_sets) == length
+    assert sorted_sets[0] == {0}
+    assert sorted_sets[-1] == {length - 1}
@@ -126,3 +126,32 @@ def test_syntax_sugar():
             ],
         },
     }
+
+
+def test_artifact_archives():
+    from dagger import dsl
+    from dagger.runtime.argo.workflow_spec import workflow_spec
+    from docs.code_snippets.argo_runtime.artifact_archives import dag, workflow
+
+    spec = workflow_spec(dsl.build(dag), workflow)
+    templates = {template["name"]: template for template in spec["templates"]}
+
+    def archive(template_name):
+        return templates[template_name]["outputs"]["artifacts"][0]["archive"]
+
+    assert archive("dag-generate-report") == {"tar": {"compressionLevel": 6}}
+    assert archive("dag-train-model") == {"none": {}}
+    assert archive("dag-summarize") == {"none": {}}
+
+
+def test_concurrency():
+    from dagger import dsl
+    from dagger.runtime.argo import Workflow
+    from dagger.runtime.argo.workflow_spec import workflow_spec
+    from docs.code_snippets.argo_runtime.concurrency import dag
+
+    spec = workflow_spec(dsl.build(dag), Workflow(container_image="my-image"))
+    templates = {template["name"]: template for template in spec["templates"]}
+
+    assert templates["fan-out-update-customer"]["parallelism"] == 20
+    assert "synchronization" in templates["dag-update-customer"]
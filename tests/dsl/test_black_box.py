@@ -471,7 +471,8 @@ def test__build__nested_dags_simple():
     )
 
 
-def test__build__nested_dags_complex():
+@pytest.mark.parametrize("lazy", [False, True])
+def test__build__nested_dags_complex(lazy):
     @dsl.task()
     def generate_seed() -> int:
         return 100
@@ -501,7 +502,7 @@ def test__build__nested_dags_complex():
         print_number(multiplied_number)
 
     verify_dags_are_equivalent(
-        dsl.build(outer_dag),
+        dsl.build(outer_dag, lazy=lazy),
         DAG(
             inputs={
                 "multiplier": FromParam("multiplier"),
@@ -746,7 +747,8 @@ def test__build__map_reduce():
     )
 
 
-def test__build__nested_map_reduce():
+@pytest.mark.parametrize("lazy", [False, True])
+def test__build__nested_map_reduce(lazy):
     @dsl.task()
     def generate_numbers(partitions):
         return list(range(partitions))
@@ -778,7 +780,7 @@ def test__build__nested_map_reduce():
         )
 
     verify_dags_are_equivalent(
-        dsl.build(dag),
+        dsl.build(dag, lazy=lazy),
         DAG(
             inputs={
                 "exponent": FromParam("exponent"),
@@ -976,3 +978,63 @@ def test__dag__with_default_values_for_nested_dags():
             },
         ),
     )
+
+
+def test__build__lazy__only_builds_the_nested_dags_that_are_accessed():
+    built = []
+
+    @dsl.task()
+    def f(x):
+        return x
+
+    def nested(name, child=None):
+        def build_func(x):
+            built.append(name)
+            return child(x) if child else f(x)
+
+        build_func.__name__ = name
+        return dsl.DAG()(build_func)
+
+    level_3 = nested("level_3")
+    level_2_a = nested("level_2_a", child=level_3)
+    level_2_b = nested("level_2_b", child=level_3)
+    level_1 = nested("level_1", child=level_2_a)
+
+    @dsl.DAG()
+    def dag(x):
+        return level_2_b(level_1(x))
+
+    built_dag = dsl.build(dag, lazy=True)
+    # Outputs of DAGs referenced by other nodes are needed to validate the DAG,
+    # but their nodes are not built
+    assert built == ["level_1", "level_2_b"]
+
+    from dagger.runtime.cli.nested_nodes import find_nested_node
+
+    task = find_nested_node(built_dag, ["level-1", "level-2-a", "level-3", "f"])
+    assert task.node.func == f.func
+    assert built == ["level_1", "level_2_b", "level_2_a", "level_3"]
+
+    assert built_dag == dsl.build(dag)
+
+
+def test__build__lazy__defers_errors_in_nested_dags():
+    @dsl.task()
+    def f():
+        pass
+
+    @dsl.DAG()
+    def empty_dag():
+        pass
+
+    @dsl.DAG()
+    def dag():
+        f()
+        empty_dag()
+
+    built_dag = dsl.build(dag, lazy=True)
+
+    with pytest.raises(ValueError) as e:
+        built_dag.nodes["empty-dag"].nodes
+
+    assert str(e.value) == "A DAG needs to contain at least one node"
@@ -0,0 +1,88 @@
+import pickle
+
+from dagger.dag import DAG
+from dagger.dsl.lazy_dag import LazyDAG
+from dagger.input import FromNodeOutput, FromParam
+from dagger.output import FromReturnValue
+from dagger.task import Task
+
+
+def identity(x):
+    return x
+
+
+def build_counting_calls(calls):
+    def build_outputs():
+        calls.append("outputs")
+        return {"y": FromNodeOutput("f", "y")}
+
+    def build_dag():
+        calls.append("dag")
+        return DAG(
+            nodes={
+                "f": Task(
+                    identity,
+                    inputs={"x": FromParam()},
+                    outputs={"y": FromReturnValue()},
+                ),
+            },
+            inputs={"x": FromParam()},
+            outputs={"y": FromNodeOutput("f", "y")},
+            runtime_options={"my": "option"},
+        )
+
+    return LazyDAG(
+        inputs={"x": FromParam()},
+        runtime_options={"my": "option"},
+        partition_by_input=None,
+        build_outputs=build_outputs,
+        build_dag=build_dag,
+    )
+
+
+def test__properties_known_upfront_do_not_build_the_dag():
+    calls = []
+    dag = build_counting_calls(calls)
+
+    assert dag.inputs == {"x": FromParam()}
+    assert dag.runtime_options == {"my": "option"}
+    assert dag.partition_by_input is None
+    assert not dag.is_built
+    assert repr(dag).startswith("LazyDAG(inputs=")
+    assert calls == []
+
+
+def test__outputs_do_not_build_the_dag():
+    calls = []
+    dag = build_counting_calls(calls)
+
+    assert dag.outputs == {"y": FromNodeOutput("f", "y")}
+    assert dag.outputs == {"y": FromNodeOutput("f", "y")}
+    assert not dag.is_built
+    assert calls == ["outputs"]
+
+
+def test__nodes_build_the_dag_once():
+    calls = []
+    dag = build_counting_calls(calls)
+
+    assert list(dag.nodes) == ["f"]
+    assert dag.node_execution_order == [{"f"}]
+    assert dag.outputs == {"y": FromNodeOutput("f", "y")}
+    assert dag.is_built
+    assert calls == ["dag"]
+    assert repr(dag) == repr(dag.dag)
+
+
+def test__equivalence_with_eager_dags():
+    dag = build_counting_calls([])
+    assert dag == dag.dag
+    assert dag.dag == build_counting_calls([])
+
+
+def test__pickles_as_a_regular_dag():
+    dag = build_counting_calls([])
+
+    unpickled = pickle.loads(pickle.dumps(dag))
+    assert type(unpickled) is DAG
+    assert unpickled == dag
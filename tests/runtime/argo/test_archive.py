@@ -0,0 +1,39 @@
+import pytest
+
+from dagger.runtime.argo.archive import ArtifactArchive, archive_strategy
+
+
+def test__artifact_archive__representation():
+    assert (
+        repr(ArtifactArchive(compression_level=6))
+        == "ArtifactArchive(compression_level=6)"
+    )
+
+
+def test__artifact_archive__eq():
+    archive = ArtifactArchive(compression_level=6)
+
+    assert archive == ArtifactArchive(compression_level=6)
+    assert archive != ArtifactArchive(compression_level=1)
+    assert archive != ArtifactArchive()
+
+
+def test__artifact_archive__with_invalid_compression_level():
+    for compression_level in [-1, 10, 2.5, True, "6"]:
+        with pytest.raises(ValueError) as e:
+            ArtifactArchive(compression_level=compression_level)
+
+        assert (
+            str(e.value)
+            == f"The compression level of an artifact must be an integer between 0 and 9. However, it was set to {repr(compression_level)}."
+        )
+
+
+def test__archive_strategy():
+    assert archive_strategy(ArtifactArchive()) == {"none": {}}
+    assert archive_strategy(ArtifactArchive(compression_level=0)) == {
+        "tar": {"compressionLevel": 0}
+    }
+    assert archive_strategy(ArtifactArchive(compression_level=9)) == {
+        "tar": {"compressionLevel": 9}
+    }
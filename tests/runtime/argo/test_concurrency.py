@@ -0,0 +1,68 @@
+import pytest
+
+from dagger.runtime.argo.concurrency import Concurrency, Semaphore, synchronization
+
+
+def test__semaphore__representation():
+    assert (
+        repr(Semaphore(config_map_name="my-limits", key="database"))
+        == "Semaphore(config_map_name=my-limits, key=database)"
+    )
+
+
+def test__semaphore__eq():
+    semaphore = Semaphore(config_map_name="my-limits", key="database")
+
+    assert semaphore == Semaphore(config_map_name="my-limits", key="database")
+    assert semaphore != Semaphore(config_map_name="my-limits", key="api")
+    assert semaphore != Semaphore(config_map_name="other-limits", key="database")
+
+
+def test__concurrency__representation():
+    concurrency = Concurrency(
+        max_partitions=10,
+        semaphore=Semaphore(config_map_name="my-limits", key="database"),
+    )
+
+    assert (
+        repr(concurrency)
+        == "Concurrency(max_partitions=10, semaphore=Semaphore(config_map_name=my-limits, key=database))"
+    )
+
+
+def test__concurrency__eq():
+    semaphore = Semaphore(config_map_name="my-limits", key="database")
+    concurrency = Concurrency(max_partitions=10, semaphore=semaphore)
+
+    assert concurrency == Concurrency(max_partitions=10, semaphore=semaphore)
+    assert concurrency != Concurrency(max_partitions=10)
+    assert concurrency != Concurrency(max_partitions=5, semaphore=semaphore)
+
+
+def test__concurrency__with_invalid_max_partitions():
+    for max_partitions in [0, -1, 2.5, True]:
+        with pytest.raises(ValueError) as e:
+            Concurrency(max_partitions=max_partitions)
+
+        assert (
+            str(e.value)
+            == f"The maximum number of concurrent partitions must be a positive integer. However, it was set to {repr(max_partitions)}."
+        )
+
+
+def test__concurrency__with_invalid_semaphore():
+    with pytest.raises(TypeError) as e:
+        Concurrency(semaphore={"name": "my-limits", "key": "database"})
+
+    assert (
+        str(e.value)
+        == "The semaphore must be of type 'Semaphore'. However, it was of type 'dict'."
+    )
+
+
+def test__synchronization():
+    assert synchronization(Semaphore(config_map_name="my-limits", key="database")) == {
+        "semaphore": {
+            "configMapKeyRef": {"name": "my-limits", "key": "database"},
+        },
+    }
@@ -0,0 +1,209 @@
+import json
+
+from dagger.dag import DAG
+from dagger.input import FromNodeOutput, FromParam
+from dagger.output import FromReturnValue
+from dagger.runtime.argo import (
+    Cron,
+    Metadata,
+    Workflow,
+    cron_workflow_manifest,
+    manifest_sizes,
+    split_manifest,
+    workflow_manifest,
+)
+from dagger.task import Task
+
+
+def _nested_dag() -> DAG:
+    return DAG(
+        nodes={
+            "double": Task(
+                lambda x: x * 2,
+                inputs={"x": FromParam()},
+                outputs={"y": FromReturnValue()},
+            ),
+        },
+        inputs={"x": FromParam()},
+        outputs={"y": FromNodeOutput("double", "y")},
+    )
+
+
+def _dag() -> DAG:
+    return DAG(
+        nodes={
+            "first": _nested_dag(),
+            "second": DAG(
+                nodes={"inner": _nested_dag()},
+                inputs={"x": FromParam()},
+                outputs={"y": FromNodeOutput("inner", "y")},
+            ),
+        },
+        inputs={"x": FromParam()},
+    )
+
+
+def test__split_manifest__moves_nested_dags_into_workflow_templates():
+    manifest = workflow_manifest(
+        _dag(),
+        metadata=Metadata(name="my-pipeline", namespace="my-namespace"),
+        workflow=Workflow(container_image="my-image", params={"x": 1}),
+    )
+
+    manifests = split_manifest(manifest)
+
+    assert [(m["kind"], m["metadata"]) for m in manifests] == [
+        (
+            "WorkflowTemplate",
+            {"name": "my-pipeline-dag-first", "namespace": "my-namespace"},
+        ),
+        (
+            "WorkflowTemplate",
+            {"name": "my-pipeline-dag-second", "namespace": "my-namespace"},
+        ),
+        (
+            "WorkflowTemplate",
+            {"name": "my-pipeline-dag-second-inner", "namespace": "my-namespace"},
+        ),
+        ("Workflow", {"name": "my-pipeline", "namespace": "my-namespace"}),
+    ]
+
+    first, second, inner, main = manifests
+    assert [t["name"] for t in first["spec"]["templates"]] == [
+        "dag-first",
+        "dag-first-double",
+    ]
+    assert [t["name"] for t in second["spec"]["templates"]] == ["dag-second"]
+    assert second["spec"]["templates"][0]["dag"]["tasks"][0]["templateRef"] == {
+        "name": "my-pipeline-dag-second-inner",
+        "template": "dag-second-inner",
+    }
+    assert [t["name"] for t in inner["spec"]["templates"]] == [
+        "dag-second-inner",
+        "dag-second-inner-double",
+    ]
+
+    assert main["spec"]["entrypoint"] == "dag"
+    assert main["spec"]["arguments"] == manifest["spec"]["arguments"]
+    assert [t["name"] for t in main["spec"]["templates"]] == ["dag"]
+    first_task, second_task = main["spec"]["templates"][0]["dag"]["tasks"]
+    assert "template" not in first_task
+    assert first_task["templateRef"] == {
+        "name": "my-pipeline-dag-first",
+        "template": "dag-first",
+    }
+    assert first_task["arguments"] == (
+        manifest["spec"]["templates"][0]["dag"]["tasks"][0]["arguments"]
+    )
+
+
+def test__split_manifest__does_not_modify_the_original_manifest():
+    manifest = workflow_manifest(
+        _dag(),
+        metadata=Metadata(name="my-pipeline"),
+        workflow=Workflow(container_image="my-image", params={"x": 1}),
+    )
+    original = json.loads(json.dumps(manifest))
+
+    split_manifest(manifest)
+
+    assert manifest == original
+
+
+def test__split_manifest__stores_shared_dag_templates_once():
+    dag = DAG(
+        nodes={"first": _nested_dag(), "second": _nested_dag()},
+        inputs={"x": FromParam()},
+    )
+    manifest = workflow_manifest(
+        dag,
+        metadata=Metadata(name="my-pipeline"),
+        workflow=Workflow(
+            container_image="my-image",
+            params={"x": 1},
+            deduplicate_templates=True,
+        ),
+    )
+
+    manifests = split_manifest(manifest)
+
+    assert [m["metadata"]["name"] for m in manifests] == [
+        "my-pipeline-dag-first",
+        "my-pipeline",
+    ]
+    tasks = manifests[-1]["spec"]["templates"][0]["dag"]["tasks"]
+    assert [task["templateRef"]["name"] for task in tasks] == [
+        "my-pipeline-dag-first",
+        "my-pipeline-dag-first",
+    ]
+
+
+def test__split_manifest__with_cluster_scope():
+    manifest = workflow_manifest(
+        _dag(),
+        metadata=Metadata(name="my-pipeline", namespace="my-namespace"),
+        workflow=Workflow(container_image="my-image", params={"x": 1}),
+    )
+
+    manifests = split_manifest(manifest, cluster_scope=True)
+
+    assert manifests[0]["kind"] == "ClusterWorkflowTemplate"
+    assert manifests[0]["metadata"] == {"name": "my-pipeline-dag-first"}
+    assert manifests[-1]["spec"]["templates"][0]["dag"]["tasks"][0]["templateRef"] == {
+        "name": "my-pipeline-dag-first",
+        "template": "dag-first",
+        "clusterScope": True,
+    }
+
+
+def test__split_manifest__of_a_cron_workflow():
+    manifest = cron_workflow_manifest(
+        _dag(),
+        metadata=Metadata(name="my-pipeline", generate_name_from_prefix=True),
+        workflow=Workflow(container_image="my-image", params={"x": 1}),
+        cron=Cron(schedule="0 0 * * *"),
+    )
+
+    manifests = split_manifest(manifest)
+
+    assert manifests[0]["metadata"] == {"name": "my-pipeline-dag-first"}
+    main = manifests[-1]
+    assert main["kind"] == "CronWorkflow"
+    assert main["spec"]["schedule"] == "0 0 * * *"
+    assert [t["name"] for t in main["spec"]["workflowSpec"]["templates"]] == ["dag"]
+
+
+def test__split_manifest__with_names_that_are_not_valid_object_names():
+    dag = DAG(nodes={"My-DAG": _nested_dag()}, inputs={"x": FromParam()})
+    manifest = workflow_manifest(
+        dag,
+        metadata=Metadata(name="my-pipeline"),
+        workflow=Workflow(container_image="my-image", params={"x": 1}),
+    )
+
+    name = split_manifest(manifest)[0]["metadata"]["name"]
+
+    assert name.startswith("my-pipeline-dag-my-dag-")
+    assert len(name) == len("my-pipeline-dag-my-dag-") + 8
+
+
+def test__manifest_sizes():
+    manifest = workflow_manifest(
+        _dag(),
+        metadata=Metadata(name="my-pipeline"),
+        workflow=Workflow(container_image="my-image", params={"x": 1}),
+    )
+    manifests = split_manifest(manifest)
+
+    sizes = manifest_sizes(manifests)
+
+    assert list(sizes) == [
+        "WorkflowTemplate/my-pipeline-dag-first",
+        "WorkflowTemplate/my-pipeline-dag-second",
+        "WorkflowTemplate/my-pipeline-dag-second-inner",
+        "Workflow/my-pipeline",
+    ]
+    assert sizes["Workflow/my-pipeline"] == len(
+        json.dumps(manifests[-1], separators=(",", ":"))
+    )
+    assert max(sizes.values()) < manifest_sizes([manifest])["Workflow/my-pipeline"]
@@ -0,0 +1,143 @@
+import io
+import json
+
+import pytest
+import yaml
+
+from dagger.dag import DAG
+from dagger.input import FromNodeOutput, FromParam
+from dagger.output import FromReturnValue
+from dagger.runtime.argo import Metadata, Workflow, workflow_manifest, write_manifest
+from dagger.task import Task
+
+
+def _dag() -> DAG:
+    return DAG(
+        nodes={
+            "double": Task(
+                lambda x: x * 2,
+                inputs={"x": FromParam()},
+                outputs={"y": FromReturnValue()},
+            ),
+            "nested": DAG(
+                nodes={
+                    "square": Task(
+                        lambda x: x ** 2,
+                        inputs={"x": FromParam()},
+                        outputs={"y": FromReturnValue()},
+                    ),
+                },
+                inputs={"x": FromNodeOutput("double", "y")},
+                outputs={"y": FromNodeOutput("square", "y")},
+            ),
+        },
+        inputs={"x": FromParam()},
+        outputs={"y": FromNodeOutput("nested", "y")},
+    )
+
+
+def _manifest(lazy_templates: bool = False):
+    return workflow_manifest(
+        _dag(),
+        metadata=Metadata(name="my-workflow", labels={"app": "dagger"}),
+        workflow=Workflow(
+            container_image="my-image",
+            container_entrypoint_to_dag_cli=["python", "dag.py"],
+            params={"x": 2},
+        ),
+        lazy_templates=lazy_templates,
+    )
+
+
+def test__write_manifest__as_yaml():
+    f = io.StringIO()
+
+    size = write_manifest(_manifest(lazy_templates=True), f)
+
+    assert yaml.safe_load(f.getvalue()) == _manifest()
+    assert size == len(f.getvalue())
+    assert f.getvalue().startswith("apiVersion: argoproj.io/v1alpha1\nkind: Workflow\n")
+
+
+def test__write_manifest__as_json():
+    f = io.StringIO()
+
+    size = write_manifest(_manifest(lazy_templates=True), f, format="json")
+
+    assert json.loads(f.getvalue()) == _manifest()
+    assert size == len(f.getvalue())
+    assert f.getvalue() == json.dumps(_manifest(), separators=(",", ":"))
+
+
+def test__write_manifest__with_values_that_need_quoting():
+    manifest = {
+        "strings": [
+            "",
+            "true",
+            "No",
+            "null",
+            "1",
+            "1.5",
+            "-x",
+            "a: b",
+            "{{inputs.parameters.x}}",
+            "line\nbreak",
+            "ünicode",
+            "# comment",
+        ],
+        "scalars": [None, True, False, 0, -1, 2.5],
+        "empty": {"mapping": {}, "list": [], "iterator": iter([])},
+        "nested": [[1, [2]], [], {}, {"a": [{"b": None}]}],
+        "tuple": (1, 2),
+        "quoted key: {}": "value",
+    }
+    expected = {
+        **manifest,
+        "empty": {"mapping": {}, "list": [], "iterator": []},
+        "tuple": [1, 2],
+    }
+
+    for format, load in [("yaml", yaml.safe_load), ("json", json.loads)]:
+        f = io.StringIO()
+        size = write_manifest(
+            {**manifest, "empty": {**manifest["empty"], "iterator": iter([])}},
+            f,
+            format=format,
+        )
+        assert load(f.getvalue()) == expected
+        assert size == len(f.getvalue().encode("utf-8"))
+
+
+def test__write_manifest__stops_consuming_the_manifest_when_it_exceeds_the_max_size():
+    templates = iter([{"name": f"template-{i}"} for i in range(1000)])
+    f = io.StringIO()
+
+    with pytest.raises(ValueError) as e:
+        write_manifest({"templates": templates}, f, max_size=100)
+
+    assert (
+        str(e.value)
+        == "The manifest exceeds the maximum size of 100 bytes. It was not written completely."
+    )
+    assert len(list(templates)) > 900
+    assert len(f.getvalue()) <= 100
+
+
+def test__write_manifest__within_the_max_size():
+    manifest = {"kind": "Workflow"}
+    f = io.StringIO()
+
+    size = write_manifest(manifest, f, max_size=15)
+
+    assert size == 15
+    assert f.getvalue() == "kind: Workflow\n"
+
+
+def test__write_manifest__with_an_unsupported_format():
+    with pytest.raises(ValueError) as e:
+        write_manifest({}, io.StringIO(), format="toml")
+
+    assert (
+        str(e.value)
+        == "Manifests can only be written in one of the following formats: ['yaml', 'json']. However, the format 'toml' was requested."
+    )
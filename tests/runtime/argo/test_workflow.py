@@ -1,4 +1,8 @@
+import pytest
+
+from dagger.runtime.argo.archive import ArtifactArchive
 from dagger.runtime.argo.workflow import Workflow
+from dagger.serializer import AsJSON
 
 
 def test__workflow__representation():
@@ -14,7 +18,7 @@ def test__workflow__representation():
     )
     assert (
         repr(workflow)
-        == f"Workflow(container_image=my-image:tag, container_entrypoint_to_dag_cli={repr(container_entrypoint)}, params={repr(params)}, extra_spec_options={repr(extra_spec_options)})"
+        == f"Workflow(container_image=my-image:tag, container_entrypoint_to_dag_cli={repr(container_entrypoint)}, params={repr(params)}, extra_spec_options={repr(extra_spec_options)}, deduplicate_templates=False, partition_fan_out=withParam, fuse_tasks=False, artifact_archives={{}})"
     )
 
 
@@ -30,9 +34,57 @@ def test__workflow__eq():
         extra_spec_options=extra_spec_options,
     )
     assert workflow != Workflow(container_image=container_image)
+    assert workflow != Workflow(
+        container_image=container_image,
+        container_entrypoint_to_dag_cli=container_entrypoint,
+        params=params,
+        extra_spec_options=extra_spec_options,
+        deduplicate_templates=True,
+    )
+    assert workflow != Workflow(
+        container_image=container_image,
+        container_entrypoint_to_dag_cli=container_entrypoint,
+        params=params,
+        extra_spec_options=extra_spec_options,
+        partition_fan_out="withSequence",
+    )
+    assert workflow != Workflow(
+        container_image=container_image,
+        container_entrypoint_to_dag_cli=container_entrypoint,
+        params=params,
+        extra_spec_options=extra_spec_options,
+        fuse_tasks=True,
+    )
+    assert workflow != Workflow(
+        container_image=container_image,
+        container_entrypoint_to_dag_cli=container_entrypoint,
+        params=params,
+        extra_spec_options=extra_spec_options,
+        artifact_archives={AsJSON: ArtifactArchive(compression_level=6)},
+    )
     assert workflow == Workflow(
         container_image=container_image,
         container_entrypoint_to_dag_cli=container_entrypoint,
         params=params,
         extra_spec_options=extra_spec_options,
     )
+
+
+def test__workflow__with_unsupported_partition_fan_out():
+    with pytest.raises(ValueError) as e:
+        Workflow(container_image="my-image", partition_fan_out="withItems")
+
+    assert (
+        str(e.value)
+        == "Partition fan-out 'withItems' is not supported. These are the options available: ['withParam', 'withSequence']"
+    )
+
+
+def test__workflow__with_invalid_artifact_archive():
+    with pytest.raises(TypeError) as e:
+        Workflow(container_image="my-image", artifact_archives={AsJSON: 6})
+
+    assert (
+        str(e.value)
+        == "The artifact archive for serializer 'AsJSON' must be of type 'ArtifactArchive'. However, it was of type 'int'."
+    )
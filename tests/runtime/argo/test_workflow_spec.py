@@ -1,10 +1,19 @@
+from typing import Iterator
+
 import pytest
 
 from dagger.dag import DAG
 from dagger.input import FromNodeOutput, FromParam
-from dagger.output import FromReturnValue
+from dagger.output import FromKey, FromReturnValue
+from dagger.runtime.argo.archive import ArtifactArchive
+from dagger.runtime.argo.concurrency import Concurrency, Semaphore
 from dagger.runtime.argo.workflow import Workflow
-from dagger.runtime.argo.workflow_spec import _dag_task_with_param, workflow_spec
+from dagger.runtime.argo.workflow_spec import (
+    _dag_output_names,
+    _dag_task_with_param,
+    workflow_spec,
+)
+from dagger.serializer import AsBytes, AsJSON, AsPickle
 from dagger.task import Task
 
 #
@@ -508,6 +517,23 @@ def test__workflow_spec__with_workflow_spec_overrides():
     }
 
 
+def test__workflow_spec__with_lazy_templates():
+    extra_template = {"name": "extra", "container": {"image": "my-image"}}
+    workflow = Workflow(
+        container_image="my-image",
+        extra_spec_options={"templates": [extra_template]},
+    )
+    dag = DAG({"n": Task(lambda: 1)})
+
+    spec = workflow_spec(dag, workflow, lazy_templates=True)
+
+    assert isinstance(spec["templates"], Iterator)
+    assert {**spec, "templates": list(spec["templates"])} == workflow_spec(
+        dag, workflow
+    )
+    assert workflow_spec(dag, workflow)["templates"][-1] == extra_template
+
+
 def test__dag_task_with_param():
     assert (
         _dag_task_with_param("my-input", FromParam("parent-input"))
@@ -523,3 +549,1113 @@ def test__dag_task_with_param():
         )
         == "{{tasks.another-node.outputs.parameters.another-output_partitions}}"
     )
+
+
+def test__dag_output_names():
+    assert _dag_output_names(
+        {
+            "a": FromNodeOutput("n1", "x"),
+            "b": FromNodeOutput("n2", "x"),
+            "c": FromNodeOutput("n1", "x"),
+            "d": FromNodeOutput("n1", "y"),
+        }
+    ) == {
+        ("n1", "x"): "a",
+        ("n2", "x"): "b",
+        ("n1", "y"): "d",
+    }
+
+
+def test__workflow_spec__with_directory_artifacts():
+    from dagger.serializer import AsDirectory
+
+    workflow = Workflow(
+        container_image="my-image",
+        container_entrypoint_to_dag_cli=["my", "dag", "entrypoint"],
+    )
+    dag = DAG(
+        {
+            "produce": Task(
+                lambda: "/my/dataset",
+                outputs=dict(dataset=FromReturnValue(serializer=AsDirectory())),
+            ),
+            "consume": Task(
+                lambda dataset: None,
+                inputs=dict(
+                    dataset=FromNodeOutput(
+                        "produce", "dataset", serializer=AsDirectory()
+                    ),
+                ),
+            ),
+        }
+    )
+
+    spec = workflow_spec(dag, workflow)
+    templates = {template["name"]: template for template in spec["templates"]}
+
+    output_artifacts = templates["dag-produce"]["outputs"]["artifacts"]
+    assert [artifact["path"] for artifact in output_artifacts] == [
+        "/tmp/outputs/dataset.tar"
+    ]
+    assert output_artifacts[0]["archive"] == {"none": {}}
+
+    input_artifacts = templates["dag-consume"]["inputs"]["artifacts"]
+    assert [artifact["path"] for artifact in input_artifacts] == [
+        "/tmp/inputs/dataset.tar"
+    ]
+
+
+def test__workflow_spec__with_deduplicate_templates__shares_identical_task_templates():
+    workflow = Workflow(
+        container_image="my-image",
+        deduplicate_templates=True,
+    )
+    dag = DAG(
+        {
+            "g-1": Task(lambda: 1),
+            "g-2": Task(lambda: 2),
+            "h": Task(
+                lambda: 3,
+                runtime_options={
+                    "argo_template_overrides": {"activeDeadlineSeconds": 10}
+                },
+            ),
+        }
+    )
+
+    assert workflow_spec(dag, workflow) == {
+        "entrypoint": "dag",
+        "templates": [
+            {
+                "name": "dag",
+                "inputs": {
+                    "parameters": [
+                        {"name": "name", "value": "dag"},
+                    ],
+                },
+                "dag": {
+                    "tasks": [
+                        {
+                            "name": "g-1",
+                            "template": "dag-g-1",
+                            "arguments": {
+                                "parameters": [
+                                    {"name": "node_name", "value": "g-1"},
+                                ],
+                            },
+                        },
+                        {
+                            "name": "g-2",
+                            "template": "dag-g-1",
+                            "arguments": {
+                                "parameters": [
+                                    {"name": "node_name", "value": "g-2"},
+                                ],
+                            },
+                        },
+                        {
+                            "name": "h",
+                            "template": "dag-h",
+                        },
+                    ],
+                },
+            },
+            {
+                "name": "dag-g-1",
+                "container": {
+                    "image": workflow.container_image,
+                    "args": [
+                        "--node-name",
+                        "{{inputs.parameters.node_name}}",
+                    ],
+                },
+                "inputs": {
+                    "parameters": [
+                        {"name": "node_name"},
+                    ],
+                },
+            },
+            {
+                "name": "dag-h",
+                "container": {
+                    "image": workflow.container_image,
+                    "args": [
+                        "--node-name",
+                        "h",
+                    ],
+                },
+                "activeDeadlineSeconds": 10,
+            },
+        ],
+    }
+
+
+def test__workflow_spec__with_deduplicate_templates__shares_identical_dag_templates():
+    workflow = Workflow(
+        container_image="my-image",
+        deduplicate_templates=True,
+    )
+
+    def inner_dag():
+        return DAG(
+            {
+                "produce": Task(lambda: 1, outputs={"x": FromReturnValue()}),
+                "consume": Task(
+                    lambda x: x,
+                    inputs={"x": FromNodeOutput("produce", "x")},
+                ),
+            },
+            outputs={"x": FromNodeOutput("produce", "x")},
+        )
+
+    dag = DAG(
+        {
+            "first": inner_dag(),
+            "second": inner_dag(),
+            "last": Task(
+                lambda y: y,
+                inputs={"y": FromNodeOutput("second", "x")},
+            ),
+        }
+    )
+
+    spec = workflow_spec(dag, workflow)
+    templates = {template["name"]: template for template in spec["templates"]}
+
+    assert list(templates) == [
+        "dag",
+        "dag-first",
+        "dag-first-produce",
+        "dag-first-consume",
+        "dag-last",
+    ]
+
+    root_tasks = templates["dag"]["dag"]["tasks"]
+    assert [task["template"] for task in root_tasks] == [
+        "dag-first",
+        "dag-first",
+        "dag-last",
+    ]
+    assert [task["arguments"]["parameters"][0] for task in root_tasks[:2]] == [
+        {"name": "node_name", "value": "first"},
+        {"name": "node_name", "value": "second"},
+    ]
+
+    assert templates["dag-first"]["inputs"]["parameters"][0] == {"name": "node_name"}
+    assert [
+        task["arguments"]["parameters"][0]
+        for task in templates["dag-first"]["dag"]["tasks"]
+    ] == [
+        {"name": "node_name", "value": "{{inputs.parameters.node_name}}.produce"},
+        {"name": "node_name", "value": "{{inputs.parameters.node_name}}.consume"},
+    ]
+    assert templates["dag-last"]["container"]["args"][:2] == ["--node-name", "last"]
+
+
+def test__workflow_spec__with_deduplicate_templates__without_identical_templates():
+    dag = DAG(
+        {
+            "a": Task(lambda: 1, outputs={"x": FromReturnValue()}),
+            "b": Task(lambda x: x, inputs={"x": FromNodeOutput("a", "x")}),
+        }
+    )
+
+    assert workflow_spec(
+        dag, Workflow(container_image="my-image", deduplicate_templates=True)
+    ) == workflow_spec(dag, Workflow(container_image="my-image"))
+
+
+def test__workflow_spec__with_sequence_partition_fan_out():
+    workflow = Workflow(
+        container_image="my-image",
+        partition_fan_out="withSequence",
+    )
+    dag = DAG(
+        {
+            "split": Task(
+                lambda: [1, 2, 3],
+                outputs={"numbers": FromReturnValue(is_partitioned=True)},
+            ),
+            "square": Task(
+                lambda number: number**2,
+                inputs={"number": FromNodeOutput("split", "numbers")},
+                outputs={"square": FromReturnValue()},
+                partition_by_input="number",
+            ),
+        }
+    )
+
+    spec = workflow_spec(dag, workflow)
+    templates = {template["name"]: template for template in spec["templates"]}
+
+    assert templates["dag-split"]["outputs"]["parameters"] == [
+        {
+            "name": "numbers_partition_count",
+            "valueFrom": {
+                "path": "{{outputs.artifacts.numbers.path}}/partition_count",
+            },
+        },
+    ]
+
+    square_task = templates["dag"]["dag"]["tasks"][1]
+    assert "withParam" not in square_task
+    assert square_task["withSequence"] == {
+        "count": "{{tasks.split.outputs.parameters.numbers_partition_count}}",
+    }
+    assert square_task["arguments"]["artifacts"] == [
+        {
+            "name": "number",
+            "s3": {
+                "key": "{{workflow.uid}}/{{inputs.parameters.name}}/split/numbers.json/{{item}}",
+            },
+        },
+    ]
+
+
+def test__workflow_spec__with_fuse_tasks__fuses_chains_of_tasks():
+    workflow = Workflow(container_image="my-image", params={"x": 1}, fuse_tasks=True)
+    dag = DAG(
+        inputs={"x": FromParam()},
+        nodes={
+            "double": Task(
+                lambda x: x * 2,
+                inputs={"x": FromParam()},
+                outputs={"x": FromReturnValue()},
+            ),
+            "increment": Task(
+                lambda x, y: x + y,
+                inputs={"x": FromNodeOutput("double", "x"), "y": FromParam("x")},
+                outputs={"x": FromReturnValue()},
+            ),
+            "report": Task(
+                lambda x: x,
+                inputs={"x": FromNodeOutput("increment", "x")},
+            ),
+            "log": Task(
+                lambda x: x,
+                inputs={"x": FromNodeOutput("increment", "x")},
+            ),
+        },
+    )
+
+    spec = workflow_spec(dag, workflow)
+    templates = {template["name"]: template for template in spec["templates"]}
+
+    assert sorted(templates) == ["dag", "dag-log", "dag-report", "fused-double"]
+    assert templates["dag"]["dag"]["tasks"][0] == {
+        "name": "increment",
+        "template": "fused-double",
+        "arguments": {
+            "parameters": [
+                {
+                    "name": "increment_x_output_path",
+                    "value": "{{workflow.uid}}/{{inputs.parameters.name}}/increment/x.json",
+                },
+            ],
+            "artifacts": [
+                {"name": "double_x", "from": "{{inputs.artifacts.x}}"},
+                {"name": "increment_y", "from": "{{inputs.artifacts.x}}"},
+            ],
+        },
+    }
+    assert templates["dag"]["dag"]["tasks"][1]["dependencies"] == ["increment"]
+    assert templates["fused-double"] == {
+        "name": "fused-double",
+        "container": {
+            "image": "my-image",
+            "args": [
+                "--node-name",
+                "double",
+                "--node-name",
+                "increment",
+                "--input",
+                "double.x",
+                "{{inputs.artifacts.double_x.path}}",
+                "--input",
+                "increment.y",
+                "{{inputs.artifacts.increment_y.path}}",
+                "--output",
+                "increment.x",
+                "{{outputs.artifacts.increment_x.path}}",
+            ],
+            "volumeMounts": [{"name": "outputs", "mountPath": "/tmp/outputs"}],
+        },
+        "inputs": {
+            "parameters": [{"name": "increment_x_output_path"}],
+            "artifacts": [
+                {"name": "double_x", "path": "/tmp/inputs/double_x.json"},
+                {"name": "increment_y", "path": "/tmp/inputs/increment_y.json"},
+            ],
+        },
+        "outputs": {
+            "artifacts": [
+                {
+                    "name": "increment_x",
+                    "path": "/tmp/outputs/increment_x.json",
+                    "archive": {"none": {}},
+                    "s3": {"key": "{{inputs.parameters.increment_x_output_path}}"},
+                },
+            ],
+        },
+        "volumes": [{"name": "outputs", "emptyDir": {}}],
+    }
+
+
+def test__workflow_spec__with_fuse_tasks__only_fuses_compatible_tasks():
+    workflow = Workflow(container_image="my-image", fuse_tasks=True)
+    dag = DAG(
+        nodes={
+            "split": Task(
+                lambda: [1, 2],
+                outputs={"numbers": FromReturnValue(is_partitioned=True)},
+            ),
+            "square": Task(
+                lambda number: number**2,
+                inputs={"number": FromNodeOutput("split", "numbers")},
+                outputs={"square": FromReturnValue()},
+                partition_by_input="number",
+            ),
+            "sum": Task(
+                lambda squares: sum(squares),
+                inputs={"squares": FromNodeOutput("square", "square")},
+                outputs={"sum": FromReturnValue()},
+            ),
+            "report": Task(
+                lambda x: x,
+                inputs={"x": FromNodeOutput("sum", "sum")},
+                outputs={"report": FromReturnValue()},
+                runtime_options={
+                    "argo_container_overrides": {"resources": {"cpu": "2"}}
+                },
+            ),
+            "publish": Task(
+                lambda x: x,
+                inputs={"x": FromNodeOutput("report", "report")},
+                outputs={"published": FromReturnValue()},
+            ),
+        },
+        outputs={"published": FromNodeOutput("publish", "published")},
+    )
+
+    spec = workflow_spec(dag, workflow)
+
+    assert spec == workflow_spec(dag, Workflow(container_image="my-image"))
+
+
+def test__workflow_spec__with_fuse_tasks_and_deduplicate_templates():
+    def chain():
+        return DAG(
+            nodes={
+                "first": Task(lambda: 1, outputs={"x": FromReturnValue()}),
+                "second": Task(
+                    lambda x: x,
+                    inputs={"x": FromNodeOutput("first", "x")},
+                ),
+            },
+        )
+
+    workflow = Workflow(
+        container_image="my-image",
+        fuse_tasks=True,
+        deduplicate_templates=True,
+    )
+    dag = DAG(nodes={"a": chain(), "b": chain()})
+
+    spec = workflow_spec(dag, workflow)
+
+    # Fused templates are named after their address, so they are never shared
+    assert [template["name"] for template in spec["templates"]] == [
+        "dag",
+        "dag-a",
+        "fused-a-first",
+        "dag-b",
+        "fused-b-first",
+    ]
+    assert spec["templates"][2]["container"]["args"] == [
+        "--node-name",
+        "a.first",
+        "--node-name",
+        "a.second",
+    ]
+
+
+def test__workflow_spec__with_deduplicate_templates_and_max_partitions():
+    def fan_out():
+        return DAG(
+            nodes={
+                "split": Task(
+                    lambda x: list(range(x)),
+                    inputs={"x": FromParam()},
+                    outputs={"numbers": FromReturnValue(is_partitioned=True)},
+                ),
+                "f": Task(
+                    lambda n: n * 2,
+                    inputs={"n": FromNodeOutput("split", "numbers")},
+                    outputs={"y": FromReturnValue()},
+                    partition_by_input="n",
+                    runtime_options={
+                        "argo_concurrency": Concurrency(max_partitions=2),
+                    },
+                ),
+            },
+            inputs={"x": FromParam()},
+        )
+
+    workflow = Workflow(
+        container_image="my-image",
+        params={"x": 3},
+        deduplicate_templates=True,
+    )
+    dag = DAG(nodes={"a": fan_out(), "b": fan_out()}, inputs={"x": FromParam()})
+
+    spec = workflow_spec(dag, workflow)
+    templates = {template["name"]: template for template in spec["templates"]}
+
+    assert list(templates) == [
+        "dag",
+        "dag-a",
+        "fan-out-a-f",
+        "dag-a-split",
+        "dag-a-f",
+    ]
+    assert [task["template"] for task in templates["dag"]["dag"]["tasks"]] == [
+        "dag-a",
+        "dag-a",
+    ]
+
+    f_task = templates["dag-a"]["dag"]["tasks"][1]
+    assert f_task["template"] == "fan-out-a-f"
+    assert f_task["arguments"]["parameters"][0] == {
+        "name": "node_name",
+        "value": "{{inputs.parameters.node_name}}.f",
+    }
+
+    fan_out_template = templates["fan-out-a-f"]
+    assert fan_out_template["inputs"]["parameters"][0] == {"name": "node_name"}
+    (fanned_out_task,) = fan_out_template["dag"]["tasks"]
+    assert fanned_out_task["template"] == "dag-a-f"
+    assert fanned_out_task["arguments"]["parameters"][0] == {
+        "name": "node_name",
+        "value": "{{inputs.parameters.node_name}}",
+    }
+    assert not any(
+        "inputs.parameters.node_name" in parameter["name"]
+        for parameter in fan_out_template["inputs"]["parameters"][1:]
+    )
+
+
+def test__workflow_spec__with_inlined_outputs():
+    workflow = Workflow(container_image="my-image")
+    dag = DAG(
+        {
+            "count": Task(
+                lambda: {"n": 3, "items": [1, 2, 3]},
+                outputs={"n": FromKey("n"), "items": FromKey("items")},
+                runtime_options={"argo_inline_outputs": ["n"]},
+            ),
+            "use": Task(
+                lambda n, items: items[:n],
+                inputs={
+                    "n": FromNodeOutput("count", "n"),
+                    "items": FromNodeOutput("count", "items"),
+                },
+            ),
+        }
+    )
+
+    spec = workflow_spec(dag, workflow)
+    templates = {template["name"]: template for template in spec["templates"]}
+
+    assert templates["dag-count"]["container"]["args"] == [
+        "--node-name",
+        "count",
+        "--output",
+        "n",
+        "/tmp/outputs/n.json",
+        "--output",
+        "items",
+        "{{outputs.artifacts.items.path}}",
+        "--output-max-size",
+        "n",
+        "65536",
+    ]
+    assert templates["dag-count"]["inputs"] == {
+        "parameters": [{"name": "items_output_path"}],
+    }
+    assert templates["dag-count"]["outputs"] == {
+        "parameters": [
+            {"name": "n", "valueFrom": {"path": "/tmp/outputs/n.json"}},
+        ],
+        "artifacts": [
+            {
+                "name": "items",
+                "path": "/tmp/outputs/items.json",
+                "archive": {"none": {}},
+                "s3": {"key": "{{inputs.parameters.items_output_path}}"},
+            },
+        ],
+    }
+
+    count_task, use_task = templates["dag"]["dag"]["tasks"]
+    assert count_task["arguments"] == {
+        "parameters": [
+            {
+                "name": "items_output_path",
+                "value": "{{workflow.uid}}/{{inputs.parameters.name}}/count/items.json",
+            },
+        ],
+    }
+    assert use_task["arguments"]["artifacts"] == [
+        {
+            "name": "n",
+            "raw": {"data": "{{tasks.count.outputs.parameters.n}}"},
+        },
+        {
+            "name": "items",
+            "s3": {
+                "key": "{{workflow.uid}}/{{inputs.parameters.name}}/count/items.json",
+            },
+        },
+    ]
+
+
+def test__workflow_spec__with_inlined_outputs_that_do_not_exist__fails():
+    dag = DAG(
+        {
+            "count": Task(
+                lambda: 3,
+                outputs={"n": FromReturnValue()},
+                runtime_options={"argo_inline_outputs": ["m"]},
+            ),
+        }
+    )
+
+    with pytest.raises(ValueError) as e:
+        workflow_spec(dag, Workflow(container_image="my-image"))
+
+    assert (
+        str(e.value)
+        == "Node 'count' is set to inline an output named 'm' through the 'argo_inline_outputs' runtime option. However, it only has the following outputs: ['n']"
+    )
+
+
+def test__workflow_spec__with_inlined_partitioned_outputs__fails():
+    dag = DAG(
+        {
+            "split": Task(
+                lambda: [1, 2],
+                outputs={"numbers": FromReturnValue(is_partitioned=True)},
+                runtime_options={"argo_inline_outputs": ["numbers"]},
+            ),
+        }
+    )
+
+    with pytest.raises(ValueError) as e:
+        workflow_spec(dag, Workflow(container_image="my-image"))
+
+    assert (
+        str(e.value)
+        == "Output 'numbers' of node 'split' is partitioned, so it can't be inlined as a parameter."
+    )
+
+
+def test__workflow_spec__with_inlined_binary_outputs__fails():
+    for serializer in [AsPickle(), AsBytes()]:
+        dag = DAG(
+            {
+                "train": Task(
+                    lambda: b"model",
+                    outputs={"t": FromReturnValue(serializer=serializer)},
+                    runtime_options={"argo_inline_outputs": ["t"]},
+                ),
+            }
+        )
+
+        with pytest.raises(ValueError) as e:
+            workflow_spec(dag, Workflow(container_image="my-image"))
+
+        assert (
+            str(e.value)
+            == f"Output 't' of node 'train' is serialized with {serializer}. However, Argo reads parameters as text, so only outputs serialized with AsJSON can be inlined as parameters."
+        )
+
+
+def test__workflow_spec__with_inlined_outputs_of_the_dag__fails():
+    dag = DAG(
+        nodes={
+            "count": Task(
+                lambda: 3,
+                outputs={"n": FromReturnValue()},
+                runtime_options={"argo_inline_outputs": ["n"]},
+            ),
+        },
+        outputs={"total": FromNodeOutput("count", "n")},
+    )
+
+    with pytest.raises(ValueError) as e:
+        workflow_spec(dag, Workflow(container_image="my-image"))
+
+    assert (
+        str(e.value)
+        == "Output 'n' of node 'count' is inlined as a parameter, so it can't be used as output 'total' of its DAG."
+    )
+
+
+def test__workflow_spec__with_memoized_tasks():
+    workflow = Workflow(container_image="my-image", params={"x": 1})
+    dag = DAG(
+        nodes={
+            "double": Task(
+                lambda x: x * 2,
+                inputs={"x": FromParam()},
+                outputs={"y": FromReturnValue()},
+                runtime_options={
+                    "argo_memoize": {
+                        "cache": "my-cache",
+                        "max_age": "1d",
+                        "version": "v1",
+                    },
+                },
+            ),
+            "square": Task(
+                lambda y: y ** 2,
+                inputs={"y": FromNodeOutput("double", "y")},
+                outputs={"z": FromReturnValue()},
+            ),
+        },
+        inputs={"x": FromParam()},
+        outputs={"z": FromNodeOutput("square", "z")},
+    )
+
+    spec = workflow_spec(dag, workflow)
+    templates = {template["name"]: template for template in spec["templates"]}
+
+    assert templates["dag-double"]["memoize"] == {
+        "key": "{{=sprig.sha256sum('3bfc269594ef6492' + '|' + inputs.parameters['x_digest'])}}",
+        "cache": {"configMap": {"name": "my-cache"}},
+        "maxAge": "1d",
+    }
+    assert templates["dag-double"]["inputs"]["parameters"] == [
+        {"name": "y_output_path"},
+        {"name": "x_digest"},
+    ]
+    assert templates["dag-double"]["container"]["args"][-3:] == [
+        "--output-digest",
+        "y",
+        "/tmp/outputs/y.sha256",
+    ]
+    assert templates["dag-double"]["outputs"]["parameters"] == [
+        {"name": "y_digest", "valueFrom": {"path": "/tmp/outputs/y.sha256"}},
+    ]
+    assert "memoize" not in templates["dag-square"]
+
+    double_task, square_task = templates["dag"]["dag"]["tasks"]
+    assert {
+        "name": "x_digest",
+        "value": "{{inputs.parameters.x_digest}}",
+    } in double_task["arguments"]["parameters"]
+    assert square_task["arguments"]["artifacts"] == [
+        {"name": "y", "from": "{{tasks.double.outputs.artifacts.y}}"},
+    ]
+    assert templates["dag"]["outputs"]["parameters"] == [
+        {
+            "name": "z_digest",
+            "valueFrom": {
+                "parameter": "{{tasks.square.outputs.parameters.z_digest}}",
+            },
+        },
+    ]
+
+
+def test__workflow_spec__with_memoized_tasks_without_a_cache__fails():
+    dag = DAG(
+        {
+            "count": Task(
+                lambda: 3,
+                outputs={"n": FromReturnValue()},
+                runtime_options={"argo_memoize": {"max_age": "1d"}},
+            ),
+        }
+    )
+
+    with pytest.raises(ValueError) as e:
+        workflow_spec(dag, Workflow(container_image="my-image"))
+
+    assert (
+        str(e.value)
+        == "Node 'count' is memoized through the 'argo_memoize' runtime option, but it doesn't specify the name of the ConfigMap to use as a 'cache'."
+    )
+
+
+def test__workflow_spec__with_memoized_partitioned_tasks__fails():
+    dag = DAG(
+        {
+            "split": Task(
+                lambda: [1, 2],
+                outputs={"numbers": FromReturnValue(is_partitioned=True)},
+                runtime_options={"argo_memoize": {"cache": "my-cache"}},
+            ),
+        }
+    )
+
+    with pytest.raises(ValueError) as e:
+        workflow_spec(dag, Workflow(container_image="my-image"))
+
+    assert (
+        str(e.value)
+        == "Node 'split' is partitioned or produces partitioned outputs, so it can't be memoized."
+    )
+
+
+def test__workflow_spec__with_a_memoized_task_that_reduces_partitions():
+    def map_reduce(runtime_options=None):
+        return DAG(
+            nodes={
+                "split": Task(
+                    lambda: [1, 2],
+                    outputs={"xs": FromReturnValue(is_partitioned=True)},
+                ),
+                "sq": Task(
+                    lambda x: x * x,
+                    inputs={"x": FromNodeOutput("split", "xs")},
+                    outputs={"y": FromReturnValue()},
+                    partition_by_input="x",
+                    runtime_options=runtime_options or {},
+                ),
+                "tot": Task(
+                    lambda xs: sum(xs),
+                    inputs={"xs": FromNodeOutput("sq", "y")},
+                    outputs={"total": FromReturnValue()},
+                    runtime_options={"argo_memoize": {"cache": "my-cache"}},
+                ),
+            },
+        )
+
+    spec = workflow_spec(map_reduce(), Workflow(container_image="my-image"))
+    templates = {template["name"]: template for template in spec["templates"]}
+
+    # The outputs of the partitions are only available together, so the key depends on all of them
+    split_task, sq_task, tot_task = templates["dag"]["dag"]["tasks"]
+    assert "withParam" in sq_task
+    assert {
+        "name": "xs_digest",
+        "value": "{{tasks.sq.outputs.parameters}}",
+    } in tot_task["arguments"]["parameters"]
+
+    spec = workflow_spec(
+        map_reduce({"argo_concurrency": Concurrency(max_partitions=1)}),
+        Workflow(container_image="my-image"),
+    )
+    templates = {template["name"]: template for template in spec["templates"]}
+
+    split_task, sq_task, tot_task = templates["dag"]["dag"]["tasks"]
+    assert {
+        "name": "xs_digest",
+        "value": "{{tasks.sq.outputs.parameters.y_digest}}",
+    } in tot_task["arguments"]["parameters"]
+    assert templates["fan-out-sq"]["outputs"]["parameters"] == [
+        {
+            "name": "y_digest",
+            "valueFrom": {"parameter": "{{tasks.sq.outputs.parameters}}"},
+        },
+    ]
+
+
+def test__workflow_spec__with_max_concurrent_partitions():
+    workflow = Workflow(container_image="my-image", params={"x": 3})
+    dag = DAG(
+        nodes={
+            "split": Task(
+                lambda x: list(range(x)),
+                inputs={"x": FromParam()},
+                outputs={"numbers": FromReturnValue(is_partitioned=True)},
+            ),
+            "double": Task(
+                lambda n, x: n * x,
+                inputs={"n": FromNodeOutput("split", "numbers"), "x": FromParam()},
+                outputs={"y": FromReturnValue()},
+                partition_by_input="n",
+                runtime_options={"argo_concurrency": Concurrency(max_partitions=10)},
+            ),
+        },
+        inputs={"x": FromParam()},
+    )
+
+    spec = workflow_spec(dag, workflow)
+    templates = {template["name"]: template for template in spec["templates"]}
+
+    split_task, double_task = templates["dag"]["dag"]["tasks"]
+    assert double_task == {
+        "name": "double",
+        "template": "fan-out-double",
+        "dependencies": ["split"],
+        "arguments": {
+            "parameters": [
+                {
+                    "name": "inputs-parameters-name",
+                    "value": "{{inputs.parameters.name}}",
+                },
+                {
+                    "name": "tasks-split-outputs-parameters-numbers_partitions",
+                    "value": "{{tasks.split.outputs.parameters.numbers_partitions}}",
+                },
+            ],
+            "artifacts": [
+                {"name": "inputs-artifacts-x", "from": "{{inputs.artifacts.x}}"},
+            ],
+        },
+    }
+    assert templates["fan-out-double"] == {
+        "name": "fan-out-double",
+        "parallelism": 10,
+        "inputs": {
+            "parameters": [
+                {"name": "inputs-parameters-name"},
+                {"name": "tasks-split-outputs-parameters-numbers_partitions"},
+            ],
+            "artifacts": [{"name": "inputs-artifacts-x"}],
+        },
+        "dag": {
+            "tasks": [
+                {
+                    "name": "double",
+                    "template": "dag-double",
+                    "arguments": {
+                        "parameters": [
+                            {
+                                "name": "y_output_path",
+                                "value": "{{workflow.uid}}/{{inputs.parameters.inputs-parameters-name}}/double/y.json/{{item}}",
+                            },
+                        ],
+                        "artifacts": [
+                            {
+                                "name": "n",
+                                "s3": {
+                                    "key": "{{workflow.uid}}/{{inputs.parameters.inputs-parameters-name}}/split/numbers.json/{{item}}",
+                                },
+                            },
+                            {
+                                "name": "x",
+                                "from": "{{inputs.artifacts.inputs-artifacts-x}}",
+                            },
+                        ],
+                    },
+                    "withParam": "{{inputs.parameters.tasks-split-outputs-parameters-numbers_partitions}}",
+                },
+            ],
+        },
+    }
+    assert "dag-double" in templates
+
+
+def test__workflow_spec__with_semaphores():
+    semaphore = Semaphore(config_map_name="my-limits", key="database")
+    dag = DAG(
+        nodes={
+            "inner": DAG(
+                nodes={
+                    "query": Task(
+                        lambda: 1,
+                        outputs={"n": FromReturnValue()},
+                        runtime_options={
+                            "argo_concurrency": Concurrency(semaphore=semaphore),
+                        },
+                    ),
+                },
+                runtime_options={"argo_concurrency": Concurrency(semaphore=semaphore)},
+            ),
+        },
+    )
+
+    spec = workflow_spec(dag, Workflow(container_image="my-image"))
+    templates = {template["name"]: template for template in spec["templates"]}
+
+    expected_synchronization = {
+        "semaphore": {
+            "configMapKeyRef": {"name": "my-limits", "key": "database"},
+        },
+    }
+    assert templates["dag-inner"]["synchronization"] == expected_synchronization
+    assert templates["dag-inner-query"]["synchronization"] == expected_synchronization
+    assert "synchronization" not in templates["dag"]
+
+
+def test__workflow_spec__with_max_concurrent_partitions_of_a_node_that_is_not_partitioned__fails():
+    dag = DAG(
+        {
+            "count": Task(
+                lambda: 3,
+                outputs={"n": FromReturnValue()},
+                runtime_options={"argo_concurrency": Concurrency(max_partitions=2)},
+            ),
+        }
+    )
+
+    with pytest.raises(ValueError) as e:
+        workflow_spec(dag, Workflow(container_image="my-image"))
+
+    assert (
+        str(e.value)
+        == "Node 'count' limits the number of partitions that may run at the same time through the 'argo_concurrency' runtime option. However, it is not partitioned."
+    )
+
+
+def test__workflow_spec__with_concurrency_options_of_the_wrong_type__fails():
+    dag = DAG(
+        {
+            "count": Task(
+                lambda: 3,
+                outputs={"n": FromReturnValue()},
+                runtime_options={"argo_concurrency": {"max_partitions": 2}},
+            ),
+        }
+    )
+
+    with pytest.raises(TypeError) as e:
+        workflow_spec(dag, Workflow(container_image="my-image"))
+
+    assert (
+        str(e.value)
+        == "Node 'count' sets the 'argo_concurrency' runtime option to a value of type 'dict'. However, it must be of type 'Concurrency'."
+    )
+
+
+def test__workflow_spec__with_artifact_archives():
+    class AsPrettyJSON(AsJSON):
+        pass
+
+    dag = DAG(
+        {
+            "generate": Task(
+                lambda: {"json": [1], "pretty": [2], "pickle": [3], "raw": [4]},
+                outputs={
+                    "json": FromKey("json", serializer=AsJSON()),
+                    "pretty": FromKey("pretty", serializer=AsPrettyJSON()),
+                    "pickle": FromKey("pickle", serializer=AsPickle()),
+                    "raw": FromKey("raw", serializer=AsJSON()),
+                },
+                runtime_options={
+                    "argo_artifact_archive": {
+                        "pickle": ArtifactArchive(compression_level=9),
+                        "raw": ArtifactArchive(),
+                    },
+                },
+            ),
+            "split": Task(
+                lambda: [1, 2],
+                outputs={"items": FromReturnValue(is_partitioned=True)},
+            ),
+        }
+    )
+
+    spec = workflow_spec(
+        dag,
+        Workflow(
+            container_image="my-image",
+            artifact_archives={AsJSON: ArtifactArchive(compression_level=6)},
+        ),
+    )
+    templates = {template["name"]: template for template in spec["templates"]}
+
+    assert {
+        artifact["name"]: artifact["archive"]
+        for artifact in templates["dag-generate"]["outputs"]["artifacts"]
+    } == {
+        "json": {"tar": {"compressionLevel": 6}},
+        "pretty": {"tar": {"compressionLevel": 6}},
+        "pickle": {"tar": {"compressionLevel": 9}},
+        "raw": {"none": {}},
+    }
+    assert templates["dag-split"]["outputs"]["artifacts"][0]["archive"] == {"none": {}}
+
+
+def test__workflow_spec__with_artifact_archives_and_fuse_tasks():
+    dag = DAG(
+        {
+            "first": Task(lambda: 1, outputs={"x": FromReturnValue()}),
+            "second": Task(
+                lambda x: x,
+                inputs={"x": FromNodeOutput("first", "x")},
+                outputs={"y": FromReturnValue()},
+            ),
+        },
+        outputs={"y": FromNodeOutput("second", "y")},
+    )
+
+    spec = workflow_spec(
+        dag,
+        Workflow(
+            container_image="my-image",
+            fuse_tasks=True,
+            artifact_archives={AsJSON: ArtifactArchive(compression_level=1)},
+        ),
+    )
+    templates = {template["name"]: template for template in spec["templates"]}
+
+    assert templates["fused-first"]["outputs"]["artifacts"][0]["archive"] == {
+        "tar": {"compressionLevel": 1}
+    }
+
+
+def test__workflow_spec__with_compressed_partitioned_output__fails():
+    dag = DAG(
+        {
+            "split": Task(
+                lambda: [1, 2],
+                outputs={"items": FromReturnValue(is_partitioned=True)},
+                runtime_options={
+                    "argo_artifact_archive": {
+                        "items": ArtifactArchive(compression_level=6)
+                    },
+                },
+            ),
+        }
+    )
+
+    with pytest.raises(ValueError) as e:
+        workflow_spec(dag, Workflow(container_image="my-image"))
+
+    assert (
+        str(e.value)
+        == "Task 'split' compresses its partitioned output 'items' through the 'argo_artifact_archive' runtime option. However, partitioned outputs are always stored as they are. Consider serializing the output with `Compressed` instead."
+    )
+
+
+def test__workflow_spec__with_artifact_archive_for_unknown_outputs__fails():
+    dag = DAG(
+        {
+            "count": Task(
+                lambda: 3,
+                outputs={"n": FromReturnValue()},
+                runtime_options={"argo_artifact_archive": {"m": ArtifactArchive()}},
+            ),
+        }
+    )
+
+    with pytest.raises(ValueError) as e:
+        workflow_spec(dag, Workflow(container_image="my-image"))
+
+    assert (
+        str(e.value)
+        == "Task 'count' sets the archive of outputs ['m'] through the 'argo_artifact_archive' runtime option. However, these are the outputs it has: ['n']."
+    )
+
+
+def test__workflow_spec__with_artifact_archive_of_the_wrong_type__fails():
+    dag = DAG(
+        {
+            "count": Task(
+                lambda: 3,
+                outputs={"n": FromReturnValue()},
+                runtime_options={"argo_artifact_archive": {"n": 6}},
+            ),
+        }
+    )
+
+    with pytest.raises(TypeError) as e:
+        workflow_spec(dag, Workflow(container_image="my-image"))
+
+    assert (
+        str(e.value)
+        == "Task 'count' sets the 'argo_artifact_archive' runtime option to {'n': 6}. However, it must be a mapping from output names to instances of 'ArtifactArchive'."
+    )
@@ -0,0 +1 @@
+"""Test suite for the CLI location schemes."""
@@ -0,0 +1,172 @@
+import json
+import os
+import tempfile
+
+import pytest
+
+from dagger.runtime.cli.location_schemes import (
+    PARTITION_COUNT_FILENAME,
+    PARTITION_MANIFEST_FILENAME,
+    S3,
+    LocationScheme,
+)
+from dagger.runtime.local import PartitionedOutput
+from dagger.runtime.local.output import dump
+from dagger.serializer import AsDirectory, AsPickle, DefaultSerializer
+from tests.runtime.cli.utils import store_value
+
+boto3 = pytest.importorskip("boto3")
+moto_server = pytest.importorskip("moto.server")
+
+BUCKET = "dagger"
+KB = 1024
+
+
+@pytest.fixture(scope="module")
+def endpoint_url():
+    """Run a local stand-in for S3 for the duration of the tests in this module."""
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+    server = moto_server.ThreadedMotoServer(port=0, verbose=False)
+    server.start()
+    host, port = server.get_host_and_port()
+    url = f"http://{host}:{port}"
+    boto3.client("s3", endpoint_url=url).create_bucket(Bucket=BUCKET)
+    yield url
+    server.stop()
+
+
+@pytest.fixture
+def client(endpoint_url):
+    return boto3.client("s3", endpoint_url=endpoint_url)
+
+
+def test__conforms_to_protocol():
+    assert isinstance(S3(), LocationScheme)
+
+
+def test__store_and_retrieve(endpoint_url, client):
+    s3 = S3(endpoint_url=endpoint_url)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        s3.store(f"{BUCKET}/simple/value.json", store_value(2, tmp))
+
+    assert (
+        client.get_object(Bucket=BUCKET, Key="simple/value.json")["Body"].read() == b"2"
+    )
+    assert s3.retrieve(f"{BUCKET}/simple/value.json", DefaultSerializer) == 2
+
+
+def test__store_and_retrieve__with_multipart_transfers(endpoint_url, client):
+    # Parts need to be at least 5MB, except for the last one
+    s3 = S3(
+        endpoint_url=endpoint_url,
+        multipart_threshold=5 * KB * KB,
+        multipart_chunksize=5 * KB * KB,
+    )
+    value = b"x" * (12 * KB * KB)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        s3.store(
+            f"{BUCKET}/multipart/value.pickle",
+            store_value(value, tmp, serializer=AsPickle()),
+        )
+
+    head = client.head_object(Bucket=BUCKET, Key="multipart/value.pickle")
+    assert head["ETag"].endswith('-3"')
+    assert s3.retrieve(f"{BUCKET}/multipart/value.pickle", AsPickle()) == value
+
+
+def test__store_and_retrieve__with_partitioned_output(endpoint_url, client):
+    s3 = S3(endpoint_url=endpoint_url)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Nodes dump all the partitions of an output into the same file, lazily
+        filename = os.path.join(tmp, "partition")
+        s3.store(
+            f"{BUCKET}/partitioned/value.json",
+            PartitionedOutput(
+                map(lambda v: store_value(v, tmp, filename="partition"), range(11))
+            ),
+        )
+
+        assert os.listdir(tmp) == []
+        assert not os.path.exists(filename)
+
+    manifest = client.get_object(
+        Bucket=BUCKET,
+        Key=f"partitioned/value.json/{PARTITION_MANIFEST_FILENAME}",
+    )
+    assert json.load(manifest["Body"]) == [str(i) for i in range(11)]
+    partition_count = client.get_object(
+        Bucket=BUCKET,
+        Key=f"partitioned/value.json/{PARTITION_COUNT_FILENAME}",
+    )
+    assert partition_count["Body"].read() == b"11"
+    assert s3.retrieve(f"{BUCKET}/partitioned/value.json", DefaultSerializer) == list(
+        range(11)
+    )
+
+
+def test__store_and_retrieve__with_outputs_stored_as_directories(endpoint_url, client):
+    s3 = S3(endpoint_url=endpoint_url)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        serializer = AsDirectory(output_dir=tmp)
+        directories = []
+        for i in range(2):
+            directories.append(os.path.join(tmp, f"dataset-{i}"))
+            os.makedirs(os.path.join(directories[-1], "empty"))
+            with open(os.path.join(directories[-1], "file"), "w") as f:
+                f.write(f"file {i}")
+
+        output = os.path.join(tmp, "output")
+        s3.store(f"{BUCKET}/dir/value.tar", dump(output, directories[0], serializer))
+        s3.store(
+            f"{BUCKET}/dirs/value.tar",
+            PartitionedOutput(map(lambda d: dump(output, d, serializer), directories)),
+        )
+
+        single = s3.retrieve(f"{BUCKET}/dir/value.tar", serializer)
+        partitioned = s3.retrieve(f"{BUCKET}/dirs/value.tar", serializer)
+
+        assert sorted(os.listdir(single)) == ["empty", "file"]
+        for directory, i in zip([single] + partitioned, [0, 0, 1]):
+            with open(os.path.join(directory, "file")) as f:
+                assert f.read() == f"file {i}"
+
+    keys = client.list_objects_v2(Bucket=BUCKET, Prefix="dir/")["Contents"]
+    assert sorted(obj["Key"] for obj in keys) == [
+        "dir/value.tar/data/empty/",
+        "dir/value.tar/data/file",
+    ]
+
+
+def test__retrieve__when_object_does_not_exist(endpoint_url):
+    with pytest.raises(FileNotFoundError):
+        S3(endpoint_url=endpoint_url).retrieve(
+            f"{BUCKET}/missing.json", DefaultSerializer
+        )
+
+
+def test__retrieve__when_bucket_does_not_exist(endpoint_url):
+    with pytest.raises(FileNotFoundError):
+        S3(endpoint_url=endpoint_url).retrieve("missing/key.json", DefaultSerializer)
+
+
+def test__store__when_bucket_does_not_exist(endpoint_url):
+    with tempfile.TemporaryDirectory() as tmp:
+        with pytest.raises(OSError):
+            S3(endpoint_url=endpoint_url).store("missing/key.json", store_value(2, tmp))
+
+
+def test__invalid_path():
+    with pytest.raises(ValueError) as e:
+        S3().retrieve("bucket-without-key", DefaultSerializer)
+
+    assert (
+        str(e.value)
+        == "'s3://bucket-without-key' is not a valid S3 location. S3 locations must follow the format 's3://<bucket>/<key>'."
+    )
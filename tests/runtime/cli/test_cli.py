@@ -1,3 +1,4 @@
+import hashlib
 import itertools
 import json
 import os
@@ -7,9 +8,10 @@ import pytest
 
 from dagger.dag import DAG
 from dagger.input import FromNodeOutput, FromParam
-from dagger.output import FromReturnValue
+from dagger.output import FromKey, FromReturnValue
 from dagger.runtime.cli.cli import invoke
 from dagger.runtime.cli.locations import (
+    PARTITION_COUNT_FILENAME,
     PARTITION_MANIFEST_FILENAME,
     store_output_in_location,
 )
@@ -66,7 +68,7 @@ def test__invoke_dag__overriding_default_value():
     dag = DAG(
         nodes=dict(
             square=Task(
-                lambda x: x ** 3,
+                lambda x: x**3,
                 inputs=dict(x=FromParam("x", 3)),
                 outputs=dict(x_squared=FromReturnValue()),
             ),
@@ -470,6 +472,374 @@ def test__invoke__node_with_partitioned_input():
             assert f.read() == b"[1, 2, 3]"
 
 
+def test__invoke__selecting_several_nodes():
+    dag = DAG(
+        nodes=dict(
+            double=Task(
+                lambda x: x * 2,
+                inputs=dict(x=FromParam()),
+                outputs=dict(x_doubled=FromReturnValue()),
+            ),
+            square=Task(
+                lambda x, y: x ** 2 + y,
+                inputs=dict(x=FromNodeOutput("double", "x_doubled"), y=FromParam()),
+                outputs=dict(x_squared=FromReturnValue()),
+            ),
+        ),
+        inputs=dict(x=FromParam(), y=FromParam()),
+        outputs=dict(x_squared=FromNodeOutput("square", "x_squared")),
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        x_input = os.path.join(tmp, "x_input")
+        y_input = os.path.join(tmp, "y_input")
+        x_output = os.path.join(tmp, "x_output")
+
+        with open(x_input, "wb") as f:
+            f.write(b"4")
+        with open(y_input, "wb") as f:
+            f.write(b"1")
+
+        invoke(
+            dag,
+            argv=itertools.chain(
+                *[
+                    ["--node-name", "double"],
+                    ["--node-name", "square"],
+                    ["--input", "double.x", x_input],
+                    ["--input", "square.y", y_input],
+                    ["--output", "square.x_squared", x_output],
+                ]
+            ),
+        )
+
+        with open(x_output, "rb") as f:
+            assert f.read() == b"65"
+
+        # Outputs consumed within the group are not stored anywhere
+        assert sorted(os.listdir(tmp)) == ["x_input", "x_output", "y_input"]
+
+
+def test__invoke__selecting_several_nodes_storing_intermediate_outputs():
+    dag = DAG(
+        nodes=dict(
+            double=Task(
+                lambda x: x * 2,
+                inputs=dict(x=FromParam()),
+                outputs=dict(x_doubled=FromReturnValue()),
+            ),
+            square=Task(
+                lambda x: x ** 2,
+                inputs=dict(x=FromNodeOutput("double", "x_doubled")),
+                outputs=dict(x_squared=FromReturnValue()),
+            ),
+        ),
+        inputs=dict(x=FromParam()),
+        outputs=dict(x_squared=FromNodeOutput("square", "x_squared")),
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        x_input = os.path.join(tmp, "x_input")
+        doubled_output = os.path.join(tmp, "doubled_output")
+        squared_output = os.path.join(tmp, "squared_output")
+
+        with open(x_input, "wb") as f:
+            f.write(b"4")
+
+        invoke(
+            dag,
+            argv=itertools.chain(
+                *[
+                    ["--node-name", "double"],
+                    ["--node-name", "square"],
+                    ["--input", "double.x", x_input],
+                    ["--output", "double.x_doubled", doubled_output],
+                    ["--output", "square.x_squared", squared_output],
+                ]
+            ),
+        )
+
+        with open(doubled_output, "rb") as f:
+            assert f.read() == b"8"
+
+        with open(squared_output, "rb") as f:
+            assert f.read() == b"64"
+
+
+def test__invoke__selecting_several_nodes_from_nested_dag():
+    dag = DAG(
+        nodes=dict(
+            nested=DAG(
+                nodes=dict(
+                    double=Task(
+                        lambda x: x * 2,
+                        inputs=dict(x=FromParam()),
+                        outputs=dict(x_doubled=FromReturnValue()),
+                    ),
+                    square=Task(
+                        lambda x: x ** 2,
+                        inputs=dict(x=FromNodeOutput("double", "x_doubled")),
+                        outputs=dict(x_squared=FromReturnValue()),
+                    ),
+                ),
+                inputs=dict(x=FromParam()),
+                outputs=dict(x_squared=FromNodeOutput("square", "x_squared")),
+            ),
+        ),
+        inputs=dict(x=FromParam()),
+        outputs=dict(x_squared=FromNodeOutput("nested", "x_squared")),
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        x_input = os.path.join(tmp, "x_input")
+        x_output = os.path.join(tmp, "x_output")
+
+        with open(x_input, "wb") as f:
+            f.write(b"3")
+
+        invoke(
+            dag,
+            argv=itertools.chain(
+                *[
+                    ["--node-name", "nested.double"],
+                    ["--node-name", "nested.square"],
+                    ["--input", "double.x", x_input],
+                    ["--output", "square.x_squared", x_output],
+                ]
+            ),
+        )
+
+        with open(x_output, "rb") as f:
+            assert f.read() == b"36"
+
+
+def test__invoke__selecting_several_nodes_with_different_parents():
+    dag = DAG(
+        nodes=dict(
+            a=Task(lambda: 1),
+            nested=DAG(nodes=dict(b=Task(lambda: 2))),
+        ),
+    )
+
+    with pytest.raises(ValueError) as e:
+        invoke(dag, argv=["--node-name", "a", "--node-name", "nested.b"])
+
+    assert (
+        str(e.value)
+        == "Only nodes with the same parent DAG can be invoked together. However, the following nodes were supplied: ['a', 'nested.b']"
+    )
+
+
+def test__invoke__selecting_several_nodes_in_the_wrong_order():
+    dag = DAG(
+        nodes=dict(
+            a=Task(lambda: 1, outputs=dict(x=FromReturnValue())),
+            b=Task(lambda x: x, inputs=dict(x=FromNodeOutput("a", "x"))),
+        ),
+    )
+
+    with pytest.raises(ValueError) as e:
+        invoke(
+            dag,
+            argv=["--node-name", "b", "--node-name", "a", "--output", "a.x", "f"],
+        )
+
+    assert (
+        str(e.value)
+        == "Node 'b' depends on the output of node 'a', so it must be invoked after it."
+    )
+
+
+def test__invoke__selecting_several_nodes__validates_all_locations_before_invoking_any_node():
+    invocations = []
+
+    def record(name):
+        invocations.append(name)
+        return name
+
+    dag = DAG(
+        nodes=dict(
+            a=Task(lambda: record("a"), outputs=dict(x=FromReturnValue())),
+            b=Task(lambda: record("b"), outputs=dict(y=FromReturnValue())),
+        ),
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with pytest.raises(ValueError) as e:
+            invoke(
+                dag,
+                argv=[
+                    "--node-name",
+                    "a",
+                    "--node-name",
+                    "b",
+                    "--output",
+                    "a.x",
+                    os.path.join(tmp, "x"),
+                ],
+            )
+
+        assert "output named 'y'" in str(e.value)
+        assert invocations == []
+        assert os.listdir(tmp) == []
+
+
+def test__invoke__selecting_several_nodes_consuming_partitioned_outputs():
+    dag = DAG(
+        nodes=dict(
+            a=Task(
+                lambda: [1, 2],
+                outputs=dict(x=FromReturnValue(is_partitioned=True)),
+            ),
+            b=Task(lambda x: x, inputs=dict(x=FromNodeOutput("a", "x"))),
+        ),
+    )
+
+    with pytest.raises(ValueError) as e:
+        invoke(dag, argv=["--node-name", "a", "--node-name", "b"])
+
+    assert (
+        str(e.value)
+        == "Node 'b' depends on output 'x' of node 'a', which is partitioned. Partitioned outputs can only be passed to other nodes through locations, so these nodes cannot be invoked together."
+    )
+
+
+def test__invoke__storing_output_digests():
+    dag = DAG(
+        nodes=dict(
+            split=Task(
+                lambda: {"numbers": [1, 2], "total": 3},
+                outputs=dict(
+                    numbers=FromKey("numbers", is_partitioned=True),
+                    total=FromKey("total"),
+                ),
+            ),
+        ),
+        outputs=dict(
+            numbers=FromNodeOutput("split", "numbers"),
+            total=FromNodeOutput("split", "total"),
+        ),
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        numbers_output = os.path.join(tmp, "numbers")
+        total_output = os.path.join(tmp, "total")
+        numbers_digest = os.path.join(tmp, "numbers.sha256")
+        total_digest = os.path.join(tmp, "total.sha256")
+
+        invoke(
+            dag,
+            argv=itertools.chain(
+                *[
+                    ["--output", "numbers", numbers_output],
+                    ["--output", "total", total_output],
+                    ["--output-digest", "numbers", numbers_digest],
+                    ["--output-digest", "total", total_digest],
+                ]
+            ),
+        )
+
+        # Digests are computed before storing the outputs, without consuming them
+        assert sorted(os.listdir(numbers_output)) == [
+            "0",
+            "1",
+            PARTITION_COUNT_FILENAME,
+            PARTITION_MANIFEST_FILENAME,
+        ]
+
+        with open(total_digest) as f:
+            assert f.read() == hashlib.sha256(b"3").hexdigest()
+
+        with open(numbers_digest) as f:
+            assert (
+                f.read()
+                == hashlib.sha256(
+                    (
+                        hashlib.sha256(b"1").hexdigest()
+                        + "\n"
+                        + hashlib.sha256(b"2").hexdigest()
+                        + "\n"
+                    ).encode("ascii")
+                ).hexdigest()
+            )
+
+
+def test__invoke__storing_the_digest_of_an_output_that_is_not_stored():
+    dag = DAG(
+        outputs={"x": FromNodeOutput("n", "x")},
+        nodes={"n": Task(lambda: 1, outputs={"x": FromReturnValue()})},
+    )
+
+    with pytest.raises(ValueError) as e:
+        invoke(
+            dag,
+            argv=["--output", "x", "f", "--output-digest", "y", "f.sha256"],
+        )
+
+    assert (
+        str(e.value)
+        == "The digest of an output named 'y' was requested. However, digests can only be requested for the outputs being stored: ['x']"
+    )
+
+
+def test__invoke__with_output_max_sizes():
+    dag = DAG(
+        nodes={
+            "n": Task(
+                lambda: {"small": 1, "large": list(range(100))},
+                outputs={"small": FromKey("small"), "large": FromKey("large")},
+            ),
+        },
+        outputs={
+            "small": FromNodeOutput("n", "small"),
+            "large": FromNodeOutput("n", "large"),
+        },
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        small_output = os.path.join(tmp, "small")
+        large_output = os.path.join(tmp, "large")
+        argv = ["--output", "small", small_output, "--output", "large", large_output]
+
+        invoke(dag, argv=argv + ["--output-max-size", "small", "1"])
+        with open(small_output, "rb") as f:
+            assert f.read() == b"1"
+
+        os.remove(small_output)
+        os.remove(large_output)
+        with pytest.raises(ValueError) as e:
+            invoke(dag, argv=argv + ["--output-max-size", "large", "100"])
+
+        assert (
+            str(e.value)
+            == "Output 'large' takes 390 bytes once serialized. However, it may take 100 bytes at most."
+        )
+        assert not os.path.exists(large_output)
+
+
+def test__invoke__with_an_invalid_output_max_size():
+    dag = DAG(
+        outputs={"x": FromNodeOutput("n", "x")},
+        nodes={"n": Task(lambda: 1, outputs={"x": FromReturnValue()})},
+    )
+
+    with pytest.raises(ValueError) as e:
+        invoke(dag, argv=["--output", "x", "f", "--output-max-size", "x", "1KB"])
+
+    assert (
+        str(e.value)
+        == "The maximum size of output 'x' must be a number of bytes. However, it was set to '1KB'."
+    )
+
+    with pytest.raises(ValueError) as e:
+        invoke(dag, argv=["--output", "x", "f", "--output-max-size", "y", "10"])
+
+    assert (
+        str(e.value)
+        == "A maximum size was set for an output named 'y'. However, maximum sizes can only be set for the outputs being stored: ['x']"
+    )
+
+
 # test dag with default
 
 # test dag with value overriding default
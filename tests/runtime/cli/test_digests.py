@@ -0,0 +1,75 @@
+import hashlib
+import os
+import tempfile
+
+from dagger.runtime.cli.digests import output_digest, with_digest_stored
+from dagger.runtime.local import OutputFile, PartitionedOutput
+from dagger.serializer import AsDirectory
+from tests.runtime.cli.utils import store_value
+
+
+def test__output_digest__of_a_file():
+    with tempfile.TemporaryDirectory() as tmp:
+        output = store_value({"a": 1}, tmp)
+
+        assert output_digest(output) == hashlib.sha256(b'{"a": 1}').hexdigest()
+
+
+def test__output_digest__of_a_directory():
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = os.path.join(tmp, "directory")
+        os.makedirs(os.path.join(directory, "nested"))
+        output = OutputFile(filename=directory, serializer=AsDirectory())
+
+        with open(os.path.join(directory, "nested", "file"), "w") as f:
+            f.write("a")
+        first = output_digest(output)
+
+        with open(os.path.join(directory, "nested", "file"), "w") as f:
+            f.write("b")
+        second = output_digest(output)
+
+        os.rename(
+            os.path.join(directory, "nested", "file"),
+            os.path.join(directory, "nested", "renamed"),
+        )
+        third = output_digest(output)
+
+        os.makedirs(os.path.join(directory, "empty"))
+        fourth = output_digest(output)
+
+        assert len({first, second, third, fourth}) == 4
+        assert fourth == output_digest(output)
+
+
+def test__output_digest__of_partitions():
+    with tempfile.TemporaryDirectory() as tmp:
+        first, second = store_value(1, tmp), store_value(2, tmp)
+
+        digest = output_digest(PartitionedOutput([first, second]))
+
+        assert digest == output_digest(PartitionedOutput([first, second]))
+        assert digest != output_digest(PartitionedOutput([second, first]))
+        assert digest != output_digest(PartitionedOutput([first]))
+
+
+def test__with_digest_stored__of_partitions_that_share_a_file():
+    with tempfile.TemporaryDirectory() as tmp:
+        digest_location = os.path.join(tmp, "digest")
+        expected = output_digest(
+            PartitionedOutput([store_value(1, tmp), store_value(2, tmp)])
+        )
+
+        def partitions():
+            # Each partition overwrites the file of the previous one
+            for value in [1, 2]:
+                yield store_value(value, tmp, filename="partition")
+
+        output = with_digest_stored(PartitionedOutput(partitions()), digest_location)
+        assert not os.path.exists(digest_location)
+
+        for _ in output:
+            pass
+
+        with open(digest_location) as f:
+            assert f.read() == expected
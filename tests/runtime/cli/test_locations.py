@@ -4,14 +4,30 @@ import tempfile
 
 import pytest
 
+from dagger.runtime.cli.location_schemes import LocationScheme
 from dagger.runtime.cli.locations import (
+    LOCATION_SCHEMES,
+    PARTITION_COUNT_FILENAME,
     PARTITION_MANIFEST_FILENAME,
+    absolute_location,
+    register_location_scheme,
     retrieve_input_from_location,
     store_output_in_location,
 )
 from dagger.runtime.local import PartitionedOutput
-from dagger.serializer import DefaultSerializer
+from dagger.runtime.local.output import dump
+from dagger.serializer import AsFile, DefaultSerializer
 from tests.runtime.cli.utils import store_value
+from tests.runtime.local.test_output import HardLinkSerializer
+
+
+def test__absolute_location():
+    cwd = os.getcwd()
+    assert absolute_location("a/b") == os.path.join(cwd, "a", "b")
+    assert absolute_location("/a/b") == "/a/b"
+    assert absolute_location("file://a/b") == "file://" + os.path.join(cwd, "a", "b")
+    assert absolute_location("FILE:///a/b") == "FILE:///a/b"
+    assert absolute_location("s3://bucket/a/b") == "s3://bucket/a/b"
 
 
 def test__retrieve_input_from_location__when_location_doesnt_exist():
@@ -112,3 +128,144 @@ def test__store_output_in_location__with_partitioned_output():
                 partitions.append(f.read())
 
         assert partitions == [b"1", b"2"]
+
+        with open(os.path.join(output_path, PARTITION_COUNT_FILENAME), "r") as f:
+            assert f.read() == "2"
+
+
+def test__retrieve_input_from_location__with_file_scheme():
+    with tempfile.TemporaryDirectory() as tmp:
+        file_ = store_value(2, tmp)
+
+        assert (
+            retrieve_input_from_location(
+                input_location=f"file://{file_.filename}",
+                serializer=file_.serializer,
+            )
+            == 2
+        )
+
+
+def test__store_output_in_location__with_file_scheme():
+    with tempfile.TemporaryDirectory() as tmp:
+        cli_output_path = os.path.join(tmp, "cli")
+
+        store_output_in_location(
+            output_location=f"file://{cli_output_path}",
+            output_value=store_value(2, tmp),
+        )
+
+        with open(cli_output_path, "rb") as f:
+            assert f.read() == b"2"
+
+
+def test__retrieve_input_from_location__with_unknown_scheme():
+    with pytest.raises(ValueError) as e:
+        retrieve_input_from_location(
+            input_location="unknown://bucket/key",
+            serializer=DefaultSerializer,
+        )
+
+    assert (
+        str(e.value)
+        == "Location 'unknown://bucket/key' uses the scheme 'unknown://'. However, there is no location scheme registered with that name. These are the schemes available: ['file', 's3']"
+    )
+
+
+def test__register_location_scheme():
+    class InMemory:
+        def __init__(self):
+            self.values = {}
+
+        def retrieve(self, path, serializer):
+            return self.values[path]
+
+        def store(self, path, output_value):
+            with open(output_value.filename, "rb") as f:
+                self.values[path] = f.read()
+
+    in_memory = InMemory()
+    assert isinstance(in_memory, LocationScheme)
+
+    register_location_scheme("mem", in_memory)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            store_output_in_location("mem://my/value", store_value(2, tmp))
+            assert in_memory.values == {"my/value": b"2"}
+            assert (
+                retrieve_input_from_location("mem://my/value", DefaultSerializer)
+                == b"2"
+            )
+    finally:
+        del LOCATION_SCHEMES["mem"]
+
+
+def test__register_location_scheme__is_case_insensitive():
+    in_memory = object()
+
+    register_location_scheme("Mem", in_memory)
+    try:
+        assert LOCATION_SCHEMES["mem"] is in_memory
+        assert "Mem" not in LOCATION_SCHEMES
+    finally:
+        del LOCATION_SCHEMES["mem"]
+
+
+def test__register_location_scheme__with_invalid_schemes():
+    for scheme in ["", "1mem", "mem://", "in memory", "mem/"]:
+        with pytest.raises(ValueError) as e:
+            register_location_scheme(scheme, object())
+
+        assert str(e.value) == (
+            f"'{scheme}' is not a valid location scheme. Schemes must start with a letter, followed by any number of letters, digits, '+', '-' or '.'."
+        )
+
+    assert sorted(LOCATION_SCHEMES) == ["file", "s3"]
+
+
+def test__retrieve_input_from_location__with_path_serializer():
+    with tempfile.TemporaryDirectory() as tmp:
+        input_file = os.path.join(tmp, "input")
+        with open(input_file, "w") as f:
+            f.write("contents")
+
+        retrieved = retrieve_input_from_location(
+            input_location=f"file://{input_file}",
+            serializer=HardLinkSerializer(tmp),
+        )
+
+        assert retrieved != input_file
+        assert os.path.samefile(retrieved, input_file)
+
+
+def test__store_and_retrieve__with_outputs_stored_as_directories():
+    with tempfile.TemporaryDirectory() as tmp:
+        serializer = AsFile(output_dir=tmp)
+        files = []
+        for i in range(3):
+            files.append(os.path.join(tmp, str(i)))
+            with open(files[-1], "w") as f:
+                f.write(f"file {i}")
+
+        store_output_in_location(
+            output_location=os.path.join(tmp, "single"),
+            output_value=dump(os.path.join(tmp, "output"), files[0], serializer),
+        )
+        store_output_in_location(
+            output_location=os.path.join(tmp, "partitioned"),
+            output_value=PartitionedOutput(
+                map(
+                    lambda f: dump(os.path.join(tmp, "output"), f, serializer),
+                    files,
+                )
+            ),
+        )
+
+        single = retrieve_input_from_location(os.path.join(tmp, "single"), serializer)
+        partitioned = retrieve_input_from_location(
+            os.path.join(tmp, "partitioned"), serializer
+        )
+
+        assert os.path.samefile(single, files[0])
+        assert [os.path.basename(p) for p in partitioned] == ["0", "1", "2"]
+        assert all(os.path.samefile(p, f) for p, f in zip(partitioned, files))
@@ -0,0 +1,275 @@
+import os
+import subprocess
+import sys
+import tempfile
+from unittest import mock
+
+import pytest
+
+from dagger import dsl
+from dagger.dag import DAG
+from dagger.input import FromNodeOutput, FromParam
+from dagger.output import FromReturnValue
+from dagger.runtime.cli.cli import invoke
+from dagger.runtime.cli.snapshot import (
+    DAGSnapshot,
+    compile_snapshot,
+    load_snapshot,
+)
+from dagger.serializer import AsPickle
+from dagger.task import Task
+
+
+def double(x):
+    return x * 2
+
+
+def square(x):
+    return x**2
+
+
+@dsl.task()
+def increment(x):
+    return x + 1
+
+
+@dsl.DAG()
+def dsl_pipeline(x):
+    return increment(increment(x))
+
+
+def nested_dag() -> DAG:
+    inner = DAG(
+        nodes=dict(
+            square=Task(
+                square,
+                inputs=dict(x=FromParam()),
+                outputs=dict(x_squared=FromReturnValue()),
+            ),
+        ),
+        inputs=dict(x=FromParam()),
+        outputs=dict(x_squared=FromNodeOutput("square", "x_squared")),
+    )
+    return DAG(
+        nodes=dict(
+            double=Task(
+                double,
+                inputs=dict(x=FromParam()),
+                outputs=dict(x_doubled=FromReturnValue(serializer=AsPickle())),
+            ),
+            inner=inner,
+        ),
+        inputs=dict(x=FromParam()),
+        outputs=dict(x_squared=FromNodeOutput("inner", "x_squared")),
+    )
+
+
+def test__find_node__restores_each_node():
+    dag = nested_dag()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "dag.snapshot")
+        compile_snapshot(dag, filename)
+        snapshot = load_snapshot(filename)
+
+        assert isinstance(snapshot, DAGSnapshot)
+        assert snapshot.find_node([]) == dag
+        assert snapshot.find_node(["double"]) == dag.nodes["double"]
+        assert snapshot.find_node(["inner"]) == dag.nodes["inner"]
+        assert (
+            snapshot.find_node(["inner", "square"])
+            == dag.nodes["inner"].nodes["square"]
+        )
+
+
+def test__find_node__does_not_build_or_validate_dags():
+    dag = nested_dag()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "dag.snapshot")
+        compile_snapshot(dag, filename)
+
+        with mock.patch.object(DAG, "__init__", side_effect=AssertionError):
+            with mock.patch.object(Task, "__init__", side_effect=AssertionError):
+                snapshot = load_snapshot(filename)
+                task = snapshot.find_node(["inner", "square"])
+                inner = snapshot.find_node(["inner"])
+
+        assert task.func is square
+        assert inner.node_execution_order == [{"square"}]
+
+
+def test__find_node__with_dags_built_through_the_dsl():
+    dag = dsl.build(dsl_pipeline)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "dag.snapshot")
+        compile_snapshot(dag, filename)
+        snapshot = load_snapshot(filename)
+
+        assert snapshot.find_node(["increment-1"]) == dag.nodes["increment-1"]
+        assert snapshot.find_node(["increment-1"]).func is increment.func
+
+
+def test__find_node__with_missing_nodes():
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "dag.snapshot")
+        compile_snapshot(nested_dag(), filename)
+        snapshot = load_snapshot(filename)
+
+        with pytest.raises(ValueError) as e:
+            snapshot.find_node(["missing"])
+
+        assert (
+            str(e.value)
+            == "You selected node 'missing'. However, this DAG does not contain any node with such a name. These are the names the DAG contains: ['double', 'inner']"
+        )
+
+        with pytest.raises(ValueError) as e:
+            snapshot.find_node(["inner", "missing", "deeper"])
+
+        assert (
+            str(e.value)
+            == "You selected node 'inner.missing'. However, DAG 'inner' does not contain any node with such a name. These are the names the DAG contains: ['square']"
+        )
+
+        with pytest.raises(ValueError) as e:
+            snapshot.find_node(["double", "missing"])
+
+        assert (
+            str(e.value)
+            == "Node 'double' does not contain any other nodes. However, you are trying to access a subnode 'missing'."
+        )
+
+
+def test__compile_snapshot__with_functions_that_cannot_be_imported():
+    dag = DAG(nodes=dict(f=Task(lambda: 1)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with pytest.raises(ValueError) as e:
+            compile_snapshot(dag, os.path.join(tmp, "dag.snapshot"))
+
+        assert "cannot be referenced by its import path" in str(e.value)
+
+
+def test__load_snapshot__compiled_by_a_different_version():
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "dag.snapshot")
+        with mock.patch("dagger.__version__", "0.0.1"):
+            compile_snapshot(nested_dag(), filename)
+
+        with pytest.raises(ValueError) as e:
+            load_snapshot(filename)
+
+        assert (
+            str(e.value)
+            == f"The snapshot in '{filename}' was compiled with version 0.0.1 of dagger (snapshot format v1). However, the current version of dagger is 0.0.0 (snapshot format v1). Please compile the snapshot again."
+        )
+
+
+def test__invoke__with_snapshot():
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "dag.snapshot")
+        compile_snapshot(nested_dag(), filename)
+
+        x_input = os.path.join(tmp, "x_input")
+        x_output = os.path.join(tmp, "x_output")
+        with open(x_input, "wb") as f:
+            f.write(b"3")
+
+        invoke(
+            load_snapshot(filename),
+            argv=[
+                "--node-name",
+                "inner.square",
+                "--input",
+                "x",
+                x_input,
+                "--output",
+                "x_squared",
+                x_output,
+            ],
+        )
+
+        with open(x_output, "rb") as f:
+            assert f.read() == b"9"
+
+
+def test__invoke__with_snapshot_from_the_command_line():
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "dag.snapshot")
+        compile_snapshot(nested_dag(), filename)
+
+        x_input = os.path.join(tmp, "x_input")
+        x_output = os.path.join(tmp, "x_output")
+        with open(x_input, "wb") as f:
+            f.write(b"3")
+
+        subprocess.check_call(
+            [
+                sys.executable,
+                "-m",
+                "dagger.runtime.cli",
+                filename,
+                "--input",
+                "x",
+                x_input,
+                "--output",
+                "x_squared",
+                x_output,
+            ]
+        )
+
+        with open(x_output, "rb") as f:
+            assert f.read() == b"9"
+
+
+def test__compile_snapshot__with_dags_built_lazily_through_the_dsl():
+    @dsl.DAG()
+    def outer(x):
+        return dsl_pipeline(x)
+
+    dag = dsl.build(outer, lazy=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "dag.snapshot")
+        compile_snapshot(dag, filename)
+        snapshot = load_snapshot(filename)
+
+        assert snapshot.find_node([]) == dag
+        assert snapshot.find_node(["dsl-pipeline", "increment-2"]).func is (
+            increment.func
+        )
+
+
+def test__compile_snapshot__with_functions_defined_in_main():
+    def f():
+        return 1
+
+    f.__module__ = "__main__"
+    f.__qualname__ = "f"
+    dag = DAG(nodes=dict(f=Task(f)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with pytest.raises(ValueError) as e:
+            compile_snapshot(dag, os.path.join(tmp, "dag.snapshot"))
+
+        assert "is defined in the '__main__' module" in str(e.value)
+        assert not os.path.exists(os.path.join(tmp, "dag.snapshot"))
+
+
+def test__load_snapshot__with_functions_that_no_longer_exist():
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "dag.snapshot")
+        compile_snapshot(nested_dag(), filename)
+        snapshot = load_snapshot(filename)
+
+        with mock.patch.dict(globals()):
+            del globals()["square"]
+            with pytest.raises(ImportError) as e:
+                snapshot.find_node(["inner", "square"])
+
+        assert (
+            str(e.value)
+            == f"Function 'square' could not be imported from module '{__name__}' (module '{__name__}' has no attribute 'square'). Please make sure the snapshot is loaded with the same code and Python path it was compiled with, or compile the snapshot again."
+        )
@@ -0,0 +1,269 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import pytest
+
+from dagger.dag import DAG
+from dagger.input import FromNodeOutput, FromParam
+from dagger.output import FromReturnValue
+from dagger.runtime.cli.worker import send_request
+from dagger.serializer import DefaultSerializer
+from dagger.task import Task
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "fork"), reason="The worker server requires os.fork()"
+)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+
+def double(x):
+    return x * 2
+
+
+def pid(x):
+    return os.getpid()
+
+
+def exit_if_zero(x):
+    if x == 0:
+        sys.exit(3)
+
+
+dag = DAG(
+    nodes=dict(
+        double=Task(
+            double,
+            inputs=dict(x=FromParam()),
+            outputs=dict(x_doubled=FromReturnValue()),
+        ),
+        pid=Task(
+            pid,
+            inputs=dict(x=FromNodeOutput("double", "x_doubled")),
+            outputs=dict(pid=FromReturnValue()),
+        ),
+        exit=Task(
+            exit_if_zero,
+            inputs=dict(x=FromParam()),
+        ),
+    ),
+    inputs=dict(x=FromParam()),
+    outputs=dict(pid=FromNodeOutput("pid", "pid")),
+)
+
+
+@pytest.fixture
+def worker():
+    with tempfile.TemporaryDirectory() as tmp:
+        socket_path = os.path.join(tmp, "worker.sock")
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                "-c",
+                "import sys; from dagger.runtime.cli import invoke; from tests.runtime.cli.test_worker import dag; invoke(dag, argv=sys.argv[1:])",
+                "--serve-worker",
+                socket_path,
+            ],
+            cwd=REPO_ROOT,
+        )
+        try:
+            for _ in range(500):
+                if os.path.exists(socket_path):
+                    break
+                time.sleep(0.01)
+            else:
+                pytest.fail("The worker server did not start")
+
+            yield socket_path, server.pid
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def _store(filename, value):
+    with open(filename, "wb") as f:
+        DefaultSerializer.serialize(value, f)
+
+
+def _retrieve(filename):
+    with open(filename, "rb") as f:
+        return DefaultSerializer.deserialize(f)
+
+
+def test__send_request__runs_node_in_a_child_of_the_worker(worker):
+    socket_path, server_pid = worker
+
+    with tempfile.TemporaryDirectory() as tmp:
+        x_path = os.path.join(tmp, "x")
+        x_doubled_path = os.path.join(tmp, "x_doubled")
+        pid_path = os.path.join(tmp, "pid")
+        _store(x_path, 2)
+
+        send_request(
+            socket_path,
+            node_address=["double"],
+            input_locations={"x": x_path},
+            output_locations={"x_doubled": x_doubled_path},
+        )
+        assert _retrieve(x_doubled_path) == 4
+
+        send_request(
+            socket_path,
+            node_address=["pid"],
+            input_locations={"x": x_doubled_path},
+            output_locations={"pid": pid_path},
+        )
+        child_pid = _retrieve(pid_path)
+        assert child_pid not in (server_pid, os.getpid())
+
+
+def test__send_request__runs_the_whole_dag(worker):
+    socket_path, _ = worker
+
+    with tempfile.TemporaryDirectory() as tmp:
+        x_path = os.path.join(tmp, "x")
+        pid_path = os.path.join(tmp, "pid")
+        _store(x_path, 2)
+
+        send_request(
+            socket_path,
+            input_locations={"x": x_path},
+            output_locations={"pid": pid_path},
+        )
+        assert isinstance(_retrieve(pid_path), int)
+
+
+def test__send_request__raises_errors_from_the_worker(worker):
+    socket_path, _ = worker
+
+    with pytest.raises(ValueError) as e:
+        send_request(socket_path, node_address=["missing"])
+
+    assert "does not contain any node with such a name" in str(e.value)
+
+    with pytest.raises(ValueError) as e:
+        send_request(socket_path, node_address=["double"])
+
+    assert "x" in str(e.value)
+
+
+def test__send_request__when_the_node_exits__keeps_the_worker_running(worker):
+    socket_path, _ = worker
+
+    with tempfile.TemporaryDirectory() as tmp:
+        x_path = os.path.join(tmp, "x")
+        x_doubled_path = os.path.join(tmp, "x_doubled")
+        _store(x_path, 0)
+
+        with pytest.raises(RuntimeError) as e:
+            send_request(
+                socket_path,
+                node_address=["exit"],
+                input_locations={"x": x_path},
+            )
+
+        assert str(e.value) == "3"
+        assert os.path.exists(socket_path)
+
+        _store(x_path, 2)
+
+        send_request(
+            socket_path,
+            node_address=["double"],
+            input_locations={"x": x_path},
+            output_locations={"x_doubled": x_doubled_path},
+        )
+        assert _retrieve(x_doubled_path) == 4
+
+
+def test__send_request__from_the_command_line(worker):
+    socket_path, _ = worker
+
+    with tempfile.TemporaryDirectory() as tmp:
+        x_path = os.path.join(tmp, "x")
+        x_doubled_path = os.path.join(tmp, "x_doubled")
+        _store(x_path, 5)
+
+        subprocess.check_call(
+            [
+                sys.executable,
+                "-m",
+                "dagger.runtime.cli",
+                "--worker-socket",
+                socket_path,
+                "--node-name",
+                "double",
+                "--input",
+                "x",
+                x_path,
+                "--output",
+                "x_doubled",
+                x_doubled_path,
+            ],
+            cwd=REPO_ROOT,
+        )
+        assert _retrieve(x_doubled_path) == 10
+
+        _store(x_path, 6)
+        subprocess.check_call(
+            [
+                sys.executable,
+                "-m",
+                "dagger.runtime.cli",
+                f"--worker-socket={socket_path}",
+                "--node-name",
+                "double",
+                "--input",
+                "x",
+                x_path,
+                "--output",
+                "x_doubled",
+                x_doubled_path,
+            ],
+            cwd=REPO_ROOT,
+        )
+        assert _retrieve(x_doubled_path) == 12
+
+
+def test__send_request__with_relative_locations(worker):
+    socket_path, _ = worker
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _store(os.path.join(tmp, "x"), 7)
+
+        # The worker runs from the root of the repository, and the client from a different directory
+        subprocess.check_call(
+            [
+                sys.executable,
+                "-m",
+                "dagger.runtime.cli",
+                "--worker-socket",
+                socket_path,
+                "--node-name",
+                "double",
+                "--input",
+                "x",
+                "x",
+                "--output",
+                "x_doubled",
+                "file://x_doubled",
+                "--output-digest",
+                "x_doubled",
+                "x_doubled.sha256",
+            ],
+            cwd=tmp,
+            env={**os.environ, "PYTHONPATH": REPO_ROOT},
+        )
+
+        assert _retrieve(os.path.join(tmp, "x_doubled")) == 14
+        assert os.path.exists(os.path.join(tmp, "x_doubled.sha256"))
+        assert not os.path.exists(os.path.join(REPO_ROOT, "x_doubled"))
+
+
+def test__send_request__when_worker_is_not_running():
+    with tempfile.TemporaryDirectory() as tmp:
+        with pytest.raises(OSError):
+            send_request(os.path.join(tmp, "missing.sock"))
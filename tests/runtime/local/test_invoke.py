@@ -58,3 +58,49 @@ def test__invoke__with_outputs_stored_in_path():
 
         with open(outputs["x_squared"].filename, "rb") as f:
             f.read() == b"9"
+
+
+def test__invoke__passing_directories_between_tasks():
+    import os
+
+    from dagger.serializer import AsDirectory
+
+    def write_dataset(output_dir):
+        dataset = os.path.join(output_dir, "dataset")
+        os.makedirs(dataset)
+        for i in range(3):
+            with open(os.path.join(dataset, f"part.{i}"), "w") as f:
+                f.write(str(i))
+
+        return dataset
+
+    def list_dataset(dataset):
+        return sorted(os.listdir(dataset))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dag = DAG(
+            nodes=dict(
+                write=Task(
+                    write_dataset,
+                    inputs=dict(output_dir=FromParam()),
+                    outputs=dict(
+                        dataset=FromReturnValue(serializer=AsDirectory(output_dir=tmp))
+                    ),
+                ),
+                list=Task(
+                    list_dataset,
+                    inputs=dict(
+                        dataset=FromNodeOutput(
+                            "write", "dataset", serializer=AsDirectory(output_dir=tmp)
+                        )
+                    ),
+                    outputs=dict(files=FromReturnValue()),
+                ),
+            ),
+            inputs=dict(output_dir=FromParam()),
+            outputs=dict(files=FromNodeOutput("list", "files")),
+        )
+
+        assert invoke(dag, params=dict(output_dir=tmp)) == {
+            "files": ["part.0", "part.1", "part.2"]
+        }
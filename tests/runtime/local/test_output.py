@@ -0,0 +1,186 @@
+import os
+import shutil
+import tempfile
+import uuid
+from typing import Any, BinaryIO
+
+from dagger.dag import DAG
+from dagger.input import FromNodeOutput, FromParam
+from dagger.output import FromReturnValue
+from dagger.runtime.local.invoke import invoke
+from dagger.runtime.local.output import deserialized_outputs, dump, load
+from dagger.runtime.local.types import PartitionedOutput
+from dagger.serializer import AsDirectory, DefaultSerializer, PathSerializer
+from dagger.task import Task
+
+
+class HardLinkSerializer:
+    """
+    Serialize values that are paths to files by hard-linking them, instead of copying their contents.
+
+    When deserialized, it produces a different pointer to the same file within the specified output directory.
+    """
+
+    extension = "file"
+
+    def __init__(self, output_dir_path: str):
+        self._output_dir_path = output_dir_path
+
+    def serialize(self, value: Any, writer: BinaryIO):
+        with open(value, "rb") as src:
+            shutil.copyfileobj(src, writer)
+
+    def deserialize(self, reader: BinaryIO) -> Any:
+        filename = os.path.join(self._output_dir_path, uuid.uuid4().hex)
+        with open(filename, "wb") as dst:
+            shutil.copyfileobj(reader, dst)
+
+        return filename
+
+    def serialize_to_path(self, value: Any, path: str):
+        os.link(value, path)
+
+    def deserialize_from_path(self, path: str) -> Any:
+        filename = os.path.join(self._output_dir_path, uuid.uuid4().hex)
+        os.link(path, filename)
+        return filename
+
+
+def _write(filename: str, contents: str) -> str:
+    with open(filename, "w") as f:
+        f.write(contents)
+
+    return filename
+
+
+def _read(filename: str) -> str:
+    with open(filename) as f:
+        return f.read()
+
+
+def test__hard_link_serializer__conforms_to_path_serializer_protocol():
+    assert isinstance(HardLinkSerializer("."), PathSerializer)
+
+
+def test__dump_and_load__with_path_serializer__do_not_copy_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        serializer = HardLinkSerializer(tmp)
+        original = _write(os.path.join(tmp, "original"), "contents")
+
+        output_file = dump(
+            filename=os.path.join(tmp, "output"),
+            value=original,
+            serializer=serializer,
+        )
+        loaded = load(output_file.filename, serializer)
+
+        assert os.path.samefile(original, output_file.filename)
+        assert os.path.samefile(original, loaded)
+        assert _read(loaded) == "contents"
+
+
+def test__dump__with_path_serializer__does_not_overwrite_previous_partitions():
+    with tempfile.TemporaryDirectory() as tmp:
+        serializer = HardLinkSerializer(tmp)
+        filename = os.path.join(tmp, "output")
+        partitions = [
+            _write(os.path.join(tmp, f"partition-{i}"), f"partition {i}")
+            for i in range(3)
+        ]
+
+        outputs = deserialized_outputs(
+            {
+                "output": PartitionedOutput(
+                    map(
+                        lambda p: dump(
+                            filename=filename, value=p, serializer=serializer
+                        ),
+                        partitions,
+                    )
+                )
+            }
+        )
+
+        assert [_read(p) for p in outputs["output"]] == [
+            "partition 0",
+            "partition 1",
+            "partition 2",
+        ]
+        assert [_read(p) for p in partitions] == [
+            "partition 0",
+            "partition 1",
+            "partition 2",
+        ]
+
+
+def test__dump__with_path_serializer__replaces_previous_partitions_stored_as_directories():
+    with tempfile.TemporaryDirectory() as tmp:
+        serializer = AsDirectory(output_dir=tmp)
+        filename = os.path.join(tmp, "output")
+        partitions = [os.path.join(tmp, f"partition-{i}") for i in range(3)]
+        for i, partition in enumerate(partitions):
+            os.mkdir(partition)
+            _write(os.path.join(partition, f"file-{i}"), f"partition {i}")
+
+        outputs = deserialized_outputs(
+            {
+                "output": PartitionedOutput(
+                    map(
+                        lambda p: dump(
+                            filename=filename, value=p, serializer=serializer
+                        ),
+                        partitions,
+                    )
+                )
+            }
+        )
+
+        assert [sorted(os.listdir(p)) for p in outputs["output"]] == [
+            ["file-0"],
+            ["file-1"],
+            ["file-2"],
+        ]
+
+
+def test__dump_and_load__with_stream_serializer():
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "output")
+        output_file = dump(
+            filename=filename,
+            value={"a": 1},
+            serializer=DefaultSerializer,
+        )
+
+        assert output_file.filename == filename
+        assert load(filename, output_file.serializer) == {"a": 1}
+
+
+def test__invoke__hands_files_over_between_tasks_without_copying_them():
+    with tempfile.TemporaryDirectory() as tmp:
+        serializer = HardLinkSerializer(tmp)
+        original = _write(os.path.join(tmp, "original"), "contents")
+
+        def identity(f):
+            return f
+
+        dag = DAG(
+            nodes=dict(
+                first=Task(
+                    identity,
+                    inputs=dict(f=FromParam()),
+                    outputs=dict(f=FromReturnValue(serializer=serializer)),
+                ),
+                second=Task(
+                    identity,
+                    inputs=dict(f=FromNodeOutput("first", "f", serializer=serializer)),
+                    outputs=dict(f=FromReturnValue(serializer=serializer)),
+                ),
+            ),
+            inputs=dict(f=FromParam()),
+            outputs=dict(f=FromNodeOutput("second", "f", serializer=serializer)),
+        )
+
+        result = invoke(dag, params=dict(f=original))
+
+        assert result["f"] != original
+        assert os.path.samefile(result["f"], original)
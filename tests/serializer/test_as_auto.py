@@ -0,0 +1,172 @@
+import io
+import os
+import tempfile
+from collections import namedtuple
+from enum import IntEnum
+
+import pytest
+
+from dagger.serializer.as_auto import AsAuto
+from dagger.serializer.as_bytes import AsBytes
+from dagger.serializer.as_json import AsJSON
+from dagger.serializer.as_numpy import AsNumpy
+from dagger.serializer.as_pickle import AsPickle
+from dagger.serializer.errors import DeserializationError, SerializationError
+from dagger.serializer.protocol import Serializer
+
+Point = namedtuple("Point", ["x", "y"])
+
+
+class Color(IntEnum):
+    RED = 1
+
+
+def serialized(value, serializer=None) -> bytes:
+    writer = io.BytesIO()
+    (serializer or AsAuto()).serialize(value, writer)
+    return writer.getvalue()
+
+
+def test__conforms_to_protocol():
+    assert isinstance(AsAuto(), Serializer)
+
+
+def test_extension():
+    assert AsAuto().extension == "auto"
+
+
+def test_serialization__chooses_the_serializer_based_on_the_type():
+    cases = [
+        (None, b"DGRAUTO:json\nnull"),
+        ({"a": [1, 2.5, "3", True]}, b'DGRAUTO:json\n{"a": [1, 2.5, "3", true]}'),
+        (b"\x00\xff", b"DGRAUTO:bytes\n\x00\xff"),
+        (memoryview(b"\x00\xff"), b"DGRAUTO:bytes\n\x00\xff"),
+    ]
+
+    for value, expected_serialized_value in cases:
+        assert serialized(value) == expected_serialized_value
+
+
+def test_serialization__pickles_values_json_would_not_restore_faithfully():
+    shared_list = [1, 2]
+    cyclic_list = []
+    cyclic_list.append(cyclic_list)
+
+    values = [
+        (1, 2),
+        {1: "non-string key"},
+        {"nested": {("tuple", "key"): 1}},
+        float("nan"),
+        float("inf"),
+        Point(1, 2),
+        Color.RED,
+        bytearray(b"bytearray"),
+        {"a", "set"},
+        [shared_list, shared_list],
+        cyclic_list,
+    ]
+
+    for value in values:
+        assert serialized(value).startswith(b"DGRAUTO:pickle\n")
+
+
+def test_serialization_and_deserialization__are_symmetric():
+    serializer = AsAuto()
+    values = [
+        None,
+        1,
+        "string",
+        [1, "two", {"three": 3.0}],
+        {"a": {"b": [None, True]}},
+        (1, 2),
+        {1: "non-string key"},
+        Point(1, 2),
+        Color.RED,
+        b"bytes",
+        bytearray(b"bytearray"),
+        {"a", "set"},
+    ]
+
+    for value in values:
+        deserialized_value = serializer.deserialize(io.BytesIO(serialized(value)))
+        assert deserialized_value == value
+        assert type(deserialized_value) is type(value)
+
+
+def test_serialization__of_numpy_arrays():
+    np = pytest.importorskip("numpy")
+    serializer = AsAuto()
+
+    assert serialized(np.arange(3)).startswith(b"DGRAUTO:numpy\n")
+    assert serialized(np.array([object()])).startswith(b"DGRAUTO:pickle\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "value.auto")
+        with open(filename, "wb") as writer:
+            serializer.serialize(np.arange(10), writer)
+
+        with open(filename, "rb") as reader:
+            value = serializer.deserialize(reader)
+
+        # The array is still memory-mapped, despite the header
+        assert isinstance(value, np.memmap)
+        np.testing.assert_array_equal(value, np.arange(10))
+        del value
+
+
+def test_serialization__with_custom_serializers():
+    serializer = AsAuto(json=AsJSON(indent=2), bytes=AsBytes(memory_map=True))
+
+    assert serialized({"a": 1}, serializer) == b'DGRAUTO:json\n{\n  "a": 1\n}'
+    deserialized_value = serializer.deserialize(
+        io.BytesIO(serialized(b"bytes", serializer))
+    )
+    assert isinstance(deserialized_value, memoryview)
+    assert deserialized_value == b"bytes"
+
+
+def test_serialization__with_errors_from_the_selected_serializer():
+    with pytest.raises(SerializationError):
+        serialized(lambda: 1)
+
+
+def test_deserialization__without_a_header():
+    invalid_values = [
+        b"",
+        b'{"a": 1}',
+        b"DGRAUTO:json",
+        b"DGRAUTO:" + b"x" * 100 + b"\n",
+    ]
+
+    for value in invalid_values:
+        with pytest.raises(DeserializationError) as e:
+            AsAuto().deserialize(io.BytesIO(value))
+
+        assert (
+            str(e.value)
+            == "The value does not start with the header written by AsAuto. Make sure it was serialized with AsAuto."
+        )
+
+
+def test_deserialization__with_an_unknown_tag():
+    with pytest.raises(DeserializationError) as e:
+        AsAuto().deserialize(io.BytesIO(b"DGRAUTO:avro\n..."))
+
+    assert (
+        str(e.value)
+        == "The value was serialized with an unknown tag 'avro'. These are the tags supported: ['json', 'bytes', 'numpy', 'pickle']"
+    )
+
+
+def test_representation():
+    assert (
+        repr(AsAuto())
+        == "AsAuto(json=AsJSON(indent=None, allow_nan=False), bytes=AsBytes(memory_map=False), numpy=AsNumpy(memory_map=True), pickle=AsPickle())"
+    )
+
+
+def test_equality():
+    assert AsAuto() == AsAuto()
+    assert AsAuto() == AsAuto(json=AsJSON(), pickle=AsPickle())
+    assert AsAuto() != AsAuto(numpy=AsNumpy(memory_map=False))
+    assert AsAuto() != "AsAuto()"
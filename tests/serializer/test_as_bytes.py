@@ -0,0 +1,159 @@
+import io
+import os
+import tempfile
+import tracemalloc
+
+import pytest
+
+from dagger.serializer.as_bytes import AsBytes
+from dagger.serializer.errors import SerializationError
+from dagger.serializer.protocol import Serializer
+
+MB = 1024**2
+
+
+def test__conforms_to_protocol():
+    assert isinstance(AsBytes(), Serializer)
+
+
+def test_extension():
+    assert AsBytes().extension == "bin"
+
+
+def test_serialization__writes_values_verbatim():
+    serializer = AsBytes()
+    valid_values = [
+        b"",
+        b"\x00\x01\xff",
+        bytearray(b"a bytearray"),
+        memoryview(b"a memoryview"),
+    ]
+
+    for value in valid_values:
+        writer = io.BytesIO()
+        serializer.serialize(value, writer)
+        assert writer.getvalue() == bytes(value)
+
+
+def test_serialization__of_non_contiguous_memoryviews():
+    serializer = AsBytes()
+    writer = io.BytesIO()
+
+    serializer.serialize(memoryview(b"abcdef")[::2], writer)
+
+    assert writer.getvalue() == b"ace"
+
+
+def test_serialization__of_invalid_values():
+    serializer = AsBytes()
+    invalid_values = ["a string", 1, None, [b"a", b"list"]]
+
+    for value in invalid_values:
+        with pytest.raises(SerializationError) as e:
+            serializer.serialize(value, io.BytesIO())
+
+        assert (
+            str(e.value)
+            == f"AsBytes can only serialize bytes, bytearray or memoryview values. However, the value was of type '{type(value).__name__}'."
+        )
+
+
+def test_deserialization__returns_bytes():
+    serializer = AsBytes()
+
+    value = serializer.deserialize(io.BytesIO(b"some bytes"))
+
+    assert isinstance(value, bytes)
+    assert value == b"some bytes"
+
+
+def test_deserialization__with_memory_map_from_a_file():
+    serializer = AsBytes(memory_map=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "value.bin")
+        with open(filename, "wb") as writer:
+            serializer.serialize(b"some bytes", writer)
+
+        with open(filename, "rb") as reader:
+            value = serializer.deserialize(reader)
+
+        # The value is still available after the reader has been closed
+        assert isinstance(value, memoryview)
+        assert value.readonly
+        assert value == b"some bytes"
+
+        value.release()
+
+
+def test_deserialization__with_memory_map_from_the_middle_of_a_file():
+    serializer = AsBytes(memory_map=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "value.bin")
+        with open(filename, "wb") as writer:
+            writer.write(b"header")
+            serializer.serialize(b"some bytes", writer)
+
+        with open(filename, "rb") as reader:
+            reader.read(len(b"header"))
+            value = serializer.deserialize(reader)
+
+        assert value == b"some bytes"
+        value.release()
+
+
+def test_deserialization__with_memory_map_from_an_empty_file():
+    serializer = AsBytes(memory_map=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "value.bin")
+        with open(filename, "wb") as writer:
+            serializer.serialize(b"", writer)
+
+        with open(filename, "rb") as reader:
+            value = serializer.deserialize(reader)
+
+        assert isinstance(value, memoryview)
+        assert value == b""
+
+
+def test_deserialization__with_memory_map_from_a_stream():
+    serializer = AsBytes(memory_map=True)
+
+    value = serializer.deserialize(io.BytesIO(b"some bytes"))
+
+    assert isinstance(value, memoryview)
+    assert value.readonly
+    assert value == b"some bytes"
+
+
+def test_memory_map__does_not_read_the_file_into_memory():
+    serializer = AsBytes(memory_map=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "value.bin")
+        with open(filename, "wb") as writer:
+            serializer.serialize(os.urandom(100 * MB), writer)
+
+        tracemalloc.start()
+        with open(filename, "rb") as reader:
+            value = serializer.deserialize(reader)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert len(value) == 100 * MB
+        assert peak < MB
+        value.release()
+
+
+def test_representation():
+    assert repr(AsBytes()) == "AsBytes(memory_map=False)"
+    assert repr(AsBytes(memory_map=True)) == "AsBytes(memory_map=True)"
+
+
+def test_equality():
+    assert AsBytes() == AsBytes()
+    assert AsBytes(memory_map=True) == AsBytes(memory_map=True)
+    assert AsBytes() != AsBytes(memory_map=True)
+    assert AsBytes() != "AsBytes()"
@@ -0,0 +1,249 @@
+import io
+import os
+import tempfile
+import tracemalloc
+
+import pytest
+
+from dagger.serializer.as_directory import AsDirectory
+from dagger.serializer.errors import DeserializationError, SerializationError
+from dagger.serializer.protocol import PathSerializer, Serializer
+
+KB = 1024
+MB = KB**2
+
+
+def _write(path, contents):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(contents)
+
+
+def _contents(root):
+    contents = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        for dirname in dirnames:
+            contents[os.path.relpath(os.path.join(dirpath, dirname), root)] = None
+        for filename in filenames:
+            with open(os.path.join(dirpath, filename)) as f:
+                contents[os.path.relpath(os.path.join(dirpath, filename), root)] = (
+                    f.read()
+                )
+
+    return contents
+
+
+def test__conforms_to_protocol():
+    assert isinstance(AsDirectory(), Serializer)
+    assert isinstance(AsDirectory(), PathSerializer)
+
+
+def test_extension():
+    assert AsDirectory().extension == "tar"
+
+
+def test_serialization_and_deserialization():
+    with tempfile.TemporaryDirectory() as tmp:
+        serializer = AsDirectory(output_dir=tmp)
+        original = os.path.join(tmp, "dataset")
+        _write(os.path.join(original, "part.0.parquet"), "first partition")
+        _write(os.path.join(original, "part.1.parquet"), "second partition")
+        _write(os.path.join(original, "nested", "deeper", "file"), "nested file")
+        os.makedirs(os.path.join(original, "empty"))
+
+        buffer = io.BytesIO()
+        serializer.serialize(original, buffer)
+        buffer.seek(0)
+        deserialized = serializer.deserialize(buffer)
+
+        assert deserialized != original
+        assert os.path.dirname(deserialized) == tmp
+        assert _contents(deserialized) == _contents(original)
+        assert _contents(original) == {
+            "part.0.parquet": "first partition",
+            "part.1.parquet": "second partition",
+            "nested": None,
+            os.path.join("nested", "deeper"): None,
+            os.path.join("nested", "deeper", "file"): "nested file",
+            "empty": None,
+        }
+
+
+def test_serialization_and_deserialization__through_paths():
+    with tempfile.TemporaryDirectory() as tmp:
+        serializer = AsDirectory(output_dir=tmp)
+        original = os.path.join(tmp, "dataset")
+        _write(os.path.join(original, "part.0.parquet"), "first partition")
+        _write(os.path.join(original, "nested", "deeper", "file"), "nested file")
+        os.makedirs(os.path.join(original, "empty"))
+
+        path = os.path.join(tmp, "value")
+        serializer.serialize_to_path(original, path)
+        deserialized = serializer.deserialize_from_path(path)
+
+        assert deserialized != original
+        assert os.path.dirname(deserialized) == tmp
+        assert _contents(deserialized) == _contents(original)
+
+        # Files are handed over through hard links, instead of being copied
+        assert os.path.samefile(
+            os.path.join(path, "data", "part.0.parquet"),
+            os.path.join(original, "part.0.parquet"),
+        )
+        assert os.path.samefile(
+            os.path.join(deserialized, "nested", "deeper", "file"),
+            os.path.join(original, "nested", "deeper", "file"),
+        )
+
+
+def test_deserialization_from_path__with_an_archive():
+    with tempfile.TemporaryDirectory() as tmp:
+        serializer = AsDirectory(output_dir=tmp)
+        original = os.path.join(tmp, "dataset")
+        _write(os.path.join(original, "a"), "a")
+
+        path = os.path.join(tmp, "value.tar")
+        with open(path, "wb") as f:
+            serializer.serialize(original, f)
+
+        assert _contents(serializer.deserialize_from_path(path)) == {"a": "a"}
+
+
+def test_deserialization_from_path__without_a_data_directory():
+    with tempfile.TemporaryDirectory() as tmp:
+        with pytest.raises(DeserializationError):
+            AsDirectory(output_dir=tmp).deserialize_from_path(tmp)
+
+
+def test_serialization__follows_symbolic_links_to_directories():
+    with tempfile.TemporaryDirectory() as tmp:
+        serializer = AsDirectory(output_dir=tmp)
+        original = os.path.join(tmp, "dataset")
+        _write(os.path.join(tmp, "shared", "file"), "shared file")
+        os.makedirs(original)
+        os.symlink(os.path.join(tmp, "shared"), os.path.join(original, "link"))
+        expected = {"link": None, os.path.join("link", "file"): "shared file"}
+
+        buffer = io.BytesIO()
+        serializer.serialize(original, buffer)
+        buffer.seek(0)
+        assert _contents(serializer.deserialize(buffer)) == expected
+
+        path = os.path.join(tmp, "value")
+        serializer.serialize_to_path(original, path)
+        assert _contents(serializer.deserialize_from_path(path)) == expected
+
+
+def test_serialization__with_symbolic_links_to_a_parent_directory():
+    with tempfile.TemporaryDirectory() as tmp:
+        serializer = AsDirectory()
+        original = os.path.join(tmp, "dataset")
+        _write(os.path.join(original, "nested", "file"), "file")
+        os.symlink(original, os.path.join(original, "nested", "cycle"))
+
+        with pytest.raises(SerializationError) as e:
+            serializer.serialize(original, io.BytesIO())
+
+        assert "contain themselves" in str(e.value)
+
+        with pytest.raises(SerializationError):
+            serializer.serialize_to_path(original, os.path.join(tmp, "value"))
+
+
+def test_serialization__is_deterministic():
+    with tempfile.TemporaryDirectory() as tmp:
+        serializer = AsDirectory()
+        original = os.path.join(tmp, "dataset")
+        for i in range(10):
+            _write(os.path.join(original, str(i)), str(i))
+
+        first, second = io.BytesIO(), io.BytesIO()
+        serializer.serialize(original, first)
+        serializer.serialize(original, second)
+
+        assert first.getvalue() == second.getvalue()
+
+
+def test_serialization__with_invalid_values():
+    serializer = AsDirectory()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_ = os.path.join(tmp, "file")
+        _write(file_, "")
+
+        for value in [None, 1, file_, os.path.join(tmp, "missing")]:
+            with pytest.raises(SerializationError):
+                serializer.serialize(value, io.BytesIO())
+
+
+def test_deserialization__when_contents_have_been_tampered_with():
+    with tempfile.TemporaryDirectory() as tmp:
+        serializer = AsDirectory(output_dir=tmp)
+        original = os.path.join(tmp, "dataset")
+        _write(os.path.join(original, "a"), "original a")
+        _write(os.path.join(original, "b"), "original b")
+
+        buffer = io.BytesIO()
+        serializer.serialize(original, buffer)
+        tampered = buffer.getvalue().replace(b"original b", b"tampered b")
+
+        with pytest.raises(DeserializationError) as e:
+            serializer.deserialize(io.BytesIO(tampered))
+
+        assert "['data/b']" in str(e.value)
+
+
+def test_memory_footprint_is_constant():
+    with tempfile.TemporaryDirectory() as tmp:
+        serializer = AsDirectory(output_dir=tmp)
+        large_dir = os.path.join(tmp, "large_dir")
+        serialized_file = os.path.join(tmp, "serialized_file")
+
+        # Write 4 files of 25 MB each
+        os.makedirs(large_dir)
+        for i in range(4):
+            with open(os.path.join(large_dir, str(i)), "w") as f:
+                for _ in range(25 * KB):
+                    f.write("x" * KB)
+
+        tracemalloc.start()
+        snapshot_before_serialization = tracemalloc.take_snapshot()
+
+        with open(serialized_file, "wb") as f:
+            serializer.serialize(large_dir, f)
+
+        snapshot_after_serialization = tracemalloc.take_snapshot()
+
+        with open(serialized_file, "rb") as f:
+            deserialized_dir = serializer.deserialize(f)
+
+        snapshot_after_deserialization = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        assert sorted(os.listdir(deserialized_dir)) == ["0", "1", "2", "3"]
+
+        largest_memory_allocation_when_serializing = (
+            snapshot_after_serialization.compare_to(
+                snapshot_before_serialization,
+                "lineno",
+            )[0].size_diff
+        )
+        assert largest_memory_allocation_when_serializing < 2 * MB
+
+        largest_memory_allocation_when_deserializing = (
+            snapshot_after_deserialization.compare_to(
+                snapshot_after_serialization,
+                "lineno",
+            )[0].size_diff
+        )
+        assert largest_memory_allocation_when_deserializing < 2 * MB
+
+
+def test_representation():
+    assert repr(AsDirectory()) == "AsDirectory(output_dir=None)"
+
+
+def test_equality():
+    assert AsDirectory() == AsDirectory()
+    assert AsDirectory(output_dir="/tmp") != AsDirectory()
+    assert AsDirectory() != "AsDirectory()"
@@ -0,0 +1,247 @@
+import io
+import os
+import tarfile
+import tempfile
+import tracemalloc
+
+import pytest
+
+from dagger.serializer.as_file import AsFile
+from dagger.serializer.errors import DeserializationError, SerializationError
+from dagger.serializer.protocol import PathSerializer, Serializer
+
+KB = 1024
+MB = KB**2
+
+
+def test__conforms_to_protocol():
+    assert isinstance(AsFile(), Serializer)
+    assert isinstance(AsFile(), PathSerializer)
+
+
+def test_extension():
+    assert AsFile().extension == "tar"
+
+
+def test_serialization_and_deserialization():
+    with tempfile.TemporaryDirectory() as tmp:
+        serializer = AsFile(output_dir=tmp)
+        original = os.path.join(tmp, "model.bin")
+        with open(original, "wb") as f:
+            f.write(b"\x00\x01binary contents")
+
+        buffer = io.BytesIO()
+        serializer.serialize(original, buffer)
+        buffer.seek(0)
+        deserialized = serializer.deserialize(buffer)
+
+        assert deserialized != original
+        assert os.path.dirname(os.path.dirname(deserialized)) == tmp
+        assert os.path.basename(deserialized) == "model.bin"
+        with open(deserialized, "rb") as f:
+            assert f.read() == b"\x00\x01binary contents"
+
+
+def test_serialization_and_deserialization__through_paths():
+    with tempfile.TemporaryDirectory() as tmp:
+        serializer = AsFile(output_dir=tmp)
+        original = os.path.join(tmp, "model.bin")
+        with open(original, "wb") as f:
+            f.write(b"\x00\x01binary contents")
+
+        path = os.path.join(tmp, "value")
+        serializer.serialize_to_path(original, path)
+        deserialized = serializer.deserialize_from_path(path)
+
+        assert deserialized != original
+        assert os.path.dirname(os.path.dirname(deserialized)) == tmp
+        assert os.path.basename(deserialized) == "model.bin"
+        with open(deserialized, "rb") as f:
+            assert f.read() == b"\x00\x01binary contents"
+
+        # Files are handed over through hard links, instead of being copied
+        assert os.path.samefile(os.path.join(path, "data", "model.bin"), original)
+        assert os.path.samefile(deserialized, original)
+
+
+def test_deserialization_from_path__with_an_archive():
+    with tempfile.TemporaryDirectory() as tmp:
+        serializer = AsFile(output_dir=tmp)
+        original = os.path.join(tmp, "file")
+        with open(original, "w") as f:
+            f.write("contents")
+
+        path = os.path.join(tmp, "value.tar")
+        with open(path, "wb") as f:
+            serializer.serialize(original, f)
+
+        with open(serializer.deserialize_from_path(path)) as f:
+            assert f.read() == "contents"
+
+
+def test_deserialization_from_path__with_invalid_values():
+    with tempfile.TemporaryDirectory() as tmp:
+        serializer = AsFile(output_dir=tmp)
+        os.makedirs(os.path.join(tmp, "empty", "data"))
+        os.makedirs(os.path.join(tmp, "several", "data", "a"))
+        os.makedirs(os.path.join(tmp, "several", "data", "b"))
+
+        for value in ["missing", "empty", "several"]:
+            with pytest.raises(DeserializationError):
+                serializer.deserialize_from_path(os.path.join(tmp, value))
+
+
+def test_serialization__when_the_file_shrinks():
+    with tempfile.TemporaryDirectory() as tmp:
+        original = os.path.join(tmp, "file")
+        with open(original, "wb") as f:
+            f.write(b"x" * MB)
+
+        class TruncatingWriter(io.BytesIO):
+            def write(self, b):
+                # The file shrinks after its header has been written
+                with open(original, "wb"):
+                    pass
+                return super().write(b)
+
+        with pytest.raises(SerializationError) as e:
+            AsFile().serialize(original, TruncatingWriter())
+
+        assert "changes size" in str(e.value)
+
+
+def test_deserialization__does_not_overwrite_files_with_the_same_name():
+    with tempfile.TemporaryDirectory() as tmp:
+        serializer = AsFile(output_dir=tmp)
+        original = os.path.join(tmp, "file")
+        with open(original, "w") as f:
+            f.write("contents")
+
+        buffer = io.BytesIO()
+        serializer.serialize(original, buffer)
+
+        first = serializer.deserialize(io.BytesIO(buffer.getvalue()))
+        second = serializer.deserialize(io.BytesIO(buffer.getvalue()))
+
+        assert first != second
+
+
+def test_serialization__with_invalid_values():
+    serializer = AsFile()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for value in [None, 1, tmp, os.path.join(tmp, "missing")]:
+            with pytest.raises(SerializationError):
+                serializer.serialize(value, io.BytesIO())
+
+
+def test_deserialization__with_invalid_values():
+    with tempfile.TemporaryDirectory() as tmp:
+        serializer = AsFile(output_dir=tmp)
+
+        for value in [b"", b"not a tar archive"]:
+            with pytest.raises(DeserializationError):
+                serializer.deserialize(io.BytesIO(value))
+
+
+def test_deserialization__without_checksums():
+    with tempfile.TemporaryDirectory() as tmp:
+        serializer = AsFile(output_dir=tmp)
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w") as tar:
+            info = tarfile.TarInfo("data/file")
+            info.size = 3
+            tar.addfile(info, io.BytesIO(b"abc"))
+
+        buffer.seek(0)
+        with pytest.raises(DeserializationError) as e:
+            serializer.deserialize(buffer)
+
+        assert "SHA256SUMS" in str(e.value)
+
+
+def test_deserialization__when_contents_have_been_tampered_with():
+    with tempfile.TemporaryDirectory() as tmp:
+        serializer = AsFile(output_dir=tmp)
+        original = os.path.join(tmp, "file")
+        with open(original, "w") as f:
+            f.write("original contents")
+
+        buffer = io.BytesIO()
+        serializer.serialize(original, buffer)
+        tampered = buffer.getvalue().replace(b"original", b"tampered")
+
+        with pytest.raises(DeserializationError) as e:
+            serializer.deserialize(io.BytesIO(tampered))
+
+        assert "data/file" in str(e.value)
+
+
+def test_deserialization__with_members_outside_of_the_data_directory():
+    with tempfile.TemporaryDirectory() as tmp:
+        serializer = AsFile(output_dir=tmp)
+
+        for name in ["data/../../escape", "/etc/passwd", "other/file"]:
+            buffer = io.BytesIO()
+            with tarfile.open(fileobj=buffer, mode="w") as tar:
+                info = tarfile.TarInfo(name)
+                info.size = 3
+                tar.addfile(info, io.BytesIO(b"abc"))
+
+            buffer.seek(0)
+            with pytest.raises(DeserializationError):
+                serializer.deserialize(buffer)
+
+
+def test_memory_footprint_is_constant():
+    with tempfile.TemporaryDirectory() as tmp:
+        serializer = AsFile(output_dir=tmp)
+        large_file = os.path.join(tmp, "large_file")
+        serialized_file = os.path.join(tmp, "serialized_file")
+
+        # Write a 100-MB file
+        with open(large_file, "w") as f:
+            for _ in range(100 * KB):
+                f.write("x" * KB)
+
+        tracemalloc.start()
+        snapshot_before_serialization = tracemalloc.take_snapshot()
+
+        with open(serialized_file, "wb") as f:
+            serializer.serialize(large_file, f)
+
+        snapshot_after_serialization = tracemalloc.take_snapshot()
+
+        with open(serialized_file, "rb") as f:
+            deserialized_filename = serializer.deserialize(f)
+
+        snapshot_after_deserialization = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        assert os.path.getsize(deserialized_filename) == 100 * MB
+
+        largest_memory_allocation_when_serializing = (
+            snapshot_after_serialization.compare_to(
+                snapshot_before_serialization,
+                "lineno",
+            )[0].size_diff
+        )
+        assert largest_memory_allocation_when_serializing < 2 * MB
+
+        largest_memory_allocation_when_deserializing = (
+            snapshot_after_deserialization.compare_to(
+                snapshot_after_serialization,
+                "lineno",
+            )[0].size_diff
+        )
+        assert largest_memory_allocation_when_deserializing < 2 * MB
+
+
+def test_representation():
+    assert repr(AsFile()) == "AsFile(output_dir=None)"
+    assert repr(AsFile(output_dir="/tmp")) == "AsFile(output_dir=/tmp)"
+
+
+def test_equality():
+    assert AsFile() == AsFile()
+    assert AsFile(output_dir="/tmp") != AsFile()
@@ -1,7 +1,10 @@
+import importlib.util
 import io
+import json
 import os
 import sys
 import tempfile
+from unittest import mock
 
 import pytest
 
@@ -88,3 +91,200 @@ def test_deserialization__with_invalid_values():
     for value in invalid_values:
         with pytest.raises(DeserializationError):
             serializer.deserialize(io.BytesIO(value))
+
+
+BACKENDS = ["json", "auto"] + (["orjson"] if importlib.util.find_spec("orjson") else [])
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_serialization_and_deserialization__with_backend(backend):
+    serializer = AsJSON(backend=backend)
+    valid_values = [
+        None,
+        1,
+        1.1,
+        True,
+        "string",
+        "ñ and other non-ascii characters",
+        ["list", "of", 3],
+        ("tuple", "as", "list"),
+        {"object": {"with": ["nested", "values"]}},
+    ]
+
+    for value in valid_values:
+        buffer = io.BytesIO()
+        serializer.serialize(value, buffer)
+        buffer.seek(0)
+
+        expected = list(value) if isinstance(value, tuple) else value
+        assert serializer.deserialize(buffer) == expected
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_serialization__with_backend__is_readable_by_every_backend(backend):
+    buffer = io.BytesIO()
+    AsJSON(backend=backend).serialize({"a": [1, 2.5, None, "ñ"]}, buffer)
+
+    for other_backend in BACKENDS:
+        assert AsJSON(backend=other_backend).deserialize(
+            io.BytesIO(buffer.getvalue())
+        ) == {"a": [1, 2.5, None, "ñ"]}
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_serialization__with_backend__and_invalid_values(backend):
+    serializer = AsJSON(backend=backend)
+    invalid_values = [
+        {"python", "set"},
+        serializer,
+    ]
+
+    for value in invalid_values:
+        with pytest.raises(SerializationError):
+            serializer.serialize(value, io.BytesIO())
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_deserialization__with_backend__and_invalid_values(backend):
+    serializer = AsJSON(backend=backend)
+    invalid_values = [
+        b"}{",
+        b"",
+        b'"a"1',
+        b"\xff",
+    ]
+
+    for value in invalid_values:
+        with pytest.raises(DeserializationError):
+            serializer.deserialize(io.BytesIO(value))
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_serialization__with_backend__and_non_finite_floats(backend):
+    serializer = AsJSON(backend=backend)
+    invalid_values = [
+        {"x": float("nan"), "y": float("inf")},
+        [None, 1.5, float("-inf")],
+        ("tuple", float("nan")),
+        float("inf"),
+    ]
+
+    for value in invalid_values:
+        with pytest.raises(SerializationError):
+            serializer.serialize(value, io.BytesIO())
+
+
+def test_serialization__streams_the_value_into_the_writer():
+    import tracemalloc
+
+    value = ["x" * 1024] * 20 * 1024
+
+    with tempfile.TemporaryFile() as f:
+        tracemalloc.start()
+        AsJSON().serialize(value, f)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert f.tell() > 20 * 1024**2
+        assert peak < 1024**2
+
+
+def test_serialization__does_not_close_the_writer():
+    buffer = io.BytesIO()
+    serializer = AsJSON()
+
+    serializer.serialize({"a": 1}, buffer)
+    buffer.seek(0)
+    assert serializer.deserialize(buffer) == {"a": 1}
+    assert not buffer.closed
+
+
+def test_serialization__with_indentation__is_the_same_in_every_backend():
+    for backend in BACKENDS:
+        buffer = io.BytesIO()
+        AsJSON(indent=2, backend=backend).serialize({"a": 1, "b": 2}, buffer)
+        assert buffer.getvalue() == b'{\n  "a": 1,\n  "b": 2\n}'
+
+
+def test_serialization__with_auto_backend__falls_back_to_json_library():
+    pytest.importorskip("orjson")
+    serializer = AsJSON(backend="auto")
+
+    buffer = io.BytesIO()
+    serializer.serialize(2**70, buffer)
+    assert buffer.getvalue() == json.dumps(2**70).encode("utf-8")
+
+    assert serializer.deserialize(io.BytesIO(b"1180591620717411303424")) == 2**70
+
+    serializer = AsJSON(backend="auto", allow_nan=True)
+    buffer = io.BytesIO()
+    serializer.serialize(float("inf"), buffer)
+    assert buffer.getvalue() == b"Infinity"
+    assert serializer.deserialize(io.BytesIO(b"Infinity")) == float("inf")
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_serialization__with_non_string_keys(backend):
+    serializer = AsJSON(backend=backend)
+    buffer = io.BytesIO()
+    serializer.serialize({1: "a", None: "b", False: "c"}, buffer)
+    buffer.seek(0)
+
+    assert serializer.deserialize(buffer) == {"1": "a", "null": "b", "false": "c"}
+
+
+def test_serialization__with_orjson_backend__does_not_serialize_types_unsupported_by_json():
+    pytest.importorskip("orjson")
+    import dataclasses
+    import datetime
+
+    @dataclasses.dataclass
+    class DataClass:
+        a: int
+
+    serializer = AsJSON(backend="orjson")
+    for value in [DataClass(a=1), datetime.datetime.now()]:
+        with pytest.raises(SerializationError):
+            serializer.serialize(value, io.BytesIO())
+
+
+def test__init__with_unsupported_backend():
+    with pytest.raises(ValueError) as e:
+        AsJSON(backend="simplejson")
+
+    assert (
+        str(e.value)
+        == "JSON backend 'simplejson' is not supported. These are the backends available: ['json', 'orjson', 'auto']"
+    )
+
+
+def test__init__with_options_unsupported_by_orjson():
+    for options in [dict(indent=4), dict(allow_nan=True)]:
+        with pytest.raises(ValueError):
+            AsJSON(backend="orjson", **options)
+
+
+def test_serialization__with_orjson_backend__when_orjson_is_not_installed():
+    with mock.patch("dagger.serializer.as_json._orjson_module", False):
+        with pytest.raises(ImportError) as e:
+            AsJSON(backend="orjson").serialize(1, io.BytesIO())
+
+        assert "pip install orjson" in str(e.value)
+
+        buffer = io.BytesIO()
+        AsJSON(backend="auto").serialize({"a": 1}, buffer)
+        assert buffer.getvalue() == b'{"a": 1}'
+
+
+def test_representation():
+    assert repr(AsJSON()) == "AsJSON(indent=None, allow_nan=False)"
+    assert (
+        repr(AsJSON(backend="auto"))
+        == "AsJSON(indent=None, allow_nan=False, backend=auto)"
+    )
+
+
+def test_equality():
+    assert AsJSON() == AsJSON()
+    assert AsJSON() != AsJSON(indent=2)
+    assert AsJSON() != AsJSON(backend="auto")
@@ -0,0 +1,310 @@
+import io
+import os
+import tempfile
+import tracemalloc
+from typing import Iterator
+from unittest import mock
+
+import pytest
+
+from dagger.dag import DAG
+from dagger.input import FromNodeOutput
+from dagger.output import FromReturnValue
+from dagger.runtime.local import invoke
+from dagger.serializer.as_json_lines import AsJSONLines
+from dagger.serializer.errors import DeserializationError, SerializationError
+from dagger.serializer.protocol import PathSerializer, Serializer
+from dagger.task import Task
+
+MB = 1024**2
+
+
+def test__conforms_to_protocol():
+    assert isinstance(AsJSONLines(), Serializer)
+    assert isinstance(AsJSONLines(), PathSerializer)
+
+
+def test_extension():
+    assert AsJSONLines().extension == "jsonl"
+
+
+def test_serialization_and_deserialization__with_valid_values():
+    serializer = AsJSONLines()
+    valid_values = [
+        [],
+        [1, 2.5, None, True, "string"],
+        [{"object": {"with": ["nested", "values"]}}, ["a", "list"]],
+        ["a string\nwith multiple\nlines", ""],
+        (i for i in range(10)),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "value.jsonl")
+
+        for value in valid_values:
+            expected = list(value)
+
+            with open(filename, "wb") as writer:
+                serializer.serialize(expected, writer)
+
+            with open(filename, "rb") as reader:
+                from_file = serializer.deserialize(reader)
+
+            assert isinstance(from_file, Iterator)
+            assert list(from_file) == expected
+            assert list(serializer.deserialize_from_path(filename)) == expected
+
+            with open(filename, "rb") as reader:
+                from_stream = serializer.deserialize(io.BytesIO(reader.read()))
+
+            assert list(from_stream) == expected
+
+
+def test_serialization__writes_one_record_per_line():
+    buffer = io.BytesIO()
+    AsJSONLines().serialize([{"a": 1}, [2], "three"], buffer)
+
+    assert buffer.getvalue() == b'{"a": 1}\n[2]\n"three"\n'
+
+
+def test_serialization__with_invalid_values():
+    serializer = AsJSONLines()
+    invalid_values = [
+        1,
+        "a string",
+        b"bytes",
+        {"a": "dict"},
+        [float("nan")],
+        [object()],
+    ]
+
+    for value in invalid_values:
+        with pytest.raises(SerializationError):
+            serializer.serialize(value, io.BytesIO())
+
+
+def test_deserialization__with_invalid_values__fails_when_reaching_the_record():
+    serializer = AsJSONLines()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "value.jsonl")
+        with open(filename, "wb") as writer:
+            writer.write(b'{"valid": "record"}\n\nnot json\n')
+
+        records = serializer.deserialize_from_path(filename)
+        assert next(records) == {"valid": "record"}
+
+        with pytest.raises(DeserializationError) as e:
+            next(records)
+
+        assert str(e.value).startswith("Line 3 is not valid JSON")
+
+
+def test_deserialization__from_a_stream__fails_when_reaching_the_record():
+    records = AsJSONLines().deserialize(io.BytesIO(b'{"valid": "record"}\nnot json\n'))
+
+    assert next(records) == {"valid": "record"}
+    with pytest.raises(DeserializationError) as e:
+        next(records)
+
+    assert str(e.value).startswith("Line 2 is not valid JSON")
+
+
+def test_deserialization__reads_the_contents_the_file_had_when_it_was_loaded():
+    serializer = AsJSONLines()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "value.jsonl")
+        serializer.serialize_to_path([1, 2, 3], filename)
+        records = serializer.deserialize_from_path(filename)
+
+        os.remove(filename)
+        serializer.serialize_to_path([4, 5, 6], filename)
+
+        assert list(records) == [1, 2, 3]
+
+
+def test_deserialization__can_be_read_after_the_reader_is_closed_and_the_file_removed():
+    serializer = AsJSONLines()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "value.jsonl")
+        with open(filename, "wb") as writer:
+            serializer.serialize([1, 2, 3], writer)
+
+        with open(filename, "rb") as reader:
+            records = serializer.deserialize(reader)
+
+    assert list(records) == [1, 2, 3]
+
+
+def test_memory_footprint__is_bounded():
+    serializer = AsJSONLines()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "value.jsonl")
+
+        tracemalloc.start()
+
+        with open(filename, "wb") as writer:
+            serializer.serialize(
+                ({"id": i, "payload": "x" * 1000} for i in range(60_000)), writer
+            )
+
+        total = 0
+        for record in serializer.deserialize_from_path(filename):
+            total += record["id"]
+
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert os.path.getsize(filename) > 50 * MB
+        assert total == sum(range(60_000))
+        assert peak < MB
+
+
+def test_memory_footprint__from_a_stream__is_bounded():
+    class Stream(io.RawIOBase):
+        """A stream of records that is generated as it is read, and is not backed by a file."""
+
+        def __init__(self, n: int):
+            self._lines = (
+                f'{{"id": {i}, "payload": "{"x" * 1000}"}}\n'.encode("utf-8")
+                for i in range(n)
+            )
+            self._buffer = b""
+
+        def readable(self):
+            return True
+
+        def readinto(self, b):
+            while not self._buffer:
+                self._buffer = next(self._lines, None)
+                if self._buffer is None:
+                    self._buffer = b""
+                    return 0
+
+            n = min(len(b), len(self._buffer))
+            b[:n] = self._buffer[:n]
+            self._buffer = self._buffer[n:]
+            return n
+
+    tracemalloc.start()
+
+    total = 0
+    for record in AsJSONLines().deserialize(io.BufferedReader(Stream(20_000))):
+        total += record["id"]
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert total == sum(range(20_000))
+    assert peak < MB
+
+
+def test_deserialization__removes_its_private_files():
+    serializer = AsJSONLines()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        private_dir = os.path.join(tmp, "private")
+        os.mkdir(private_dir)
+        filename = os.path.join(tmp, "value.jsonl")
+        serializer.serialize_to_path([1, 2, 3], filename)
+
+        with mock.patch("tempfile.tempdir", private_dir):
+            consumed = serializer.deserialize_from_path(filename)
+            discarded = serializer.deserialize_from_path(filename)
+            with tempfile.TemporaryFile() as reader:
+                # Anonymous files (e.g. the ones S3 values are downloaded into) have no name to link to
+                serializer.serialize([4, 5], reader)
+                reader.seek(0)
+                spooled = serializer.deserialize(reader)
+
+        assert len(os.listdir(private_dir)) == 3
+
+        assert list(consumed) == [1, 2, 3]
+        assert list(spooled) == [4, 5]
+        del discarded
+        assert os.listdir(private_dir) == []
+
+
+def test__partitioned_outputs_and_fan_in():
+    def generate_partitions():
+        return [range(i * 3, i * 3 + 3) for i in range(3)]
+
+    def count(partitions):
+        return [list(records) for records in list(partitions)]
+
+    dag = DAG(
+        nodes=dict(
+            generate=Task(
+                generate_partitions,
+                outputs=dict(
+                    partitions=FromReturnValue(
+                        serializer=AsJSONLines(), is_partitioned=True
+                    )
+                ),
+            ),
+            count=Task(
+                count,
+                inputs=dict(
+                    partitions=FromNodeOutput(
+                        "generate", "partitions", serializer=AsJSONLines()
+                    )
+                ),
+                outputs=dict(count=FromReturnValue()),
+            ),
+        ),
+        outputs=dict(count=FromNodeOutput("count", "count")),
+    )
+
+    assert invoke(dag) == {"count": [[0, 1, 2], [3, 4, 5], [6, 7, 8]]}
+
+
+def test__fan_in_of_many_partitions__does_not_keep_a_file_open_per_partition():
+    resource = pytest.importorskip("resource")
+
+    def total(partitions):
+        return sum(sum(records) for records in partitions)
+
+    dag = DAG(
+        nodes=dict(
+            items=Task(
+                lambda: list(range(400)),
+                outputs=dict(items=FromReturnValue(is_partitioned=True)),
+            ),
+            records=Task(
+                lambda item: [item],
+                inputs=dict(item=FromNodeOutput("items", "items")),
+                outputs=dict(records=FromReturnValue(serializer=AsJSONLines())),
+                partition_by_input="item",
+            ),
+            total=Task(
+                total,
+                inputs=dict(
+                    partitions=FromNodeOutput(
+                        "records", "records", serializer=AsJSONLines()
+                    )
+                ),
+                outputs=dict(total=FromReturnValue()),
+            ),
+        ),
+        outputs=dict(total=FromNodeOutput("total", "total")),
+    )
+
+    soft_limit, hard_limit = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (min(soft_limit, 256), hard_limit))
+    try:
+        assert invoke(dag) == {"total": sum(range(400))}
+    finally:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (soft_limit, hard_limit))
+
+
+def test_representation():
+    assert repr(AsJSONLines()) == "AsJSONLines(allow_nan=False)"
+
+
+def test_equality():
+    assert AsJSONLines() == AsJSONLines()
+    assert AsJSONLines() != AsJSONLines(allow_nan=True)
+    assert AsJSONLines() != "AsJSONLines()"
@@ -0,0 +1,189 @@
+import io
+import os
+import tempfile
+import tracemalloc
+
+import pytest
+
+from dagger.serializer.as_numpy import AsNumpy
+from dagger.serializer.errors import DeserializationError, SerializationError
+from dagger.serializer.protocol import Serializer
+
+np = pytest.importorskip("numpy")
+
+MB = 1024**2
+
+
+def test__conforms_to_protocol():
+    assert isinstance(AsNumpy(), Serializer)
+
+
+def test_extension():
+    assert AsNumpy().extension == "npy"
+
+
+def test_serialization_and_deserialization__with_valid_values():
+    serializer = AsNumpy()
+    valid_values = [
+        np.arange(10),
+        np.array([[1.5, 2.5], [3.5, float("nan")]]),
+        np.array(["a", "string"]),
+        np.array([True, False]),
+        np.zeros((0, 3)),
+        np.array(42),
+        [1, 2, 3],
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "value.npy")
+
+        for value in valid_values:
+            with open(filename, "wb") as writer:
+                serializer.serialize(value, writer)
+
+            with open(filename, "rb") as reader:
+                deserialized_value = serializer.deserialize(reader)
+
+            np.testing.assert_array_equal(deserialized_value, value)
+
+
+def test_deserialization__from_a_file_returns_a_read_only_memmap():
+    serializer = AsNumpy()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "value.npy")
+        with open(filename, "wb") as writer:
+            serializer.serialize(np.arange(10), writer)
+
+        with open(filename, "rb") as reader:
+            value = serializer.deserialize(reader)
+
+        assert isinstance(value, np.memmap)
+        with pytest.raises(ValueError):
+            value[0] = 1
+
+        del value
+
+
+def test_deserialization__from_the_middle_of_a_file_returns_a_memmap():
+    serializer = AsNumpy()
+    values = [np.arange(10), np.asfortranarray(np.ones((3, 2))), np.array(42)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "value.npy")
+        for original in values:
+            with open(filename, "wb") as writer:
+                writer.write(b"header")
+                serializer.serialize(original, writer)
+
+            with open(filename, "rb") as reader:
+                reader.read(len(b"header"))
+                value = serializer.deserialize(reader)
+
+            assert isinstance(value, np.memmap)
+            np.testing.assert_array_equal(value, original)
+            assert value.flags.f_contiguous == original.flags.f_contiguous
+            del value
+
+
+def test_deserialization__without_memory_map():
+    serializer = AsNumpy(memory_map=False)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "value.npy")
+        with open(filename, "wb") as writer:
+            serializer.serialize(np.arange(10), writer)
+
+        with open(filename, "rb") as reader:
+            value = serializer.deserialize(reader)
+
+        assert not isinstance(value, np.memmap)
+        np.testing.assert_array_equal(value, np.arange(10))
+
+
+def test_deserialization__from_a_stream_not_backed_by_a_file():
+    serializer = AsNumpy()
+    buffer = io.BytesIO()
+    serializer.serialize(np.arange(10), buffer)
+    buffer.seek(0)
+
+    value = serializer.deserialize(buffer)
+
+    assert not isinstance(value, np.memmap)
+    np.testing.assert_array_equal(value, np.arange(10))
+
+
+def test_serialization__with_invalid_values():
+    serializer = AsNumpy()
+    invalid_values = [
+        {"a": "dict"},
+        np.array([object()]),
+    ]
+
+    for value in invalid_values:
+        with pytest.raises(SerializationError):
+            serializer.serialize(value, io.BytesIO())
+
+
+def test_deserialization__with_invalid_values():
+    serializer = AsNumpy()
+    invalid_values = [
+        b"",
+        b"not a numpy array",
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "value.npy")
+        for value in invalid_values:
+            with open(filename, "wb") as writer:
+                writer.write(value)
+
+            with open(filename, "rb") as reader:
+                with pytest.raises(DeserializationError):
+                    serializer.deserialize(reader)
+
+            with pytest.raises(DeserializationError):
+                serializer.deserialize(io.BytesIO(value))
+
+
+def test_memory_footprint__is_constant_when_deserializing_from_a_file():
+    serializer = AsNumpy()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "large.npy")
+
+        # Write a 100-MB array
+        with open(filename, "wb") as writer:
+            serializer.serialize(np.ones(100 * MB // 8), writer)
+
+        tracemalloc.start()
+        snapshot_before_deserialization = tracemalloc.take_snapshot()
+
+        with open(filename, "rb") as reader:
+            value = serializer.deserialize(reader)
+
+        assert value[-1000:].sum() == 1000
+
+        snapshot_after_deserialization = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        largest_memory_allocation_when_deserializing = (
+            snapshot_after_deserialization.compare_to(
+                snapshot_before_deserialization,
+                "lineno",
+            )[0].size_diff
+        )
+        assert largest_memory_allocation_when_deserializing < MB
+
+        del value
+
+
+def test_representation():
+    assert repr(AsNumpy()) == "AsNumpy(memory_map=True)"
+    assert repr(AsNumpy(memory_map=False)) == "AsNumpy(memory_map=False)"
+
+
+def test_equality():
+    assert AsNumpy() == AsNumpy()
+    assert AsNumpy() != AsNumpy(memory_map=False)
+    assert AsNumpy() != "AsNumpy()"
@@ -76,3 +76,190 @@ def test_deserialization__with_invalid_values():
     for value in invalid_values:
         with pytest.raises(DeserializationError):
             serializer.deserialize(io.BytesIO(value))
+
+
+def test_serialization_and_deserialization__with_specific_protocol():
+    import pickle
+
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        serializer = AsPickle(protocol=protocol)
+        buffer = io.BytesIO()
+        serializer.serialize({"a": [1, 2, 3]}, buffer)
+        buffer.seek(0)
+
+        assert serializer.deserialize(buffer) == {"a": [1, 2, 3]}
+
+        if protocol >= 2:
+            assert buffer.getvalue()[:2] == bytes([0x80, protocol])
+
+
+def test__init__with_unsupported_protocol():
+    import pickle
+
+    with pytest.raises(ValueError) as e:
+        AsPickle(protocol=pickle.HIGHEST_PROTOCOL + 1)
+
+    assert "is not supported" in str(e.value)
+
+
+def test__init__with_out_of_band_buffers_and_old_protocol():
+    with pytest.raises(ValueError) as e:
+        AsPickle(protocol=4, out_of_band_buffers=True)
+
+    assert (
+        str(e.value)
+        == "Out-of-band buffers require pickle protocol 5 or higher. However, you selected protocol 4."
+    )
+
+
+def test_serialization_and_deserialization__with_out_of_band_buffers():
+    import pickle
+
+    serializer = AsPickle(out_of_band_buffers=True)
+    values = [
+        None,
+        {"object": {"with": ["nested", "values"]}},
+        bytearray(b"a bytearray"),
+        [pickle.PickleBuffer(b"x" * 100), pickle.PickleBuffer(b"y" * 3)],
+        memoryview(b"abcdef")[::2].tobytes(),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "value.pickle")
+
+        for value in values:
+            with open(filename, "wb") as writer:
+                serializer.serialize(value, writer)
+
+            with open(filename, "rb") as reader:
+                from_file = serializer.deserialize(reader)
+
+            with open(filename, "rb") as reader:
+                from_stream = serializer.deserialize(io.BytesIO(reader.read()))
+
+            if isinstance(value, list):
+                assert [bytes(b) for b in from_file] == [bytes(b) for b in value]
+                assert [bytes(b) for b in from_stream] == [bytes(b) for b in value]
+            else:
+                assert from_file == value
+                assert from_stream == value
+
+
+def test_serialization__with_out_of_band_buffers__aligns_buffers():
+    import pickle
+
+    from dagger.serializer.as_pickle import BUFFER_ALIGNMENT
+
+    serializer = AsPickle(out_of_band_buffers=True)
+    buffer = io.BytesIO()
+    serializer.serialize(
+        [pickle.PickleBuffer(b"x" * 7), pickle.PickleBuffer(b"y" * 13)], buffer
+    )
+    contents = buffer.getvalue()
+
+    assert contents.index(b"x" * 7) % BUFFER_ALIGNMENT == 0
+    assert contents.index(b"y" * 13) % BUFFER_ALIGNMENT == 0
+
+
+def test_deserialization__with_out_of_band_buffers__from_a_file_memory_maps_buffers():
+    import pickle
+
+    serializer = AsPickle(out_of_band_buffers=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "value.pickle")
+        with open(filename, "wb") as writer:
+            serializer.serialize(pickle.PickleBuffer(b"x" * 1024), writer)
+
+        with open(filename, "rb") as reader:
+            value = serializer.deserialize(reader)
+
+        # Out-of-band buffers are restored as views over the mapped file
+        assert isinstance(value, memoryview)
+        assert value.readonly
+        assert bytes(value) == b"x" * 1024
+
+
+def test_deserialization__with_out_of_band_buffers__with_invalid_values():
+    serializer = AsPickle(out_of_band_buffers=True)
+    buffer = io.BytesIO()
+    serializer.serialize(bytearray(b"x" * 100), buffer)
+
+    invalid_values = [
+        b"",
+        b"arbitrary byte string",
+        buffer.getvalue()[:-10],
+        buffer.getvalue()[:20],
+    ]
+
+    for value in invalid_values:
+        with pytest.raises(DeserializationError):
+            serializer.deserialize(io.BytesIO(value))
+
+
+def test_deserialization__without_out_of_band_buffers__fails_if_value_has_them():
+    buffer = io.BytesIO()
+    AsPickle(out_of_band_buffers=True).serialize(bytearray(b"x"), buffer)
+    buffer.seek(0)
+
+    with pytest.raises(DeserializationError):
+        AsPickle().deserialize(buffer)
+
+
+def test_memory_footprint__with_out_of_band_buffers():
+    import tracemalloc
+
+    np = pytest.importorskip("numpy")
+    MB = 1024**2
+    serializer = AsPickle(out_of_band_buffers=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "value.pickle")
+        array = np.ones(100 * MB // 8)
+
+        tracemalloc.start()
+        snapshot_before_serialization = tracemalloc.take_snapshot()
+
+        with open(filename, "wb") as writer:
+            serializer.serialize({"array": array}, writer)
+
+        snapshot_after_serialization = tracemalloc.take_snapshot()
+
+        with open(filename, "rb") as reader:
+            value = serializer.deserialize(reader)
+
+        snapshot_after_deserialization = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        assert value["array"].sum() == len(array)
+        assert not value["array"].flags.writeable
+
+        largest_memory_allocation_when_serializing = (
+            snapshot_after_serialization.compare_to(
+                snapshot_before_serialization,
+                "lineno",
+            )[0].size_diff
+        )
+        assert largest_memory_allocation_when_serializing < MB
+
+        largest_memory_allocation_when_deserializing = (
+            snapshot_after_deserialization.compare_to(
+                snapshot_after_serialization,
+                "lineno",
+            )[0].size_diff
+        )
+        assert largest_memory_allocation_when_deserializing < MB
+
+
+def test_representation():
+    assert repr(AsPickle()) == "AsPickle()"
+    assert (
+        repr(AsPickle(protocol=5, out_of_band_buffers=True))
+        == "AsPickle(protocol=5, out_of_band_buffers=True)"
+    )
+
+
+def test_equality():
+    assert AsPickle() == AsPickle()
+    assert AsPickle(protocol=4) != AsPickle()
+    assert AsPickle(out_of_band_buffers=True) != AsPickle()
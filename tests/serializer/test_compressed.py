@@ -0,0 +1,200 @@
+import io
+import json
+import os
+import tempfile
+import tracemalloc
+
+import pytest
+
+from dagger.serializer.as_file import AsFile
+from dagger.serializer.as_json import AsJSON
+from dagger.serializer.as_pickle import AsPickle
+from dagger.serializer.compressed import Compressed
+from dagger.serializer.errors import DeserializationError, SerializationError
+from dagger.serializer.protocol import Serializer
+
+KB = 1024
+MB = KB**2
+
+STDLIB_CODECS = ["gzip", "bz2", "lzma"]
+
+
+def _codecs():
+    try:
+        import zstandard  # noqa
+
+        return STDLIB_CODECS + ["zstd"]
+    except ImportError:
+        return STDLIB_CODECS
+
+
+def test__conforms_to_protocol():
+    assert isinstance(Compressed(AsJSON()), Serializer)
+
+
+def test_extension():
+    assert Compressed(AsJSON()).extension == "json.gz"
+    assert Compressed(AsJSON(), codec="bz2").extension == "json.bz2"
+    assert Compressed(AsPickle(), codec="lzma").extension == "pickle.xz"
+    assert Compressed(AsPickle(), codec="zstd").extension == "pickle.zst"
+
+
+def test__init__with_unsupported_codec():
+    with pytest.raises(ValueError) as e:
+        Compressed(AsJSON(), codec="rar")
+
+    assert (
+        str(e.value)
+        == "Compression codec 'rar' is not supported. These are the codecs available: ['gzip', 'bz2', 'lzma', 'zstd']"
+    )
+
+
+@pytest.mark.parametrize("codec", _codecs())
+def test_serialization_and_deserialization(codec):
+    values = [
+        None,
+        1,
+        "string",
+        ["list", "of", 3],
+        {"object": {"with": ["nested", "values"]}},
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "value")
+
+        for inner in [AsJSON(), AsPickle(), AsPickle(out_of_band_buffers=True)]:
+            for level in [None, 1]:
+                serializer = Compressed(inner, codec=codec, level=level)
+                for value in values:
+                    with open(filename, "wb") as writer:
+                        serializer.serialize(value, writer)
+
+                    with open(filename, "rb") as reader:
+                        assert serializer.deserialize(reader) == value
+
+
+@pytest.mark.parametrize("codec", _codecs())
+def test_serialization__compresses_values(codec):
+    serializer = Compressed(AsJSON(), codec=codec)
+    value = [{"key": "a repetitive value"} for _ in range(1000)]
+
+    compressed = io.BytesIO()
+    serializer.serialize(value, compressed)
+
+    assert len(compressed.getvalue()) * 10 < len(json.dumps(value))
+
+
+def test_serialization__is_deterministic():
+    serializer = Compressed(AsJSON())
+    first, second = io.BytesIO(), io.BytesIO()
+    serializer.serialize({"a": 1}, first)
+    serializer.serialize({"a": 1}, second)
+
+    assert first.getvalue() == second.getvalue()
+
+
+def test_serialization__with_invalid_values():
+    serializer = Compressed(AsJSON())
+
+    with pytest.raises(SerializationError):
+        serializer.serialize(float("nan"), io.BytesIO())
+
+
+@pytest.mark.parametrize("codec", _codecs())
+def test_deserialization__with_invalid_values(codec):
+    serializer = Compressed(AsJSON(), codec=codec)
+    invalid_values = [
+        b"",
+        b"arbitrary byte string",
+    ]
+
+    for value in invalid_values:
+        with pytest.raises(DeserializationError):
+            serializer.deserialize(io.BytesIO(value))
+
+
+def test_deserialization__with_invalid_inner_value():
+    buffer = io.BytesIO()
+    Compressed(AsJSON()).serialize(1, buffer)
+    buffer.seek(0)
+
+    with pytest.raises(DeserializationError):
+        Compressed(AsPickle()).deserialize(buffer)
+
+
+def test_deserialization__does_not_memory_map_compressed_files():
+    np = pytest.importorskip("numpy")
+    from dagger.serializer.as_numpy import AsNumpy
+
+    serializer = Compressed(AsNumpy())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "value")
+        with open(filename, "wb") as writer:
+            serializer.serialize(np.arange(100), writer)
+
+        with open(filename, "rb") as reader:
+            value = serializer.deserialize(reader)
+
+        assert not isinstance(value, np.memmap)
+        np.testing.assert_array_equal(value, np.arange(100))
+
+
+def test_memory_footprint_is_constant():
+    with tempfile.TemporaryDirectory() as tmp:
+        serializer = Compressed(AsFile(output_dir=tmp), level=1)
+        large_file = os.path.join(tmp, "large_file")
+        serialized_file = os.path.join(tmp, "serialized_file")
+
+        # Write a 50-MB file
+        with open(large_file, "w") as f:
+            for _ in range(50 * KB):
+                f.write("x" * KB)
+
+        tracemalloc.start()
+        snapshot_before_serialization = tracemalloc.take_snapshot()
+
+        with open(serialized_file, "wb") as f:
+            serializer.serialize(large_file, f)
+
+        snapshot_after_serialization = tracemalloc.take_snapshot()
+
+        with open(serialized_file, "rb") as f:
+            deserialized_filename = serializer.deserialize(f)
+
+        snapshot_after_deserialization = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        assert os.path.getsize(deserialized_filename) == 50 * MB
+        assert os.path.getsize(serialized_file) < MB
+
+        largest_memory_allocation_when_serializing = (
+            snapshot_after_serialization.compare_to(
+                snapshot_before_serialization,
+                "lineno",
+            )[0].size_diff
+        )
+        assert largest_memory_allocation_when_serializing < 2 * MB
+
+        largest_memory_allocation_when_deserializing = (
+            snapshot_after_deserialization.compare_to(
+                snapshot_after_serialization,
+                "lineno",
+            )[0].size_diff
+        )
+        assert largest_memory_allocation_when_deserializing < 2 * MB
+
+
+def test_representation():
+    assert (
+        repr(Compressed(AsJSON(), codec="bz2", level=3))
+        == "Compressed(AsJSON(indent=None, allow_nan=False), codec=bz2, level=3)"
+    )
+
+
+def test_equality():
+    assert Compressed(AsJSON()) == Compressed(AsJSON())
+    assert Compressed(AsJSON()) != Compressed(AsPickle())
+    assert Compressed(AsJSON()) != Compressed(AsJSON(), codec="bz2")
+    assert Compressed(AsJSON()) != Compressed(AsJSON(), level=1)
+    assert Compressed(AsJSON()) != AsJSON()
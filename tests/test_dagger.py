@@ -1,5 +1,51 @@
+import subprocess
+import sys
+
+import pytest
+
+import dagger
 from dagger import __version__
 
 
 def test_version():
     assert __version__ == "0.0.0"
+
+
+def test__top_level_objects_are_imported_lazily():
+    output = subprocess.check_output(
+        [
+            sys.executable,
+            "-c",
+            "import sys, dagger.runtime.cli; print([m for m in sys.modules if m.startswith('dagger.dsl')])",
+        ]
+    )
+    assert output.strip() == b"[]"
+
+
+def test__serializers_import_tarfile_lazily():
+    output = subprocess.check_output(
+        [
+            sys.executable,
+            "-c",
+            "import sys, dagger.serializer; print('tarfile' in sys.modules)",
+        ]
+    )
+    assert output.strip() == b"False"
+
+
+def test__top_level_objects_are_available():
+    from dagger.dag import DAG
+    from dagger.dsl import build
+    from dagger.serializer import AsJSON
+
+    assert dagger.DAG is DAG
+    assert dagger.AsJSON is AsJSON
+    assert dagger.dsl.build is build
+    assert "Task" in dir(dagger)
+
+
+def test__unknown_top_level_object():
+    with pytest.raises(AttributeError) as e:
+        dagger.Unknown
+
+    assert str(e.value) == "module 'dagger' has no attribute 'Unknown'"